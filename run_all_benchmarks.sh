@@ -0,0 +1,3 @@
+#!/bin/bash
+
+cd src && python3 benchmark_suite.py "$@"
@@ -0,0 +1,18 @@
+#!/bin/bash
+
+# Starts a local mock robot database and the service pointed at it, then drives load at the service.
+# Arguments are passed to load_generator.py; MOCK_ROBOT_DATABASE_ARGUMENTS is passed to mock_robot_database.py.
+# Setting SERVICE_WORKER_COUNT serves the service from that many worker processes using production_server.py.
+cd src || exit 1
+python3 mock_robot_database.py --port 5001 ${MOCK_ROBOT_DATABASE_ARGUMENTS} &
+MOCK_ROBOT_DATABASE_PID=$!
+if [ -n "${SERVICE_WORKER_COUNT}" ]; then
+    ROBOT_DATABASE_ENDPOINT_URL=http://localhost:5001/robots python3 production_server.py \
+        --workers "${SERVICE_WORKER_COUNT}" > /dev/null 2>&1 &
+else
+    ROBOT_DATABASE_ENDPOINT_URL=http://localhost:5001/robots python3 closest_robot_service.py > /dev/null 2>&1 &
+fi
+SERVICE_PID=$!
+trap 'kill ${SERVICE_PID} ${MOCK_ROBOT_DATABASE_PID}' EXIT
+sleep 3
+python3 load_generator.py "$@"
@@ -0,0 +1,149 @@
+import numpy
+
+# Internal Libraries
+import selection_policies
+
+
+class MultiLoadRobotAssigner(object):
+    _MAX_OPTIMAL_LOAD_COUNT = 128
+    _INITIAL_GREEDY_CANDIDATE_COUNT = 8
+
+    def __init__(self, robot_spatial_index, selection_policy=None):
+        # Costs and Candidates Both Come From the Selection Policy, So a Load on Its Own Gets the Robot It Would Select
+        self._robot_spatial_index = robot_spatial_index
+        self._selection_policy = selection_policy or selection_policies.DEFAULT_SELECTION_POLICY
+        battery_levels = numpy.frombuffer(robot_spatial_index.get_robot_fleet().get_battery_levels(),
+                                          dtype=numpy.float64)
+        self._assignable_robot_count = int(numpy.count_nonzero(
+            (battery_levels != 0) & (battery_levels >= self._selection_policy.get_min_battery_level())))
+
+    def get_selection_policy(self):
+        return self._selection_policy
+
+    def calculate_assignment_cost(self, distance_to_load, battery_level):
+        return float(self._selection_policy.calculate_assignment_costs(
+            distances=numpy.float64(distance_to_load), battery_levels=numpy.float64(battery_level)))
+
+    def assign_robots_to_loads(self, loads, use_optimal_assignment=None):
+        loads = list(loads)
+        if use_optimal_assignment is None:
+            use_optimal_assignment = len(loads) <= self._MAX_OPTIMAL_LOAD_COUNT
+        if use_optimal_assignment:
+            return self.assign_robots_to_loads_optimally(loads)
+        return self.assign_robots_to_loads_greedily(loads)
+
+    def _find_candidate_entries(self, load, robot_count):
+        robot_fleet = self._robot_spatial_index.get_robot_fleet()
+        ranked_entries = self._selection_policy.rank_robot_positions_using_index(
+            robot_spatial_index=self._robot_spatial_index, load=load, robot_count=robot_count)
+        return [(position, robot_fleet.get_robot(position), distance) for position, distance in ranked_entries]
+
+    @staticmethod
+    def _create_assigned_robots(assigned_entries):
+        return [assigned_entry[1].with_distance_to_load(assigned_entry[2]) if assigned_entry else None
+                for assigned_entry in assigned_entries]
+
+    def assign_robots_to_loads_greedily(self, loads):
+        assigned_entries = [None] * len(loads)
+        assigned_positions = set()
+        unassigned_load_indices = list(range(len(loads)))
+        candidate_count = self._INITIAL_GREEDY_CANDIDATE_COUNT
+        while unassigned_load_indices and len(assigned_positions) < self._assignable_robot_count:
+            candidate_entries = []
+            for load_index in unassigned_load_indices:
+                candidate_entries.extend((load_index, entry) for entry
+                                         in self._find_candidate_entries(load=loads[load_index],
+                                                                         robot_count=candidate_count)
+                                         if entry[0] not in assigned_positions)
+            costs = self._selection_policy.calculate_assignment_costs(
+                distances=numpy.array([entry[2] for _, entry in candidate_entries], dtype=numpy.float64),
+                battery_levels=numpy.array([entry[1].get_battery_level() for _, entry in candidate_entries],
+                                           dtype=numpy.float64))
+            candidate_pairs = [(cost, load_index, entry[0], entry)
+                               for cost, (load_index, entry) in zip(costs.tolist(), candidate_entries)]
+            candidate_pairs.sort(key=lambda candidate_pair: candidate_pair[:3])
+            for _, load_index, position, entry in candidate_pairs:
+                if assigned_entries[load_index] is None and position not in assigned_positions:
+                    assigned_entries[load_index] = entry
+                    assigned_positions.add(position)
+            unassigned_load_indices = [load_index for load_index in unassigned_load_indices
+                                       if assigned_entries[load_index] is None]
+            # Loads Whose Candidates Were All Taken Look Further Out on the Next Round
+            candidate_count *= 2
+        return self._create_assigned_robots(assigned_entries)
+
+    def assign_robots_to_loads_optimally(self, loads):
+        if not loads:
+            return []
+        # Each Load's Optimal Robot Is Always Among Its len(loads) Cheapest Robots, So Only Those Are Considered
+        candidate_entries_by_position = {}
+        for load in loads:
+            for entry in self._find_candidate_entries(load=load, robot_count=len(loads)):
+                candidate_entries_by_position[entry[0]] = entry
+        if not candidate_entries_by_position:
+            return [None] * len(loads)
+        candidate_positions = sorted(candidate_entries_by_position)
+        candidate_robots = [candidate_entries_by_position[position][1] for position in candidate_positions]
+
+        distances = self._calculate_distance_matrix(loads=loads, robots=candidate_robots)
+        battery_levels = numpy.array([robot.get_battery_level() for robot in candidate_robots], dtype=numpy.float64)
+        costs = self._selection_policy.calculate_assignment_costs(distances=distances, battery_levels=battery_levels)
+
+        assigned_entries = [None] * len(loads)
+        for load_index, candidate_index in self._solve_minimum_cost_assignment(costs):
+            candidate_robot = candidate_robots[candidate_index]
+            distance_to_load = self._robot_spatial_index.calculate_distance(
+                candidate_robot.get_x_coordinate(), candidate_robot.get_y_coordinate(),
+                loads[load_index].get_x_coordinate(), loads[load_index].get_y_coordinate())
+            assigned_entries[load_index] = (candidate_positions[candidate_index], candidate_robot, distance_to_load)
+        return self._create_assigned_robots(assigned_entries)
+
+    @staticmethod
+    def _calculate_distance_matrix(loads, robots):
+        # Squaring by Multiplication Can Differ From the math.pow Distance Used Elsewhere in the Last Bit, Which Only
+        # Nudges Costs; Assigned Robots Report Their Distance Worked Out Again the Usual Way
+        load_x_coordinates = numpy.array([load.get_x_coordinate() for load in loads], dtype=numpy.float64)
+        load_y_coordinates = numpy.array([load.get_y_coordinate() for load in loads], dtype=numpy.float64)
+        robot_x_coordinates = numpy.array([robot.get_x_coordinate() for robot in robots], dtype=numpy.float64)
+        robot_y_coordinates = numpy.array([robot.get_y_coordinate() for robot in robots], dtype=numpy.float64)
+        x_differences = numpy.subtract.outer(load_x_coordinates, robot_x_coordinates)
+        y_differences = numpy.subtract.outer(load_y_coordinates, robot_y_coordinates)
+        return numpy.sqrt(x_differences * x_differences + y_differences * y_differences)
+
+    @classmethod
+    def _solve_minimum_cost_assignment(cls, costs):
+        if costs.shape[0] > costs.shape[1]:
+            return [(row, column) for column, row in cls._solve_minimum_cost_assignment(costs.T)]
+        # Hungarian Algorithm With Potentials (Rows <= Columns), With Its Inner Column Scan Vectorized
+        row_count, column_count = costs.shape
+        row_potentials = numpy.zeros(row_count + 1)
+        column_potentials = numpy.zeros(column_count + 1)
+        column_matches = numpy.zeros(column_count + 1, dtype=numpy.int64)
+        previous_columns = numpy.zeros(column_count + 1, dtype=numpy.int64)
+        for row in range(1, row_count + 1):
+            column_matches[0] = row
+            current_column = 0
+            min_reduced_costs = numpy.full(column_count + 1, numpy.inf)
+            is_column_used = numpy.zeros(column_count + 1, dtype=bool)
+            while True:
+                is_column_used[current_column] = True
+                current_row = column_matches[current_column]
+                reduced_costs = costs[current_row - 1] - row_potentials[current_row] - column_potentials[1:]
+                is_improved = ~is_column_used[1:] & (reduced_costs < min_reduced_costs[1:])
+                min_reduced_costs[1:][is_improved] = reduced_costs[is_improved]
+                previous_columns[1:][is_improved] = current_column
+                free_reduced_costs = numpy.where(is_column_used[1:], numpy.inf, min_reduced_costs[1:])
+                next_column = int(free_reduced_costs.argmin()) + 1
+                delta = free_reduced_costs[next_column - 1]
+                row_potentials[column_matches[is_column_used]] += delta
+                column_potentials[is_column_used] -= delta
+                min_reduced_costs[~is_column_used] -= delta
+                current_column = next_column
+                if column_matches[current_column] == 0:
+                    break
+            while current_column:
+                previous_column = previous_columns[current_column]
+                column_matches[current_column] = column_matches[previous_column]
+                current_column = previous_column
+        return [(int(column_matches[column]) - 1, column - 1) for column in range(1, column_count + 1)
+                if column_matches[column]]
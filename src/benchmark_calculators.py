@@ -0,0 +1,74 @@
+#!/bin/python3
+
+import random
+import sys
+import time
+
+# Internal Libraries
+from calculators import ClosestRobotCalculator, VectorizedClosestRobotCalculator
+from models import Robot, Load
+from spatial_index import RobotSpatialIndex
+
+FLEET_SIZES = [100, 1000, 10000, 50000]
+LOAD_COUNT = 50
+FLOOR_SIZE = 1000
+RANDOM_SEED = 20230301
+
+
+def create_random_robots(random_generator, robot_count):
+    return [Robot(id=robot_id,
+                  battery_level=random_generator.randint(0, 100),
+                  x_coordinate=random_generator.uniform(0, FLOOR_SIZE),
+                  y_coordinate=random_generator.uniform(0, FLOOR_SIZE))
+            for robot_id in range(robot_count)]
+
+
+def create_random_loads(random_generator, load_count):
+    return [Load(id=load_id,
+                 x_coordinate=random_generator.uniform(0, FLOOR_SIZE),
+                 y_coordinate=random_generator.uniform(0, FLOOR_SIZE))
+            for load_id in range(load_count)]
+
+
+def time_per_call(function, arguments):
+    start_time = time.perf_counter()
+    results = [function(argument) for argument in arguments]
+    return (time.perf_counter() - start_time) / len(arguments), results
+
+
+def main():
+    random_generator = random.Random(RANDOM_SEED)
+    print('{:>10} {:>12} {:>12} {:>12} {:>12} {:>12}'.format('robots', 'linear (us)', 'index (us)', 'numpy (us)',
+                                                              'batched (us)', 'build (ms)'))
+    for fleet_size in FLEET_SIZES:
+        robots = create_random_robots(random_generator=random_generator, robot_count=fleet_size)
+        loads = create_random_loads(random_generator=random_generator, load_count=LOAD_COUNT)
+
+        build_start_time = time.perf_counter()
+        robot_spatial_index = RobotSpatialIndex(robots)
+        build_time = time.perf_counter() - build_start_time
+        vectorized_calculator = VectorizedClosestRobotCalculator(robots)
+
+        linear_time, linear_results = time_per_call(
+            lambda load: ClosestRobotCalculator.calculate_closest_robot_for_load(robots=robots, load=load), loads)
+        index_time, index_results = time_per_call(
+            lambda load: ClosestRobotCalculator.calculate_closest_robot_for_load_using_index(
+                robot_spatial_index=robot_spatial_index, load=load), loads)
+        vectorized_time, vectorized_results = time_per_call(vectorized_calculator.calculate_closest_robot_for_load,
+                                                            loads)
+        batched_time, batched_results = time_per_call(vectorized_calculator.calculate_closest_robots_for_loads,
+                                                      [loads])
+
+        expected_ids = [robot.get_id() for robot in linear_results]
+        for results in [index_results, vectorized_results, batched_results[0]]:
+            if [robot.get_id() for robot in results] != expected_ids:
+                print('Results Differ From the Linear Path for {} Robots.'.format(fleet_size))
+                return 1
+        print('{:>10} {:>12.1f} {:>12.1f} {:>12.1f} {:>12.1f} {:>12.1f}'.format(
+            fleet_size, linear_time * 1e6, index_time * 1e6, vectorized_time * 1e6,
+            batched_time / len(loads) * 1e6, build_time * 1e3))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,92 @@
+#!/bin/python3
+
+import json
+import random
+import sys
+import time
+import tracemalloc
+
+# Internal Libraries
+from json_helpers import JSONArrayStreamDecoder, RobotDatabaseJSONTransformer
+
+RECORD_COUNT = 100000
+REPEAT_COUNT = 5
+FLOOR_SIZE = 1000
+RANDOM_SEED = 20230301
+STREAM_CHUNK_SIZE = 1 << 16
+
+
+def create_random_robots_json(random_generator, record_count):
+    return [{'robotId': str(robot_id) if robot_id % 2 else robot_id,
+             'batteryLevel': random_generator.randint(0, 100),
+             'x': random_generator.uniform(0, FLOOR_SIZE),
+             'y': random_generator.uniform(0, FLOOR_SIZE)}
+            for robot_id in range(record_count)]
+
+
+def create_robots_in_two_passes(robots_json):
+    return [RobotDatabaseJSONTransformer.create_robot_from_robot_database_json(robot_json)
+            for robot_json in robots_json if RobotDatabaseJSONTransformer.is_robot_database_json_valid(robot_json)]
+
+
+def split_into_chunks(data, chunk_size):
+    return [data[index:index + chunk_size] for index in range(0, len(data), chunk_size)]
+
+
+def create_robot_fleet_from_whole_document(chunks):
+    return RobotDatabaseJSONTransformer.create_robot_fleet_from_robot_database_json(json.loads(b''.join(chunks)))
+
+
+def create_robot_fleet_from_stream(chunks):
+    return RobotDatabaseJSONTransformer.create_robot_fleet_from_robot_database_json(JSONArrayStreamDecoder(chunks))
+
+
+def measure_peak_memory(function, argument):
+    tracemalloc.start()
+    function(argument)
+    peak_memory = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return peak_memory
+
+
+def time_per_record(function, robots_json):
+    best_time = None
+    for _ in range(REPEAT_COUNT):
+        start_time = time.perf_counter()
+        result = function(robots_json)
+        elapsed_time = time.perf_counter() - start_time
+        best_time = elapsed_time if best_time is None else min(best_time, elapsed_time)
+    return best_time / len(robots_json), result
+
+
+def main():
+    robots_json = create_random_robots_json(random_generator=random.Random(RANDOM_SEED), record_count=RECORD_COUNT)
+    two_pass_time, robots = time_per_record(create_robots_in_two_passes, robots_json)
+    single_pass_time, robot_fleet = time_per_record(
+        RobotDatabaseJSONTransformer.create_robot_fleet_from_robot_database_json, robots_json)
+
+    if [robot.get_id() for robot in robots] != list(robot_fleet.get_ids()):
+        print('Single Pass Results Differ From the Two Pass Results.')
+        return 1
+    print('{:>10} {:>16} {:>18} {:>10}'.format('records', 'two pass (ns)', 'single pass (ns)', 'speedup'))
+    print('{:>10} {:>16.1f} {:>18.1f} {:>9.1f}x'.format(RECORD_COUNT, two_pass_time * 1e9, single_pass_time * 1e9,
+                                                        two_pass_time / single_pass_time))
+
+    # The Payload Arrives as Chunks of Bytes, Either Joined and Parsed Whole or Parsed Element by Element
+    chunks = split_into_chunks(json.dumps(robots_json).encode(), STREAM_CHUNK_SIZE)
+    document_time, _ = time_per_record(lambda _: create_robot_fleet_from_whole_document(chunks), robots_json)
+    stream_time, streamed_robot_fleet = time_per_record(lambda _: create_robot_fleet_from_stream(chunks), robots_json)
+    if list(streamed_robot_fleet.get_ids()) != list(robot_fleet.get_ids()):
+        print('Streamed Results Differ From the Whole Document Results.')
+        return 1
+    print()
+    print('{:>10} {:>16} {:>18} {:>16} {:>18}'.format('records', 'document (ns)', 'document peak (MB)', 'stream (ns)',
+                                                      'stream peak (MB)'))
+    print('{:>10} {:>16.1f} {:>18.1f} {:>16.1f} {:>18.1f}'.format(
+        RECORD_COUNT, document_time * 1e9, measure_peak_memory(create_robot_fleet_from_whole_document, chunks) / 1e6,
+        stream_time * 1e9, measure_peak_memory(create_robot_fleet_from_stream, chunks) / 1e6))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,351 @@
+#!/bin/python3
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+
+# Internal Libraries
+import binary_helpers
+import closest_robot_service
+from benchmark_utilities import DISTRIBUTIONS, BenchmarkResults, BenchmarkTimer, SyntheticFleetGenerator
+from calculators import ClosestRobotCalculator, VectorizedClosestRobotCalculator
+from closest_robot_result_cache import ClosestRobotResultCache
+from closest_robot_subscriptions import ClosestRobotSubscriptions
+from fleet_snapshot_cache import FleetSnapshot, FleetSnapshotCache
+from fleet_snapshot_file import FleetSnapshotFile
+from json_helpers import RequestJSONTransformer, ResponseJSONFormatter, RobotDatabaseJSONTransformer
+from json_retriever import JSONRetriever
+from mock_robot_database import StandInRobotDatabaseServer
+from models import Robot
+from nearest_robot_raster import NearestRobotRaster
+from selection_policies import DEFAULT_SELECTION_POLICY
+from spatial_index import RobotSpatialIndex
+
+FLEET_SIZES = [10, 100, 1000, 10000, 100000, 1000000]
+LOAD_COUNT = 100
+RANKED_ROBOT_COUNT = 5
+SUBSCRIBED_LOAD_COPY_COUNT = 10
+RASTER_FLOOR_SIZE = 1000
+DEFAULT_OUTPUT_PATH = 'benchmark_results.json'
+ENDPOINT_PATH = '/api/robots/closest'
+SNAPSHOT_REFRESH_INTERVAL_SECONDS = 3600
+METRICS_BENCHMARK_ENDPOINT = 'benchmark'
+
+
+def record_result(benchmark_results, benchmark, distribution, fleet_size, timings):
+    result = benchmark_results.add_result(benchmark=benchmark,
+                                          distribution=distribution,
+                                          fleet_size=fleet_size,
+                                          timings=timings)
+    print('{:<38} {:<18} {:>8} {:>14.1f} {:>14.1f} {:>10}'.format(
+        benchmark, distribution or '-', fleet_size if fleet_size is not None else '-', result['median_us'],
+        result['p95_us'], result['iterations']))
+
+
+def benchmark_request_and_response_json(benchmark_timer, benchmark_results, loads_json):
+    def transform_request_json(load_json):
+        if RequestJSONTransformer.is_request_json_valid(load_json):
+            return RequestJSONTransformer.create_load_from_request_json(load_json)
+
+    record_result(benchmark_results, 'request_json_transformer', None, None,
+                  benchmark_timer.time_function(transform_request_json, loads_json))
+    record_result(benchmark_results, 'response_json_formatter', None, None,
+                  benchmark_timer.time_function(
+                      lambda load_json: ResponseJSONFormatter.get_formatted_response_json(
+                          robot_id=load_json['loadId'], distance_to_goal=load_json['x'], battery_level=50),
+                      loads_json))
+
+
+def benchmark_request_and_response_encodings(benchmark_timer, benchmark_results, loads_json):
+    # The Full Cost of Each Wire Format, From Request Bytes to a Load and From a Result to Response Bytes
+    def decode_request_json(request_body):
+        load_json = json.loads(request_body)
+        if RequestJSONTransformer.is_request_json_valid(load_json):
+            return RequestJSONTransformer.create_load_from_request_json(load_json)
+
+    def decode_request_binary(request_body):
+        if binary_helpers.RequestBinaryTransformer.is_request_binary_valid(request_body):
+            return binary_helpers.RequestBinaryTransformer.create_load_from_request_binary(request_body)
+
+    def encode_response_json(load_json):
+        return json.dumps(ResponseJSONFormatter.get_formatted_response_json(
+            robot_id=load_json['loadId'], distance_to_goal=load_json['x'], battery_level=50)).encode()
+
+    def encode_response_binary(load_json):
+        return binary_helpers.ResponseBinaryFormatter.get_formatted_response_binary(
+            robot_id=load_json['loadId'], distance_to_goal=load_json['x'], battery_level=50)
+
+    record_result(benchmark_results, 'request_json_decoding', None, None,
+                  benchmark_timer.time_function(decode_request_json,
+                                                [json.dumps(load_json).encode() for load_json in loads_json]))
+    record_result(benchmark_results, 'request_binary_decoding', None, None,
+                  benchmark_timer.time_function(decode_request_binary,
+                                                [binary_helpers.RequestBinaryTransformer.get_formatted_request_binary(
+                                                    load_id=load_json['loadId'], x_coordinate=load_json['x'],
+                                                    y_coordinate=load_json['y']) for load_json in loads_json]))
+    record_result(benchmark_results, 'response_json_encoding', None, None,
+                  benchmark_timer.time_function(encode_response_json, loads_json))
+    record_result(benchmark_results, 'response_binary_encoding', None, None,
+                  benchmark_timer.time_function(encode_response_binary, loads_json))
+
+
+def benchmark_robot_database_json(benchmark_timer, benchmark_results, distribution, robots_json):
+    def transform_robot_database_json_in_two_passes(robots_json):
+        return [RobotDatabaseJSONTransformer.create_robot_from_robot_database_json(robot_json)
+                for robot_json in robots_json if RobotDatabaseJSONTransformer.is_robot_database_json_valid(robot_json)]
+
+    record_result(benchmark_results, 'robot_database_json_transformer', distribution, len(robots_json),
+                  benchmark_timer.time_function(transform_robot_database_json_in_two_passes, [robots_json]))
+    record_result(benchmark_results, 'robot_database_json_fleet_builder', distribution, len(robots_json),
+                  benchmark_timer.time_function(
+                      RobotDatabaseJSONTransformer.create_robot_fleet_from_robot_database_json, [robots_json]))
+
+
+def benchmark_calculators(benchmark_timer, benchmark_results, distribution, robots_json, loads):
+    robot_fleet = RobotDatabaseJSONTransformer.create_robot_fleet_from_robot_database_json(robots_json)
+    robots = list(robot_fleet)
+    robot_spatial_index = RobotSpatialIndex(robot_fleet)
+    vectorized_calculator = VectorizedClosestRobotCalculator(robot_fleet)
+
+    record_result(benchmark_results, 'closest_robot_calculator', distribution, len(robots),
+                  benchmark_timer.time_function(
+                      lambda load: ClosestRobotCalculator.calculate_closest_robot_for_load(robots=robots, load=load),
+                      loads))
+    record_result(benchmark_results, 'closest_robot_calculator_using_index', distribution, len(robots),
+                  benchmark_timer.time_function(
+                      lambda load: ClosestRobotCalculator.calculate_closest_robot_for_load_using_index(
+                          robot_spatial_index=robot_spatial_index, load=load),
+                      loads))
+    record_result(benchmark_results, 'vectorized_closest_robot_calculator', distribution, len(robots),
+                  benchmark_timer.time_function(vectorized_calculator.calculate_closest_robot_for_load, loads))
+    record_result(benchmark_results, 'top_{}_closest_robots_calculator'.format(RANKED_ROBOT_COUNT), distribution,
+                  len(robots),
+                  benchmark_timer.time_function(
+                      lambda load: ClosestRobotCalculator.calculate_closest_robots_for_load(
+                          robots=robots, load=load, robot_count=RANKED_ROBOT_COUNT),
+                      loads))
+    record_result(benchmark_results, 'top_{}_closest_robots_using_index'.format(RANKED_ROBOT_COUNT),
+                  distribution, len(robots),
+                  benchmark_timer.time_function(
+                      lambda load: ClosestRobotCalculator.calculate_closest_robots_for_load_using_index(
+                          robot_spatial_index=robot_spatial_index, load=load, robot_count=RANKED_ROBOT_COUNT),
+                      loads))
+
+    # Every Load Is Calculated Once Up Front, So Only Cache Hits Are Timed
+    fleet_snapshot = FleetSnapshot(version=1, robots=robot_fleet, fetched_at=0)
+    result_cache = ClosestRobotResultCache(max_entry_count=len(loads))
+
+    def get_cached_closest_robot(load):
+        return result_cache.get_closest_robot(
+            fleet_snapshot=fleet_snapshot,
+            load=load,
+            calculate_closest_robot=lambda load: ClosestRobotCalculator.calculate_closest_robot_for_load_using_index(
+                robot_spatial_index=robot_spatial_index, load=load))
+
+    for load in loads:
+        get_cached_closest_robot(load)
+    record_result(benchmark_results, 'closest_robot_result_cache_hit', distribution, len(robots),
+                  benchmark_timer.time_function(get_cached_closest_robot, loads))
+
+
+def benchmark_subscriptions(benchmark_timer, benchmark_results, distribution, robots_json, loads):
+    robot_fleet = RobotDatabaseJSONTransformer.create_robot_fleet_from_robot_database_json(robots_json)
+    fleet_snapshot_cache = FleetSnapshotCache(json_retriever=None)
+    fleet_snapshot_cache.apply_robot_updates(list(robot_fleet))
+    subscriptions = ClosestRobotSubscriptions(selection_policy=DEFAULT_SELECTION_POLICY)
+    subscriptions.watch(fleet_snapshot_cache)
+    for _ in range(SUBSCRIBED_LOAD_COPY_COUNT):
+        subscriptions.subscribe(fleet_snapshot=fleet_snapshot_cache.get_snapshot(), loads=loads)
+    # Each Update Moves One Robot Onto a Subscribed Load, the Worst Case for the Loads Around It
+    moved_robots = [Robot(id=robot_fleet[position % len(robot_fleet)].get_id(),
+                          battery_level=robot_fleet[position % len(robot_fleet)].get_battery_level(),
+                          x_coordinate=load.get_x_coordinate(),
+                          y_coordinate=load.get_y_coordinate())
+                    for position, load in enumerate(loads)]
+    record_result(benchmark_results, 'subscribed_robot_update', distribution, len(robot_fleet),
+                  benchmark_timer.time_function(lambda robot: fleet_snapshot_cache.apply_robot_updates([robot]),
+                                                moved_robots))
+
+
+def benchmark_nearest_robot_raster(benchmark_timer, benchmark_results, distribution, robots_json, loads):
+    robot_fleet = RobotDatabaseJSONTransformer.create_robot_fleet_from_robot_database_json(robots_json)
+    fleet_snapshot_cache = FleetSnapshotCache(json_retriever=None)
+    fleet_snapshot_cache.apply_robot_updates(list(robot_fleet))
+    nearest_robot_raster = NearestRobotRaster(min_x=0, min_y=0, max_x=RASTER_FLOOR_SIZE, max_y=RASTER_FLOOR_SIZE,
+                                              selection_policy=DEFAULT_SELECTION_POLICY)
+    nearest_robot_raster.watch(fleet_snapshot_cache)
+    fleet_snapshot = fleet_snapshot_cache.get_snapshot()
+
+    def find_closest_robot(load):
+        return nearest_robot_raster.find_closest_robot(fleet_snapshot=fleet_snapshot, load=load)
+
+    # Every Load's Cell Is Calculated Once Up Front, So Only Lookups in Hot Cells Are Timed
+    for load in loads:
+        find_closest_robot(load)
+    record_result(benchmark_results, 'nearest_robot_raster_lookup', distribution, len(robot_fleet),
+                  benchmark_timer.time_function(find_closest_robot, loads))
+
+
+def benchmark_fleet_snapshot_file(benchmark_timer, benchmark_results, distribution, robots_json):
+    fleet_snapshot = FleetSnapshot.create_from_robot_database_json(version=1, robots_json=robots_json)
+    with tempfile.TemporaryDirectory() as temporary_directory:
+        fleet_snapshot_file = FleetSnapshotFile(os.path.join(temporary_directory, 'fleet_snapshot.bin'))
+        record_result(benchmark_results, 'fleet_snapshot_file_write', distribution, len(robots_json),
+                      benchmark_timer.time_function(fleet_snapshot_file.write, [fleet_snapshot]))
+        # The Full Time to a Servable Snapshot at Startup; Its Spatial Index Is Only Built by the First Query
+        record_result(benchmark_results, 'fleet_snapshot_file_restore', distribution, len(robots_json),
+                      benchmark_timer.time_function(fleet_snapshot_file.read, [1]))
+
+
+def benchmark_endpoint(benchmark_timer, benchmark_results, distribution, robots_json, loads_json):
+    # The Service Is Driven Through Flask Against a Local Stand-In, So No Network Beyond localhost Is Involved
+    stand_in_server = StandInRobotDatabaseServer(robots_json=robots_json).start()
+    original_fleet_snapshot_cache = closest_robot_service.g_fleet_snapshot_cache
+    original_closest_robot_result_cache = closest_robot_service.g_closest_robot_result_cache
+    try:
+        json_retriever = JSONRetriever(
+            stand_in_server.get_url(),
+            json_array_consumer=RobotDatabaseJSONTransformer.create_robot_fleet_from_robot_database_json)
+        fleet_snapshot_cache = FleetSnapshotCache(json_retriever=json_retriever,
+                                                  refresh_interval_seconds=SNAPSHOT_REFRESH_INTERVAL_SECONDS)
+        closest_robot_service.g_fleet_snapshot_cache = fleet_snapshot_cache
+        record_result(benchmark_results, 'fleet_snapshot_refresh', distribution, len(robots_json),
+                      benchmark_timer.time_function(lambda _: fleet_snapshot_cache.refresh(), [None]))
+
+        flask_client = closest_robot_service.g_flask_app.test_client()
+        # Loads Are Cycled Through Many Times, So the Result Cache Keeps Nothing Here or Mostly Hits Would Be Timed
+        closest_robot_service.g_closest_robot_result_cache = ClosestRobotResultCache(max_entry_count=0)
+        record_result(benchmark_results, 'closest_robot_endpoint', distribution, len(robots_json),
+                      benchmark_timer.time_function(lambda load_json: flask_client.post(ENDPOINT_PATH, json=load_json),
+                                                    loads_json))
+        requests_binary = [binary_helpers.RequestBinaryTransformer.get_formatted_request_binary(
+            load_id=load_json['loadId'], x_coordinate=load_json['x'], y_coordinate=load_json['y'])
+            for load_json in loads_json]
+        record_result(benchmark_results, 'closest_robot_endpoint_binary', distribution, len(robots_json),
+                      benchmark_timer.time_function(
+                          lambda request_binary: flask_client.post(ENDPOINT_PATH,
+                                                                   data=request_binary,
+                                                                   content_type=binary_helpers.MEDIA_TYPE,
+                                                                   headers={'Accept': binary_helpers.MEDIA_TYPE}),
+                          requests_binary))
+
+        # Every Load Is Answered Once Up Front, So Only Requests Answered From the Result Cache Are Timed
+        closest_robot_service.g_closest_robot_result_cache = ClosestRobotResultCache(max_entry_count=len(loads_json))
+        for load_json in loads_json:
+            flask_client.post(ENDPOINT_PATH, json=load_json)
+        record_result(benchmark_results, 'closest_robot_endpoint_cache_hit', distribution, len(robots_json),
+                      benchmark_timer.time_function(lambda load_json: flask_client.post(ENDPOINT_PATH, json=load_json),
+                                                    loads_json))
+    finally:
+        closest_robot_service.g_fleet_snapshot_cache = original_fleet_snapshot_cache
+        closest_robot_service.g_closest_robot_result_cache = original_closest_robot_result_cache
+        stand_in_server.stop()
+
+
+def benchmark_micro_batching(benchmark_timer, benchmark_results, distribution, robots_json, loads):
+    # A Full Micro-Batch of Loads Is Calculated Together, as the Micro-Batcher Does, and One Load at a Time, as Requests
+    # Are Without It. Both Timings Cover the Same Loads, So Their Medians Compare Throughput Directly
+    fleet_snapshot = FleetSnapshot.create_from_robot_database_json(version=1, robots_json=robots_json)
+    micro_batch_loads = [loads[index % len(loads)] for index in range(closest_robot_service.MICRO_BATCH_MAX_SIZE)]
+    original_closest_robot_result_cache = closest_robot_service.g_closest_robot_result_cache
+    try:
+        closest_robot_service.g_closest_robot_result_cache = ClosestRobotResultCache(max_entry_count=0)
+        record_result(benchmark_results, 'micro_batch_calculated_alone', distribution, len(robots_json),
+                      benchmark_timer.time_function(
+                          lambda loads: [closest_robot_service._calculate_closest_robot(fleet_snapshot=fleet_snapshot,
+                                                                                        load=load)
+                                         for load in loads],
+                          [micro_batch_loads]))
+        record_result(benchmark_results, 'micro_batch_calculated_together', distribution, len(robots_json),
+                      benchmark_timer.time_function(
+                          lambda loads: closest_robot_service._calculate_closest_robots(fleet_snapshot=fleet_snapshot,
+                                                                                        loads=loads),
+                          [micro_batch_loads]))
+    finally:
+        closest_robot_service.g_closest_robot_result_cache = original_closest_robot_result_cache
+
+
+def benchmark_metrics_recording(benchmark_timer, benchmark_results):
+    # What Instrumentation Adds to Each Request: Four Stage Observations and One Response Count
+    response_counter = closest_robot_service.g_response_counters.labels(METRICS_BENCHMARK_ENDPOINT, '200')
+
+    def record_request_metrics(_):
+        stage_start_time = time.perf_counter()
+        for stage in closest_robot_service.g_stage_duration_histograms_by_stage:
+            stage_start_time = closest_robot_service._observe_stage_duration(stage, stage_start_time)
+        response_counter.increment()
+
+    record_result(benchmark_results, 'request_metrics_recording', None, None,
+                  benchmark_timer.time_function(record_request_metrics, [None]))
+
+
+def parse_arguments(arguments):
+    argument_parser = argparse.ArgumentParser(description='Benchmarks the closest robot service and its components.')
+    argument_parser.add_argument('--max-fleet-size', type=int, default=FLEET_SIZES[-1],
+                                 help='Largest fleet size to benchmark.')
+    argument_parser.add_argument('--distributions', nargs='+', choices=DISTRIBUTIONS, default=DISTRIBUTIONS,
+                                 help='Synthetic fleet distributions to benchmark.')
+    argument_parser.add_argument('--min-duration-seconds', type=float, default=0.2,
+                                 help='Minimum time spent timing each benchmark.')
+    argument_parser.add_argument('--output', default=DEFAULT_OUTPUT_PATH,
+                                 help='Path of the JSON results file to write.')
+    argument_parser.add_argument('--compare-with',
+                                 help='Path of a previous JSON results file to compare the results against.')
+    argument_parser.add_argument('--regression-ratio', type=float, default=1.2,
+                                 help='Median slowdown, relative to the previous results, reported as a regression.')
+    return argument_parser.parse_args(arguments)
+
+
+def print_comparisons(comparisons):
+    print()
+    print('{:<38} {:<18} {:>8} {:>14} {:>14} {:>10}'.format('benchmark', 'distribution', 'robots', 'previous (us)',
+                                                            'current (us)', 'ratio'))
+    for result, previous_result, ratio, is_regression in comparisons:
+        print('{:<38} {:<18} {:>8} {:>14.1f} {:>14.1f} {:>9.2f}x{}'.format(
+            result['benchmark'], result['distribution'] or '-',
+            result['fleet_size'] if result['fleet_size'] is not None else '-',
+            previous_result['median_us'], result['median_us'], ratio, ' REGRESSION' if is_regression else ''))
+
+
+def main(arguments):
+    parsed_arguments = parse_arguments(arguments)
+    benchmark_timer = BenchmarkTimer(min_duration_seconds=parsed_arguments.min_duration_seconds)
+    benchmark_results = BenchmarkResults()
+
+    print('{:<38} {:<18} {:>8} {:>14} {:>14} {:>10}'.format('benchmark', 'distribution', 'robots', 'median (us)',
+                                                            'p95 (us)', 'iterations'))
+    loads_json = SyntheticFleetGenerator(DISTRIBUTIONS[0]).create_loads_json(LOAD_COUNT)
+    benchmark_request_and_response_json(benchmark_timer, benchmark_results, loads_json)
+    benchmark_request_and_response_encodings(benchmark_timer, benchmark_results, loads_json)
+    benchmark_metrics_recording(benchmark_timer, benchmark_results)
+    for distribution in parsed_arguments.distributions:
+        for fleet_size in [fleet_size for fleet_size in FLEET_SIZES if fleet_size <= parsed_arguments.max_fleet_size]:
+            fleet_generator = SyntheticFleetGenerator(distribution)
+            robots_json = fleet_generator.create_robots_json(fleet_size)
+            loads_json = fleet_generator.create_loads_json(LOAD_COUNT)
+            loads = [RequestJSONTransformer.create_load_from_request_json(load_json) for load_json in loads_json]
+            benchmark_robot_database_json(benchmark_timer, benchmark_results, distribution, robots_json)
+            benchmark_calculators(benchmark_timer, benchmark_results, distribution, robots_json, loads)
+            benchmark_subscriptions(benchmark_timer, benchmark_results, distribution, robots_json, loads)
+            benchmark_nearest_robot_raster(benchmark_timer, benchmark_results, distribution, robots_json, loads)
+            benchmark_fleet_snapshot_file(benchmark_timer, benchmark_results, distribution, robots_json)
+            benchmark_micro_batching(benchmark_timer, benchmark_results, distribution, robots_json, loads)
+            benchmark_endpoint(benchmark_timer, benchmark_results, distribution, robots_json, loads_json)
+
+    benchmark_results.write(parsed_arguments.output)
+    print()
+    print('Results Written to {}.'.format(parsed_arguments.output))
+    if parsed_arguments.compare_with:
+        comparisons = benchmark_results.compare_with(BenchmarkResults.read(parsed_arguments.compare_with),
+                                                     regression_ratio=parsed_arguments.regression_ratio)
+        print_comparisons(comparisons)
+        if any(is_regression for _, _, _, is_regression in comparisons):
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,181 @@
+import datetime
+import json
+import math
+import platform
+import random
+import statistics
+import subprocess
+import time
+
+# Internal Libraries
+from calculators import ClosestRobotCalculator
+
+UNIFORM_DISTRIBUTION = 'uniform'
+CLUSTERED_DISTRIBUTION = 'clustered'
+ALL_WITHIN_WINDOW_DISTRIBUTION = 'all_within_window'
+ALL_ZERO_BATTERY_DISTRIBUTION = 'all_zero_battery'
+DISTRIBUTIONS = [UNIFORM_DISTRIBUTION, CLUSTERED_DISTRIBUTION, ALL_WITHIN_WINDOW_DISTRIBUTION,
+                 ALL_ZERO_BATTERY_DISTRIBUTION]
+DEFAULT_RANDOM_SEED = 20230301
+
+
+def calculate_percentile(sorted_values, percentile):
+    # Nearest-Rank Percentile; Rounding First Stops Float Error (99.9 / 100 * 1000 > 999) Skipping a Rank
+    percentile_index = math.ceil(round(percentile / 100 * len(sorted_values), 9)) - 1
+    return sorted_values[min(max(percentile_index, 0), len(sorted_values) - 1)]
+
+
+class SyntheticFleetGenerator(object):
+    _FLOOR_SIZE = 1000
+    _CLUSTER_COUNT = 20
+    _CLUSTER_SPREAD = 15
+    _MAX_BATTERY_LEVEL = 100
+
+    def __init__(self, distribution, random_seed=DEFAULT_RANDOM_SEED):
+        if distribution not in DISTRIBUTIONS:
+            raise ValueError('Unknown Fleet Distribution: {}.'.format(distribution))
+        self._distribution = distribution
+        self._random_generator = random.Random(random_seed)
+        self._floor_center = self._FLOOR_SIZE / 2
+        self._cluster_centers = [(self._random_generator.uniform(0, self._FLOOR_SIZE),
+                                  self._random_generator.uniform(0, self._FLOOR_SIZE))
+                                 for _ in range(self._CLUSTER_COUNT)]
+
+    def get_distribution(self):
+        return self._distribution
+
+    def _create_point_in_disc(self, center_x, center_y, radius):
+        # Square Root of the Radius Keeps Points Uniform Over the Disc Instead of Bunched at Its Center
+        distance = radius * math.sqrt(self._random_generator.random())
+        angle = self._random_generator.uniform(0, 2 * math.pi)
+        return center_x + distance * math.cos(angle), center_y + distance * math.sin(angle)
+
+    def _create_robot_point(self):
+        if self._distribution == CLUSTERED_DISTRIBUTION:
+            center_x, center_y = self._random_generator.choice(self._cluster_centers)
+            return (self._random_generator.gauss(center_x, self._CLUSTER_SPREAD),
+                    self._random_generator.gauss(center_y, self._CLUSTER_SPREAD))
+        if self._distribution == ALL_WITHIN_WINDOW_DISTRIBUTION:
+            return self._create_point_in_disc(self._floor_center, self._floor_center,
+                                              ClosestRobotCalculator._DISTANCE_WINDOW / 2)
+        return (self._random_generator.uniform(0, self._FLOOR_SIZE),
+                self._random_generator.uniform(0, self._FLOOR_SIZE))
+
+    def _create_load_point(self):
+        if self._distribution == ALL_WITHIN_WINDOW_DISTRIBUTION:
+            # Robots and Loads Share a Disc Half the Window Wide, So Every Robot Is Within the Window of Every Load
+            return self._create_point_in_disc(self._floor_center, self._floor_center,
+                                              ClosestRobotCalculator._DISTANCE_WINDOW / 2)
+        return (self._random_generator.uniform(0, self._FLOOR_SIZE),
+                self._random_generator.uniform(0, self._FLOOR_SIZE))
+
+    def create_robots_json(self, robot_count):
+        robots_json = []
+        for robot_id in range(robot_count):
+            x_coordinate, y_coordinate = self._create_robot_point()
+            battery_level = 0 if self._distribution == ALL_ZERO_BATTERY_DISTRIBUTION else \
+                self._random_generator.randint(1, self._MAX_BATTERY_LEVEL)
+            robots_json.append({'robotId': robot_id,
+                                'batteryLevel': battery_level,
+                                'x': x_coordinate,
+                                'y': y_coordinate})
+        return robots_json
+
+    def create_loads_json(self, load_count):
+        loads_json = []
+        for load_id in range(load_count):
+            x_coordinate, y_coordinate = self._create_load_point()
+            loads_json.append({'loadId': load_id,
+                               'x': x_coordinate,
+                               'y': y_coordinate})
+        return loads_json
+
+
+class BenchmarkTimer(object):
+    _DEFAULT_MIN_DURATION_SECONDS = 0.2
+    _DEFAULT_MAX_ITERATION_COUNT = 10000
+
+    def __init__(self, min_duration_seconds=_DEFAULT_MIN_DURATION_SECONDS,
+                 max_iteration_count=_DEFAULT_MAX_ITERATION_COUNT):
+        self._min_duration_seconds = min_duration_seconds
+        self._max_iteration_count = max_iteration_count
+
+    def time_function(self, function, arguments):
+        # Cycles Through the Arguments Until the Minimum Duration Is Spent, Always Running at Least Once
+        durations_seconds = []
+        total_duration_seconds = 0
+        while not durations_seconds or (total_duration_seconds < self._min_duration_seconds and
+                                        len(durations_seconds) < self._max_iteration_count):
+            argument = arguments[len(durations_seconds) % len(arguments)]
+            start_time = time.perf_counter()
+            function(argument)
+            duration_seconds = time.perf_counter() - start_time
+            durations_seconds.append(duration_seconds)
+            total_duration_seconds += duration_seconds
+        return self.summarize_durations(durations_seconds)
+
+    @staticmethod
+    def summarize_durations(durations_seconds):
+        durations_microseconds = sorted(duration_seconds * 1e6 for duration_seconds in durations_seconds)
+        return {'iterations': len(durations_microseconds),
+                'mean_us': statistics.fmean(durations_microseconds),
+                'median_us': statistics.median(durations_microseconds),
+                'min_us': durations_microseconds[0],
+                'p95_us': calculate_percentile(durations_microseconds, 95)}
+
+
+class BenchmarkResults(object):
+    _DEFAULT_REGRESSION_RATIO = 1.2
+
+    def __init__(self, metadata=None, results=None):
+        self._metadata = self.get_environment_metadata() if metadata is None else metadata
+        self._results = [] if results is None else results
+
+    @staticmethod
+    def get_environment_metadata():
+        try:
+            git_commit = subprocess.run(['git', 'rev-parse', 'HEAD'], capture_output=True, text=True,
+                                        check=True).stdout.strip()
+        except (OSError, subprocess.CalledProcessError):
+            git_commit = None
+        return {'git_commit': git_commit,
+                'python_version': platform.python_version(),
+                'platform': platform.platform(),
+                'created_at': datetime.datetime.now(datetime.timezone.utc).isoformat()}
+
+    @staticmethod
+    def get_result_key(result):
+        return result['benchmark'], result['distribution'], result['fleet_size']
+
+    def get_results(self):
+        return self._results
+
+    def add_result(self, benchmark, distribution, fleet_size, timings):
+        result = {'benchmark': benchmark,
+                  'distribution': distribution,
+                  'fleet_size': fleet_size}
+        result.update(timings)
+        self._results.append(result)
+        return result
+
+    def write(self, path):
+        with open(path, 'w') as results_file:
+            json.dump({'metadata': self._metadata, 'results': self._results}, results_file, indent=2)
+
+    @classmethod
+    def read(cls, path):
+        with open(path) as results_file:
+            results_json = json.load(results_file)
+        return cls(metadata=results_json['metadata'], results=results_json['results'])
+
+    def compare_with(self, previous_benchmark_results, regression_ratio=_DEFAULT_REGRESSION_RATIO):
+        # Median Ratios Against a Previous Run, Flagging Anything Slower by More Than the Regression Ratio
+        previous_results_by_key = {self.get_result_key(result): result
+                                   for result in previous_benchmark_results.get_results()}
+        comparisons = []
+        for result in self._results:
+            previous_result = previous_results_by_key.get(self.get_result_key(result))
+            if previous_result is not None and previous_result['median_us'] > 0:
+                ratio = result['median_us'] / previous_result['median_us']
+                comparisons.append((result, previous_result, ratio, ratio > regression_ratio))
+        return comparisons
@@ -0,0 +1,42 @@
+import struct
+
+# Internal Libraries
+from models import RobotFleet
+
+# Fixed-Width Id, Battery Level, X, Y and Integer Battery Level Flag Columns, Each Holding `capacity` Items
+ID_TYPE_CODE = 'q'
+NUMBER_TYPE_CODE = 'd'
+FLAG_TYPE_CODE = 'B'
+COLUMN_TYPE_CODES = [ID_TYPE_CODE, NUMBER_TYPE_CODE, NUMBER_TYPE_CODE, NUMBER_TYPE_CODE, FLAG_TYPE_CODE]
+COLUMN_ITEM_SIZES = [struct.calcsize(type_code) for type_code in COLUMN_TYPE_CODES]
+
+
+def get_columns_size(capacity):
+    return sum(COLUMN_ITEM_SIZES) * capacity
+
+
+def get_column_offsets(columns_offset, capacity):
+    column_offsets = []
+    column_offset = columns_offset
+    for column_item_size in COLUMN_ITEM_SIZES:
+        column_offsets.append(column_offset)
+        column_offset += column_item_size * capacity
+    return column_offsets
+
+
+def write_robot_fleet_columns(buffer, columns_offset, capacity, robot_fleet):
+    robot_count = len(robot_fleet)
+    columns = [robot_fleet.get_ids(), robot_fleet.get_battery_levels(), robot_fleet.get_x_coordinates(),
+               robot_fleet.get_y_coordinates(), robot_fleet.get_battery_level_is_integer()]
+    for column, column_offset, column_item_size in zip(columns, get_column_offsets(columns_offset, capacity),
+                                                       COLUMN_ITEM_SIZES):
+        buffer[column_offset:column_offset + column_item_size * robot_count] = memoryview(column).cast(FLAG_TYPE_CODE)
+
+
+def create_robot_fleet_from_columns(buffer, columns_offset, capacity, robot_count):
+    # The Fleet Views the Buffer in Place, So the Buffer Must Outlive It and Not Change Underneath It
+    buffer = memoryview(buffer)
+    columns = [buffer[column_offset:column_offset + column_item_size * robot_count].cast(type_code)
+               for column_offset, column_item_size, type_code
+               in zip(get_column_offsets(columns_offset, capacity), COLUMN_ITEM_SIZES, COLUMN_TYPE_CODES)]
+    return RobotFleet.create_from_columns(*columns)
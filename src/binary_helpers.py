@@ -0,0 +1,87 @@
+import struct
+
+# Internal Libraries
+from models import MAX_COORDINATE_MAGNITUDE, Load
+
+# Sent in Place of JSON by Clients That Set It as Their Content-Type (Requests) or Prefer It in Their Accept Header
+# (Responses). Every Message Is a Run of Fixed-Layout Little-Endian Records: One for a Single Load or Robot, One per
+# Load or Robot (in Order) for a Batch
+MEDIA_TYPE = 'application/x-closest-robot'
+
+
+class ResponseBinaryFormatter(object):
+    # Flags, Robot Id, Distance to Goal and Battery Level
+    _RESPONSE_STRUCT = struct.Struct('<B7xqdd')
+    _ROBOT_FOUND_FLAG = 1
+    _INVALID_LOAD_FLAG = 2
+    _ERROR_RESPONSE_BINARY = _RESPONSE_STRUCT.pack(0, 0, 0, 0)
+    _BATCH_ITEM_ERROR_RESPONSE_BINARY = _RESPONSE_STRUCT.pack(_INVALID_LOAD_FLAG, 0, 0, 0)
+
+    @classmethod
+    def get_formatted_response_binary(cls, robot_id, distance_to_goal, battery_level):
+        if robot_id is None:
+            return cls._ERROR_RESPONSE_BINARY
+        return cls._RESPONSE_STRUCT.pack(cls._ROBOT_FOUND_FLAG, robot_id, distance_to_goal, battery_level)
+
+    @classmethod
+    def get_formatted_error_response_binary(cls):
+        return cls._ERROR_RESPONSE_BINARY
+
+    @classmethod
+    def get_formatted_batch_item_error_response_binary(cls):
+        return cls._BATCH_ITEM_ERROR_RESPONSE_BINARY
+
+    @classmethod
+    def is_response_binary_valid(cls, response_binary):
+        return len(response_binary) % cls._RESPONSE_STRUCT.size == 0
+
+    @classmethod
+    def create_response_jsons_from_response_binary(cls, response_binary):
+        # For Clients (and Tests): Each Record Decoded to What the JSON Response Would Have Held, Except That Battery
+        # Levels Are Always Floats and Malformed Loads Are Only Flagged, Without an Error Message
+        response_jsons = []
+        for flags, robot_id, distance_to_goal, battery_level in cls._RESPONSE_STRUCT.iter_unpack(response_binary):
+            robot_is_found = flags & cls._ROBOT_FOUND_FLAG
+            response_json = {'robotId': robot_id if robot_is_found else None,
+                             'distanceToGoal': distance_to_goal if robot_is_found else None,
+                             'batteryLevel': battery_level if robot_is_found else None}
+            if flags & cls._INVALID_LOAD_FLAG:
+                response_json['error'] = True
+            response_jsons.append(response_json)
+        return response_jsons
+
+
+class RequestBinaryTransformer(object):
+    # Load Id, X and Y; an Unsigned Id Cannot Be Out of Range, So Only Unusable Coordinates Are Rejected
+    _REQUEST_STRUCT = struct.Struct('<Qdd')
+
+    @staticmethod
+    def _are_coordinates_usable(x_coordinate, y_coordinate):
+        return abs(x_coordinate) <= MAX_COORDINATE_MAGNITUDE and abs(y_coordinate) <= MAX_COORDINATE_MAGNITUDE
+
+    @classmethod
+    def get_formatted_request_binary(cls, load_id, x_coordinate, y_coordinate):
+        return cls._REQUEST_STRUCT.pack(int(load_id), x_coordinate, y_coordinate)
+
+    @classmethod
+    def is_request_binary_valid(cls, request_binary):
+        return len(request_binary) == cls._REQUEST_STRUCT.size and \
+            cls._are_coordinates_usable(*cls._REQUEST_STRUCT.unpack(request_binary)[1:])
+
+    @classmethod
+    def create_load_from_request_binary(cls, request_binary):
+        load_id, x_coordinate, y_coordinate = cls._REQUEST_STRUCT.unpack(request_binary)
+        return Load(id=load_id,
+                    x_coordinate=x_coordinate,
+                    y_coordinate=y_coordinate)
+
+    @classmethod
+    def is_batch_request_binary_valid(cls, request_binary):
+        return len(request_binary) % cls._REQUEST_STRUCT.size == 0
+
+    @classmethod
+    def create_loads_from_batch_request_binary(cls, request_binary):
+        # None in Place of Each Invalid Load, as for JSON Batches
+        return [Load(id=load_id, x_coordinate=x_coordinate, y_coordinate=y_coordinate)
+                if cls._are_coordinates_usable(x_coordinate, y_coordinate) else None
+                for load_id, x_coordinate, y_coordinate in cls._REQUEST_STRUCT.iter_unpack(request_binary)]
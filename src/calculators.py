@@ -1,11 +1,17 @@
 import math
 
+import numpy
+
 # Internal Libraries
+import selection_policies
 from json_helpers import RequestJSONTransformer, RobotDatabaseJSONTransformer
+from models import RobotFleet
 
 
 class ClosestRobotCalculator(object):
-    _DISTANCE_WINDOW = 10
+    _DISTANCE_WINDOW = selection_policies.DEFAULT_DISTANCE_WINDOW
+    # Most Battery Within the Distance Window, Otherwise Closest; Other Policies Can Be Passed In
+    _DEFAULT_SELECTION_POLICY = selection_policies.DEFAULT_SELECTION_POLICY
 
     @staticmethod
     def _calculate_distance_between_robot_and_load(robot, load):
@@ -16,31 +22,168 @@ class ClosestRobotCalculator(object):
         return math.sqrt(math.pow((x_2 - x_1), 2) + math.pow((y_2 - y_1), 2))
 
     @classmethod
-    def calculate_closest_robot_for_load(cls, robots, load):
-        for robot in robots:
-            distance_to_load = cls._calculate_distance_between_robot_and_load(robot=robot, load=load)
-            robot.set_distance_to_load(distance_to_load)
-        robots_that_have_non_zero_battery = [robot for robot in robots if robot.get_battery_level()]
-        sorted_robots_based_on_distances_to_loads = sorted(
-            robots_that_have_non_zero_battery, key=lambda robot: robot.get_distance_to_load())
-        sorted_robots_within_window = [robot for robot in sorted_robots_based_on_distances_to_loads
-                                       if robot.get_distance_to_load() <= cls._DISTANCE_WINDOW]
-        closest_robot_with_most_battery = None
-        if len(sorted_robots_based_on_distances_to_loads):
-            closest_robot_with_most_battery = sorted_robots_based_on_distances_to_loads[0]
-        if len(sorted_robots_within_window):
-            closest_robot_with_most_battery = sorted_robots_within_window[0]
-        for i in range(1, len(sorted_robots_within_window)):
-            current_robot = sorted_robots_within_window[i]
-            if current_robot.get_battery_level() > closest_robot_with_most_battery.get_battery_level():
-                closest_robot_with_most_battery = current_robot
-        return closest_robot_with_most_battery
+    def calculate_closest_robot_for_load(cls, robots, load, selection_policy=None):
+        return (selection_policy or cls._DEFAULT_SELECTION_POLICY).select_robot(robots=robots, load=load)
+
+    @classmethod
+    def calculate_closest_robot_for_load_using_index(cls, robot_spatial_index, load, selection_policy=None):
+        return (selection_policy or cls._DEFAULT_SELECTION_POLICY).select_robot_using_index(
+            robot_spatial_index=robot_spatial_index, load=load)
+
+    @classmethod
+    def calculate_closest_robots_for_load(cls, robots, load, robot_count, selection_policy=None):
+        # Ranked by the Same Rule as calculate_closest_robot_for_load, So the First Robot Is Always Its Answer
+        return (selection_policy or cls._DEFAULT_SELECTION_POLICY).rank_robots(robots=robots,
+                                                                               load=load,
+                                                                               robot_count=robot_count)
+
+    @classmethod
+    def calculate_closest_robots_for_load_using_index(cls, robot_spatial_index, load, robot_count,
+                                                      selection_policy=None):
+        return (selection_policy or cls._DEFAULT_SELECTION_POLICY).rank_robots_using_index(
+            robot_spatial_index=robot_spatial_index, load=load, robot_count=robot_count)
 
     @classmethod
     def calculate_closest_robot_for_load_from_json_format(cls, robots_json, load_json):
         if not RequestJSONTransformer.is_request_json_valid(load_json):
             raise ValueError('Load Request JSON is Invalid.')
         load = RequestJSONTransformer.create_load_from_request_json(load_json)
-        robots = [RobotDatabaseJSONTransformer.create_robot_from_robot_database_json(robot_json)
-                  for robot_json in robots_json if RobotDatabaseJSONTransformer.is_robot_database_json_valid(robot_json)]
+        robots = RobotDatabaseJSONTransformer.create_robot_fleet_from_robot_database_json(robots_json)
         return cls.calculate_closest_robot_for_load(robots=robots, load=load)
+
+
+class VectorizedClosestRobotCalculator(object):
+    _MAX_DISTANCE_MATRIX_SIZE = 1 << 16
+    # Far Wider Than the Last-Bit Differences Between the Array Operations and the Linear Path
+    _NEAR_TIE_RELATIVE_TOLERANCE = 1e-12
+
+    def __init__(self, robots, selection_policy=None):
+        self._selection_policy = selection_policy or ClosestRobotCalculator._DEFAULT_SELECTION_POLICY
+        if not isinstance(self._selection_policy, (selection_policies.WindowSelectionPolicy,
+                                                   selection_policies.WeightedScoreSelectionPolicy)):
+            raise ValueError('Vectorized Calculators Only Support Window and Weighted Score Selection Policies.')
+        self._robot_fleet = robots if isinstance(robots, RobotFleet) else RobotFleet.create_from_robots(robots)
+        battery_levels = numpy.frombuffer(self._robot_fleet.get_battery_levels(), dtype=numpy.float64)
+        # Robots the Policy Can Never Select Are Dropped Up Front, So Only the Eligible Ones Are Kept as Columns
+        self._positions = numpy.flatnonzero((battery_levels != 0) &
+                                            (battery_levels >= self._selection_policy.get_min_battery_level()))
+        self._battery_levels = battery_levels[self._positions]
+        self._ids = numpy.frombuffer(self._robot_fleet.get_ids(), dtype=numpy.int64)[self._positions]
+        self._x_coordinates = numpy.frombuffer(self._robot_fleet.get_x_coordinates(),
+                                               dtype=numpy.float64)[self._positions]
+        self._y_coordinates = numpy.frombuffer(self._robot_fleet.get_y_coordinates(),
+                                               dtype=numpy.float64)[self._positions]
+        if isinstance(self._selection_policy, selection_policies.WindowSelectionPolicy):
+            self._window_squared_limit = self._get_largest_squared_distance_within(
+                self._selection_policy.get_distance_window())
+
+    @staticmethod
+    def _get_largest_squared_distance_within(distance):
+        # Comparing Squared Distances Against This Limit Agrees Exactly With math.sqrt(...) <= distance
+        squared_distance_limit = float(distance) * float(distance)
+        while math.sqrt(math.nextafter(squared_distance_limit, math.inf)) <= distance:
+            squared_distance_limit = math.nextafter(squared_distance_limit, math.inf)
+        while math.sqrt(squared_distance_limit) > distance:
+            squared_distance_limit = math.nextafter(squared_distance_limit, -math.inf)
+        return squared_distance_limit
+
+    def get_robot_fleet(self):
+        return self._robot_fleet
+
+    def get_selection_policy(self):
+        return self._selection_policy
+
+    def calculate_closest_robot_for_load(self, load):
+        return self.calculate_closest_robots_for_loads([load])[0]
+
+    def calculate_closest_robots_for_loads(self, loads):
+        loads = list(loads)
+        if not len(self._positions):
+            return [None for _ in loads]
+        closest_robots = []
+        chunk_size = max(1, self._MAX_DISTANCE_MATRIX_SIZE // len(self._positions))
+        for chunk_start in range(0, len(loads), chunk_size):
+            load_chunk = loads[chunk_start:chunk_start + chunk_size]
+            closest_robots.extend(self._calculate_closest_robots_for_load_chunk(load_chunk))
+        return closest_robots
+
+    def _calculate_squared_distances(self, loads):
+        load_x_coordinates = numpy.array([load.get_x_coordinate() for load in loads], dtype=numpy.float64)
+        load_y_coordinates = numpy.array([load.get_y_coordinate() for load in loads], dtype=numpy.float64)
+        squared_distances = numpy.subtract.outer(load_x_coordinates, self._x_coordinates)
+        squared_distances *= squared_distances
+        y_differences = numpy.subtract.outer(load_y_coordinates, self._y_coordinates)
+        y_differences *= y_differences
+        squared_distances += y_differences
+        return squared_distances
+
+    def _calculate_closest_robots_for_load_chunk(self, loads):
+        # Every Load in the Chunk Is Answered by the Same Array Operations. Squaring by Multiplication Can Differ From
+        # the Linear Path's math.pow in the Last Bit, So Wherever That Could Change the Answer (Robots on the Edge of
+        # the Window, and Near Ties), the Few Robots Involved Are Compared Again the Way the Linear Path Does
+        squared_distances = self._calculate_squared_distances(loads)
+        if isinstance(self._selection_policy, selection_policies.WeightedScoreSelectionPolicy):
+            closest_indices = self._find_best_scored_indices(loads, squared_distances)
+        else:
+            closest_indices = self._find_best_windowed_indices(loads, squared_distances)
+        get_robot = self._robot_fleet.get_robot
+        closest_robots = [get_robot(position) for position in self._positions[closest_indices].tolist()]
+        return [closest_robot.with_distance_to_load(self._calculate_exact_distance(load, closest_index))
+                for closest_robot, load, closest_index in zip(closest_robots, loads, closest_indices.tolist())]
+
+    def _calculate_exact_distance(self, load, index):
+        return math.sqrt(math.pow((load.get_x_coordinate() - float(self._x_coordinates[index])), 2) +
+                         math.pow((load.get_y_coordinate() - float(self._y_coordinates[index])), 2))
+
+    def _find_best_windowed_indices(self, loads, squared_distances):
+        # Most Battery Within the Window, Then Closest, Then Earliest in the Fleet; Otherwise Closest, Then Earliest
+        window_squared_limit = self._window_squared_limit
+        is_within_window = squared_distances <= window_squared_limit
+        is_near_window_edge = numpy.abs(squared_distances - window_squared_limit) <= \
+            window_squared_limit * self._NEAR_TIE_RELATIVE_TOLERANCE
+        for load_index, index in zip(*(indices.tolist() for indices in numpy.nonzero(is_near_window_edge))):
+            is_within_window[load_index, index] = self._calculate_exact_distance(loads[load_index], index) <= \
+                self._selection_policy.get_distance_window()
+        best_battery_levels = numpy.where(is_within_window, self._battery_levels, -numpy.inf).max(axis=1)
+        is_candidate = is_within_window & (self._battery_levels == best_battery_levels[:, numpy.newaxis])
+        is_candidate |= ~is_within_window.any(axis=1)[:, numpy.newaxis]
+        candidate_squared_distances = numpy.where(is_candidate, squared_distances, numpy.inf)
+        closest_indices = candidate_squared_distances.argmin(axis=1)
+        closest_squared_distances = candidate_squared_distances[numpy.arange(len(loads)), closest_indices]
+        near_tie_limits = closest_squared_distances * (1 + self._NEAR_TIE_RELATIVE_TOLERANCE)
+        return self._break_near_ties(
+            loads=loads,
+            closest_indices=closest_indices,
+            is_near_tie=candidate_squared_distances <= near_tie_limits[:, numpy.newaxis],
+            get_exact_sort_key=lambda load, index: (self._calculate_exact_distance(load, index), index))
+
+    def _find_best_scored_indices(self, loads, squared_distances):
+        # Lowest Score, Then Closest, Then Earliest in the Fleet
+        distance_weight = self._selection_policy.get_distance_weight()
+        battery_weight = self._selection_policy.get_battery_weight()
+        distances = numpy.sqrt(squared_distances)
+        scores = distance_weight * distances - battery_weight * self._battery_levels
+        closest_indices = scores.argmin(axis=1)
+        load_indices = numpy.arange(len(loads))
+        min_scores = scores[load_indices, closest_indices]
+        # Wide Enough to Cover Rounding in Any Score That Could Come Close to the Lowest
+        near_tie_limits = min_scores + self._NEAR_TIE_RELATIVE_TOLERANCE * (
+            numpy.abs(min_scores) + distance_weight * distances[load_indices, closest_indices] +
+            battery_weight * selection_policies.MAX_BATTERY_LEVEL)
+
+        def get_exact_sort_key(load, index):
+            distance = self._calculate_exact_distance(load, index)
+            return distance_weight * distance - battery_weight * float(self._battery_levels[index]), distance, index
+
+        return self._break_near_ties(loads=loads,
+                                     closest_indices=closest_indices,
+                                     is_near_tie=scores <= near_tie_limits[:, numpy.newaxis],
+                                     get_exact_sort_key=get_exact_sort_key)
+
+    @staticmethod
+    def _break_near_ties(loads, closest_indices, is_near_tie, get_exact_sort_key):
+        # Indices Follow Fleet Order, So the Exact Sort Keys End in the Index to Prefer the Earliest Robot
+        for load_index in numpy.flatnonzero(is_near_tie.sum(axis=1) > 1).tolist():
+            closest_indices[load_index] = min(numpy.flatnonzero(is_near_tie[load_index]).tolist(),
+                                              key=lambda index: get_exact_sort_key(loads[load_index], index))
+        return closest_indices
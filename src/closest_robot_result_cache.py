@@ -0,0 +1,99 @@
+import collections
+import threading
+
+# Internal Libraries
+from calculators import ClosestRobotCalculator
+
+
+class ClosestRobotResultCache(object):
+    _DEFAULT_MAX_ENTRY_COUNT = 4096
+    _DEFAULT_QUANTIZATION = 0
+    _MISSING_RESULT = object()
+
+    def __init__(self, max_entry_count=_DEFAULT_MAX_ENTRY_COUNT, quantization=_DEFAULT_QUANTIZATION):
+        # A Quantization of 0 Keys on the Exact Load Position; Anything Larger Shares One Answer Across Each Cell
+        self._max_entry_count = max_entry_count
+        self._quantization = quantization
+        self._closest_robots_by_position_key = collections.OrderedDict()
+        self._fleet_version = 0
+        self._hit_count = 0
+        self._miss_count = 0
+        self._lock = threading.Lock()
+
+    def get_hit_count(self):
+        return self._hit_count
+
+    def get_miss_count(self):
+        return self._miss_count
+
+    def get_entry_count(self):
+        return len(self._closest_robots_by_position_key)
+
+    def _get_position_key(self, load):
+        if not self._quantization:
+            return load.get_x_coordinate(), load.get_y_coordinate()
+        return (round(load.get_x_coordinate() / self._quantization),
+                round(load.get_y_coordinate() / self._quantization))
+
+    def _look_up_closest_robot(self, fleet_version, position_key):
+        # Called With self._lock Held. Fleet Versions Only Advance When Robots Change, So Results Survive Refreshes That
+        # Changed Nothing. Queries Still Holding an Older Fleet Are Calculated Without Disturbing the Cached Results
+        if fleet_version > self._fleet_version:
+            # Results for an Older Fleet Can Never Be Served Again, So They Are Dropped All at Once
+            self._closest_robots_by_position_key.clear()
+            self._fleet_version = fleet_version
+        if fleet_version < self._fleet_version:
+            closest_robot = self._MISSING_RESULT
+        else:
+            closest_robot = self._closest_robots_by_position_key.get(position_key, self._MISSING_RESULT)
+        if closest_robot is self._MISSING_RESULT:
+            self._miss_count += 1
+        else:
+            self._hit_count += 1
+            self._closest_robots_by_position_key.move_to_end(position_key)
+        return closest_robot
+
+    def _store_closest_robot(self, fleet_version, position_key, closest_robot):
+        # Called With self._lock Held
+        if fleet_version == self._fleet_version:
+            self._closest_robots_by_position_key[position_key] = closest_robot
+            if len(self._closest_robots_by_position_key) > self._max_entry_count:
+                self._closest_robots_by_position_key.popitem(last=False)
+
+    @staticmethod
+    def _create_result(closest_robot, load):
+        if closest_robot is None:
+            return None
+        # The Cached Robot May Have Been Found for Another Load in the Same Cell, So Its Distance Is Worked Out Again
+        return closest_robot.with_distance_to_load(
+            ClosestRobotCalculator._calculate_distance_between_robot_and_load(robot=closest_robot, load=load))
+
+    def get_closest_robot(self, fleet_snapshot, load, calculate_closest_robot):
+        # The Version Is Read Before Calculating, So a Result Is Never Stored Against a Newer Fleet Than It Saw
+        fleet_version = fleet_snapshot.get_fleet_version()
+        position_key = self._get_position_key(load)
+        with self._lock:
+            closest_robot = self._look_up_closest_robot(fleet_version, position_key)
+        if closest_robot is self._MISSING_RESULT:
+            closest_robot = calculate_closest_robot(load)
+            with self._lock:
+                self._store_closest_robot(fleet_version, position_key, closest_robot)
+        return self._create_result(closest_robot, load)
+
+    def get_closest_robots(self, fleet_snapshot, loads, calculate_closest_robots):
+        # Every Load Missing From the Cache Is Calculated by One Call to calculate_closest_robots(missing_loads), Which
+        # Returns One Result per Load, in Order
+        fleet_version = fleet_snapshot.get_fleet_version()
+        position_keys = [self._get_position_key(load) for load in loads]
+        with self._lock:
+            closest_robots = [self._look_up_closest_robot(fleet_version, position_key)
+                              for position_key in position_keys]
+        missing_indices = [index for index, closest_robot in enumerate(closest_robots)
+                           if closest_robot is self._MISSING_RESULT]
+        if missing_indices:
+            calculated_closest_robots = calculate_closest_robots([loads[index] for index in missing_indices])
+            with self._lock:
+                for index, closest_robot in zip(missing_indices, calculated_closest_robots):
+                    closest_robots[index] = closest_robot
+                    self._store_closest_robot(fleet_version, position_keys[index], closest_robot)
+        return [self._create_result(closest_robot, load) for closest_robot, load in zip(closest_robots, loads)]
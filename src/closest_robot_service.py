@@ -1,50 +1,513 @@
 #!/bin/python3
 
+import functools
+import json
+import os
+import time
+
 import flask
 
 # Internal Libraries
 import json_helpers
+import binary_helpers
 import json_retriever
 import calculators
+import assigners
+import fleet_snapshot_cache
+import fleet_snapshot_file
+import closest_robot_result_cache
+import closest_robot_subscriptions
+import metrics
+import micro_batcher
+import nearest_robot_raster
+import profiling
+import selection_policies
 
 SERVER_HOST = 'localhost'
 SERVER_PORT = 5000
 API_BASE_PATH = '/api/robots'
 OK_RESPONSE_CODE = 200
 BAD_REQUEST_RESPONSE_CODE = 400
+NOT_FOUND_RESPONSE_CODE = 404
 UNSUPPORTED_MEDIA_TYPE_RESPONSE_CODE = 415
 INTERNAL_SERVER_ERROR_CODE = 500
-ROBOT_DATABASE_ENDPOINT_URL = 'https://60c8ed887dafc90017ffbd56.mockapi.io/robots'
+# Clients May Swap JSON for the Compact Binary Format in binary_helpers.py; JSON Remains the Default
+JSON_MEDIA_TYPE = 'application/json'
+# Streamed Batches Send and Receive One JSON Document per Line
+NDJSON_MEDIA_TYPE = 'application/x-ndjson'
+EVENT_STREAM_MEDIA_TYPE = 'text/event-stream'
+# The Robot Database Can Be Pointed Elsewhere (e.g. at mock_robot_database.py) Through the Environment
+ROBOT_DATABASE_ENDPOINT_URL = os.environ.get('ROBOT_DATABASE_ENDPOINT_URL',
+                                             'https://60c8ed887dafc90017ffbd56.mockapi.io/robots')
+ROBOT_DATABASE_BACKUP_ENDPOINT_URLS = [url_endpoint for url_endpoint
+                                       in os.environ.get('ROBOT_DATABASE_BACKUP_ENDPOINT_URLS', '').split(',')
+                                       if url_endpoint]
+ROBOT_DATABASE_ATTEMPT_TIMEOUT_SECONDS = 2.0
+ROBOT_DATABASE_HEDGE_PERCENTILE = 95
+FLEET_SNAPSHOT_REFRESH_INTERVAL_SECONDS = 1.0
+# Each Refreshed Fleet Is Persisted Here and Served at Startup Until the Robot Database First Answers
+FLEET_SNAPSHOT_FILE_PATH = os.environ.get('FLEET_SNAPSHOT_FILE_PATH', 'fleet_snapshot.bin')
+# Responses Calculated From a Fleet Older Than This (or Restored From File and Not Yet Refreshed) Carry a Warning Header
+# Flagging Them as Stale
+FLEET_SNAPSHOT_STALE_AGE_SECONDS = 5.0
+STALE_RESPONSE_WARNING = '110 - "Response is Stale"'
+INVALID_LOAD_ERROR_MESSAGE = 'Load Request JSON is Invalid.'
+BATCH_MODE_QUERY_PARAMETER = 'mode'
+INDEPENDENT_BATCH_MODE = 'independent'
+EXCLUSIVE_BATCH_MODE = 'exclusive'
+# Asking for k Robots Answers With the k Best, Ranked, So Callers Have Fallbacks Without Another Request
+CANDIDATE_COUNT_QUERY_PARAMETER = 'k'
+MAX_CANDIDATE_COUNT = 100
+# Sites Choose How Robots Are Selected (e.g. {"type": "window", "distanceWindow": 15, "minBatteryLevel": 20} or
+# {"type": "weightedScore", "distanceWeight": 1, "batteryWeight": 0.5}); Without One, the Default Window Rule Applies
+SELECTION_POLICY_JSON = os.environ.get('SELECTION_POLICY_JSON', '')
+SUBSCRIPTION_EVENT_NAME = 'closestRobot'
+# Comments Sent While Nothing Changes, So Proxies Keep the Connection Open and Closed Clients Are Noticed
+SUBSCRIPTION_KEEP_ALIVE_SECONDS = 15.0
+# Single Load Requests Arriving Within MICRO_BATCH_MAX_WAIT_SECONDS of Each Other (Up to MICRO_BATCH_MAX_SIZE of Them)
+# Can Be Calculated as One Batch, Trading at Most That Wait per Request for Throughput Under Concurrent Load
+MICRO_BATCHING_ENABLED = os.environ.get('MICRO_BATCHING_ENABLED', '').lower() in ['1', 'true']
+MICRO_BATCH_MAX_WAIT_SECONDS = float(os.environ.get('MICRO_BATCH_MAX_WAIT_SECONDS', '0.002'))
+MICRO_BATCH_MAX_SIZE = int(os.environ.get('MICRO_BATCH_MAX_SIZE', '64'))
+# Loads Within the Floor Rectangle "minX,minY,maxX,maxY" (e.g. "0,0,500,200") Can Be Answered From a Raster of
+# NEAREST_ROBOT_RASTER_RESOLUTION Sized Cells, Each Holding the Few Robots That Can Win Anywhere in It
+NEAREST_ROBOT_RASTER_BOUNDS = os.environ.get('NEAREST_ROBOT_RASTER_BOUNDS', '')
+NEAREST_ROBOT_RASTER_RESOLUTION = float(os.environ.get('NEAREST_ROBOT_RASTER_RESOLUTION', '5'))
+# Loads From the Same Pickup Station Repeat Until the Fleet Changes; a Quantization Above 0 Also Shares One Answer
+# Between Loads That Fall in the Same Cell of That Size, Trading Exactness for More Hits
+CLOSEST_ROBOT_RESULT_CACHE_SIZE = 4096
+CLOSEST_ROBOT_RESULT_CACHE_QUANTIZATION = 0
+# Batches of at Least VECTORIZED_BATCH_MIN_LOAD_COUNT Uncached Loads Against At Most VECTORIZED_BATCH_MAX_ROBOT_COUNT
+# Charged Robots Are Answered Together by Array Operations Over the Whole Fleet, Which Outpaces One Spatial Index Query
+# per Load Until the Fleet Grows Past That Size
+VECTORIZED_BATCH_MIN_LOAD_COUNT = 4
+VECTORIZED_BATCH_MAX_ROBOT_COUNT = 1024
+METRICS_PATH = '/metrics'
+VALIDATION_STAGE = 'validation'
+FETCH_STAGE = 'fetch'
+CALCULATION_STAGE = 'calculation'
+SERIALIZATION_STAGE = 'serialization'
+STAGE_DURATION_BUCKET_UPPER_BOUNDS_SECONDS = [0.00001, 0.000025, 0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025,
+                                              0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5]
+# Profiling Is Only Possible When Enabled at Startup, and Then Only for Requests Carrying the Profiling Header
+REQUEST_PROFILING_ENABLED = os.environ.get('REQUEST_PROFILING_ENABLED', '').lower() in ['1', 'true']
+REQUEST_PROFILING_HEADER = 'X-Profile-Request'
+REQUEST_PROFILE_BUFFER_SIZE = 32
+REQUEST_PROFILES_PATH = '/admin/profiles'
+
+
+def _create_selection_policy(selection_policy_json_text):
+    if not selection_policy_json_text:
+        return selection_policies.DEFAULT_SELECTION_POLICY
+    selection_policy_json = json.loads(selection_policy_json_text)
+    if not json_helpers.SelectionPolicyJSONTransformer.is_selection_policy_json_valid(selection_policy_json):
+        raise ValueError('SELECTION_POLICY_JSON Does Not Describe a Valid Selection Policy.')
+    return json_helpers.SelectionPolicyJSONTransformer.create_selection_policy_from_selection_policy_json(
+        selection_policy_json)
+
+
+def _create_nearest_robot_raster(bounds_text, resolution, selection_policy):
+    if not bounds_text:
+        return None
+    bounds = [float(bound) for bound in bounds_text.split(',')]
+    if len(bounds) != 4:
+        raise ValueError('NEAREST_ROBOT_RASTER_BOUNDS Must Hold minX,minY,maxX,maxY.')
+    min_x, min_y, max_x, max_y = bounds
+    return nearest_robot_raster.NearestRobotRaster(min_x=min_x, min_y=min_y, max_x=max_x, max_y=max_y,
+                                                   resolution=resolution, selection_policy=selection_policy)
+
 
 g_flask_app = flask.Flask(__name__)
-g_json_retriever = json_retriever.JSONRetriever(ROBOT_DATABASE_ENDPOINT_URL)
+g_json_retriever = json_retriever.PooledJSONRetriever(
+    url_endpoints=[ROBOT_DATABASE_ENDPOINT_URL] + ROBOT_DATABASE_BACKUP_ENDPOINT_URLS,
+    attempt_timeout_seconds=ROBOT_DATABASE_ATTEMPT_TIMEOUT_SECONDS,
+    hedge_percentile=ROBOT_DATABASE_HEDGE_PERCENTILE,
+    json_array_consumer=json_helpers.RobotDatabaseJSONTransformer.create_robot_fleet_from_robot_database_json)
+g_fleet_snapshot_cache = fleet_snapshot_cache.FleetSnapshotCache(
+    json_retriever=g_json_retriever,
+    refresh_interval_seconds=FLEET_SNAPSHOT_REFRESH_INTERVAL_SECONDS,
+    fleet_snapshot_file=fleet_snapshot_file.FleetSnapshotFile(FLEET_SNAPSHOT_FILE_PATH))
+g_closest_robot_result_cache = closest_robot_result_cache.ClosestRobotResultCache(
+    max_entry_count=CLOSEST_ROBOT_RESULT_CACHE_SIZE,
+    quantization=CLOSEST_ROBOT_RESULT_CACHE_QUANTIZATION)
+g_selection_policy = _create_selection_policy(SELECTION_POLICY_JSON)
+g_closest_robot_subscriptions = closest_robot_subscriptions.ClosestRobotSubscriptions(
+    selection_policy=g_selection_policy)
+g_nearest_robot_raster = _create_nearest_robot_raster(bounds_text=NEAREST_ROBOT_RASTER_BOUNDS,
+                                                      resolution=NEAREST_ROBOT_RASTER_RESOLUTION,
+                                                      selection_policy=g_selection_policy)
+g_request_profiler = None
+g_micro_batcher = None
+g_metrics_registry = metrics.MetricsRegistry()
+g_stage_duration_histograms = g_metrics_registry.create_histogram(
+    name='closest_robot_stage_duration_seconds',
+    help_text='Time spent in each stage of determining the closest robot.',
+    bucket_upper_bounds=STAGE_DURATION_BUCKET_UPPER_BOUNDS_SECONDS,
+    label_names=['stage'])
+# Resolved Once Up Front, So Recording a Stage Costs a Histogram Observation and No Label Lookups
+g_stage_duration_histograms_by_stage = {stage: g_stage_duration_histograms.labels(stage)
+                                        for stage in [VALIDATION_STAGE, FETCH_STAGE, CALCULATION_STAGE,
+                                                      SERIALIZATION_STAGE]}
+g_response_counters = g_metrics_registry.create_counter(name='closest_robot_service_responses_total',
+                                                        help_text='Responses sent, by endpoint and status code.',
+                                                        label_names=['endpoint', 'code'])
 
 
-@g_flask_app.post('{}/closest'.format(API_BASE_PATH))
-def determine_closest_robot():
+def _get_fleet_snapshot_attribute(get_attribute):
+    fleet_snapshot = g_fleet_snapshot_cache.peek_snapshot()
+    return get_attribute(fleet_snapshot) if fleet_snapshot else None
+
+
+g_metrics_registry.create_function_metric(
+    name='closest_robot_fleet_size',
+    help_text='Robots in the current fleet snapshot.',
+    value_function=lambda: _get_fleet_snapshot_attribute(lambda fleet_snapshot: len(fleet_snapshot.get_robot_fleet())))
+g_metrics_registry.create_function_metric(
+    name='closest_robot_fleet_snapshot_age_seconds',
+    help_text='Time since the current fleet snapshot was fetched from the robot database.',
+    value_function=lambda: _get_fleet_snapshot_attribute(lambda fleet_snapshot: fleet_snapshot.get_age()))
+g_metrics_registry.create_function_metric(
+    name='closest_robot_robot_database_fetches_total',
+    help_text='Fetches sent to the robot database.',
+    value_function=lambda: g_json_retriever.get_fetch_count(),
+    metric_type=metrics.COUNTER_METRIC_TYPE)
+g_metrics_registry.create_function_metric(
+    name='closest_robot_result_cache_hits_total',
+    help_text='Closest robot lookups answered from the result cache.',
+    value_function=lambda: g_closest_robot_result_cache.get_hit_count(),
+    metric_type=metrics.COUNTER_METRIC_TYPE)
+g_metrics_registry.create_function_metric(
+    name='closest_robot_result_cache_misses_total',
+    help_text='Closest robot lookups that had to be calculated.',
+    value_function=lambda: g_closest_robot_result_cache.get_miss_count(),
+    metric_type=metrics.COUNTER_METRIC_TYPE)
+
+
+def _observe_stage_duration(stage, stage_start_time):
+    stage_end_time = time.perf_counter()
+    g_stage_duration_histograms_by_stage[stage].observe(stage_end_time - stage_start_time)
+    return stage_end_time
+
+
+@g_flask_app.after_request
+def count_response(response):
+    g_response_counters.labels(flask.request.endpoint or '', str(response.status_code)).increment()
+    return response
+
+
+@g_flask_app.get(METRICS_PATH)
+def get_metrics():
+    return (g_metrics_registry.render_prometheus_text(), OK_RESPONSE_CODE,
+            {'Content-Type': metrics.PROMETHEUS_CONTENT_TYPE})
+
+
+def _is_binary_request():
+    return flask.request.mimetype == binary_helpers.MEDIA_TYPE
+
+
+def _is_binary_response_accepted():
+    # Only Clients Preferring Binary Over JSON Get It, So a Missing Accept Header (or */*) Still Gets JSON
+    return flask.request.accept_mimetypes.best_match([JSON_MEDIA_TYPE, binary_helpers.MEDIA_TYPE]) == \
+        binary_helpers.MEDIA_TYPE
+
+
+def _create_binary_response(response_binary):
+    return flask.Response(response_binary, mimetype=binary_helpers.MEDIA_TYPE)
+
+
+def _get_formatted_error_response():
+    if _is_binary_response_accepted():
+        return _create_binary_response(binary_helpers.ResponseBinaryFormatter.get_formatted_error_response_binary())
+    return json_helpers.ResponseJSONFormatter.get_formatted_error_response_json()
+
+
+def _get_formatted_closest_robot_response_json(closest_robot):
+    if closest_robot:
+        return json_helpers.ResponseJSONFormatter.get_formatted_response_json(robot_id=closest_robot.get_id(),
+                                                                              distance_to_goal=closest_robot.get_distance_to_load(),
+                                                                              battery_level=closest_robot.get_battery_level())
+    return json_helpers.ResponseJSONFormatter.get_formatted_response_json(robot_id=None,
+                                                                          distance_to_goal=None,
+                                                                          battery_level=None)
+
+
+def _get_formatted_closest_robot_response_binary(closest_robot):
+    if closest_robot:
+        return binary_helpers.ResponseBinaryFormatter.get_formatted_response_binary(
+            robot_id=closest_robot.get_id(),
+            distance_to_goal=closest_robot.get_distance_to_load(),
+            battery_level=closest_robot.get_battery_level())
+    return binary_helpers.ResponseBinaryFormatter.get_formatted_response_binary(robot_id=None,
+                                                                              distance_to_goal=None,
+                                                                              battery_level=None)
+
+
+def _get_formatted_closest_robot_response(closest_robot):
+    if _is_binary_response_accepted():
+        return _create_binary_response(_get_formatted_closest_robot_response_binary(closest_robot))
+    return flask.jsonify(_get_formatted_closest_robot_response_json(closest_robot))
+
+
+def _get_formatted_closest_robots_response(closest_robots):
+    if _is_binary_response_accepted():
+        return _create_binary_response(b''.join(_get_formatted_closest_robot_response_binary(closest_robot)
+                                                for closest_robot in closest_robots))
+    return flask.jsonify([_get_formatted_closest_robot_response_json(closest_robot)
+                          for closest_robot in closest_robots])
+
+
+def _get_fleet_snapshot_headers(fleet_snapshot):
+    if fleet_snapshot.is_restored_from_file() or fleet_snapshot.get_age() > FLEET_SNAPSHOT_STALE_AGE_SECONDS:
+        return {'Warning': STALE_RESPONSE_WARNING}
+    return {}
+
+
+def _get_closest_robot_calculation(fleet_snapshot):
+    if g_nearest_robot_raster is not None:
+        # The Raster Follows Fleet Changes Itself, So It Must Be Listening to Whichever Cache Is Current
+        g_nearest_robot_raster.watch(g_fleet_snapshot_cache)
+        return functools.partial(g_nearest_robot_raster.find_closest_robot, fleet_snapshot)
+    return functools.partial(calculators.ClosestRobotCalculator.calculate_closest_robot_for_load_using_index,
+                             fleet_snapshot.get_robot_spatial_index(),
+                             selection_policy=g_selection_policy)
+
+
+def _calculate_closest_robot(fleet_snapshot, load):
+    return g_closest_robot_result_cache.get_closest_robot(
+        fleet_snapshot=fleet_snapshot,
+        load=load,
+        calculate_closest_robot=_get_closest_robot_calculation(fleet_snapshot))
+
+
+def _calculate_uncached_closest_robots(fleet_snapshot, loads):
+    # The Raster Answers Each Load in Constant Time, So Only Without It Is a Small Fleet Worth Vectorizing
+    if g_nearest_robot_raster is None and len(loads) >= VECTORIZED_BATCH_MIN_LOAD_COUNT and \
+            fleet_snapshot.get_robot_spatial_index().get_robot_count() <= VECTORIZED_BATCH_MAX_ROBOT_COUNT:
+        vectorized_calculator = calculators.VectorizedClosestRobotCalculator(robots=fleet_snapshot.get_robot_fleet(),
+                                                                             selection_policy=g_selection_policy)
+        return vectorized_calculator.calculate_closest_robots_for_loads(loads)
+    calculate_closest_robot = _get_closest_robot_calculation(fleet_snapshot)
+    return [calculate_closest_robot(load) for load in loads]
+
+
+def _calculate_closest_robots(fleet_snapshot, loads):
+    return g_closest_robot_result_cache.get_closest_robots(
+        fleet_snapshot=fleet_snapshot,
+        loads=loads,
+        calculate_closest_robots=functools.partial(_calculate_uncached_closest_robots, fleet_snapshot))
+
+
+def _create_load_from_request():
+    # None When the Request Does Not Describe a Valid Load
     if flask.request.is_json:
         request_json = flask.request.get_json()
         if json_helpers.RequestJSONTransformer.is_request_json_valid(request_json):
-            is_successful, robots_json = g_json_retriever.get_json_data()
-            if is_successful:
-                closest_robot = calculators.ClosestRobotCalculator.calculate_closest_robot_for_load_from_json_format(robots_json=robots_json,
-                                                                                                                     load_json=request_json)
-                if closest_robot:
-                    response_json = json_helpers.ResponseJSONFormatter.get_formatted_response_json(robot_id=closest_robot.get_id(),
-                                                                                                   distance_to_goal=closest_robot.get_distance_to_load(),
-                                                                                                   battery_level=closest_robot.get_battery_level())
+            return json_helpers.RequestJSONTransformer.create_load_from_request_json(request_json)
+    else:
+        request_binary = flask.request.get_data()
+        if binary_helpers.RequestBinaryTransformer.is_request_binary_valid(request_binary):
+            return binary_helpers.RequestBinaryTransformer.create_load_from_request_binary(request_binary)
+    return None
+
+
+def _get_candidate_count():
+    # None When No Ranking Was Asked For, and 0 When the Count Asked For Is Not Between 1 and MAX_CANDIDATE_COUNT
+    candidate_count = flask.request.args.get(CANDIDATE_COUNT_QUERY_PARAMETER)
+    if candidate_count is None:
+        return None
+    if candidate_count.isdigit() and 1 <= int(candidate_count) <= MAX_CANDIDATE_COUNT:
+        return int(candidate_count)
+    return 0
+
+
+@g_flask_app.post('{}/closest'.format(API_BASE_PATH))
+def determine_closest_robot():
+    if flask.request.is_json or _is_binary_request():
+        stage_start_time = time.perf_counter()
+        load = _create_load_from_request()
+        candidate_count = _get_candidate_count()
+        if load is not None and candidate_count != 0:
+            stage_start_time = _observe_stage_duration(VALIDATION_STAGE, stage_start_time)
+            fleet_snapshot = g_fleet_snapshot_cache.get_snapshot()
+            stage_start_time = _observe_stage_duration(FETCH_STAGE, stage_start_time)
+            if fleet_snapshot and candidate_count:
+                closest_robots = calculators.ClosestRobotCalculator.calculate_closest_robots_for_load_using_index(
+                    robot_spatial_index=fleet_snapshot.get_robot_spatial_index(),
+                    load=load,
+                    robot_count=candidate_count,
+                    selection_policy=g_selection_policy)
+                stage_start_time = _observe_stage_duration(CALCULATION_STAGE, stage_start_time)
+                response = _get_formatted_closest_robots_response(closest_robots)
+                _observe_stage_duration(SERIALIZATION_STAGE, stage_start_time)
+                return (response, OK_RESPONSE_CODE, _get_fleet_snapshot_headers(fleet_snapshot))
+            elif fleet_snapshot:
+                if g_micro_batcher is not None:
+                    closest_robot = g_micro_batcher.submit(batch_key=fleet_snapshot, item=load)
                 else:
-                    response_json = json_helpers.ResponseJSONFormatter.get_formatted_response_json(robot_id=None,
-                                                                                                   distance_to_goal=None,
-                                                                                                   battery_level=None)
-                return (response_json, OK_RESPONSE_CODE)
+                    closest_robot = _calculate_closest_robot(fleet_snapshot=fleet_snapshot, load=load)
+                stage_start_time = _observe_stage_duration(CALCULATION_STAGE, stage_start_time)
+                # Serialised Here Rather Than by Flask After Returning, So Its Cost Is Part of the Recorded Stages
+                response = _get_formatted_closest_robot_response(closest_robot)
+                _observe_stage_duration(SERIALIZATION_STAGE, stage_start_time)
+                return (response, OK_RESPONSE_CODE, _get_fleet_snapshot_headers(fleet_snapshot))
             else:
                 g_flask_app.logger.warning('Issue Connecting to Robot Database Endpoint.')
-                return (json_helpers.ResponseJSONFormatter.get_formatted_error_response_json(),
+                return (_get_formatted_error_response(),
                         INTERNAL_SERVER_ERROR_CODE)
 
         else:
-            g_flask_app.logger.warning('Bad JSON Request. Improper Data or Formatting Supplied in Request.')
+            g_flask_app.logger.warning('Bad Request. Improper Data or Formatting Supplied in Request.')
+            return (_get_formatted_error_response(),
+                    BAD_REQUEST_RESPONSE_CODE)
+    else:
+        g_flask_app.logger.warning('Unsupported Media Type Supplied in Request.')
+        return (_get_formatted_error_response(),
+                UNSUPPORTED_MEDIA_TYPE_RESPONSE_CODE)
+
+
+def _create_batch_loads_from_request():
+    # One Entry per Requested Load (None Where It Is Invalid), or None When the Request Is Not a List of Loads
+    if flask.request.is_json:
+        request_json = flask.request.get_json()
+        if isinstance(request_json, list):
+            return [json_helpers.RequestJSONTransformer.create_load_from_request_json(load_json)
+                    if json_helpers.RequestJSONTransformer.is_request_json_valid(load_json) else None
+                    for load_json in request_json]
+    else:
+        request_binary = flask.request.get_data()
+        if binary_helpers.RequestBinaryTransformer.is_batch_request_binary_valid(request_binary):
+            return binary_helpers.RequestBinaryTransformer.create_loads_from_batch_request_binary(request_binary)
+    return None
+
+
+def _calculate_batch_closest_robots(fleet_snapshot, loads, batch_mode):
+    if batch_mode == EXCLUSIVE_BATCH_MODE:
+        assigner = assigners.MultiLoadRobotAssigner(robot_spatial_index=fleet_snapshot.get_robot_spatial_index(),
+                                                    selection_policy=g_selection_policy)
+        return assigner.assign_robots_to_loads(loads)
+    return _calculate_closest_robots(fleet_snapshot=fleet_snapshot, loads=loads)
+
+
+def _get_formatted_batch_response(loads, closest_robots):
+    # Invalid Loads Keep Their Place in the Response, Answered With an Error Instead of a Robot
+    closest_robots = iter(closest_robots)
+    if _is_binary_response_accepted():
+        return _create_binary_response(b''.join(
+            _get_formatted_closest_robot_response_binary(next(closest_robots)) if load is not None else
+            binary_helpers.ResponseBinaryFormatter.get_formatted_batch_item_error_response_binary()
+            for load in loads))
+    return [_get_formatted_closest_robot_response_json(next(closest_robots)) if load is not None else
+            json_helpers.ResponseJSONFormatter.get_formatted_batch_item_error_response_json(
+                error_message=INVALID_LOAD_ERROR_MESSAGE)
+            for load in loads]
+
+
+@g_flask_app.post('{}/closest/batch'.format(API_BASE_PATH))
+def determine_closest_robots():
+    batch_mode = flask.request.args.get(BATCH_MODE_QUERY_PARAMETER, INDEPENDENT_BATCH_MODE)
+    if flask.request.is_json or _is_binary_request():
+        loads = _create_batch_loads_from_request()
+        if loads is not None and batch_mode in [INDEPENDENT_BATCH_MODE, EXCLUSIVE_BATCH_MODE]:
+            # The Fleet Snapshot (and Its Index) Is Fetched Once and Shared by Every Load in the Batch
+            fleet_snapshot = g_fleet_snapshot_cache.get_snapshot()
+            if fleet_snapshot:
+                closest_robots = _calculate_batch_closest_robots(fleet_snapshot=fleet_snapshot,
+                                                                 loads=[load for load in loads if load is not None],
+                                                                 batch_mode=batch_mode)
+                return (_get_formatted_batch_response(loads=loads, closest_robots=closest_robots), OK_RESPONSE_CODE,
+                        _get_fleet_snapshot_headers(fleet_snapshot))
+            else:
+                g_flask_app.logger.warning('Issue Connecting to Robot Database Endpoint.')
+                return (_get_formatted_error_response(),
+                        INTERNAL_SERVER_ERROR_CODE)
+        else:
+            g_flask_app.logger.warning('Bad Request. Batch Requests Must Supply a List of Loads and a Known Mode.')
+            return (_get_formatted_error_response(),
+                    BAD_REQUEST_RESPONSE_CODE)
+    else:
+        g_flask_app.logger.warning('Unsupported Media Type Supplied in Request.')
+        return (_get_formatted_error_response(),
+                UNSUPPORTED_MEDIA_TYPE_RESPONSE_CODE)
+
+
+def _iterate_streamed_response_lines(fleet_snapshot, request_lines):
+    # Each Load Is Answered as Soon as Its Line Has Been Read, So Neither the Request Nor the Response Is Ever Held
+    # in Memory as a Whole
+    for request_line in request_lines:
+        if not request_line.strip():
+            continue
+        try:
+            load_json = json.loads(request_line)
+        except ValueError:
+            load_json = None
+        if json_helpers.RequestJSONTransformer.is_request_json_valid(load_json):
+            load = json_helpers.RequestJSONTransformer.create_load_from_request_json(load_json)
+            response_json = _get_formatted_closest_robot_response_json(
+                _calculate_closest_robot(fleet_snapshot=fleet_snapshot, load=load))
+        else:
+            response_json = json_helpers.ResponseJSONFormatter.get_formatted_batch_item_error_response_json(
+                error_message=INVALID_LOAD_ERROR_MESSAGE)
+        yield json.dumps(response_json) + '\n'
+
+
+@g_flask_app.post('{}/closest/stream'.format(API_BASE_PATH))
+def stream_closest_robots():
+    if flask.request.mimetype == NDJSON_MEDIA_TYPE:
+        # As With Batches, Every Load in the Stream Is Answered From the Same Fleet Snapshot
+        fleet_snapshot = g_fleet_snapshot_cache.get_snapshot()
+        if fleet_snapshot:
+            # The Body Is Read Line by Line While the Response Is Being Sent, Rather Than Up Front
+            response = flask.Response(_iterate_streamed_response_lines(fleet_snapshot=fleet_snapshot,
+                                                                       request_lines=flask.request.stream),
+                                      mimetype=NDJSON_MEDIA_TYPE)
+            return (response, OK_RESPONSE_CODE, _get_fleet_snapshot_headers(fleet_snapshot))
+        else:
+            g_flask_app.logger.warning('Issue Connecting to Robot Database Endpoint.')
+            return (json_helpers.ResponseJSONFormatter.get_formatted_error_response_json(),
+                    INTERNAL_SERVER_ERROR_CODE)
+    else:
+        g_flask_app.logger.warning('Unsupported Media Type Supplied in Request.')
+        return (json_helpers.ResponseJSONFormatter.get_formatted_error_response_json(),
+                UNSUPPORTED_MEDIA_TYPE_RESPONSE_CODE)
+
+
+def _iterate_subscription_events(subscription):
+    # Runs for as Long as the Client Stays Connected; the Subscription Is Dropped as Soon as the Response Is Closed
+    try:
+        while True:
+            event = subscription.get_event(timeout_seconds=SUBSCRIPTION_KEEP_ALIVE_SECONDS)
+            if event is None:
+                yield ': keep-alive\n\n'
+                continue
+            load, closest_robot = event
+            event_json = json_helpers.ResponseJSONFormatter.get_formatted_load_response_json(
+                load_id=load.get_id(),
+                response_json=_get_formatted_closest_robot_response_json(closest_robot))
+            yield 'event: {}\ndata: {}\n\n'.format(SUBSCRIPTION_EVENT_NAME, json.dumps(event_json))
+    finally:
+        g_closest_robot_subscriptions.unsubscribe(subscription)
+
+
+@g_flask_app.post('{}/closest/subscriptions'.format(API_BASE_PATH))
+def subscribe_to_closest_robots():
+    if flask.request.is_json:
+        loads = _create_batch_loads_from_request()
+        if loads is not None and None not in loads:
+            fleet_snapshot = g_fleet_snapshot_cache.get_snapshot()
+            if fleet_snapshot:
+                # Every Load Is Answered Once Up Front, Then Again Only When a Fleet Change Gives It a Different Robot
+                g_closest_robot_subscriptions.watch(g_fleet_snapshot_cache)
+                subscription = g_closest_robot_subscriptions.subscribe(fleet_snapshot=fleet_snapshot, loads=loads)
+                response = flask.Response(_iterate_subscription_events(subscription),
+                                          mimetype=EVENT_STREAM_MEDIA_TYPE,
+                                          headers={'Cache-Control': 'no-cache'})
+                return (response, OK_RESPONSE_CODE)
+            else:
+                g_flask_app.logger.warning('Issue Connecting to Robot Database Endpoint.')
+                return (json_helpers.ResponseJSONFormatter.get_formatted_error_response_json(),
+                        INTERNAL_SERVER_ERROR_CODE)
+        else:
+            g_flask_app.logger.warning('Bad JSON Request. Subscriptions Must Supply a List of Valid Loads.')
             return (json_helpers.ResponseJSONFormatter.get_formatted_error_response_json(),
                     BAD_REQUEST_RESPONSE_CODE)
     else:
@@ -53,7 +516,81 @@ def determine_closest_robot():
                 UNSUPPORTED_MEDIA_TYPE_RESPONSE_CODE)
 
 
+@g_flask_app.post('{}/updates'.format(API_BASE_PATH))
+def update_robots():
+    if flask.request.is_json:
+        request_json = flask.request.get_json()
+        if isinstance(request_json, list):
+            robots = [json_helpers.RobotDatabaseJSONTransformer.create_robot_from_robot_database_json(robot_json)
+                      for robot_json in request_json
+                      if json_helpers.RobotDatabaseJSONTransformer.is_robot_database_json_valid(robot_json)]
+            g_fleet_snapshot_cache.apply_robot_updates(robots)
+            response_json = json_helpers.ResponseJSONFormatter.get_formatted_update_response_json(
+                applied_update_count=len(robots),
+                rejected_update_count=len(request_json) - len(robots))
+            return (response_json, OK_RESPONSE_CODE)
+        else:
+            g_flask_app.logger.warning('Bad JSON Request. Robot Updates Must Supply a List of Robots.')
+            return (json_helpers.ResponseJSONFormatter.get_formatted_update_error_response_json(),
+                    BAD_REQUEST_RESPONSE_CODE)
+    else:
+        g_flask_app.logger.warning('Unsupported Media Type Supplied in Request.')
+        return (json_helpers.ResponseJSONFormatter.get_formatted_update_error_response_json(),
+                UNSUPPORTED_MEDIA_TYPE_RESPONSE_CODE)
+
+
+def enable_request_profiling(max_profile_count=REQUEST_PROFILE_BUFFER_SIZE):
+    # The Endpoint Is Only Swapped for Its Profiled Wrapper Here, So Requests Pay Nothing While Profiling Is Disabled
+    global g_request_profiler
+    g_request_profiler = profiling.RequestProfiler(max_profile_count=max_profile_count)
+    g_flask_app.view_functions[determine_closest_robot.__name__] = g_request_profiler.wrap(
+        determine_closest_robot,
+        should_profile=lambda: REQUEST_PROFILING_HEADER in flask.request.headers)
+    return g_request_profiler
+
+
+def disable_request_profiling():
+    global g_request_profiler
+    g_request_profiler = None
+    g_flask_app.view_functions[determine_closest_robot.__name__] = determine_closest_robot
+
+
+@g_flask_app.get(REQUEST_PROFILES_PATH)
+def get_request_profiles():
+    if g_request_profiler is None:
+        g_flask_app.logger.warning('Request Profiles Requested While Request Profiling Is Disabled.')
+        return (json_helpers.ResponseJSONFormatter.get_formatted_request_profiles_error_response_json(),
+                NOT_FOUND_RESPONSE_CODE)
+    return (json_helpers.ResponseJSONFormatter.get_formatted_request_profiles_response_json(
+        request_profiles=g_request_profiler.get_profiles()), OK_RESPONSE_CODE)
+
+
+if REQUEST_PROFILING_ENABLED:
+    enable_request_profiling()
+
+
+def enable_micro_batching(max_wait_seconds=MICRO_BATCH_MAX_WAIT_SECONDS, max_batch_size=MICRO_BATCH_MAX_SIZE):
+    # Requests Are Only Batched With Others Answered From the Same Fleet Snapshot, Which Is Also the Batch's Key. Each
+    # Batch Is Calculated Like an Independent Batch Request, So Its Uncached Loads Are Calculated Together
+    global g_micro_batcher
+    g_micro_batcher = micro_batcher.MicroBatcher(process_batch=_calculate_closest_robots,
+                                                 max_wait_seconds=max_wait_seconds,
+                                                 max_batch_size=max_batch_size)
+    return g_micro_batcher
+
+
+def disable_micro_batching():
+    global g_micro_batcher
+    g_micro_batcher = None
+
+
+if MICRO_BATCHING_ENABLED:
+    enable_micro_batching()
+
+
 def main():
+    g_fleet_snapshot_cache.restore_snapshot()
+    g_fleet_snapshot_cache.start()
     g_flask_app.run(host=SERVER_HOST,
                     port=SERVER_PORT)
 
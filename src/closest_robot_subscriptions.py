@@ -0,0 +1,182 @@
+import math
+import queue
+import threading
+
+# Internal Libraries
+from selection_policies import DEFAULT_DISTANCE_WINDOW
+from spatial_index import RobotSpatialIndex
+
+
+class ClosestRobotSubscription(object):
+    # One Client's Pending Loads, and the Closest Robots Waiting to Be Sent to It
+
+    def __init__(self, loads):
+        self._loads = loads
+        self._events = queue.SimpleQueue()
+
+    def get_loads(self):
+        return self._loads
+
+    def put_event(self, load, closest_robot):
+        self._events.put((load, closest_robot))
+
+    def get_event(self, timeout_seconds):
+        # A (Load, Closest Robot) Pair, or None When Nothing Changed Within timeout_seconds
+        try:
+            return self._events.get(timeout=timeout_seconds)
+        except queue.Empty:
+            return None
+
+
+class _SubscribedLoad(object):
+    __slots__ = ('subscription', 'load', 'closest_robot', 'contention_distance', 'cell_key')
+
+    def __init__(self, subscription, load):
+        self.subscription = subscription
+        self.load = load
+        self.closest_robot = None
+        self.contention_distance = math.inf
+        self.cell_key = None
+
+
+class ClosestRobotSubscriptions(object):
+    # Loads Whose Closest Robot Can Only Be Displaced by Robots Nearer Than the Cell Size Are Kept in a Grid, So a
+    # Changed Robot Is Only Checked Against the Loads in the Cells Around It; the Rest Are Checked One by One
+    _DEFAULT_CELL_SIZE = 2 * DEFAULT_DISTANCE_WINDOW
+    _NEAR_CONTENTION_DISTANCE_RATIO = 0.99
+
+    def __init__(self, selection_policy, cell_size=_DEFAULT_CELL_SIZE):
+        self._selection_policy = selection_policy
+        self._cell_size = cell_size
+        self._near_contention_distance = cell_size * self._NEAR_CONTENTION_DISTANCE_RATIO
+        self._lock = threading.Lock()
+        self._fleet_snapshot_cache = None
+        self._snapshot = None
+        self._subscribed_loads_by_subscription = {}
+        self._near_subscribed_loads_by_cell = {}
+        self._far_subscribed_loads = set()
+        self._subscribed_loads_by_robot_id = {}
+        self._calculation_count = 0
+
+    def get_subscription_count(self):
+        return len(self._subscribed_loads_by_subscription)
+
+    def get_calculation_count(self):
+        return self._calculation_count
+
+    def watch(self, fleet_snapshot_cache):
+        # The Service's Cache Can Be Replaced (e.g. in Production Server Workers), So Whichever Is Current Is Followed
+        with self._lock:
+            if fleet_snapshot_cache is self._fleet_snapshot_cache:
+                return
+            if self._fleet_snapshot_cache is not None:
+                self._fleet_snapshot_cache.remove_snapshot_listener(self.update_closest_robots)
+            fleet_snapshot_cache.add_snapshot_listener(self.update_closest_robots)
+            self._fleet_snapshot_cache = fleet_snapshot_cache
+            self._snapshot = None
+
+    def _get_cell_key(self, x_coordinate, y_coordinate):
+        return math.floor(x_coordinate / self._cell_size), math.floor(y_coordinate / self._cell_size)
+
+    def _calculate_closest_robot(self, load):
+        self._calculation_count += 1
+        return self._selection_policy.select_robot_using_index(
+            robot_spatial_index=self._snapshot.get_robot_spatial_index(), load=load)
+
+    def _add_subscribed_load(self, subscribed_load, closest_robot):
+        subscribed_load.closest_robot = closest_robot
+        subscribed_load.contention_distance = self._selection_policy.get_contention_distance(closest_robot)
+        if subscribed_load.contention_distance <= self._near_contention_distance:
+            subscribed_load.cell_key = self._get_cell_key(subscribed_load.load.get_x_coordinate(),
+                                                          subscribed_load.load.get_y_coordinate())
+            self._near_subscribed_loads_by_cell.setdefault(subscribed_load.cell_key, set()).add(subscribed_load)
+        else:
+            subscribed_load.cell_key = None
+            self._far_subscribed_loads.add(subscribed_load)
+        if closest_robot is not None:
+            self._subscribed_loads_by_robot_id.setdefault(closest_robot.get_id(), set()).add(subscribed_load)
+
+    def _remove_subscribed_load(self, subscribed_load):
+        if subscribed_load.cell_key is None:
+            self._far_subscribed_loads.discard(subscribed_load)
+        else:
+            cell_subscribed_loads = self._near_subscribed_loads_by_cell[subscribed_load.cell_key]
+            cell_subscribed_loads.discard(subscribed_load)
+            if not cell_subscribed_loads:
+                del self._near_subscribed_loads_by_cell[subscribed_load.cell_key]
+        if subscribed_load.closest_robot is not None:
+            robot_subscribed_loads = self._subscribed_loads_by_robot_id[subscribed_load.closest_robot.get_id()]
+            robot_subscribed_loads.discard(subscribed_load)
+            if not robot_subscribed_loads:
+                del self._subscribed_loads_by_robot_id[subscribed_load.closest_robot.get_id()]
+
+    def subscribe(self, fleet_snapshot, loads):
+        subscription = ClosestRobotSubscription(loads)
+        with self._lock:
+            # A Snapshot Announced Since fleet_snapshot Was Fetched Is at Least as New, So Answers Start From It
+            self._snapshot = self._snapshot or fleet_snapshot
+            subscribed_loads = []
+            for load in loads:
+                subscribed_load = _SubscribedLoad(subscription=subscription, load=load)
+                self._add_subscribed_load(subscribed_load, self._calculate_closest_robot(load))
+                subscribed_loads.append(subscribed_load)
+                subscription.put_event(load, subscribed_load.closest_robot)
+            self._subscribed_loads_by_subscription[subscription] = subscribed_loads
+        return subscription
+
+    def unsubscribe(self, subscription):
+        with self._lock:
+            for subscribed_load in self._subscribed_loads_by_subscription.pop(subscription, []):
+                self._remove_subscribed_load(subscribed_load)
+
+    def _find_affected_subscribed_loads(self, changed_robot_ids):
+        affected_subscribed_loads = set()
+        for robot_id in changed_robot_ids:
+            # Loads Served by a Changed Robot May Lose It; Loads Near Its New Position May Prefer It
+            affected_subscribed_loads.update(self._subscribed_loads_by_robot_id.get(robot_id, ()))
+            robot = self._snapshot.get_robot_by_id(robot_id)
+            if robot is None:
+                continue
+            x_coordinate = robot.get_x_coordinate()
+            y_coordinate = robot.get_y_coordinate()
+            cell_x, cell_y = self._get_cell_key(x_coordinate, y_coordinate)
+            for cell_key in [(cell_x + offset_x, cell_y + offset_y)
+                             for offset_x in [-1, 0, 1] for offset_y in [-1, 0, 1]]:
+                for subscribed_load in self._near_subscribed_loads_by_cell.get(cell_key, ()):
+                    if RobotSpatialIndex.calculate_distance(x_coordinate, y_coordinate,
+                                                            subscribed_load.load.get_x_coordinate(),
+                                                            subscribed_load.load.get_y_coordinate()) <= \
+                            subscribed_load.contention_distance:
+                        affected_subscribed_loads.add(subscribed_load)
+            for subscribed_load in self._far_subscribed_loads:
+                if RobotSpatialIndex.calculate_distance(x_coordinate, y_coordinate,
+                                                        subscribed_load.load.get_x_coordinate(),
+                                                        subscribed_load.load.get_y_coordinate()) <= \
+                        subscribed_load.contention_distance:
+                    affected_subscribed_loads.add(subscribed_load)
+        return affected_subscribed_loads
+
+    def update_closest_robots(self, snapshot, changed_robot_ids):
+        # Snapshot Listener: Only the Loads a Changed Robot Could Affect Are Recalculated, and Only Loads Whose Closest
+        # Robot Is Now a Different Robot Are Sent an Event
+        with self._lock:
+            self._snapshot = snapshot
+            subscribed_load_count = sum(len(subscribed_loads)
+                                        for subscribed_loads in self._subscribed_loads_by_subscription.values())
+            if changed_robot_ids is None or len(changed_robot_ids) >= subscribed_load_count:
+                # Checking Every Changed Robot Would Cost More Than Recalculating Every Load
+                affected_subscribed_loads = [subscribed_load for subscribed_loads
+                                             in self._subscribed_loads_by_subscription.values()
+                                             for subscribed_load in subscribed_loads]
+            else:
+                affected_subscribed_loads = self._find_affected_subscribed_loads(changed_robot_ids)
+            for subscribed_load in affected_subscribed_loads:
+                previous_closest_robot = subscribed_load.closest_robot
+                self._remove_subscribed_load(subscribed_load)
+                self._add_subscribed_load(subscribed_load, self._calculate_closest_robot(subscribed_load.load))
+                if self._get_robot_id(subscribed_load.closest_robot) != self._get_robot_id(previous_closest_robot):
+                    subscribed_load.subscription.put_event(subscribed_load.load, subscribed_load.closest_robot)
+
+    @staticmethod
+    def _get_robot_id(robot):
+        return None if robot is None else robot.get_id()
@@ -0,0 +1,377 @@
+import copy
+import itertools
+import logging
+import threading
+import time
+
+import numpy
+
+# Internal Libraries
+from json_helpers import RobotDatabaseJSONTransformer
+from models import RobotFleet
+from spatial_index import RobotSpatialIndex
+
+
+class FleetSnapshot(object):
+    # Beyond This Share of Changed Robots, Rebuilding the Index Is Cheaper Than Moving Each of Them
+    _MAX_INDEX_UPDATE_FRACTION = 0.02
+    # Fleet Versions Name What the Robots Are, Not When They Were Fetched: One Only Advances When a Robot Changes, and
+    # All Are Drawn From One Counter, So Equal Fleet Versions Always Mean Equal Robots Whichever Cache Made Them
+    _fleet_versions = itertools.count(1)
+
+    def __init__(self, version, robots, fetched_at, is_restored_from_file=False):
+        self._version = version
+        self._fleet_version = next(FleetSnapshot._fleet_versions)
+        self._robot_fleet = robots if isinstance(robots, RobotFleet) else RobotFleet.create_from_robots(robots)
+        self._index_robot_ids()
+        # A Snapshot Restored From File Is Served at Startup, So Building Its Index Waits for Its First Query Rather
+        # Than Holding Up the Warm Start
+        self._robot_spatial_index = None if is_restored_from_file else RobotSpatialIndex(self._robot_fleet)
+        self._robot_spatial_index_lock = threading.Lock()
+        self._fetched_at = fetched_at
+        # Until the Robot Database First Answers, There Is No Telling How Far the Fleet Has Moved On Since
+        self._is_restored_from_file = is_restored_from_file
+
+    def _index_robot_ids(self):
+        # Ids Are Looked Up by Binary Search Over a Sorted Copy, Rather Than Through a Dict Holding Objects per Robot
+        ids = numpy.frombuffer(self._robot_fleet.get_ids(), dtype=numpy.int64)
+        self._robot_id_positions = numpy.argsort(ids, kind='stable')
+        self._sorted_robot_ids = ids[self._robot_id_positions]
+
+    @classmethod
+    def create_from_robot_database_json(cls, version, robots_json, fetched_at=None):
+        return cls(version=version,
+                   robots=RobotDatabaseJSONTransformer.create_robot_fleet_from_robot_database_json(robots_json),
+                   fetched_at=time.monotonic() if fetched_at is None else fetched_at)
+
+    def get_version(self):
+        return self._version
+
+    def set_version(self, version):
+        self._version = version
+
+    def get_fleet_version(self):
+        return self._fleet_version
+
+    def set_fleet_version(self, fleet_version):
+        self._fleet_version = fleet_version
+
+    def get_robot_fleet(self):
+        return self._robot_fleet
+
+    def get_robot_spatial_index(self):
+        robot_spatial_index = self._robot_spatial_index
+        if robot_spatial_index is None:
+            with self._robot_spatial_index_lock:
+                if self._robot_spatial_index is None:
+                    self._robot_spatial_index = RobotSpatialIndex(self._robot_fleet)
+                robot_spatial_index = self._robot_spatial_index
+        return robot_spatial_index
+
+    def get_fetched_at(self):
+        return self._fetched_at
+
+    def is_restored_from_file(self):
+        return self._is_restored_from_file
+
+    def get_robot_position(self, robot_id):
+        # Where an Id Appears More Than Once, Its Last Position Is the One Kept Up to Date
+        sorted_index = int(numpy.searchsorted(self._sorted_robot_ids, robot_id, side='right')) - 1
+        if sorted_index < 0 or self._sorted_robot_ids[sorted_index] != robot_id:
+            return None
+        return int(self._robot_id_positions[sorted_index])
+
+    def get_robot_by_id(self, robot_id):
+        position = self.get_robot_position(robot_id)
+        return None if position is None else self._robot_fleet.get_robot(position)
+
+    @staticmethod
+    def _get_changed_robot_positions(robot_fleet, previous_robot_fleet):
+        # Positions of the Robots Added or Changed Since previous_robot_fleet, or None When Robots Were Removed or
+        # Reordered (Which Can Change Tie Breaks Anywhere, So Everything Must Be Treated as Changed)
+        previous_robot_count = len(previous_robot_fleet)
+        if len(robot_fleet) < previous_robot_count:
+            return None
+        ids = numpy.frombuffer(robot_fleet.get_ids(), dtype=numpy.int64)
+        if not numpy.array_equal(ids[:previous_robot_count],
+                                 numpy.frombuffer(previous_robot_fleet.get_ids(), dtype=numpy.int64)):
+            return None
+        is_changed = numpy.zeros(previous_robot_count, dtype=bool)
+        for get_column in [RobotFleet.get_battery_levels, RobotFleet.get_x_coordinates, RobotFleet.get_y_coordinates]:
+            is_changed |= numpy.frombuffer(get_column(robot_fleet), dtype=numpy.float64)[:previous_robot_count] != \
+                numpy.frombuffer(get_column(previous_robot_fleet), dtype=numpy.float64)
+        return numpy.concatenate((numpy.flatnonzero(is_changed), numpy.arange(previous_robot_count, len(robot_fleet))))
+
+    def get_changed_robot_ids(self, previous_snapshot):
+        # Ids of the Robots Added or Changed Since previous_snapshot, or None When Everything Must Be Treated as Changed
+        changed_positions = self._get_changed_robot_positions(self._robot_fleet, previous_snapshot.get_robot_fleet())
+        if changed_positions is None:
+            return None
+        return set(numpy.frombuffer(self._robot_fleet.get_ids(), dtype=numpy.int64)[changed_positions].tolist())
+
+    def create_updated_snapshot(self, version, robots):
+        # Published Snapshots Are Never Changed, Since Queries May Still Be Reading Them. Updates Go Into a Copy of the
+        # Fleet, and the Copy's Index Shares Every Cell (and the Id Lookup, Unless Robots Were Added) It Can
+        robot_fleet = self._robot_fleet.copy()
+        updated_positions = []
+        added_robot_positions_by_id = {}
+        for robot in robots:
+            position = added_robot_positions_by_id.get(robot.get_id(), self.get_robot_position(robot.get_id()))
+            if position is None:
+                position = len(robot_fleet)
+                robot_fleet.append_robot(robot)
+                added_robot_positions_by_id[robot.get_id()] = position
+            else:
+                robot_fleet.update_robot(position=position, robot=robot)
+            updated_positions.append(position)
+        return self._create_snapshot_sharing_index(version=version,
+                                                   robot_fleet=robot_fleet,
+                                                   fetched_at=self._fetched_at,
+                                                   updated_positions=updated_positions,
+                                                   is_restored_from_file=self._is_restored_from_file)
+
+    def create_snapshot_of_updated_fleet(self, version, robot_fleet, fetched_at, is_restored_from_file=False):
+        # A Snapshot of robot_fleet, a Later Copy of This Snapshot's Fleet (e.g. Read Back From Shared Memory). While
+        # Only a Few Robots Were Changed or Appended, Its Index Is Updated From This One's Rather Than Rebuilt
+        changed_positions = self._get_changed_robot_positions(robot_fleet, self._robot_fleet)
+        if changed_positions is None or len(changed_positions) > self._MAX_INDEX_UPDATE_FRACTION * len(robot_fleet):
+            return FleetSnapshot(version=version, robots=robot_fleet, fetched_at=fetched_at,
+                                 is_restored_from_file=is_restored_from_file)
+        return self._create_snapshot_sharing_index(version=version,
+                                                   robot_fleet=robot_fleet,
+                                                   fetched_at=fetched_at,
+                                                   updated_positions=changed_positions.tolist(),
+                                                   is_restored_from_file=is_restored_from_file)
+
+    def _create_snapshot_sharing_index(self, version, robot_fleet, fetched_at, updated_positions,
+                                       is_restored_from_file):
+        # robot_fleet Must Match This Snapshot's Fleet Except at updated_positions
+        robot_spatial_index = self.get_robot_spatial_index()
+        snapshot = copy.copy(self)
+        snapshot._version = version
+        snapshot._is_restored_from_file = is_restored_from_file
+        if len(updated_positions):
+            snapshot._fleet_version = next(FleetSnapshot._fleet_versions)
+        snapshot._robot_fleet = robot_fleet
+        snapshot._fetched_at = fetched_at
+        snapshot._robot_spatial_index = robot_spatial_index.create_updated_index(
+            robot_fleet=robot_fleet, updated_positions=updated_positions)
+        if len(robot_fleet) > len(self._robot_fleet):
+            snapshot._index_robot_ids()
+        return snapshot
+
+    def get_age(self):
+        return time.monotonic() - self._fetched_at
+
+
+class _InFlightRefresh(object):
+
+    def __init__(self):
+        self._completed = threading.Event()
+        self._is_successful = False
+        self._exception = None
+
+    def set_result(self, is_successful, exception):
+        self._is_successful = is_successful
+        self._exception = exception
+        self._completed.set()
+
+    def get_result(self):
+        self._completed.wait()
+        if self._exception is not None:
+            raise self._exception
+        return self._is_successful
+
+
+class FleetSnapshotCache(object):
+    _DEFAULT_REFRESH_INTERVAL_SECONDS = 1.0
+
+    def __init__(self, json_retriever, refresh_interval_seconds=_DEFAULT_REFRESH_INTERVAL_SECONDS,
+                 fleet_snapshot_file=None):
+        self._json_retriever = json_retriever
+        self._refresh_interval_seconds = refresh_interval_seconds
+        self._fleet_snapshot_file = fleet_snapshot_file
+        self._snapshot = None
+        self._snapshot_version = 0
+        self._in_flight_lock = threading.Lock()
+        self._in_flight_refresh = None
+        self._update_lock = threading.Lock()
+        self._refresh_requested = threading.Event()
+        self._stop_requested = threading.Event()
+        self._refresher_thread = None
+        self._snapshot_listeners = []
+        # Robots Pushed While a Refresh Is Fetching, by Id; None When No Fetch Is in Flight
+        self._robot_updates_during_fetch = None
+
+    def get_refresh_interval_seconds(self):
+        return self._refresh_interval_seconds
+
+    def add_snapshot_listener(self, snapshot_listener):
+        # Called as snapshot_listener(snapshot, changed_robot_ids) Whenever a Snapshot Is Swapped In, Even One Where
+        # No Robot Changed (changed_robot_ids Is Then Empty), So Listeners Can Always Follow the Current Snapshot;
+        # changed_robot_ids Is None When Every Robot Must Be Treated as Changed. Listeners Are Called in the Order the
+        # Changes Were Made, With Updates Held Off Until They Return, So They Must Not Update the Cache Themselves
+        self._snapshot_listeners = self._snapshot_listeners + [snapshot_listener]
+
+    def remove_snapshot_listener(self, snapshot_listener):
+        self._snapshot_listeners = [listener for listener in self._snapshot_listeners if listener != snapshot_listener]
+
+    def _notify_snapshot_listeners(self, snapshot, changed_robot_ids):
+        for snapshot_listener in self._snapshot_listeners:
+            snapshot_listener(snapshot, changed_robot_ids)
+
+    def is_running(self):
+        return self._refresher_thread is not None and self._refresher_thread.is_alive()
+
+    def start(self):
+        if self.is_running():
+            return
+        self._stop_requested.clear()
+        self._refresher_thread = threading.Thread(target=self._run_refresher, daemon=True)
+        self._refresher_thread.start()
+
+    def stop(self):
+        self._stop_requested.set()
+        self._refresh_requested.set()
+        if self._refresher_thread is not None:
+            self._refresher_thread.join()
+            self._refresher_thread = None
+
+    def refresh(self):
+        # Single Flight: Callers Arriving While a Refresh Is in Flight Share Its Outcome (Its Exception Included),
+        # Rather Than Each Running Another Refresh After It
+        with self._in_flight_lock:
+            in_flight_refresh = self._in_flight_refresh
+            if in_flight_refresh is None:
+                self._in_flight_refresh = _InFlightRefresh()
+        if in_flight_refresh is not None:
+            return in_flight_refresh.get_result()
+        return self._run_in_flight_refresh()
+
+    def _run_in_flight_refresh(self):
+        # Only Called by Whoever Set self._in_flight_refresh, Which Stays Set Until This Refresh Is Over
+        in_flight_refresh = self._in_flight_refresh
+        is_successful = False
+        exception = None
+        try:
+            is_successful = self._refresh()
+            return is_successful
+        except Exception as refresh_exception:
+            exception = refresh_exception
+            raise
+        finally:
+            with self._in_flight_lock:
+                self._in_flight_refresh = None
+            in_flight_refresh.set_result(is_successful, exception)
+
+    def _refresh(self):
+        with self._update_lock:
+            self._robot_updates_during_fetch = {}
+        try:
+            snapshot = self._fetch_snapshot()
+            if snapshot is None:
+                return False
+            with self._update_lock:
+                # The Robot Database Cannot Have Seen Robots Pushed After It Was Asked, So Those Pushed Updates Are
+                # Newer Than What It Reported and Are Kept, Rather Than Overwritten by the Full Refresh
+                if self._robot_updates_during_fetch:
+                    snapshot = snapshot.create_updated_snapshot(
+                        version=None, robots=list(self._robot_updates_during_fetch.values()))
+                self._robot_updates_during_fetch = None
+                snapshot.set_version(self._get_next_snapshot_version())
+                previous_snapshot = self._snapshot
+                changed_robot_ids = None if previous_snapshot is None else \
+                    snapshot.get_changed_robot_ids(previous_snapshot)
+                if changed_robot_ids is not None and not changed_robot_ids:
+                    # The Robot Database Reported the Same Robots, So Anything Worked Out for Them Still Holds
+                    snapshot.set_fleet_version(previous_snapshot.get_fleet_version())
+                # Readers Only Ever Dereference self._snapshot Once, So Rebinding It Here Swaps Snapshots Atomically
+                self._snapshot = snapshot
+                self._notify_snapshot_listeners(snapshot, changed_robot_ids)
+        finally:
+            with self._update_lock:
+                self._robot_updates_during_fetch = None
+        if self._fleet_snapshot_file is not None:
+            # Persisting Is Best Effort: a Failed Write Only Costs the Next Restart Its Warm Start
+            self._fleet_snapshot_file.write(snapshot)
+        return True
+
+    def _fetch_snapshot(self):
+        is_successful, robots_json = self._json_retriever.get_json_data()
+        if not is_successful:
+            return None
+        if isinstance(robots_json, RobotFleet):
+            # Streaming Retrievers Hand Back a Fleet That Was Built While the Response Was Being Read
+            return FleetSnapshot(version=None, robots=robots_json, fetched_at=time.monotonic())
+        if isinstance(robots_json, list):
+            return FleetSnapshot.create_from_robot_database_json(version=None, robots_json=robots_json)
+        return None
+
+    def restore_snapshot(self):
+        # Warm Start: Serve the Last Persisted Fleet Until the Robot Database Has Answered, Rather Than Nothing
+        if self._fleet_snapshot_file is None:
+            return False
+        with self._update_lock:
+            if self._snapshot is not None:
+                return False
+            snapshot = self._fleet_snapshot_file.read(version=self._snapshot_version + 1)
+            if snapshot is None:
+                return False
+            self._get_next_snapshot_version()
+            self._snapshot = snapshot
+            self._notify_snapshot_listeners(snapshot, None)
+        return True
+
+    def apply_robot_updates(self, robots):
+        with self._update_lock:
+            if self._robot_updates_during_fetch is not None:
+                self._robot_updates_during_fetch.update((robot.get_id(), robot) for robot in robots)
+            if self._snapshot is None:
+                self._snapshot = FleetSnapshot(version=self._get_next_snapshot_version(),
+                                               robots=robots,
+                                               fetched_at=time.monotonic())
+            else:
+                # Swapped in Whole, Like a Refreshed Snapshot, So No Query Ever Sees a Partly Updated Fleet
+                self._snapshot = self._snapshot.create_updated_snapshot(version=self._get_next_snapshot_version(),
+                                                                        robots=robots)
+            self._notify_snapshot_listeners(self._snapshot, {robot.get_id() for robot in robots})
+
+    def _get_next_snapshot_version(self):
+        self._snapshot_version += 1
+        return self._snapshot_version
+
+    def peek_snapshot(self):
+        # The Current Snapshot (or None), Without Fetching or Triggering a Refresh
+        return self._snapshot
+
+    def get_snapshot(self):
+        snapshot = self._snapshot
+        if snapshot is None:
+            # Cold Start: Nothing to Serve Yet, So Every Caller Waits on the One Upstream Fetch in Flight
+            self.refresh()
+            snapshot = self._snapshot
+        elif snapshot.get_age() > self._refresh_interval_seconds:
+            # Stale-While-Revalidate: Serve the Current Snapshot and Nudge the Refresher Without Waiting on It
+            self._request_background_refresh()
+        return snapshot
+
+    def _request_background_refresh(self):
+        if self.is_running():
+            self._refresh_requested.set()
+            return
+        with self._in_flight_lock:
+            # Claimed Before the Thread Starts, So a Burst of Stale Requests Starts One Refresh Between Them
+            if self._in_flight_refresh is not None:
+                return
+            self._in_flight_refresh = _InFlightRefresh()
+        threading.Thread(target=self._run_in_flight_refresh, daemon=True).start()
+
+    def _run_refresher(self):
+        while not self._stop_requested.is_set():
+            try:
+                self.refresh()
+            except Exception:
+                # One Bad Refresh Must Not End Every Later One; the Current Snapshot Is Served Until One Succeeds
+                logging.getLogger(__name__).exception('Fleet Snapshot Refresh Failed.')
+            self._refresh_requested.wait(timeout=self._refresh_interval_seconds)
+            self._refresh_requested.clear()
@@ -0,0 +1,67 @@
+import mmap
+import os
+import struct
+import time
+
+# Internal Libraries
+import binary_fleet_format
+from fleet_snapshot_cache import FleetSnapshot
+
+
+class FleetSnapshotFile(object):
+    # Header: Magic, Format Version, Robot Count and Wall Clock Fetch Time, Followed by the Fleet's Columns
+    _HEADER_STRUCT = struct.Struct('<8sIxxxxQd')
+    _MAGIC = b'ROBOTFLT'
+    _FORMAT_VERSION = 1
+
+    def __init__(self, path):
+        self._path = path
+
+    def get_path(self):
+        return self._path
+
+    def write(self, fleet_snapshot):
+        robot_fleet = fleet_snapshot.get_robot_fleet()
+        robot_count = len(robot_fleet)
+        # Snapshot Times Are Monotonic, Which Means Nothing After a Restart, So the Wall Clock Time Is Stored Instead
+        fetched_at_wall_time = time.time() - fleet_snapshot.get_age()
+        file_buffer = bytearray(self._HEADER_STRUCT.size + binary_fleet_format.get_columns_size(robot_count))
+        self._HEADER_STRUCT.pack_into(file_buffer, 0, self._MAGIC, self._FORMAT_VERSION, robot_count,
+                                      fetched_at_wall_time)
+        binary_fleet_format.write_robot_fleet_columns(buffer=file_buffer,
+                                                      columns_offset=self._HEADER_STRUCT.size,
+                                                      capacity=robot_count,
+                                                      robot_fleet=robot_fleet)
+        temporary_path = '{}.{}.tmp'.format(self._path, os.getpid())
+        try:
+            with open(temporary_path, 'wb') as snapshot_file:
+                snapshot_file.write(file_buffer)
+            # Replaced in One Step, So a Crash Mid-Write Never Leaves a Half-Written Snapshot Behind
+            os.replace(temporary_path, self._path)
+        except OSError:
+            if os.path.exists(temporary_path):
+                os.remove(temporary_path)
+            return False
+        return True
+
+    def read(self, version):
+        try:
+            with open(self._path, 'rb') as snapshot_file:
+                # Mapped Rather Than Read, So the Fleet Views Its Columns in Place Instead of Copying Them
+                file_buffer = mmap.mmap(snapshot_file.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):
+            return None
+        if len(file_buffer) < self._HEADER_STRUCT.size:
+            return None
+        magic, format_version, robot_count, fetched_at_wall_time = self._HEADER_STRUCT.unpack_from(file_buffer)
+        if (magic != self._MAGIC or format_version != self._FORMAT_VERSION or
+                len(file_buffer) != self._HEADER_STRUCT.size + binary_fleet_format.get_columns_size(robot_count)):
+            return None
+        robot_fleet = binary_fleet_format.create_robot_fleet_from_columns(buffer=file_buffer,
+                                                                          columns_offset=self._HEADER_STRUCT.size,
+                                                                          capacity=robot_count,
+                                                                          robot_count=robot_count)
+        return FleetSnapshot(version=version,
+                             robots=robot_fleet,
+                             fetched_at=time.monotonic() - max(time.time() - fetched_at_wall_time, 0),
+                             is_restored_from_file=True)
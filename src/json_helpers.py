@@ -1,12 +1,23 @@
 
+import codecs
+import json
+import math
+import re
+
 # Internal Libraries
-from models import Load, Robot
+from models import MAX_COORDINATE_MAGNITUDE, Load, Robot, RobotFleet
+from selection_policies import DEFAULT_DISTANCE_WINDOW, WeightedScoreSelectionPolicy, WindowSelectionPolicy
 
 
 class ResponseJSONFormatter(object):
+    _LOAD_ID_KEY = 'loadId'
     _ROBOT_ID_KEY = 'robotId'
     _DISTANCE_TO_GOAL_KEY = 'distanceToGoal'
     _BATTERY_LEVEL_KEY = 'batteryLevel'
+    _ERROR_KEY = 'error'
+    _APPLIED_UPDATES_KEY = 'appliedUpdates'
+    _REJECTED_UPDATES_KEY = 'rejectedUpdates'
+    _REQUEST_PROFILES_KEY = 'requestProfiles'
     _RESPONSE_JSON_ERROR_VALUE = None
 
     @classmethod
@@ -15,12 +26,48 @@ class ResponseJSONFormatter(object):
                 cls._DISTANCE_TO_GOAL_KEY: distance_to_goal,
                 cls._BATTERY_LEVEL_KEY: battery_level}
 
+    @classmethod
+    def get_formatted_load_response_json(cls, load_id, response_json):
+        load_response_json = {cls._LOAD_ID_KEY: load_id}
+        load_response_json.update(response_json)
+        return load_response_json
+
     @classmethod
     def get_formatted_error_response_json(cls):
         return cls.get_formatted_response_json(robot_id=cls._RESPONSE_JSON_ERROR_VALUE,
                                                distance_to_goal=cls._RESPONSE_JSON_ERROR_VALUE,
                                                battery_level=cls._RESPONSE_JSON_ERROR_VALUE)
 
+    @classmethod
+    def get_formatted_batch_item_error_response_json(cls, error_message):
+        response_json = cls.get_formatted_error_response_json()
+        response_json[cls._ERROR_KEY] = error_message
+        return response_json
+
+    @classmethod
+    def get_formatted_update_response_json(cls, applied_update_count, rejected_update_count):
+        return {cls._APPLIED_UPDATES_KEY: applied_update_count,
+                cls._REJECTED_UPDATES_KEY: rejected_update_count}
+
+    @classmethod
+    def get_formatted_update_error_response_json(cls):
+        return cls.get_formatted_update_response_json(applied_update_count=cls._RESPONSE_JSON_ERROR_VALUE,
+                                                      rejected_update_count=cls._RESPONSE_JSON_ERROR_VALUE)
+
+    @classmethod
+    def get_formatted_request_profiles_response_json(cls, request_profiles):
+        return {cls._REQUEST_PROFILES_KEY: request_profiles}
+
+    @classmethod
+    def get_formatted_request_profiles_error_response_json(cls):
+        return cls.get_formatted_request_profiles_response_json(request_profiles=cls._RESPONSE_JSON_ERROR_VALUE)
+
+
+def _is_usable_coordinate(value):
+    # Infinite and NaN Coordinates (Which JSON Parsers Accept), and Integers Too Large to Be Floats, Have No Place on
+    # the Floor or in the Spatial Index. Integers Are Compared Exactly, So Even Huge Ones Never Overflow Here
+    return (type(value) == int or type(value) == float) and abs(value) <= MAX_COORDINATE_MAGNITUDE
+
 
 class RequestJSONTransformer(object):
     _LOAD_ID_KEY = 'loadId'
@@ -41,13 +88,13 @@ class RequestJSONTransformer(object):
         x_coordinate = request_json[cls._X_COORDINATE_KEY]
         y_coordinate = request_json[cls._Y_COORDINATE_KEY]
         load_id_is_int = (type(load_id) == int) or ((type(load_id) == str) and (load_id.isnumeric()))
-        coordinates_are_numbers = ((type(x_coordinate) == int) or (type(x_coordinate) == float)) and \
-                                  ((type(y_coordinate) == int) or (type(y_coordinate) == float))
+        coordinates_are_numbers = _is_usable_coordinate(x_coordinate) and _is_usable_coordinate(y_coordinate)
         return load_id_is_int and (int(load_id) >= 0) and coordinates_are_numbers
 
     @classmethod
     def is_request_json_valid(cls, request_json):
-        return cls._desired_keys_exist_in_json(request_json) and cls._desired_value_ranges_exist_in_json(request_json)
+        return isinstance(request_json, dict) and \
+            cls._desired_keys_exist_in_json(request_json) and cls._desired_value_ranges_exist_in_json(request_json)
 
     @classmethod
     def create_load_from_request_json(cls, request_json):
@@ -64,6 +111,9 @@ class RobotDatabaseJSONTransformer(object):
     _BATTERY_LEVEL_KEY = 'batteryLevel'
     _X_COORDINATE_KEY = 'x'
     _Y_COORDINATE_KEY = 'y'
+    _ROBOT_FLEET_BATCH_SIZE = 4096
+    # Robot Fleets Hold Ids as Signed 64-Bit Integers
+    _MAX_ROBOT_ID = 2 ** 63 - 1
 
     @classmethod
     def _desired_keys_exist_in_json(cls, robot_database_json):
@@ -82,15 +132,15 @@ class RobotDatabaseJSONTransformer(object):
         y_coordinate = robot_database_json[cls._Y_COORDINATE_KEY]
         robot_id_is_int = (type(robot_id) == int) or ((type(robot_id) == str) and (robot_id.isnumeric()))
         battery_level_is_number = ((type(battery_level) == int) or (type(battery_level) == float))
-        coordinates_are_numbers = ((type(x_coordinate) == int) or (type(x_coordinate) == float)) and \
-                                  ((type(y_coordinate) == int) or (type(y_coordinate) == float))
-        return robot_id_is_int and (int(robot_id) >= 0) and \
+        coordinates_are_numbers = _is_usable_coordinate(x_coordinate) and _is_usable_coordinate(y_coordinate)
+        return robot_id_is_int and (0 <= int(robot_id) <= cls._MAX_ROBOT_ID) and \
             battery_level_is_number and (battery_level >= 0) and (battery_level <= 100) and\
             coordinates_are_numbers
 
     @classmethod
     def is_robot_database_json_valid(cls, robot_database_json):
-        return cls._desired_keys_exist_in_json(robot_database_json) and \
+        return isinstance(robot_database_json, dict) and \
+            cls._desired_keys_exist_in_json(robot_database_json) and \
             cls._desired_value_ranges_exist_in_json(robot_database_json)
 
     @classmethod
@@ -103,3 +153,188 @@ class RobotDatabaseJSONTransformer(object):
                      battery_level=battery_level,
                      x_coordinate=x_coordinate,
                      y_coordinate=y_coordinate)
+
+    @classmethod
+    def create_robot_fleet_from_robot_database_json(cls, robots_json):
+        # Validates and Builds Each Record in a Single Pass, Accepting and Rejecting Exactly What
+        # is_robot_database_json_valid Does, Without Building a Robot per Record
+        robot_id_key = cls._ROBOT_ID_KEY
+        battery_level_key = cls._BATTERY_LEVEL_KEY
+        x_coordinate_key = cls._X_COORDINATE_KEY
+        y_coordinate_key = cls._Y_COORDINATE_KEY
+        max_robot_id = cls._MAX_ROBOT_ID
+        number_types = (int, float)
+        max_coordinate_magnitude = MAX_COORDINATE_MAGNITUDE
+        robot_fleet = RobotFleet()
+        ids, battery_levels, x_coordinates, y_coordinates = [], [], [], []
+        for robot_database_json in robots_json:
+            if type(robot_database_json) is not dict:
+                # Dict Subclasses May Customise Lookups, So They Take the Regular Path
+                if not cls.is_robot_database_json_valid(robot_database_json):
+                    continue
+                robot = cls.create_robot_from_robot_database_json(robot_database_json)
+                robot_id = robot.get_id()
+                battery_level = robot.get_battery_level()
+                x_coordinate = robot.get_x_coordinate()
+                y_coordinate = robot.get_y_coordinate()
+            else:
+                try:
+                    robot_id = robot_database_json[robot_id_key]
+                    battery_level = robot_database_json[battery_level_key]
+                    x_coordinate = robot_database_json[x_coordinate_key]
+                    y_coordinate = robot_database_json[y_coordinate_key]
+                except KeyError:
+                    continue
+                robot_id_type = type(robot_id)
+                if robot_id_type == str and robot_id.isnumeric():
+                    robot_id = int(robot_id)
+                elif robot_id_type != int:
+                    continue
+                if not 0 <= robot_id <= max_robot_id:
+                    continue
+                if type(battery_level) not in number_types or not 0 <= battery_level <= 100 or \
+                        type(x_coordinate) not in number_types or type(y_coordinate) not in number_types:
+                    continue
+                if not (abs(x_coordinate) <= max_coordinate_magnitude and
+                        abs(y_coordinate) <= max_coordinate_magnitude):
+                    continue
+            ids.append(robot_id)
+            battery_levels.append(battery_level)
+            x_coordinates.append(x_coordinate)
+            y_coordinates.append(y_coordinate)
+            if len(ids) == cls._ROBOT_FLEET_BATCH_SIZE:
+                # Moving Each Batch Into the Compact Fleet Keeps Memory Bounded When robots_json Is Streamed
+                robot_fleet.extend_robot_values(ids=ids,
+                                                battery_levels=battery_levels,
+                                                x_coordinates=x_coordinates,
+                                                y_coordinates=y_coordinates)
+                ids, battery_levels, x_coordinates, y_coordinates = [], [], [], []
+        robot_fleet.extend_robot_values(ids=ids,
+                                        battery_levels=battery_levels,
+                                        x_coordinates=x_coordinates,
+                                        y_coordinates=y_coordinates)
+        return robot_fleet
+
+
+class SelectionPolicyJSONTransformer(object):
+    _TYPE_KEY = 'type'
+    _WINDOW_TYPE = 'window'
+    _WEIGHTED_SCORE_TYPE = 'weightedScore'
+    _DISTANCE_WINDOW_KEY = 'distanceWindow'
+    _MIN_BATTERY_LEVEL_KEY = 'minBatteryLevel'
+    _DISTANCE_WEIGHT_KEY = 'distanceWeight'
+    _BATTERY_WEIGHT_KEY = 'batteryWeight'
+    # Every Key Other Than the Type Is Optional, and Must Hold a Number at or Above Its Lower Bound (Exclusive When
+    # Marked) When Given
+    _NUMBER_BOUNDS_BY_TYPE = {_WINDOW_TYPE: {_DISTANCE_WINDOW_KEY: (0, False),
+                                             _MIN_BATTERY_LEVEL_KEY: (0, False)},
+                              _WEIGHTED_SCORE_TYPE: {_DISTANCE_WEIGHT_KEY: (0, True),
+                                                     _BATTERY_WEIGHT_KEY: (0, False),
+                                                     _MIN_BATTERY_LEVEL_KEY: (0, False)}}
+
+    @staticmethod
+    def _is_number_within_bounds(value, lower_bound, lower_bound_is_exclusive):
+        return (type(value) == int or type(value) == float) and math.isfinite(value) and \
+            (value > lower_bound if lower_bound_is_exclusive else value >= lower_bound)
+
+    @classmethod
+    def is_selection_policy_json_valid(cls, selection_policy_json):
+        if not isinstance(selection_policy_json, dict) or \
+                selection_policy_json.get(cls._TYPE_KEY) not in cls._NUMBER_BOUNDS_BY_TYPE:
+            return False
+        number_bounds = cls._NUMBER_BOUNDS_BY_TYPE[selection_policy_json[cls._TYPE_KEY]]
+        return all(key == cls._TYPE_KEY or
+                   (key in number_bounds and cls._is_number_within_bounds(value, *number_bounds[key]))
+                   for key, value in selection_policy_json.items())
+
+    @classmethod
+    def create_selection_policy_from_selection_policy_json(cls, selection_policy_json):
+        min_battery_level = selection_policy_json.get(cls._MIN_BATTERY_LEVEL_KEY, 0)
+        if selection_policy_json[cls._TYPE_KEY] == cls._WEIGHTED_SCORE_TYPE:
+            return WeightedScoreSelectionPolicy(distance_weight=selection_policy_json.get(cls._DISTANCE_WEIGHT_KEY, 1),
+                                                battery_weight=selection_policy_json.get(cls._BATTERY_WEIGHT_KEY, 0),
+                                                min_battery_level=min_battery_level)
+        return WindowSelectionPolicy(
+            distance_window=selection_policy_json.get(cls._DISTANCE_WINDOW_KEY, DEFAULT_DISTANCE_WINDOW),
+            min_battery_level=min_battery_level)
+
+
+class JSONArrayStreamDecoder(object):
+    _JSON_DECODER = json.JSONDecoder()
+    _WHITESPACE_PATTERN = re.compile(r'[ \t\n\r]*')
+    _NUMBER_TAIL_PATTERN = re.compile(r'[0-9.eE+-]*')
+    _ENCODING = 'utf-8'
+
+    def __init__(self, chunks):
+        self._text_chunks = self._iterate_text_chunks(chunks)
+        self._buffer = ''
+        self._position = 0
+
+    @classmethod
+    def _iterate_text_chunks(cls, chunks):
+        # Multi-Byte Characters May Be Split Across Chunks, So Bytes Are Decoded Incrementally
+        incremental_decoder = codecs.getincrementaldecoder(cls._ENCODING)()
+        for chunk in chunks:
+            yield incremental_decoder.decode(chunk) if isinstance(chunk, bytes) else chunk
+        yield incremental_decoder.decode(b'', True)
+
+    def _read_more(self):
+        text_chunk = next(self._text_chunks, None)
+        if text_chunk is None:
+            return False
+        # Only the Unconsumed Tail Is Kept, So the Buffer Never Holds More Than a Chunk Plus One Element
+        self._buffer = self._buffer[self._position:] + text_chunk
+        self._position = 0
+        return True
+
+    def _peek_character(self):
+        while True:
+            self._position = self._WHITESPACE_PATTERN.match(self._buffer, self._position).end()
+            if self._position < len(self._buffer):
+                return self._buffer[self._position]
+            if not self._read_more():
+                return None
+
+    def _consume_character(self, expected_character):
+        if self._peek_character() != expected_character:
+            raise ValueError('Expected {} at Position {} of the JSON Array Stream.'.format(expected_character,
+                                                                                         self._position))
+        self._position += 1
+
+    def __iter__(self):
+        self._consume_character('[')
+        is_array_open = self._peek_character() != ']'
+        if not is_array_open:
+            self._position += 1
+        scan_once = self._JSON_DECODER.scan_once
+        match_whitespace = self._WHITESPACE_PATTERN.match
+        while is_array_open:
+            buffer = self._buffer
+            position = self._position
+            try:
+                while True:
+                    position = match_whitespace(buffer, position).end()
+                    element, end_position = scan_once(buffer, position)
+                    # An Element Is Only Trusted Once the Delimiter After It Is Buffered
+                    delimiter_position = match_whitespace(buffer, end_position).end()
+                    delimiter = buffer[delimiter_position:delimiter_position + 1]
+                    if delimiter == ',' or delimiter == ']':
+                        position = delimiter_position + 1
+                        is_array_open = delimiter == ','
+                        yield element
+                        if not is_array_open:
+                            break
+                    elif delimiter and not self._NUMBER_TAIL_PATTERN.fullmatch(buffer, end_position):
+                        raise ValueError('Expected , or ] at Position {} of the JSON Array Stream.'.format(
+                            delimiter_position))
+                    else:
+                        # A Number Cut Off at the End of the Buffer (e.g. 1.5e) Decodes Short, So More Input Is Needed
+                        break
+            except (StopIteration, json.JSONDecodeError):
+                # The Element Runs Past the End of the Buffer (or Is Invalid, Which Surfaces Once Input Runs Out)
+                pass
+            self._position = position
+            if is_array_open and not self._read_more():
+                raise ValueError('The JSON Array Stream Ended Before the Array Was Closed.')
+        if self._peek_character() is not None:
+            raise ValueError('Unexpected Data After the JSON Array Stream.')
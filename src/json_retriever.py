@@ -1,14 +1,172 @@
+import asyncio
+import collections
+import concurrent.futures
+import math
+import threading
+import time
+
 import requests
+import requests.adapters
+
+# Internal Libraries
+from json_helpers import JSONArrayStreamDecoder
+
+
+class _InFlightFetch(object):
+
+    def __init__(self):
+        self._completed = threading.Event()
+        self._result = (False, None)
+
+    def set_result(self, result):
+        self._result = result
+        self._completed.set()
+
+    def get_result(self):
+        self._completed.wait()
+        return self._result
 
 
 class JSONRetriever(object):
+    _STREAM_CHUNK_SIZE = 1 << 16
 
-    def __init__(self, url_endpoint):
+    def __init__(self, url_endpoint, json_array_consumer=None):
         self._url_endpoint = url_endpoint
+        self._json_array_consumer = json_array_consumer
+        self._in_flight_lock = threading.Lock()
+        self._in_flight_fetch = None
+        self._in_flight_async_fetches = {}
+        self._fetch_count = 0
+        self._coalesced_call_count = 0
+
+    def get_fetch_count(self):
+        return self._fetch_count
+
+    def get_coalesced_call_count(self):
+        return self._coalesced_call_count
+
+    def _is_streaming(self):
+        return self._json_array_consumer is not None
+
+    def _read_json_data(self, response):
+        if not self._is_streaming():
+            return response.json()
+        # Each Array Element Is Handed to the Consumer as Soon as It Is Parsed, So the Whole Document Is Never Held
+        return self._json_array_consumer(JSONArrayStreamDecoder(response.iter_content(self._STREAM_CHUNK_SIZE)))
+
+    def _fetch_json_data(self):
+        try:
+            with requests.get(self._url_endpoint, stream=self._is_streaming()) as response:
+                return True, self._read_json_data(response)
+        except (requests.exceptions.RequestException, ValueError):
+            return False, None
 
     def get_json_data(self):
+        # Single-Flight: Callers Arriving While a Fetch Is In Flight Share Its Response Instead of Sending Their Own
+        with self._in_flight_lock:
+            in_flight_fetch = self._in_flight_fetch
+            is_leader = in_flight_fetch is None
+            if is_leader:
+                in_flight_fetch = self._in_flight_fetch = _InFlightFetch()
+                self._fetch_count += 1
+            else:
+                self._coalesced_call_count += 1
+        if is_leader:
+            result = (False, None)
+            try:
+                result = self._fetch_json_data()
+            finally:
+                with self._in_flight_lock:
+                    self._in_flight_fetch = None
+                in_flight_fetch.set_result(result)
+        return in_flight_fetch.get_result()
+
+    async def get_json_data_async(self):
+        event_loop = asyncio.get_running_loop()
+        in_flight_fetch = self._in_flight_async_fetches.get(event_loop)
+        if in_flight_fetch is None:
+            # The Blocking Fetch Runs in the Default Executor, Where It Also Coalesces With Any Threaded Callers
+            in_flight_fetch = event_loop.run_in_executor(None, self.get_json_data)
+            self._in_flight_async_fetches[event_loop] = in_flight_fetch
+            in_flight_fetch.add_done_callback(lambda _: self._in_flight_async_fetches.pop(event_loop, None))
+        else:
+            with self._in_flight_lock:
+                self._coalesced_call_count += 1
+        return await asyncio.shield(in_flight_fetch)
+
+
+class PooledJSONRetriever(JSONRetriever):
+    _DEFAULT_ATTEMPT_TIMEOUT_SECONDS = 2.0
+    _DEFAULT_HEDGE_PERCENTILE = 95
+    _DEFAULT_INITIAL_HEDGE_DELAY_SECONDS = 0.25
+    _DEFAULT_LATENCY_SAMPLE_COUNT = 100
+    _MIN_LATENCY_SAMPLE_COUNT = 10
+    _DEFAULT_POOL_SIZE = 10
+
+    def __init__(self, url_endpoints,
+                 attempt_timeout_seconds=_DEFAULT_ATTEMPT_TIMEOUT_SECONDS,
+                 hedge_percentile=_DEFAULT_HEDGE_PERCENTILE,
+                 initial_hedge_delay_seconds=_DEFAULT_INITIAL_HEDGE_DELAY_SECONDS,
+                 latency_sample_count=_DEFAULT_LATENCY_SAMPLE_COUNT,
+                 pool_size=_DEFAULT_POOL_SIZE,
+                 json_array_consumer=None):
+        super().__init__(url_endpoints[0], json_array_consumer=json_array_consumer)
+        self._url_endpoints = list(url_endpoints)
+        self._attempt_timeout_seconds = attempt_timeout_seconds
+        self._hedge_percentile = hedge_percentile
+        self._initial_hedge_delay_seconds = initial_hedge_delay_seconds
+        self._latencies_seconds = collections.deque(maxlen=latency_sample_count)
+        self._hedged_request_count = 0
+        # Keep-Alive Connections Are Reused Across Fetches Instead of Paying a TCP + TLS Handshake Every Time
+        self._session = requests.Session()
+        http_adapter = requests.adapters.HTTPAdapter(pool_connections=len(self._url_endpoints), pool_maxsize=pool_size)
+        self._session.mount('http://', http_adapter)
+        self._session.mount('https://', http_adapter)
+        self._executor = concurrent.futures.ThreadPoolExecutor(max_workers=pool_size)
+
+    def get_hedged_request_count(self):
+        return self._hedged_request_count
+
+    def get_hedge_delay_seconds(self):
+        latencies_seconds = sorted(self._latencies_seconds)
+        if len(latencies_seconds) < self._MIN_LATENCY_SAMPLE_COUNT:
+            return self._initial_hedge_delay_seconds
+        percentile_index = math.ceil(self._hedge_percentile / 100 * len(latencies_seconds)) - 1
+        return latencies_seconds[min(max(percentile_index, 0), len(latencies_seconds) - 1)]
+
+    def close(self):
+        self._executor.shutdown(wait=False)
+        self._session.close()
+
+    def _fetch_json_data_from_endpoint(self, url_endpoint):
+        start_time = time.monotonic()
         try:
-            response = requests.get(self._url_endpoint)
-            return True, response.json()
-        except requests.exceptions.RequestException as ex:
+            with self._session.get(url_endpoint, timeout=self._attempt_timeout_seconds,
+                                   stream=self._is_streaming()) as response:
+                response.raise_for_status()
+                json_data = self._read_json_data(response)
+        except (requests.exceptions.RequestException, ValueError):
             return False, None
+        self._latencies_seconds.append(time.monotonic() - start_time)
+        return True, json_data
+
+    def _fetch_json_data(self):
+        pending_attempts = set()
+        for endpoint_index, url_endpoint in enumerate(self._url_endpoints):
+            if endpoint_index:
+                self._hedged_request_count += 1
+            pending_attempts.add(self._executor.submit(self._fetch_json_data_from_endpoint, url_endpoint))
+            is_last_endpoint = endpoint_index == len(self._url_endpoints) - 1
+            # Hedge to the Next Endpoint Once the Budget Runs Out, or Straight Away if Every Attempt So Far Failed
+            hedge_deadline = time.monotonic() + self.get_hedge_delay_seconds()
+            while pending_attempts:
+                remaining_seconds = None if is_last_endpoint else hedge_deadline - time.monotonic()
+                if remaining_seconds is not None and remaining_seconds <= 0:
+                    break
+                completed_attempts, pending_attempts = concurrent.futures.wait(
+                    pending_attempts, timeout=remaining_seconds, return_when=concurrent.futures.FIRST_COMPLETED)
+                for completed_attempt in completed_attempts:
+                    is_successful, json_data = completed_attempt.result()
+                    if is_successful:
+                        return True, json_data
+        return False, None
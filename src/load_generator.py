@@ -0,0 +1,152 @@
+#!/bin/python3
+
+import argparse
+import collections
+import json
+import statistics
+import sys
+import threading
+import time
+
+import requests
+
+# Internal Libraries
+from benchmark_utilities import DISTRIBUTIONS, UNIFORM_DISTRIBUTION, SyntheticFleetGenerator, calculate_percentile
+
+DEFAULT_URL = 'http://localhost:5000/api/robots/closest'
+REPORTED_PERCENTILES = [50, 95, 99, 99.9]
+LOAD_COUNT = 1000
+
+
+class LoadGenerator(object):
+    _OK_RESPONSE_CODE = 200
+
+    def __init__(self, url, loads_json, concurrency=8, request_count=None, duration_seconds=None,
+                 timeout_seconds=5.0):
+        if request_count is None and duration_seconds is None:
+            raise ValueError('Either a Request Count or a Duration Is Required.')
+        self._url = url
+        self._loads_json = loads_json
+        self._concurrency = concurrency
+        self._request_count = request_count
+        self._duration_seconds = duration_seconds
+        self._timeout_seconds = timeout_seconds
+        self._request_lock = threading.Lock()
+        self._issued_request_count = 0
+        self._deadline = None
+
+    def _claim_request_index(self):
+        with self._request_lock:
+            if self._request_count is not None and self._issued_request_count >= self._request_count:
+                return None
+            if self._deadline is not None and time.monotonic() >= self._deadline:
+                return None
+            request_index = self._issued_request_count
+            self._issued_request_count += 1
+            return request_index
+
+    def _run_worker(self, samples):
+        with requests.Session() as session:
+            while True:
+                request_index = self._claim_request_index()
+                if request_index is None:
+                    return
+                load_json = self._loads_json[request_index % len(self._loads_json)]
+                start_time = time.perf_counter()
+                try:
+                    response = session.post(self._url, json=load_json, timeout=self._timeout_seconds)
+                    outcome = str(response.status_code)
+                except requests.exceptions.RequestException as ex:
+                    outcome = type(ex).__name__
+                samples.append((time.perf_counter() - start_time, outcome))
+
+    def run(self):
+        # Each Worker Keeps Its Own Samples and Connection, So Workers Only Contend When Claiming the Next Request
+        samples_by_worker = [[] for _ in range(self._concurrency)]
+        workers = [threading.Thread(target=self._run_worker, args=(samples,), daemon=True)
+                   for samples in samples_by_worker]
+        start_time = time.perf_counter()
+        if self._duration_seconds is not None:
+            self._deadline = time.monotonic() + self._duration_seconds
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+        elapsed_seconds = time.perf_counter() - start_time
+        return self.summarize_samples([sample for samples in samples_by_worker for sample in samples],
+                                      elapsed_seconds)
+
+    @classmethod
+    def summarize_samples(cls, samples, elapsed_seconds):
+        latencies_milliseconds = sorted(latency_seconds * 1e3 for latency_seconds, _ in samples)
+        outcome_counts = collections.Counter(outcome for _, outcome in samples)
+        error_count = len(samples) - outcome_counts[str(cls._OK_RESPONSE_CODE)]
+        report = {'request_count': len(samples),
+                  'elapsed_seconds': elapsed_seconds,
+                  'throughput_rps': len(samples) / elapsed_seconds if elapsed_seconds else 0,
+                  'error_count': error_count,
+                  'error_rate': error_count / len(samples) if samples else 0,
+                  'outcome_counts': dict(outcome_counts),
+                  'latency_ms': {}}
+        if latencies_milliseconds:
+            report['latency_ms']['mean'] = statistics.fmean(latencies_milliseconds)
+            for percentile in REPORTED_PERCENTILES:
+                report['latency_ms']['p{:g}'.format(percentile)] = calculate_percentile(latencies_milliseconds,
+                                                                                        percentile)
+            report['latency_ms']['max'] = latencies_milliseconds[-1]
+        return report
+
+
+def print_report(report):
+    print('Requests:    {}'.format(report['request_count']))
+    print('Elapsed:     {:.2f} s'.format(report['elapsed_seconds']))
+    print('Throughput:  {:.1f} requests/s'.format(report['throughput_rps']))
+    print('Errors:      {} ({:.2%})'.format(report['error_count'], report['error_rate']))
+    print('Outcomes:    {}'.format(', '.join('{}: {}'.format(outcome, count)
+                                             for outcome, count in sorted(report['outcome_counts'].items()))))
+    for name, latency_milliseconds in report['latency_ms'].items():
+        print('Latency {:<7} {:.2f} ms'.format(name + ':', latency_milliseconds))
+
+
+def parse_arguments(arguments):
+    argument_parser = argparse.ArgumentParser(description='Drives concurrent load at the closest robot endpoint.')
+    argument_parser.add_argument('--url', default=DEFAULT_URL, help='Closest robot endpoint URL.')
+    argument_parser.add_argument('--concurrency', type=int, default=8, help='Number of concurrent clients.')
+    argument_parser.add_argument('--request-count', type=int, default=1000,
+                                 help='Total requests to send (ignored when --duration-seconds is given).')
+    argument_parser.add_argument('--duration-seconds', type=float, help='Send requests for this long instead.')
+    argument_parser.add_argument('--warmup-request-count', type=int, default=10,
+                                 help='Requests sent, and not measured, before the run (e.g. to fill caches).')
+    argument_parser.add_argument('--distribution', choices=DISTRIBUTIONS, default=UNIFORM_DISTRIBUTION,
+                                 help='Synthetic distribution the load positions are drawn from.')
+    argument_parser.add_argument('--timeout-seconds', type=float, default=5.0, help='Per-request timeout.')
+    argument_parser.add_argument('--output', help='Path of a JSON file to write the report to.')
+    return argument_parser.parse_args(arguments)
+
+
+def main(arguments):
+    parsed_arguments = parse_arguments(arguments)
+    loads_json = SyntheticFleetGenerator(parsed_arguments.distribution).create_loads_json(LOAD_COUNT)
+    if parsed_arguments.warmup_request_count:
+        LoadGenerator(url=parsed_arguments.url,
+                      loads_json=loads_json,
+                      concurrency=1,
+                      request_count=parsed_arguments.warmup_request_count,
+                      timeout_seconds=parsed_arguments.timeout_seconds).run()
+    load_generator = LoadGenerator(url=parsed_arguments.url,
+                                   loads_json=loads_json,
+                                   concurrency=parsed_arguments.concurrency,
+                                   request_count=None if parsed_arguments.duration_seconds else
+                                   parsed_arguments.request_count,
+                                   duration_seconds=parsed_arguments.duration_seconds,
+                                   timeout_seconds=parsed_arguments.timeout_seconds)
+    report = load_generator.run()
+    print_report(report)
+    if parsed_arguments.output:
+        with open(parsed_arguments.output, 'w') as report_file:
+            json.dump(report, report_file, indent=2)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,165 @@
+import bisect
+import math
+import threading
+
+COUNTER_METRIC_TYPE = 'counter'
+GAUGE_METRIC_TYPE = 'gauge'
+HISTOGRAM_METRIC_TYPE = 'histogram'
+PROMETHEUS_CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+
+def format_prometheus_value(value):
+    if value == math.inf:
+        return '+Inf'
+    if value == -math.inf:
+        return '-Inf'
+    if math.isnan(value):
+        return 'NaN'
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+def format_prometheus_labels(label_names, label_values):
+    if not label_names:
+        return ''
+    escaped_label_values = [str(label_value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+                            for label_value in label_values]
+    return '{' + ','.join('{}="{}"'.format(label_name, label_value)
+                          for label_name, label_value in zip(label_names, escaped_label_values)) + '}'
+
+
+class Counter(object):
+
+    def __init__(self):
+        self._value = 0
+        self._lock = threading.Lock()
+
+    def increment(self, amount=1):
+        with self._lock:
+            self._value += amount
+
+    def get_value(self):
+        return self._value
+
+    def collect_samples(self, name, label_names, label_values):
+        yield name + format_prometheus_labels(label_names, label_values), self._value
+
+
+class Histogram(object):
+
+    def __init__(self, bucket_upper_bounds):
+        self._bucket_upper_bounds = tuple(sorted(bucket_upper_bounds))
+        # One Count per Bucket Plus a Final +Inf Bucket; Made Cumulative Only When Collected
+        self._bucket_counts = [0] * (len(self._bucket_upper_bounds) + 1)
+        self._sum = 0
+        self._lock = threading.Lock()
+
+    def observe(self, value):
+        bucket_index = bisect.bisect_left(self._bucket_upper_bounds, value)
+        with self._lock:
+            self._bucket_counts[bucket_index] += 1
+            self._sum += value
+
+    def get_count(self):
+        return sum(self._bucket_counts)
+
+    def get_sum(self):
+        return self._sum
+
+    def collect_samples(self, name, label_names, label_values):
+        with self._lock:
+            bucket_counts = list(self._bucket_counts)
+            value_sum = self._sum
+        cumulative_count = 0
+        for bucket_upper_bound, bucket_count in zip(self._bucket_upper_bounds + (math.inf,), bucket_counts):
+            cumulative_count += bucket_count
+            yield (name + '_bucket' + format_prometheus_labels(label_names + ('le',), label_values +
+                                                               (format_prometheus_value(bucket_upper_bound),)),
+                   cumulative_count)
+        yield name + '_sum' + format_prometheus_labels(label_names, label_values), value_sum
+        yield name + '_count' + format_prometheus_labels(label_names, label_values), cumulative_count
+
+
+class FunctionMetric(object):
+
+    def __init__(self, value_function):
+        self._value_function = value_function
+
+    def collect_samples(self, name, label_names, label_values):
+        # Read Only When Scraped, So Keeping the Value Current Costs Nothing on the Request Path
+        value = self._value_function()
+        if value is not None:
+            yield name + format_prometheus_labels(label_names, label_values), value
+
+
+class MetricFamily(object):
+
+    def __init__(self, name, help_text, metric_type, create_metric, label_names=()):
+        self._name = name
+        self._help_text = help_text
+        self._metric_type = metric_type
+        self._create_metric = create_metric
+        self._label_names = tuple(label_names)
+        self._metrics_by_label_values = {}
+        self._lock = threading.Lock()
+
+    def get_name(self):
+        return self._name
+
+    def labels(self, *label_values):
+        # Hot Paths Should Resolve Their Labelled Metric Once and Keep It, Rather Than Calling This per Request
+        metric = self._metrics_by_label_values.get(label_values)
+        if metric is None:
+            if len(label_values) != len(self._label_names):
+                raise ValueError('Expected Label Values for {}.'.format(list(self._label_names)))
+            with self._lock:
+                metric = self._metrics_by_label_values.setdefault(label_values, self._create_metric())
+        return metric
+
+    def render_prometheus_text(self):
+        lines = ['# HELP {} {}'.format(self._name, self._help_text),
+                 '# TYPE {} {}'.format(self._name, self._metric_type)]
+        for label_values, metric in sorted(tuple(self._metrics_by_label_values.items()), key=lambda item: item[0]):
+            for sample_name, sample_value in metric.collect_samples(self._name, self._label_names, label_values):
+                lines.append('{} {}'.format(sample_name, format_prometheus_value(sample_value)))
+        return lines
+
+
+class MetricsRegistry(object):
+
+    def __init__(self):
+        self._metric_families = []
+
+    def _register(self, metric_family):
+        if any(registered_family.get_name() == metric_family.get_name()
+               for registered_family in self._metric_families):
+            raise ValueError('A Metric Named {} Is Already Registered.'.format(metric_family.get_name()))
+        self._metric_families.append(metric_family)
+        return metric_family
+
+    def create_counter(self, name, help_text, label_names=()):
+        return self._register(MetricFamily(name=name,
+                                           help_text=help_text,
+                                           metric_type=COUNTER_METRIC_TYPE,
+                                           create_metric=Counter,
+                                           label_names=label_names))
+
+    def create_histogram(self, name, help_text, bucket_upper_bounds, label_names=()):
+        return self._register(MetricFamily(name=name,
+                                           help_text=help_text,
+                                           metric_type=HISTOGRAM_METRIC_TYPE,
+                                           create_metric=lambda: Histogram(bucket_upper_bounds),
+                                           label_names=label_names))
+
+    def create_function_metric(self, name, help_text, value_function, metric_type=GAUGE_METRIC_TYPE):
+        metric_family = self._register(MetricFamily(name=name,
+                                                    help_text=help_text,
+                                                    metric_type=metric_type,
+                                                    create_metric=lambda: FunctionMetric(value_function)))
+        metric_family.labels()
+        return metric_family
+
+    def render_prometheus_text(self):
+        lines = []
+        for metric_family in self._metric_families:
+            lines.extend(metric_family.render_prometheus_text())
+        return '\n'.join(lines) + '\n'
@@ -0,0 +1,84 @@
+import threading
+
+
+class _MicroBatch(object):
+
+    def __init__(self):
+        self.items = []
+        self.is_closed = threading.Event()
+        self.is_processed = threading.Event()
+        self.results = None
+        self.exception = None
+
+
+class MicroBatcher(object):
+    # Items Submitted Together From Different Threads Are Processed as One Batch. The First Item Submitted Opens a
+    # Batch, Which Others With the Same Key Join Until max_batch_size Items Have Joined or max_wait_seconds Have
+    # Passed; Its Submitter Then Processes the Whole Batch While the Others Wait for Their Own Results. A Batch Opened
+    # While No Other Submission Is in Flight Is Processed at Once, So Batching Costs Nothing Without Concurrency
+    _DEFAULT_MAX_WAIT_SECONDS = 0.002
+    _DEFAULT_MAX_BATCH_SIZE = 64
+
+    def __init__(self, process_batch, max_wait_seconds=_DEFAULT_MAX_WAIT_SECONDS,
+                 max_batch_size=_DEFAULT_MAX_BATCH_SIZE):
+        # Called as process_batch(batch_key, items), Returning One Result per Item, in Order
+        self._process_batch = process_batch
+        self._max_wait_seconds = max_wait_seconds
+        self._max_batch_size = max_batch_size
+        self._lock = threading.Lock()
+        self._open_batches = {}
+        self._in_flight_count = 0
+        self._batch_count = 0
+        self._item_count = 0
+
+    def get_max_wait_seconds(self):
+        return self._max_wait_seconds
+
+    def get_max_batch_size(self):
+        return self._max_batch_size
+
+    def get_batch_count(self):
+        return self._batch_count
+
+    def get_item_count(self):
+        return self._item_count
+
+    def _close_batch(self, batch_key, batch):
+        # Called With self._lock Held; the Batch May Already Have Been Closed by Filling Up
+        if self._open_batches.get(batch_key) is batch:
+            del self._open_batches[batch_key]
+            self._batch_count += 1
+            self._item_count += len(batch.items)
+        batch.is_closed.set()
+
+    def submit(self, batch_key, item):
+        with self._lock:
+            self._in_flight_count += 1
+            batch = self._open_batches.get(batch_key)
+            is_batch_opener = batch is None
+            if is_batch_opener:
+                batch = _MicroBatch()
+                self._open_batches[batch_key] = batch
+            position = len(batch.items)
+            batch.items.append(item)
+            if len(batch.items) >= self._max_batch_size or self._in_flight_count == 1:
+                self._close_batch(batch_key, batch)
+        try:
+            if is_batch_opener:
+                batch.is_closed.wait(self._max_wait_seconds)
+                with self._lock:
+                    self._close_batch(batch_key, batch)
+                try:
+                    batch.results = self._process_batch(batch_key, batch.items)
+                except Exception as exception:
+                    batch.exception = exception
+                finally:
+                    batch.is_processed.set()
+            else:
+                batch.is_processed.wait()
+        finally:
+            with self._lock:
+                self._in_flight_count -= 1
+        if batch.exception is not None:
+            raise batch.exception
+        return batch.results[position]
@@ -0,0 +1,194 @@
+#!/bin/python3
+
+import argparse
+import http.server
+import json
+import random
+import sys
+import threading
+import time
+
+# Internal Libraries
+from benchmark_utilities import DISTRIBUTIONS, UNIFORM_DISTRIBUTION, DEFAULT_RANDOM_SEED, SyntheticFleetGenerator
+
+DEFAULT_HOST = 'localhost'
+DEFAULT_PORT = 5001
+ROBOTS_PATH = '/robots'
+
+
+class MockRobotDatabaseServer(object):
+    _FAILURE_RESPONSE_BODY = json.dumps({'error': 'Injected Failure'}).encode()
+
+    def __init__(self, fleet_size, distribution=UNIFORM_DISTRIBUTION, host=DEFAULT_HOST, port=0,
+                 latency_seconds=0, latency_jitter_seconds=0, failure_rate=0, failure_status_code=503,
+                 malformed_rate=0, random_seed=DEFAULT_RANDOM_SEED):
+        robots_json = SyntheticFleetGenerator(distribution, random_seed=random_seed).create_robots_json(fleet_size)
+        # The Fleet Never Changes, So It Is Serialised Once Rather Than on Every Request
+        self._robots_body = json.dumps(robots_json).encode()
+        self._latency_seconds = latency_seconds
+        self._latency_jitter_seconds = latency_jitter_seconds
+        self._failure_rate = failure_rate
+        self._failure_status_code = failure_status_code
+        self._malformed_rate = malformed_rate
+        self._random_generator = random.Random(random_seed)
+        self._random_lock = threading.Lock()
+        self._request_count = 0
+        self._failure_count = 0
+        self._http_server = http.server.ThreadingHTTPServer((host, port), self._create_request_handler_class())
+        self._http_server.daemon_threads = True
+        self._server_thread = threading.Thread(target=self._http_server.serve_forever, daemon=True)
+
+    def _create_request_handler_class(self):
+        mock_server = self
+
+        class MockRequestHandler(http.server.BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def do_GET(self):
+                if self.path.split('?')[0] != ROBOTS_PATH:
+                    self._send_body(404, mock_server._FAILURE_RESPONSE_BODY)
+                    return
+                latency_seconds, status_code, body = mock_server._create_response()
+                time.sleep(latency_seconds)
+                self._send_body(status_code, body)
+
+            def _send_body(self, status_code, body):
+                self.send_response(status_code)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        return MockRequestHandler
+
+    def _create_response(self):
+        with self._random_lock:
+            self._request_count += 1
+            latency_seconds = max(self._latency_seconds + self._random_generator.uniform(
+                -self._latency_jitter_seconds, self._latency_jitter_seconds), 0)
+            failure_draw = self._random_generator.random()
+            if failure_draw < self._failure_rate:
+                self._failure_count += 1
+                return latency_seconds, self._failure_status_code, self._FAILURE_RESPONSE_BODY
+            if failure_draw < self._failure_rate + self._malformed_rate:
+                # A Truncated Body Still Arrives With a 200, As If the Connection Dropped Mid-Response
+                self._failure_count += 1
+                return latency_seconds, 200, self._robots_body[:len(self._robots_body) // 2]
+        return latency_seconds, 200, self._robots_body
+
+    def get_url(self):
+        host, port = self._http_server.server_address[:2]
+        return 'http://{}:{}{}'.format(host, port, ROBOTS_PATH)
+
+    def get_request_count(self):
+        return self._request_count
+
+    def get_failure_count(self):
+        return self._failure_count
+
+    def start(self):
+        self._server_thread.start()
+        return self
+
+    def stop(self):
+        self._http_server.shutdown()
+        self._http_server.server_close()
+
+    def serve_forever(self):
+        self._http_server.serve_forever()
+
+
+class StandInRobotDatabaseServer(object):
+    # Serves a Given Robots JSON Document As Is, for Tests and Benchmarks That Need an Exact Fleet
+
+    def __init__(self, robots_json, delay_seconds=0, status_code=200):
+        self._robots_json = robots_json
+        self._delay_seconds = delay_seconds
+        self._status_code = status_code
+        self._request_count = 0
+        self._http_server = http.server.ThreadingHTTPServer(('localhost', 0), self._create_request_handler_class())
+        self._http_server.daemon_threads = True
+        self._server_thread = threading.Thread(target=self._http_server.serve_forever, daemon=True)
+
+    def _create_request_handler_class(self):
+        stand_in_server = self
+
+        class StandInRequestHandler(http.server.BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def do_GET(self):
+                stand_in_server._request_count += 1
+                time.sleep(stand_in_server._delay_seconds)
+                body = json.dumps(stand_in_server._robots_json).encode()
+                self.send_response(stand_in_server._status_code)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        return StandInRequestHandler
+
+    def get_url(self):
+        return 'http://localhost:{}/robots'.format(self._http_server.server_address[1])
+
+    def get_request_count(self):
+        return self._request_count
+
+    def start(self):
+        self._server_thread.start()
+        return self
+
+    def stop(self):
+        self._http_server.shutdown()
+        self._http_server.server_close()
+
+
+def parse_arguments(arguments):
+    argument_parser = argparse.ArgumentParser(description='Serves a synthetic robot fleet as a mock robot database.')
+    argument_parser.add_argument('--fleet-size', type=int, default=100, help='Number of robots served.')
+    argument_parser.add_argument('--distribution', choices=DISTRIBUTIONS, default=UNIFORM_DISTRIBUTION,
+                                 help='Synthetic fleet distribution served.')
+    argument_parser.add_argument('--host', default=DEFAULT_HOST, help='Host to listen on.')
+    argument_parser.add_argument('--port', type=int, default=DEFAULT_PORT, help='Port to listen on.')
+    argument_parser.add_argument('--latency-seconds', type=float, default=0, help='Delay before each response.')
+    argument_parser.add_argument('--latency-jitter-seconds', type=float, default=0,
+                                 help='Uniform random jitter added to / removed from the delay.')
+    argument_parser.add_argument('--failure-rate', type=float, default=0,
+                                 help='Fraction of requests answered with --failure-status-code.')
+    argument_parser.add_argument('--failure-status-code', type=int, default=503,
+                                 help='Status code of injected failures.')
+    argument_parser.add_argument('--malformed-rate', type=float, default=0,
+                                 help='Fraction of requests answered with a truncated JSON body.')
+    argument_parser.add_argument('--random-seed', type=int, default=DEFAULT_RANDOM_SEED,
+                                 help='Seed for the fleet and the injected latency / failures.')
+    return argument_parser.parse_args(arguments)
+
+
+def main(arguments):
+    parsed_arguments = parse_arguments(arguments)
+    mock_server = MockRobotDatabaseServer(fleet_size=parsed_arguments.fleet_size,
+                                          distribution=parsed_arguments.distribution,
+                                          host=parsed_arguments.host,
+                                          port=parsed_arguments.port,
+                                          latency_seconds=parsed_arguments.latency_seconds,
+                                          latency_jitter_seconds=parsed_arguments.latency_jitter_seconds,
+                                          failure_rate=parsed_arguments.failure_rate,
+                                          failure_status_code=parsed_arguments.failure_status_code,
+                                          malformed_rate=parsed_arguments.malformed_rate,
+                                          random_seed=parsed_arguments.random_seed)
+    print('Serving {} Robots at {}'.format(parsed_arguments.fleet_size, mock_server.get_url()))
+    try:
+        mock_server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
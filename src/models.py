@@ -1,5 +1,11 @@
+import array
+
+# Coordinates Beyond This Magnitude Could Overflow When Squared for a Distance, So They Are Rejected Wherever Loads and
+# Robots Enter the Service. Infinite and NaN Coordinates Fail the Same Check
+MAX_COORDINATE_MAGNITUDE = 1e150
 
 class Robot(object):
+    __slots__ = ('_id', '_battery_level', '_x_coordinate', '_y_coordinate', '_distance_to_load')
 
     def __init__(self, id, battery_level, x_coordinate, y_coordinate):
         self._id = id
@@ -26,6 +32,124 @@ class Robot(object):
     def get_distance_to_load(self):
         return self._distance_to_load
 
+    def with_distance_to_load(self, distance_to_load):
+        robot = Robot(id=self._id,
+                      battery_level=self._battery_level,
+                      x_coordinate=self._x_coordinate,
+                      y_coordinate=self._y_coordinate)
+        robot.set_distance_to_load(distance_to_load)
+        return robot
+
+
+class RobotFleet(object):
+    _ID_TYPE_CODE = 'q'
+    _NUMBER_TYPE_CODE = 'd'
+
+    def __init__(self):
+        self._ids = array.array(self._ID_TYPE_CODE)
+        self._battery_levels = array.array(self._NUMBER_TYPE_CODE)
+        self._x_coordinates = array.array(self._NUMBER_TYPE_CODE)
+        self._y_coordinates = array.array(self._NUMBER_TYPE_CODE)
+        # Lets Robot Views Hand Back Integer Battery Levels as Integers, Exactly as They Were Received
+        self._battery_level_is_integer = bytearray()
+
+    @classmethod
+    def create_from_robots(cls, robots):
+        robot_fleet = cls()
+        for robot in robots:
+            robot_fleet.append_robot(robot)
+        return robot_fleet
+
+    @classmethod
+    def create_from_columns(cls, ids, battery_levels, x_coordinates, y_coordinates, battery_level_is_integer):
+        # The Columns Are Used As Given (e.g. Memoryviews of Shared Memory) Rather Than Copied
+        robot_fleet = cls()
+        robot_fleet._ids = ids
+        robot_fleet._battery_levels = battery_levels
+        robot_fleet._x_coordinates = x_coordinates
+        robot_fleet._y_coordinates = y_coordinates
+        robot_fleet._battery_level_is_integer = battery_level_is_integer
+        return robot_fleet
+
+    def copy(self):
+        # A Fleet Over Private Copies of These Columns, So Writing to It Never Changes This One
+        return RobotFleet.create_from_columns(
+            ids=array.array(self._ID_TYPE_CODE, self._ids.tobytes()),
+            battery_levels=array.array(self._NUMBER_TYPE_CODE, self._battery_levels.tobytes()),
+            x_coordinates=array.array(self._NUMBER_TYPE_CODE, self._x_coordinates.tobytes()),
+            y_coordinates=array.array(self._NUMBER_TYPE_CODE, self._y_coordinates.tobytes()),
+            battery_level_is_integer=bytearray(self._battery_level_is_integer))
+
+    def _ensure_columns_are_private(self):
+        # Fleets Created Over Borrowed Columns Copy Them on the First Write, So the Owner's Data Is Never Changed
+        if not isinstance(self._ids, array.array):
+            self._ids = array.array(self._ID_TYPE_CODE, self._ids.tobytes())
+            self._battery_levels = array.array(self._NUMBER_TYPE_CODE, self._battery_levels.tobytes())
+            self._x_coordinates = array.array(self._NUMBER_TYPE_CODE, self._x_coordinates.tobytes())
+            self._y_coordinates = array.array(self._NUMBER_TYPE_CODE, self._y_coordinates.tobytes())
+            self._battery_level_is_integer = bytearray(self._battery_level_is_integer)
+
+    def __len__(self):
+        return len(self._ids)
+
+    def __getitem__(self, position):
+        return self.get_robot(position)
+
+    def __iter__(self):
+        return (self.get_robot(position) for position in range(len(self._ids)))
+
+    def get_ids(self):
+        return self._ids
+
+    def get_battery_levels(self):
+        return self._battery_levels
+
+    def get_x_coordinates(self):
+        return self._x_coordinates
+
+    def get_y_coordinates(self):
+        return self._y_coordinates
+
+    def get_battery_level_is_integer(self):
+        return self._battery_level_is_integer
+
+    def get_robot(self, position):
+        battery_level = self._battery_levels[position]
+        return Robot(id=self._ids[position],
+                     battery_level=int(battery_level) if self._battery_level_is_integer[position] else battery_level,
+                     x_coordinate=self._x_coordinates[position],
+                     y_coordinate=self._y_coordinates[position])
+
+    def append_robot(self, robot):
+        self.append_robot_values(robot_id=robot.get_id(),
+                                 battery_level=robot.get_battery_level(),
+                                 x_coordinate=robot.get_x_coordinate(),
+                                 y_coordinate=robot.get_y_coordinate())
+
+    def append_robot_values(self, robot_id, battery_level, x_coordinate, y_coordinate):
+        self._ensure_columns_are_private()
+        self._ids.append(int(robot_id))
+        self._battery_levels.append(battery_level)
+        self._x_coordinates.append(x_coordinate)
+        self._y_coordinates.append(y_coordinate)
+        self._battery_level_is_integer.append(type(battery_level) == int)
+
+    def extend_robot_values(self, ids, battery_levels, x_coordinates, y_coordinates):
+        self._ensure_columns_are_private()
+        self._ids.fromlist(ids)
+        self._battery_levels.fromlist(battery_levels)
+        self._x_coordinates.fromlist(x_coordinates)
+        self._y_coordinates.fromlist(y_coordinates)
+        self._battery_level_is_integer.extend(type(battery_level) == int for battery_level in battery_levels)
+
+    def update_robot(self, position, robot):
+        self._ensure_columns_are_private()
+        battery_level = robot.get_battery_level()
+        self._battery_level_is_integer[position] = type(battery_level) == int
+        self._battery_levels[position] = battery_level
+        self._x_coordinates[position] = robot.get_x_coordinate()
+        self._y_coordinates[position] = robot.get_y_coordinate()
+
 
 class Load(object):
 
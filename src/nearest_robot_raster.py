@@ -0,0 +1,209 @@
+import math
+import threading
+
+# Internal Libraries
+from selection_policies import WindowSelectionPolicy, find_nearest_eligible_robot_positions
+
+
+class NearestRobotRaster(object):
+    # The Floor Between (min_x, min_y) and (max_x, max_y) Is Split Into Square Cells of Side resolution, Each Holding
+    # Every Robot That Can Win for Some Point in It: Those Within the Distance Window of the Cell, and Those No Farther
+    # From It Than the Nearest Robot Can Be From Any of Its Points (a Discretised Voronoi Region). A Lookup Is Then the
+    # Selection Policy Run Over a Handful of Candidates, Kept in Fleet Order So Ties Break Exactly as Over the Fleet.
+    # Cells Are Calculated the First Time They Are Looked Up, So Only the Floor That Loads Come From Is Ever Rastered
+    _DEFAULT_RESOLUTION = 5
+    _RELATIVE_PADDING = 1e-9
+
+    def __init__(self, min_x, min_y, max_x, max_y, resolution=_DEFAULT_RESOLUTION, selection_policy=None):
+        selection_policy = selection_policy or WindowSelectionPolicy()
+        if not isinstance(selection_policy, WindowSelectionPolicy):
+            raise ValueError('Nearest Robot Rasters Only Support Window Selection Policies.')
+        if not (max_x > min_x and max_y > min_y and resolution > 0):
+            raise ValueError('Nearest Robot Rasters Need a Non-Empty Floor and a Positive Resolution.')
+        self._min_x = min_x
+        self._min_y = min_y
+        self._resolution = resolution
+        self._column_count = math.ceil((max_x - min_x) / resolution)
+        self._row_count = math.ceil((max_y - min_y) / resolution)
+        self._selection_policy = selection_policy
+        self._lock = threading.Lock()
+        self._fleet_snapshot_cache = None
+        # Moves Whenever Cells Are Invalidated, So a Cell Calculated Against an Older Fleet Is Never Stored
+        self._generation = 0
+        self._reset(fleet_snapshot=None)
+
+    def get_resolution(self):
+        return self._resolution
+
+    def get_cell_count(self):
+        return len(self._cells)
+
+    def _reset(self, fleet_snapshot):
+        # Called With self._lock Held (or Before the Raster Is Shared)
+        self._snapshot = fleet_snapshot
+        self._cells = {}
+        self._candidate_distances = {}
+        self._cell_keys_by_position = {}
+        self._unbounded_cell_keys = set()
+        self._max_candidate_distance = 0
+        self._generation += 1
+
+    def watch(self, fleet_snapshot_cache):
+        with self._lock:
+            if fleet_snapshot_cache is self._fleet_snapshot_cache:
+                return
+            if self._fleet_snapshot_cache is not None:
+                self._fleet_snapshot_cache.remove_snapshot_listener(self.update_robots)
+            fleet_snapshot_cache.add_snapshot_listener(self.update_robots)
+            self._fleet_snapshot_cache = fleet_snapshot_cache
+            self._reset(fleet_snapshot=None)
+
+    def _get_cell_key(self, x_coordinate, y_coordinate):
+        cell_x = math.floor((x_coordinate - self._min_x) / self._resolution)
+        cell_y = math.floor((y_coordinate - self._min_y) / self._resolution)
+        if 0 <= cell_x < self._column_count and 0 <= cell_y < self._row_count:
+            return cell_x, cell_y
+        return None
+
+    def _get_cell_bounds(self, cell_key):
+        min_x = self._min_x + cell_key[0] * self._resolution
+        min_y = self._min_y + cell_key[1] * self._resolution
+        return min_x, min_y, min_x + self._resolution, min_y + self._resolution
+
+    def _get_padding(self, x_coordinate, y_coordinate, distance):
+        # Absorbs Floating Point Rounding in Cell Bounds and Distances So No Candidate Is Ever Missed
+        return self._RELATIVE_PADDING * (abs(x_coordinate) + abs(y_coordinate) + distance + self._resolution)
+
+    @staticmethod
+    def _calculate_min_distance_to_cell(cell_bounds, x_coordinate, y_coordinate):
+        min_x, min_y, max_x, max_y = cell_bounds
+        return math.hypot(max(min_x - x_coordinate, 0, x_coordinate - max_x),
+                          max(min_y - y_coordinate, 0, y_coordinate - max_y))
+
+    @staticmethod
+    def _calculate_max_distance_to_cell(cell_bounds, x_coordinate, y_coordinate):
+        min_x, min_y, max_x, max_y = cell_bounds
+        return math.hypot(max(abs(x_coordinate - min_x), abs(x_coordinate - max_x)),
+                          max(abs(y_coordinate - min_y), abs(y_coordinate - max_y)))
+
+    def _calculate_cell(self, cell_key, robot_spatial_index):
+        cell_bounds = self._get_cell_bounds(cell_key)
+        center_x = (cell_bounds[0] + cell_bounds[2]) / 2
+        center_y = (cell_bounds[1] + cell_bounds[3]) / 2
+        min_battery_level = self._selection_policy.get_min_battery_level()
+        nearest_entries = find_nearest_eligible_robot_positions(robot_spatial_index=robot_spatial_index,
+                                                                x_coordinate=center_x,
+                                                                y_coordinate=center_y,
+                                                                robot_count=1,
+                                                                min_battery_level=min_battery_level)
+        if not nearest_entries:
+            # Without Any Eligible Robot, the First One to Appear Wins Here Wherever It Is
+            return math.inf, []
+        # No Point in the Cell Is Farther From Its Nearest Robot Than From the Robot Nearest the Cell's Center, So
+        # Beyond the Distance Window Only Robots This Close to the Cell Can Ever Be the Nearest
+        nearest_robot = robot_spatial_index.get_robot_fleet().get_robot(nearest_entries[0][0])
+        candidate_distance = max(self._selection_policy.get_distance_window(),
+                                 self._calculate_max_distance_to_cell(cell_bounds,
+                                                                      nearest_robot.get_x_coordinate(),
+                                                                      nearest_robot.get_y_coordinate()))
+        candidate_distance += self._get_padding(center_x, center_y, candidate_distance)
+        candidate_entries = sorted(
+            (position, robot) for position, robot, _ in robot_spatial_index.find_robots_within_distance(
+                x_coordinate=center_x,
+                y_coordinate=center_y,
+                distance=candidate_distance + math.hypot(self._resolution, self._resolution) / 2)
+            if robot.get_battery_level() >= min_battery_level and
+            self._calculate_min_distance_to_cell(cell_bounds, robot.get_x_coordinate(),
+                                                 robot.get_y_coordinate()) <= candidate_distance)
+        return candidate_distance, candidate_entries
+
+    def _get_candidate_robots(self, fleet_snapshot, cell_key):
+        # None Unless the Raster Describes fleet_snapshot. The Check and the Lookup Are Made Under One Lock, So a Cell
+        # Is Never Served Across an Update That Is Still Invalidating Cells for the Next Snapshot
+        with self._lock:
+            if fleet_snapshot is not self._snapshot:
+                return None
+            candidate_robots = self._cells.get(cell_key)
+            generation = self._generation
+        if candidate_robots is not None:
+            return candidate_robots
+        candidate_distance, candidate_entries = self._calculate_cell(
+            cell_key=cell_key, robot_spatial_index=fleet_snapshot.get_robot_spatial_index())
+        candidate_robots = [robot for _, robot in candidate_entries]
+        with self._lock:
+            if generation == self._generation and fleet_snapshot is self._snapshot:
+                self._cells[cell_key] = candidate_robots
+                self._candidate_distances[cell_key] = candidate_distance
+                if candidate_distance == math.inf:
+                    self._unbounded_cell_keys.add(cell_key)
+                else:
+                    self._max_candidate_distance = max(self._max_candidate_distance, candidate_distance)
+                for position, _ in candidate_entries:
+                    self._cell_keys_by_position.setdefault(position, set()).add(cell_key)
+        return candidate_robots
+
+    def find_closest_robot(self, fleet_snapshot, load):
+        # Answers Exactly as the Selection Policy Would, Falling Back to the Spatial Index for Loads Off the Floor and
+        # While the Raster Has Not Yet Caught Up With fleet_snapshot
+        x_coordinate = load.get_x_coordinate()
+        y_coordinate = load.get_y_coordinate()
+        if self._snapshot is None:
+            with self._lock:
+                # Only the Cache's Current Snapshot Is Adopted, So Every Later Notification Describes Changes From It
+                if self._snapshot is None and (self._fleet_snapshot_cache is None or
+                                               fleet_snapshot is self._fleet_snapshot_cache.peek_snapshot()):
+                    self._reset(fleet_snapshot=fleet_snapshot)
+        cell_key = self._get_cell_key(x_coordinate, y_coordinate)
+        if cell_key is not None:
+            candidate_robots = self._get_candidate_robots(fleet_snapshot, cell_key)
+            if candidate_robots is not None:
+                return self._selection_policy.select_robot(robots=candidate_robots, load=load)
+        return self._selection_policy.select_robot_using_index(
+            robot_spatial_index=fleet_snapshot.get_robot_spatial_index(), load=load)
+
+    def _invalidate_cell(self, cell_key):
+        self._cells.pop(cell_key, None)
+        self._candidate_distances.pop(cell_key, None)
+        self._unbounded_cell_keys.discard(cell_key)
+
+    def _invalidate_cells_reaching(self, x_coordinate, y_coordinate):
+        # Cells a Robot Moving Here Could Now Win Points In, Found Among the Calculated Cells Within Reach
+        for cell_key in list(self._unbounded_cell_keys):
+            self._invalidate_cell(cell_key)
+        reach = self._max_candidate_distance + self._resolution
+        min_cell_x = max(math.floor((x_coordinate - reach - self._min_x) / self._resolution), 0)
+        max_cell_x = min(math.floor((x_coordinate + reach - self._min_x) / self._resolution), self._column_count - 1)
+        min_cell_y = max(math.floor((y_coordinate - reach - self._min_y) / self._resolution), 0)
+        max_cell_y = min(math.floor((y_coordinate + reach - self._min_y) / self._resolution), self._row_count - 1)
+        if max_cell_x < min_cell_x or max_cell_y < min_cell_y:
+            return
+        if (max_cell_x - min_cell_x + 1) * (max_cell_y - min_cell_y + 1) > len(self._cells):
+            cell_keys = [cell_key for cell_key in self._cells
+                         if min_cell_x <= cell_key[0] <= max_cell_x and min_cell_y <= cell_key[1] <= max_cell_y]
+        else:
+            cell_keys = [(cell_x, cell_y) for cell_x in range(min_cell_x, max_cell_x + 1)
+                         for cell_y in range(min_cell_y, max_cell_y + 1) if (cell_x, cell_y) in self._cells]
+        for cell_key in cell_keys:
+            if self._calculate_min_distance_to_cell(self._get_cell_bounds(cell_key), x_coordinate,
+                                                    y_coordinate) <= self._candidate_distances[cell_key]:
+                self._invalidate_cell(cell_key)
+
+    def update_robots(self, snapshot, changed_robot_ids):
+        # Snapshot Listener: Only Cells a Changed Robot Was a Candidate in, or Could Now Be One in, Are Recalculated
+        with self._lock:
+            self._generation += 1
+            if changed_robot_ids is None or self._snapshot is None:
+                self._reset(fleet_snapshot=snapshot)
+                return
+            for robot_id in changed_robot_ids:
+                position = snapshot.get_robot_position(robot_id)
+                if position is None:
+                    continue
+                for cell_key in self._cell_keys_by_position.pop(position, ()):
+                    self._invalidate_cell(cell_key)
+                robot = snapshot.get_robot_fleet().get_robot(position)
+                if robot.get_battery_level() >= self._selection_policy.get_min_battery_level() and \
+                        robot.get_battery_level():
+                    self._invalidate_cells_reaching(robot.get_x_coordinate(), robot.get_y_coordinate())
+            # Snapshots Are Never Changed Once Published, So Swapping Identity Last Is All Readers Need to Check
+            self._snapshot = snapshot
@@ -0,0 +1,144 @@
+#!/bin/python3
+
+import argparse
+import multiprocessing
+import multiprocessing.connection
+import os
+import signal
+import socket
+import sys
+
+import werkzeug.serving
+
+# Internal Libraries
+import closest_robot_service
+from shared_fleet import SharedFleetPublisher, SharedFleetReader, SharedFleetSnapshotCache
+
+DEFAULT_WORKER_COUNT = os.cpu_count() or 1
+LISTEN_BACKLOG = 1024
+REFRESHER_STOP_TIMEOUT_SECONDS = 5.0
+
+
+class QuietWSGIRequestHandler(werkzeug.serving.WSGIRequestHandler):
+
+    def log_request(self, code='-', size='-'):
+        # Per-Request Access Lines Cost Every Worker Throughput; /metrics Already Counts Responses by Status Code
+        pass
+
+
+class ProductionServer(object):
+
+    def __init__(self, host=closest_robot_service.SERVER_HOST, port=closest_robot_service.SERVER_PORT,
+                 worker_count=DEFAULT_WORKER_COUNT):
+        # Workers Are Forked, So They Inherit the Listening Socket and the Already Imported Service
+        self._multiprocessing_context = multiprocessing.get_context('fork')
+        self._worker_count = worker_count
+        self._listening_socket = socket.create_server((host, port), backlog=LISTEN_BACKLOG)
+        self._shared_fleet_publisher = SharedFleetPublisher()
+        self._robot_update_queue = self._multiprocessing_context.Queue()
+        self._stop_event = self._multiprocessing_context.Event()
+        self._refresher_process = None
+        self._worker_processes = []
+
+    def get_address(self):
+        return self._listening_socket.getsockname()[:2]
+
+    def _run_refresher(self):
+        # Only This Process Fetches From the Robot Database; Workers Read What It Publishes
+        closest_robot_service.g_fleet_snapshot_cache.restore_snapshot()
+        try:
+            self._shared_fleet_publisher.run_refresher(
+                fleet_snapshot_cache=closest_robot_service.g_fleet_snapshot_cache,
+                robot_update_queue=self._robot_update_queue,
+                stop_event=self._stop_event)
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self._shared_fleet_publisher.close_data_segments()
+
+    def _run_worker(self):
+        shared_fleet_reader = SharedFleetReader(self._shared_fleet_publisher.get_control_segment_name())
+        closest_robot_service.g_fleet_snapshot_cache = SharedFleetSnapshotCache(
+            shared_fleet_reader=shared_fleet_reader,
+            robot_update_queue=self._robot_update_queue)
+        host, port = self.get_address()
+        # Every Worker Accepts From the Same Socket, So the Kernel Spreads Connections Across Them
+        wsgi_server = werkzeug.serving.make_server(host=host,
+                                                   port=port,
+                                                   app=closest_robot_service.g_flask_app,
+                                                   request_handler=QuietWSGIRequestHandler,
+                                                   fd=self._listening_socket.fileno())
+        try:
+            wsgi_server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+
+    def _start_worker(self):
+        worker_process = self._multiprocessing_context.Process(target=self._run_worker, daemon=True)
+        worker_process.start()
+        return worker_process
+
+    def start(self):
+        self._refresher_process = self._multiprocessing_context.Process(target=self._run_refresher, daemon=True)
+        self._refresher_process.start()
+        self._worker_processes = [self._start_worker() for _ in range(self._worker_count)]
+        return self
+
+    def supervise(self):
+        # Workers That Exit Unexpectedly Are Replaced, So One Crash Does Not Permanently Cost a Core
+        while not self._stop_event.is_set():
+            multiprocessing.connection.wait([worker_process.sentinel for worker_process in self._worker_processes])
+            if self._stop_event.is_set():
+                break
+            for worker_index, worker_process in enumerate(self._worker_processes):
+                if not worker_process.is_alive():
+                    closest_robot_service.g_flask_app.logger.warning('Worker Exited With Code {}. Restarting.'.format(
+                        worker_process.exitcode))
+                    self._worker_processes[worker_index] = self._start_worker()
+
+    def stop(self):
+        self._stop_event.set()
+        for worker_process in self._worker_processes:
+            worker_process.terminate()
+        for worker_process in self._worker_processes:
+            worker_process.join()
+        if self._refresher_process is not None:
+            self._robot_update_queue.put(None)
+            self._refresher_process.join(timeout=REFRESHER_STOP_TIMEOUT_SECONDS)
+            if self._refresher_process.is_alive():
+                self._refresher_process.terminate()
+                self._refresher_process.join()
+        self._listening_socket.close()
+        self._shared_fleet_publisher.close()
+
+
+def parse_arguments(arguments):
+    argument_parser = argparse.ArgumentParser(
+        description='Serves the closest robot service from several worker processes sharing one fleet snapshot.')
+    argument_parser.add_argument('--host', default=closest_robot_service.SERVER_HOST, help='Host to listen on.')
+    argument_parser.add_argument('--port', type=int, default=closest_robot_service.SERVER_PORT,
+                                 help='Port to listen on.')
+    argument_parser.add_argument('--workers', type=int, default=DEFAULT_WORKER_COUNT,
+                                 help='Number of worker processes (defaults to the number of CPUs).')
+    return argument_parser.parse_args(arguments)
+
+
+def main(arguments):
+    parsed_arguments = parse_arguments(arguments)
+    production_server = ProductionServer(host=parsed_arguments.host,
+                                         port=parsed_arguments.port,
+                                         worker_count=parsed_arguments.workers).start()
+    # Installed Only After Forking, So SIGTERM Still Simply Ends the Workers When They Are Terminated
+    signal.signal(signal.SIGTERM, lambda signal_number, frame: sys.exit(0))
+    print('Serving on http://{}:{} With {} Workers'.format(*production_server.get_address(), parsed_arguments.workers))
+    try:
+        production_server.supervise()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        production_server.stop()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
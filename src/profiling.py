@@ -0,0 +1,81 @@
+import cProfile
+import collections
+import functools
+import pstats
+import threading
+import time
+import tracemalloc
+
+
+class RequestProfiler(object):
+    _DEFAULT_MAX_PROFILE_COUNT = 32
+    _DEFAULT_MAX_ENTRY_COUNT = 25
+    _TRACEMALLOC_FRAME_COUNT = 1
+
+    def __init__(self, max_profile_count=_DEFAULT_MAX_PROFILE_COUNT, max_entry_count=_DEFAULT_MAX_ENTRY_COUNT):
+        # The Oldest Profiles Are Dropped Once the Buffer Is Full, So Memory Stays Bounded
+        self._profiles = collections.deque(maxlen=max_profile_count)
+        self._max_entry_count = max_entry_count
+        # cProfile and tracemalloc Are Process Wide, So Only One Request Is Profiled at a Time
+        self._profiling_lock = threading.Lock()
+
+    def get_profiles(self):
+        return list(self._profiles)
+
+    def _create_function_entries(self, profiler):
+        function_stats = pstats.Stats(profiler).stats
+        function_entries = [{'function': '{}:{}({})'.format(file_name, line_number, function_name),
+                             'callCount': call_count,
+                             'totalTimeSeconds': total_time_seconds,
+                             'cumulativeTimeSeconds': cumulative_time_seconds}
+                            for (file_name, line_number, function_name),
+                            (_, call_count, total_time_seconds, cumulative_time_seconds, _)
+                            in function_stats.items()]
+        function_entries.sort(key=lambda function_entry: function_entry['cumulativeTimeSeconds'], reverse=True)
+        return function_entries[:self._max_entry_count]
+
+    def _create_allocation_entries(self, allocation_snapshot):
+        allocation_snapshot = allocation_snapshot.filter_traces([tracemalloc.Filter(False, tracemalloc.__file__),
+                                                                 tracemalloc.Filter(False, __file__)])
+        return [{'location': '{}:{}'.format(statistic.traceback[0].filename, statistic.traceback[0].lineno),
+                 'sizeBytes': statistic.size,
+                 'count': statistic.count}
+                for statistic in allocation_snapshot.statistics('lineno')[:self._max_entry_count]]
+
+    def profile(self, function, *args, **kwargs):
+        if not self._profiling_lock.acquire(blocking=False):
+            return function(*args, **kwargs)
+        try:
+            is_already_tracing = tracemalloc.is_tracing()
+            if not is_already_tracing:
+                tracemalloc.start(self._TRACEMALLOC_FRAME_COUNT)
+            tracemalloc.reset_peak()
+            profiler = cProfile.Profile()
+            start_time = time.perf_counter()
+            profiler.enable()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                profiler.disable()
+                duration_seconds = time.perf_counter() - start_time
+                allocation_snapshot = tracemalloc.take_snapshot()
+                _, peak_allocated_bytes = tracemalloc.get_traced_memory()
+                if not is_already_tracing:
+                    tracemalloc.stop()
+                self._profiles.append({'profiledAt': time.time(),
+                                       'function': function.__name__,
+                                       'durationSeconds': duration_seconds,
+                                       'peakAllocatedBytes': peak_allocated_bytes,
+                                       'functions': self._create_function_entries(profiler),
+                                       'allocations': self._create_allocation_entries(allocation_snapshot)})
+        finally:
+            self._profiling_lock.release()
+
+    def wrap(self, function, should_profile):
+        @functools.wraps(function)
+        def profiled_function(*args, **kwargs):
+            if should_profile():
+                return self.profile(function, *args, **kwargs)
+            return function(*args, **kwargs)
+
+        return profiled_function
@@ -0,0 +1,248 @@
+import heapq
+import math
+
+import numpy
+
+# Internal Libraries
+from models import RobotFleet
+
+MAX_BATTERY_LEVEL = 100
+DEFAULT_DISTANCE_WINDOW = 10
+
+
+def _iterate_robot_values(robots):
+    # Fleets Are Read Straight From Their Columns, Without Building a Robot per Position
+    if isinstance(robots, RobotFleet):
+        return zip(robots.get_battery_levels(), robots.get_x_coordinates(), robots.get_y_coordinates())
+    return ((robot.get_battery_level(), robot.get_x_coordinate(), robot.get_y_coordinate()) for robot in robots)
+
+
+def find_nearest_eligible_robot_positions(robot_spatial_index, x_coordinate, y_coordinate, robot_count,
+                                          min_battery_level):
+    # Robots Below the Minimum Battery Level Are Still Indexed, So the Search Widens Until Enough of Them Qualify
+    battery_levels = robot_spatial_index.get_robot_fleet().get_battery_levels()
+    search_count = robot_count
+    while True:
+        entries = robot_spatial_index.find_nearest_robot_positions(x_coordinate=x_coordinate,
+                                                                   y_coordinate=y_coordinate,
+                                                                   robot_count=search_count)
+        eligible_entries = [entry for entry in entries if battery_levels[entry[0]] >= min_battery_level]
+        if len(eligible_entries) >= robot_count or len(entries) < search_count:
+            return eligible_entries[:robot_count]
+        search_count *= 2
+
+
+def _create_ranked_robots(robot_fleet, ranked_entries):
+    # Robots Are Only Created for the (Position, Distance) Entries Returned, Each Carrying Its Distance to the Load
+    return [robot_fleet.get_robot(position).with_distance_to_load(distance_to_load)
+            for position, distance_to_load in ranked_entries]
+
+
+class SelectionPolicy(object):
+    # Robots With No Battery Are Never Selected, Nor Are Robots Below min_battery_level. Every Policy Selects Its
+    # Robot in One Pass Over the Fleet (or With One Spatial Index Query), and Ranks Robots the Same Way, So the First
+    # Ranked Robot Is Always the Selected One. Ties Go to the Earliest Robot in the Fleet
+
+    def __init__(self, min_battery_level=0):
+        self._min_battery_level = min_battery_level
+
+    def get_min_battery_level(self):
+        return self._min_battery_level
+
+    def _iterate_ranking_entries(self, robots, load):
+        raise NotImplementedError()
+
+    def select_robot(self, robots, load):
+        ranked_robots = self.rank_robots(robots=robots, load=load, robot_count=1)
+        return ranked_robots[0] if ranked_robots else None
+
+    def rank_robots(self, robots, load, robot_count):
+        # Only robot_count Entries Are Ever Held, So the Fleet Is Never Sorted as a Whole
+        ranking_entries = heapq.nsmallest(robot_count, self._iterate_ranking_entries(robots=robots, load=load))
+        return [robots[ranking_entry[-2]].with_distance_to_load(ranking_entry[-1]) for ranking_entry in ranking_entries]
+
+    def select_robot_using_index(self, robot_spatial_index, load):
+        ranked_robots = self.rank_robots_using_index(robot_spatial_index=robot_spatial_index, load=load, robot_count=1)
+        return ranked_robots[0] if ranked_robots else None
+
+    def rank_robots_using_index(self, robot_spatial_index, load, robot_count):
+        return _create_ranked_robots(robot_spatial_index.get_robot_fleet(),
+                                     self.rank_robot_positions_using_index(robot_spatial_index=robot_spatial_index,
+                                                                           load=load,
+                                                                           robot_count=robot_count))
+
+    def rank_robot_positions_using_index(self, robot_spatial_index, load, robot_count):
+        # The Fleet Positions and Distances to the Load of the robot_count Best Ranked Robots, Best First
+        raise NotImplementedError()
+
+    def get_contention_distance(self, closest_robot):
+        # The Farthest From the Load Any Robot Could Be and Still Displace (or Tie With) closest_robot
+        raise NotImplementedError()
+
+    def calculate_assignment_costs(self, distances, battery_levels):
+        # Element-Wise Costs (Over numpy Arrays) of Giving Robots to Loads When Each Robot Can Serve Only One Load.
+        # They Order Any One Load's Robots as the Ranking Does, So a Load on Its Own Is Given Its Selected Robot
+        raise NotImplementedError()
+
+
+class WindowSelectionPolicy(SelectionPolicy):
+    # The Robot With the Most Battery Within distance_window of the Load (Closest First on Equal Battery), Otherwise
+    # the Closest Robot
+    _DISTANCE_TIE_BREAK_WEIGHT = 1e-6
+
+    def __init__(self, distance_window=DEFAULT_DISTANCE_WINDOW, min_battery_level=0):
+        super().__init__(min_battery_level=min_battery_level)
+        self._distance_window = distance_window
+
+    def get_distance_window(self):
+        return self._distance_window
+
+    def get_contention_distance(self, closest_robot):
+        if closest_robot is None:
+            return math.inf
+        return max(self._distance_window, closest_robot.get_distance_to_load())
+
+    def calculate_assignment_costs(self, distances, battery_levels):
+        # Any Robot Within the Window Is Cheaper Than Every Robot Outside It, and More Battery Is Cheaper Within It
+        battery_costs = (MAX_BATTERY_LEVEL - battery_levels) / MAX_BATTERY_LEVEL * self._distance_window
+        return numpy.where(distances <= self._distance_window,
+                           battery_costs + distances * self._DISTANCE_TIE_BREAK_WEIGHT,
+                           self._distance_window + distances)
+
+    def select_robot(self, robots, load):
+        # The Hot Path, So the Ranking Rule Is Inlined: Only the Best Robot Within the Window and the Nearest Robot
+        # Outside It Are Kept
+        distance_window = self._distance_window
+        min_battery_level = self._min_battery_level
+        load_x_coordinate = load.get_x_coordinate()
+        load_y_coordinate = load.get_y_coordinate()
+        sqrt = math.sqrt
+        pow = math.pow
+        best_position = best_battery_level = best_distance = None
+        nearest_position = nearest_distance = None
+        for position, (battery_level, x_coordinate, y_coordinate) in enumerate(_iterate_robot_values(robots)):
+            if not battery_level or battery_level < min_battery_level:
+                continue
+            distance = sqrt(pow((load_x_coordinate - x_coordinate), 2) + pow((load_y_coordinate - y_coordinate), 2))
+            if distance <= distance_window:
+                if best_position is None or battery_level > best_battery_level or \
+                        (battery_level == best_battery_level and distance < best_distance):
+                    best_position, best_battery_level, best_distance = position, battery_level, distance
+            elif best_position is None and (nearest_position is None or distance < nearest_distance):
+                nearest_position, nearest_distance = position, distance
+        if best_position is None:
+            best_position, best_distance = nearest_position, nearest_distance
+        if best_position is None:
+            return None
+        return robots[best_position].with_distance_to_load(best_distance)
+
+    def _iterate_ranking_entries(self, robots, load):
+        distance_window = self._distance_window
+        min_battery_level = self._min_battery_level
+        load_x_coordinate = load.get_x_coordinate()
+        load_y_coordinate = load.get_y_coordinate()
+        sqrt = math.sqrt
+        pow = math.pow
+        for position, (battery_level, x_coordinate, y_coordinate) in enumerate(_iterate_robot_values(robots)):
+            if not battery_level or battery_level < min_battery_level:
+                continue
+            distance = sqrt(pow((load_x_coordinate - x_coordinate), 2) + pow((load_y_coordinate - y_coordinate), 2))
+            if distance <= distance_window:
+                yield False, -battery_level, distance, position, distance
+            else:
+                yield True, 0, distance, position, distance
+
+    def rank_robot_positions_using_index(self, robot_spatial_index, load, robot_count):
+        x_coordinate = load.get_x_coordinate()
+        y_coordinate = load.get_y_coordinate()
+        min_battery_level = self._min_battery_level
+        battery_levels = robot_spatial_index.get_robot_fleet().get_battery_levels()
+        positions_within_window = robot_spatial_index.find_robot_positions_within_distance(
+            x_coordinate=x_coordinate, y_coordinate=y_coordinate, distance=self._distance_window)
+        ranked_entries = heapq.nsmallest(robot_count,
+                                         (entry for entry in positions_within_window
+                                          if battery_levels[entry[0]] >= min_battery_level),
+                                         key=lambda entry: (-battery_levels[entry[0]], entry[1], entry[0]))
+        if len(ranked_entries) < robot_count:
+            # Every Robot Within the Window Is Nearer Than Any Outside It, So the Nearest robot_count Robots Hold
+            # All of the Window Followed by the Nearest Robots Beyond It
+            nearest_entries = find_nearest_eligible_robot_positions(robot_spatial_index=robot_spatial_index,
+                                                                    x_coordinate=x_coordinate,
+                                                                    y_coordinate=y_coordinate,
+                                                                    robot_count=robot_count,
+                                                                    min_battery_level=min_battery_level)
+            ranked_entries.extend(entry for entry in nearest_entries if entry[1] > self._distance_window)
+        return ranked_entries
+
+
+class WeightedScoreSelectionPolicy(SelectionPolicy):
+    # The Robot With the Lowest distance_weight * Distance - battery_weight * Battery Level (Closest First on Equal
+    # Scores), Trading Distance Against Battery Smoothly Instead of Through a Window
+    _RELATIVE_PADDING = 1e-9
+
+    def __init__(self, distance_weight=1, battery_weight=0, min_battery_level=0):
+        super().__init__(min_battery_level=min_battery_level)
+        self._distance_weight = distance_weight
+        self._battery_weight = battery_weight
+
+    def get_distance_weight(self):
+        return self._distance_weight
+
+    def get_battery_weight(self):
+        return self._battery_weight
+
+    def get_contention_distance(self, closest_robot):
+        if closest_robot is None:
+            return math.inf
+        score = self._distance_weight * closest_robot.get_distance_to_load() - \
+            self._battery_weight * closest_robot.get_battery_level()
+        contention_distance = (score + self._battery_weight * MAX_BATTERY_LEVEL) / self._distance_weight
+        return contention_distance + self._RELATIVE_PADDING * (abs(contention_distance) + 1)
+
+    def calculate_assignment_costs(self, distances, battery_levels):
+        return self._distance_weight * distances - self._battery_weight * battery_levels
+
+    def _iterate_ranking_entries(self, robots, load):
+        distance_weight = self._distance_weight
+        battery_weight = self._battery_weight
+        min_battery_level = self._min_battery_level
+        load_x_coordinate = load.get_x_coordinate()
+        load_y_coordinate = load.get_y_coordinate()
+        sqrt = math.sqrt
+        pow = math.pow
+        for position, (battery_level, x_coordinate, y_coordinate) in enumerate(_iterate_robot_values(robots)):
+            if not battery_level or battery_level < min_battery_level:
+                continue
+            distance = sqrt(pow((load_x_coordinate - x_coordinate), 2) + pow((load_y_coordinate - y_coordinate), 2))
+            yield distance_weight * distance - battery_weight * battery_level, distance, position, distance
+
+    def rank_robot_positions_using_index(self, robot_spatial_index, load, robot_count):
+        x_coordinate = load.get_x_coordinate()
+        y_coordinate = load.get_y_coordinate()
+        distance_weight = self._distance_weight
+        battery_weight = self._battery_weight
+        min_battery_level = self._min_battery_level
+        battery_levels = robot_spatial_index.get_robot_fleet().get_battery_levels()
+        nearest_entries = find_nearest_eligible_robot_positions(robot_spatial_index=robot_spatial_index,
+                                                                x_coordinate=x_coordinate,
+                                                                y_coordinate=y_coordinate,
+                                                                robot_count=robot_count,
+                                                                min_battery_level=min_battery_level)
+        if not nearest_entries:
+            return []
+        # No Robot Scores Below distance_weight * Distance - battery_weight * MAX_BATTERY_LEVEL, So Only Robots Within
+        # This Distance Can Outscore the Worst of the Nearest Robots
+        worst_score = max(distance_weight * distance - battery_weight * battery_levels[position]
+                          for position, distance in nearest_entries)
+        search_distance = (worst_score + battery_weight * MAX_BATTERY_LEVEL) / distance_weight
+        search_distance += self._RELATIVE_PADDING * (abs(search_distance) + 1)
+        ranked_entries = heapq.nsmallest(
+            robot_count,
+            ((distance_weight * distance - battery_weight * battery_levels[position], distance, position)
+             for position, distance in robot_spatial_index.find_robot_positions_within_distance(
+                 x_coordinate=x_coordinate, y_coordinate=y_coordinate, distance=search_distance)
+             if battery_levels[position] >= min_battery_level))
+        return [(position, distance_to_load) for _, distance_to_load, position in ranked_entries]
+
+
+DEFAULT_SELECTION_POLICY = WindowSelectionPolicy()
@@ -0,0 +1,247 @@
+import logging
+import multiprocessing.shared_memory
+import queue
+import struct
+import threading
+import time
+
+# Internal Libraries
+import binary_fleet_format
+from fleet_snapshot_cache import FleetSnapshot
+
+# Control Segment: a Seqlock Sequence Followed by the Generation, Robot Count, Fetch Time, Whether the Fleet Was
+# Restored From File and Name of the Data Segment Holding the Current Fleet
+_CONTROL_SEQUENCE_STRUCT = struct.Struct('<Q')
+_CONTROL_FIELDS_STRUCT = struct.Struct('<QQd?64s')
+_CONTROL_FIELDS_OFFSET = _CONTROL_SEQUENCE_STRUCT.size
+
+
+class SharedFleetPublisher(object):
+    _MAX_ROBOT_UPDATE_BATCH_SIZE = 65536
+
+    def __init__(self):
+        # Created Up Front (Before Any Worker Is Forked), So Every Process Shares the Same Resource Tracker
+        self._control_segment = multiprocessing.shared_memory.SharedMemory(create=True,
+                                                                           size=_CONTROL_FIELDS_OFFSET +
+                                                                           _CONTROL_FIELDS_STRUCT.size)
+        self._control_segment.buf[:] = bytes(len(self._control_segment.buf))
+        # Each Generation Is Written Into a Data Segment of Its Own (Its Columns, See binary_fleet_format.py) That Is
+        # Never Written Again, So Workers Serve Straight From It. It Is Unlinked Once the Next Generation Is Published,
+        # But Workers Already Mapping It Keep It (and Its Memory) Until Their Last Snapshot of It Is Gone
+        self._data_segment = None
+        self._generation = 0
+
+    def get_control_segment_name(self):
+        return self._control_segment.name
+
+    def get_generation(self):
+        return self._generation
+
+    def publish(self, robot_fleet, fetched_at, is_restored_from_file=False):
+        robot_count = len(robot_fleet)
+        # Shared Memory Segments Cannot Be Empty, So an Empty Fleet Still Gets a Byte
+        data_segment = multiprocessing.shared_memory.SharedMemory(
+            create=True, size=max(binary_fleet_format.get_columns_size(robot_count), 1))
+        binary_fleet_format.write_robot_fleet_columns(buffer=data_segment.buf,
+                                                      columns_offset=0,
+                                                      capacity=robot_count,
+                                                      robot_fleet=robot_fleet)
+        # Only Its Name Is Needed From Here On, to Unlink It
+        data_segment.close()
+
+        self._generation += 1
+        control_sequence = _CONTROL_SEQUENCE_STRUCT.unpack_from(self._control_segment.buf)[0]
+        _CONTROL_SEQUENCE_STRUCT.pack_into(self._control_segment.buf, 0, control_sequence + 1)
+        _CONTROL_FIELDS_STRUCT.pack_into(self._control_segment.buf, _CONTROL_FIELDS_OFFSET, self._generation,
+                                         robot_count, fetched_at, is_restored_from_file, data_segment.name.encode())
+        _CONTROL_SEQUENCE_STRUCT.pack_into(self._control_segment.buf, 0, control_sequence + 2)
+        self.close_data_segments()
+        self._data_segment = data_segment
+        return self._generation
+
+    def publish_snapshot(self, fleet_snapshot):
+        return self.publish(robot_fleet=fleet_snapshot.get_robot_fleet(),
+                            fetched_at=fleet_snapshot.get_fetched_at(),
+                            is_restored_from_file=fleet_snapshot.is_restored_from_file())
+
+    def run_refresher(self, fleet_snapshot_cache, robot_update_queue, stop_event):
+        # Refreshes on the Cache's Interval and Applies Robot Updates Forwarded by Workers, Publishing After Each
+        # Refresh and Each Batch of Updates
+        if fleet_snapshot_cache.peek_snapshot() is not None:
+            # e.g. a Fleet Restored From Disk, Served Until the First Refresh Replaces It
+            self.publish_snapshot(fleet_snapshot_cache.peek_snapshot())
+        next_refresh_time = time.monotonic()
+        while not stop_event.is_set():
+            if time.monotonic() >= next_refresh_time:
+                next_refresh_time = time.monotonic() + fleet_snapshot_cache.get_refresh_interval_seconds()
+                try:
+                    if fleet_snapshot_cache.refresh():
+                        self.publish_snapshot(fleet_snapshot_cache.peek_snapshot())
+                except Exception:
+                    # One Bad Refresh Must Not End Every Later One; Workers Keep the Last Published Fleet Meanwhile
+                    logging.getLogger(__name__).exception('Fleet Snapshot Refresh Failed.')
+            try:
+                robots = robot_update_queue.get(timeout=max(next_refresh_time - time.monotonic(), 0))
+            except queue.Empty:
+                continue
+            # Every Update Already Waiting Is Applied and Published Together, So Workers Pick Up One Generation for a
+            # Burst of Updates Rather Than One per Request. None Is Only Put on the Queue to Wake the Refresher
+            robots = list(robots or [])
+            while len(robots) < self._MAX_ROBOT_UPDATE_BATCH_SIZE:
+                try:
+                    robots.extend(robot_update_queue.get_nowait() or [])
+                except queue.Empty:
+                    break
+            if robots:
+                fleet_snapshot_cache.apply_robot_updates(robots)
+                self.publish_snapshot(fleet_snapshot_cache.peek_snapshot())
+
+    def close_data_segments(self):
+        # Data Segments Belong to Whichever Process Published Into Them, So That Process Must Unlink Them
+        if self._data_segment is not None:
+            self._data_segment.unlink()
+            self._data_segment = None
+
+    def close(self):
+        self.close_data_segments()
+        self._control_segment.close()
+        self._control_segment.unlink()
+
+
+class SharedFleetReader(object):
+
+    def __init__(self, control_segment_name):
+        self._control_segment = multiprocessing.shared_memory.SharedMemory(name=control_segment_name)
+        self._data_segments_by_name = {}
+        self._closing_data_segments = []
+
+    def get_generation(self):
+        # A Single Aligned Field, So It Can Be Checked on Every Request Without Taking the Seqlock
+        return _CONTROL_FIELDS_STRUCT.unpack_from(self._control_segment.buf, _CONTROL_FIELDS_OFFSET)[0]
+
+    def _read_control_fields(self):
+        while True:
+            control_sequence = _CONTROL_SEQUENCE_STRUCT.unpack_from(self._control_segment.buf)[0]
+            if control_sequence % 2 == 0:
+                control_fields = _CONTROL_FIELDS_STRUCT.unpack_from(self._control_segment.buf,
+                                                                    _CONTROL_FIELDS_OFFSET)
+                if _CONTROL_SEQUENCE_STRUCT.unpack_from(self._control_segment.buf)[0] == control_sequence:
+                    return control_fields
+            time.sleep(0)
+
+    def _get_data_segment(self, data_segment_name):
+        data_segment = self._data_segments_by_name.get(data_segment_name)
+        if data_segment is None:
+            data_segment = multiprocessing.shared_memory.SharedMemory(name=data_segment_name)
+            self._data_segments_by_name[data_segment_name] = data_segment
+        return data_segment
+
+    def _close_unused_data_segments(self, data_segment_name):
+        # A Segment Still Viewed by an Older Snapshot Cannot Be Closed Yet, So Closing Is Retried on Later Reads
+        for unused_data_segment_name in [name for name in self._data_segments_by_name if name != data_segment_name]:
+            self._closing_data_segments.append(self._data_segments_by_name.pop(unused_data_segment_name))
+        closing_data_segments = []
+        for data_segment in self._closing_data_segments:
+            try:
+                data_segment.close()
+            except BufferError:
+                closing_data_segments.append(data_segment)
+        self._closing_data_segments = closing_data_segments
+
+    def read_snapshot(self, previous_snapshot=None):
+        # previous_snapshot (an Earlier Snapshot Read Here) Lets the Index Be Updated Rather Than Rebuilt
+        while True:
+            generation, robot_count, fetched_at, is_restored_from_file, data_segment_name = \
+                self._read_control_fields()
+            if generation == 0:
+                return None
+            data_segment_name = data_segment_name.rstrip(b'\0').decode()
+            try:
+                data_segment = self._get_data_segment(data_segment_name)
+            except FileNotFoundError:
+                # Unlinked Since the Control Fields Were Read, So a Later Generation Has Been Published Meanwhile
+                continue
+            self._close_unused_data_segments(data_segment_name)
+            # Published Segments Are Never Written Again, So the Fleet Views Its Columns in Place. The Views Are
+            # Read-Only, So Nothing in This Worker Can Change What the Other Workers Are Serving
+            robot_fleet = binary_fleet_format.create_robot_fleet_from_columns(buffer=data_segment.buf.toreadonly(),
+                                                                              columns_offset=0,
+                                                                              capacity=robot_count,
+                                                                              robot_count=robot_count)
+            if previous_snapshot is None:
+                return FleetSnapshot(version=generation, robots=robot_fleet, fetched_at=fetched_at,
+                                     is_restored_from_file=is_restored_from_file)
+            return previous_snapshot.create_snapshot_of_updated_fleet(version=generation,
+                                                                      robot_fleet=robot_fleet,
+                                                                      fetched_at=fetched_at,
+                                                                      is_restored_from_file=is_restored_from_file)
+
+    def close(self):
+        # Segments Still Viewed by Snapshots Cannot Be Closed Yet, So They Stay Mapped for as Long as This Reader
+        self._close_unused_data_segments(None)
+        self._control_segment.close()
+
+
+class SharedFleetSnapshotCache(object):
+    _DEFAULT_FIRST_SNAPSHOT_TIMEOUT_SECONDS = 5.0
+    _FIRST_SNAPSHOT_POLL_INTERVAL_SECONDS = 0.01
+    _SNAPSHOT_LISTENER_POLL_INTERVAL_SECONDS = 0.05
+
+    def __init__(self, shared_fleet_reader, robot_update_queue,
+                 first_snapshot_timeout_seconds=_DEFAULT_FIRST_SNAPSHOT_TIMEOUT_SECONDS):
+        self._shared_fleet_reader = shared_fleet_reader
+        self._robot_update_queue = robot_update_queue
+        self._first_snapshot_timeout_seconds = first_snapshot_timeout_seconds
+        self._snapshot = None
+        self._snapshot_lock = threading.Lock()
+        self._snapshot_listeners = []
+        self._snapshot_watcher_thread = None
+
+    def add_snapshot_listener(self, snapshot_listener):
+        # Workers Only Learn of New Generations by Looking, So Listeners Are Served by a Thread Watching for Them
+        self._snapshot_listeners = self._snapshot_listeners + [snapshot_listener]
+        if self._snapshot_watcher_thread is None:
+            self._snapshot_watcher_thread = threading.Thread(target=self._run_snapshot_watcher, daemon=True)
+            self._snapshot_watcher_thread.start()
+
+    def remove_snapshot_listener(self, snapshot_listener):
+        self._snapshot_listeners = [listener for listener in self._snapshot_listeners if listener != snapshot_listener]
+
+    def _run_snapshot_watcher(self):
+        previous_snapshot = self.peek_snapshot()
+        while True:
+            time.sleep(self._SNAPSHOT_LISTENER_POLL_INTERVAL_SECONDS)
+            if self._shared_fleet_reader.get_generation() == 0:
+                continue
+            snapshot = self.get_snapshot()
+            if snapshot is previous_snapshot:
+                continue
+            changed_robot_ids = None if previous_snapshot is None else \
+                snapshot.get_changed_robot_ids(previous_snapshot)
+            previous_snapshot = snapshot
+            for snapshot_listener in self._snapshot_listeners:
+                snapshot_listener(snapshot, changed_robot_ids)
+
+    def peek_snapshot(self):
+        return self._snapshot
+
+    def get_snapshot(self):
+        generation = self._shared_fleet_reader.get_generation()
+        if generation == 0:
+            # Cold Start: Nothing Has Been Published Yet, So Wait (Briefly) on the Refresher's First Fetch
+            deadline = time.monotonic() + self._first_snapshot_timeout_seconds
+            while generation == 0 and time.monotonic() < deadline:
+                time.sleep(self._FIRST_SNAPSHOT_POLL_INTERVAL_SECONDS)
+                generation = self._shared_fleet_reader.get_generation()
+        snapshot = self._snapshot
+        if generation and (snapshot is None or snapshot.get_version() != generation):
+            with self._snapshot_lock:
+                snapshot = self._snapshot
+                if snapshot is None or snapshot.get_version() != self._shared_fleet_reader.get_generation():
+                    snapshot = self._shared_fleet_reader.read_snapshot(previous_snapshot=snapshot)
+                    self._snapshot = snapshot
+        return snapshot
+
+    def apply_robot_updates(self, robots):
+        # Forwarded to the Refresher, Which Owns the Fleet; Every Worker Sees Them Once the Next Generation Is Published
+        self._robot_update_queue.put(robots)
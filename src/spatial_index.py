@@ -0,0 +1,212 @@
+import array
+import copy
+import heapq
+import math
+
+import numpy
+
+# Internal Libraries
+from models import RobotFleet
+
+
+class RobotSpatialIndex(object):
+    # Cells Hold Only Fleet Positions, So the Index Costs a Few Bytes per Robot. Coordinates Are Read From the Fleet's
+    # Columns While Querying, and Robots Are Only Created for the Entries a Query Returns
+    _DEFAULT_CELL_SIZE = 10
+    _RELATIVE_PADDING = 1e-9
+    _POSITION_TYPE_CODE = 'q'
+
+    def __init__(self, robots, cell_size=_DEFAULT_CELL_SIZE):
+        self._robot_fleet = robots if isinstance(robots, RobotFleet) else RobotFleet.create_from_robots(robots)
+        self._cell_size = cell_size
+        self._cells = {}
+        self._robot_count = 0
+        self._min_cell_x = self._min_cell_y = self._max_cell_x = self._max_cell_y = 0
+        self._add_fleet_positions()
+
+    def _add_fleet_positions(self):
+        # Robots Without Battery Can Never Be Selected, So They Are Left Out of the Index Entirely
+        positions = numpy.flatnonzero(numpy.frombuffer(self._robot_fleet.get_battery_levels(), dtype=numpy.float64))
+        if not len(positions):
+            return
+        cell_xs = numpy.floor(numpy.frombuffer(self._robot_fleet.get_x_coordinates(),
+                                               dtype=numpy.float64)[positions] / self._cell_size).astype(numpy.int64)
+        cell_ys = numpy.floor(numpy.frombuffer(self._robot_fleet.get_y_coordinates(),
+                                               dtype=numpy.float64)[positions] / self._cell_size).astype(numpy.int64)
+        # Grouped by Cell With a Stable Sort, So Each Cell Lists Its Positions in Fleet Order
+        cell_order = numpy.lexsort((cell_ys, cell_xs))
+        positions, cell_xs, cell_ys = positions[cell_order], cell_xs[cell_order], cell_ys[cell_order]
+        cell_starts = numpy.flatnonzero(numpy.concatenate(([True], (cell_xs[1:] != cell_xs[:-1]) |
+                                                           (cell_ys[1:] != cell_ys[:-1]))))
+        cell_ends = numpy.append(cell_starts[1:], len(positions))
+        for cell_start, cell_end in zip(cell_starts.tolist(), cell_ends.tolist()):
+            self._cells[(int(cell_xs[cell_start]), int(cell_ys[cell_start]))] = array.array(
+                self._POSITION_TYPE_CODE, positions[cell_start:cell_end].tobytes())
+        self._robot_count = len(positions)
+        self._min_cell_x, self._max_cell_x = int(cell_xs[0]), int(cell_xs[-1])
+        self._min_cell_y, self._max_cell_y = int(cell_ys.min()), int(cell_ys.max())
+
+    @staticmethod
+    def calculate_distance(x_1, y_1, x_2, y_2):
+        # Kept Identical to ClosestRobotCalculator So Index Answers Match the Linear Path Bit for Bit
+        return math.sqrt(math.pow((x_2 - x_1), 2) + math.pow((y_2 - y_1), 2))
+
+    def get_cell_size(self):
+        return self._cell_size
+
+    def get_robot_fleet(self):
+        return self._robot_fleet
+
+    def get_robot_count(self):
+        return self._robot_count
+
+    def _get_cell_key(self, x_coordinate, y_coordinate):
+        return math.floor(x_coordinate / self._cell_size), math.floor(y_coordinate / self._cell_size)
+
+    def _get_padding(self, x_coordinate, y_coordinate, distance=0):
+        # Absorbs Floating Point Rounding at Cell Boundaries So No Candidate Is Ever Missed
+        return self._RELATIVE_PADDING * (abs(x_coordinate) + abs(y_coordinate) + distance + self._cell_size)
+
+    def _expand_cell_bounds(self, cell_key):
+        if not self._cells:
+            self._min_cell_x, self._min_cell_y = cell_key
+            self._max_cell_x, self._max_cell_y = cell_key
+        self._min_cell_x = min(self._min_cell_x, cell_key[0])
+        self._min_cell_y = min(self._min_cell_y, cell_key[1])
+        self._max_cell_x = max(self._max_cell_x, cell_key[0])
+        self._max_cell_y = max(self._max_cell_y, cell_key[1])
+
+    def create_updated_index(self, robot_fleet, updated_positions):
+        # An Index Over robot_fleet, a Copy of This Index's Fleet in Which Only the Robots at updated_positions Were
+        # Changed or Appended. This Index Is Left As It Is, Since Queries May Still Be Reading It: the New One Shares
+        # Every Cell the Updated Robots Neither Left Nor Entered, and Gets New Arrays for the Rest
+        robot_spatial_index = copy.copy(self)
+        robot_spatial_index._robot_fleet = robot_fleet
+        robot_spatial_index._cells = dict(self._cells)
+        for position in sorted(set(updated_positions)):
+            robot_spatial_index._move_robot(position=position, previous_robot_fleet=self._robot_fleet)
+        return robot_spatial_index
+
+    def _move_robot(self, position, previous_robot_fleet):
+        # Moves the Robot at position From Wherever previous_robot_fleet Had It (Nowhere for a New Position) to
+        # Wherever This Index's Fleet Has It Now
+        if position < len(previous_robot_fleet) and previous_robot_fleet.get_battery_levels()[position]:
+            previous_cell_key = self._get_cell_key(previous_robot_fleet.get_x_coordinates()[position],
+                                                   previous_robot_fleet.get_y_coordinates()[position])
+            remaining_positions = array.array(self._POSITION_TYPE_CODE,
+                                              (cell_position for cell_position in self._cells[previous_cell_key]
+                                               if cell_position != position))
+            if remaining_positions:
+                self._cells[previous_cell_key] = remaining_positions
+            else:
+                del self._cells[previous_cell_key]
+            self._robot_count -= 1
+        if self._robot_fleet.get_battery_levels()[position]:
+            cell_key = self._get_cell_key(self._robot_fleet.get_x_coordinates()[position],
+                                          self._robot_fleet.get_y_coordinates()[position])
+            self._expand_cell_bounds(cell_key)
+            self._cells[cell_key] = self._cells.get(cell_key, array.array(self._POSITION_TYPE_CODE)) + \
+                array.array(self._POSITION_TYPE_CODE, [position])
+            self._robot_count += 1
+
+    def _create_entries(self, positions_and_distances):
+        # (Position, Robot, Distance) Entries, Creating Robots Only for What Is Returned
+        get_robot = self._robot_fleet.get_robot
+        return [(position, get_robot(position), distance) for position, distance in positions_and_distances]
+
+    def _iterate_ring_cells(self, center_cell_x, center_cell_y, ring):
+        if ring == 0:
+            yield center_cell_x, center_cell_y
+            return
+        for offset in range(-ring, ring + 1):
+            yield center_cell_x + offset, center_cell_y - ring
+            yield center_cell_x + offset, center_cell_y + ring
+        for offset in range(-ring + 1, ring):
+            yield center_cell_x - ring, center_cell_y + offset
+            yield center_cell_x + ring, center_cell_y + offset
+
+    def _get_max_ring(self, center_cell_x, center_cell_y):
+        return max(abs(center_cell_x - self._min_cell_x), abs(self._max_cell_x - center_cell_x),
+                   abs(center_cell_y - self._min_cell_y), abs(self._max_cell_y - center_cell_y))
+
+    def _iterate_positions_with_distances(self, cell_keys, x_coordinate, y_coordinate):
+        x_coordinates = self._robot_fleet.get_x_coordinates()
+        y_coordinates = self._robot_fleet.get_y_coordinates()
+        calculate_distance = self.calculate_distance
+        cells = self._cells
+        for cell_key in cell_keys:
+            for position in cells.get(cell_key, ()):
+                yield position, calculate_distance(x_coordinates[position], y_coordinates[position],
+                                                   x_coordinate, y_coordinate)
+
+    def find_robot_positions_within_distance(self, x_coordinate, y_coordinate, distance):
+        # (Position, Distance) Pairs, for Callers That Read What Else They Need From the Fleet's Columns
+        padded_distance = distance + self._get_padding(x_coordinate, y_coordinate, distance)
+        min_cell_x, min_cell_y = self._get_cell_key(x_coordinate - padded_distance, y_coordinate - padded_distance)
+        max_cell_x, max_cell_y = self._get_cell_key(x_coordinate + padded_distance, y_coordinate + padded_distance)
+        if (max_cell_x - min_cell_x + 1) * (max_cell_y - min_cell_y + 1) > len(self._cells):
+            cell_keys = [cell_key for cell_key in tuple(self._cells)
+                         if min_cell_x <= cell_key[0] <= max_cell_x and min_cell_y <= cell_key[1] <= max_cell_y]
+        else:
+            cell_keys = [(cell_x, cell_y) for cell_x in range(min_cell_x, max_cell_x + 1)
+                         for cell_y in range(min_cell_y, max_cell_y + 1)]
+        return [(position, robot_distance) for position, robot_distance
+                in self._iterate_positions_with_distances(cell_keys, x_coordinate, y_coordinate)
+                if robot_distance <= distance]
+
+    def find_robots_within_distance(self, x_coordinate, y_coordinate, distance):
+        return self._create_entries(self.find_robot_positions_within_distance(x_coordinate=x_coordinate,
+                                                                              y_coordinate=y_coordinate,
+                                                                              distance=distance))
+
+    def find_nearest_robot(self, x_coordinate, y_coordinate):
+        if not self._cells:
+            return None
+        center_cell_x, center_cell_y = self._get_cell_key(x_coordinate, y_coordinate)
+        padding = self._get_padding(x_coordinate, y_coordinate)
+        max_ring = self._get_max_ring(center_cell_x, center_cell_y)
+        nearest = None
+        for ring in range(max_ring + 1):
+            scans_remaining_rings = 8 * ring > len(self._cells)
+            if scans_remaining_rings:
+                # The Remaining Rings Are Mostly Empty, So Scanning the Occupied Cells Directly Is Cheaper
+                cell_keys = [cell_key for cell_key in tuple(self._cells)
+                             if max(abs(cell_key[0] - center_cell_x), abs(cell_key[1] - center_cell_y)) >= ring]
+            else:
+                cell_keys = self._iterate_ring_cells(center_cell_x, center_cell_y, ring)
+            for position, distance in self._iterate_positions_with_distances(cell_keys, x_coordinate, y_coordinate):
+                if nearest is None or (distance, position) < (nearest[1], nearest[0]):
+                    nearest = position, distance
+            # Every Robot Beyond This Ring Is At Least ring * cell_size Away From the Point
+            if scans_remaining_rings or (nearest is not None and nearest[1] < ring * self._cell_size - padding):
+                break
+        return None if nearest is None else self._create_entries([nearest])[0]
+
+    def find_nearest_robot_positions(self, x_coordinate, y_coordinate, robot_count):
+        # The robot_count Nearest (Position, Distance) Pairs, Nearest First
+        if not self._cells or robot_count <= 0:
+            return []
+        center_cell_x, center_cell_y = self._get_cell_key(x_coordinate, y_coordinate)
+        padding = self._get_padding(x_coordinate, y_coordinate)
+        max_ring = self._get_max_ring(center_cell_x, center_cell_y)
+        entries = []
+        for ring in range(max_ring + 1):
+            scans_remaining_rings = 8 * ring > len(self._cells)
+            if scans_remaining_rings:
+                cell_keys = [cell_key for cell_key in tuple(self._cells)
+                             if max(abs(cell_key[0] - center_cell_x), abs(cell_key[1] - center_cell_y)) >= ring]
+            else:
+                cell_keys = self._iterate_ring_cells(center_cell_x, center_cell_y, ring)
+            entries.extend(self._iterate_positions_with_distances(cell_keys, x_coordinate, y_coordinate))
+            if scans_remaining_rings:
+                break
+            if len(entries) >= robot_count:
+                entries = heapq.nsmallest(robot_count, entries, key=lambda entry: (entry[1], entry[0]))
+                if entries[-1][1] < ring * self._cell_size - padding:
+                    break
+        return heapq.nsmallest(robot_count, entries, key=lambda entry: (entry[1], entry[0]))
+
+    def find_nearest_robots(self, x_coordinate, y_coordinate, robot_count):
+        return self._create_entries(self.find_nearest_robot_positions(x_coordinate=x_coordinate,
+                                                                      y_coordinate=y_coordinate,
+                                                                      robot_count=robot_count))
@@ -0,0 +1,163 @@
+import itertools
+import random
+import unittest
+
+# Internal Libraries
+from assigners import MultiLoadRobotAssigner
+from models import Robot, Load
+from selection_policies import WeightedScoreSelectionPolicy, WindowSelectionPolicy
+from spatial_index import RobotSpatialIndex
+
+
+class MultiLoadRobotAssignerUnitTest(unittest.TestCase):
+
+    @staticmethod
+    def create_assigner(robots, selection_policy=None):
+        return MultiLoadRobotAssigner(robot_spatial_index=RobotSpatialIndex(robots), selection_policy=selection_policy)
+
+    @staticmethod
+    def create_random_robots(random_generator, robot_count, spread):
+        return [Robot(id=robot_id,
+                      battery_level=random_generator.choice([0, 10, 50, 90, 100]),
+                      x_coordinate=random_generator.uniform(-spread, spread),
+                      y_coordinate=random_generator.uniform(-spread, spread))
+                for robot_id in range(robot_count)]
+
+    @staticmethod
+    def create_random_loads(random_generator, load_count, spread):
+        return [Load(id=load_id,
+                     x_coordinate=random_generator.uniform(-spread, spread),
+                     y_coordinate=random_generator.uniform(-spread, spread))
+                for load_id in range(load_count)]
+
+    @staticmethod
+    def calculate_total_cost(assigner, assigned_robots):
+        return sum(assigner.calculate_assignment_cost(distance_to_load=robot.get_distance_to_load(),
+                                                      battery_level=robot.get_battery_level())
+                   for robot in assigned_robots if robot is not None)
+
+    def test_assign_robots_to_loads_returns_empty_list_for_no_loads(self):
+        assigner = self.create_assigner([Robot(id=1, battery_level=100, x_coordinate=0, y_coordinate=0)])
+
+        self.assertEqual(first=assigner.assign_robots_to_loads([]), second=[])
+
+    def test_single_load_gets_the_same_robot_as_the_closest_robot_rule(self):
+        robots = [Robot(id=1, battery_level=50, x_coordinate=0, y_coordinate=1),
+                  Robot(id=2, battery_level=95, x_coordinate=0, y_coordinate=10),
+                  Robot(id=3, battery_level=100, x_coordinate=0, y_coordinate=11)]
+        assigner = self.create_assigner(robots)
+
+        for use_optimal_assignment in [True, False]:
+            assigned_robots = assigner.assign_robots_to_loads([Load(id=0, x_coordinate=0, y_coordinate=0)],
+                                                              use_optimal_assignment=use_optimal_assignment)
+            self.assertEqual(first=assigned_robots[0].get_id(), second=2)
+
+    def test_loads_sharing_a_closest_robot_get_different_robots(self):
+        robots = [Robot(id=1, battery_level=100, x_coordinate=0, y_coordinate=0),
+                  Robot(id=2, battery_level=100, x_coordinate=50, y_coordinate=0)]
+        loads = [Load(id=1, x_coordinate=1, y_coordinate=0), Load(id=2, x_coordinate=2, y_coordinate=0)]
+        assigner = self.create_assigner(robots)
+
+        for use_optimal_assignment in [True, False]:
+            assigned_robots = assigner.assign_robots_to_loads(loads, use_optimal_assignment=use_optimal_assignment)
+            self.assertEqual(first=sorted(robot.get_id() for robot in assigned_robots), second=[1, 2])
+
+    def test_optimal_assignment_minimizes_total_distance(self):
+        robots = [Robot(id=1, battery_level=100, x_coordinate=0, y_coordinate=0),
+                  Robot(id=2, battery_level=100, x_coordinate=30, y_coordinate=0)]
+        loads = [Load(id=1, x_coordinate=15, y_coordinate=0), Load(id=2, x_coordinate=-15, y_coordinate=0)]
+        assigner = self.create_assigner(robots)
+
+        assigned_robots = assigner.assign_robots_to_loads_optimally(loads)
+
+        self.assertEqual(first=[robot.get_id() for robot in assigned_robots], second=[2, 1])
+        self.assertEqual(first=[robot.get_distance_to_load() for robot in assigned_robots], second=[15.0, 15.0])
+
+    def test_loads_beyond_the_fleet_size_are_left_unassigned(self):
+        robots = [Robot(id=1, battery_level=100, x_coordinate=0, y_coordinate=0),
+                  Robot(id=2, battery_level=0, x_coordinate=1, y_coordinate=0)]
+        loads = [Load(id=1, x_coordinate=5, y_coordinate=0), Load(id=2, x_coordinate=1, y_coordinate=0)]
+        assigner = self.create_assigner(robots)
+
+        for use_optimal_assignment in [True, False]:
+            assigned_robots = assigner.assign_robots_to_loads(loads, use_optimal_assignment=use_optimal_assignment)
+            self.assertEqual(first=len([robot for robot in assigned_robots if robot is None]), second=1)
+            self.assertEqual(first=[robot.get_id() for robot in assigned_robots if robot], second=[1])
+
+    def test_optimal_assignment_matches_brute_force_for_small_random_problems(self):
+        random_generator = random.Random(20230305)
+        selection_policies = [None,
+                              WindowSelectionPolicy(distance_window=5, min_battery_level=50),
+                              WeightedScoreSelectionPolicy(distance_weight=1, battery_weight=0.2)]
+        for selection_policy in selection_policies:
+            for _ in range(30):
+                robots = self.create_random_robots(random_generator=random_generator, robot_count=6, spread=20)
+                loads = self.create_random_loads(random_generator=random_generator, load_count=4, spread=20)
+                assigner = self.create_assigner(robots, selection_policy=selection_policy)
+                min_battery_level = assigner.get_selection_policy().get_min_battery_level()
+
+                assigned_robots = assigner.assign_robots_to_loads_optimally(loads)
+
+                eligible_robots = [robot for robot in robots
+                                   if robot.get_battery_level() and robot.get_battery_level() >= min_battery_level]
+                assigned_count = min(len(loads), len(eligible_robots))
+                best_total_cost = min(
+                    sum(assigner.calculate_assignment_cost(
+                        distance_to_load=RobotSpatialIndex.calculate_distance(robot.get_x_coordinate(),
+                                                                              robot.get_y_coordinate(),
+                                                                              load.get_x_coordinate(),
+                                                                              load.get_y_coordinate()),
+                        battery_level=robot.get_battery_level())
+                        for load, robot in zip(assigned_loads, assigned_robots_permutation))
+                    for assigned_loads in itertools.combinations(loads, assigned_count)
+                    for assigned_robots_permutation in itertools.permutations(eligible_robots, assigned_count))
+                self.assertAlmostEqual(first=self.calculate_total_cost(assigner=assigner,
+                                                                       assigned_robots=assigned_robots),
+                                       second=best_total_cost)
+
+    def test_single_load_gets_the_robot_its_selection_policy_selects(self):
+        random_generator = random.Random(20230307)
+        selection_policies = [WindowSelectionPolicy(distance_window=25, min_battery_level=50),
+                              WeightedScoreSelectionPolicy(distance_weight=1, battery_weight=0.5, min_battery_level=10)]
+        for selection_policy in selection_policies:
+            for _ in range(20):
+                robots = self.create_random_robots(random_generator=random_generator, robot_count=50, spread=50)
+                load = self.create_random_loads(random_generator=random_generator, load_count=1, spread=50)[0]
+                assigner = self.create_assigner(robots, selection_policy=selection_policy)
+                expected_robot = selection_policy.select_robot(robots=robots, load=load)
+
+                for use_optimal_assignment in [True, False]:
+                    assigned_robot = assigner.assign_robots_to_loads(
+                        [load], use_optimal_assignment=use_optimal_assignment)[0]
+                    self.assertEqual(first=assigned_robot.get_id(), second=expected_robot.get_id())
+                    self.assertEqual(first=assigned_robot.get_distance_to_load(),
+                                     second=expected_robot.get_distance_to_load())
+
+    def test_robots_below_the_min_battery_level_are_never_assigned(self):
+        robots = [Robot(id=1, battery_level=100, x_coordinate=0, y_coordinate=0),
+                  Robot(id=2, battery_level=20, x_coordinate=1, y_coordinate=0),
+                  Robot(id=3, battery_level=90, x_coordinate=40, y_coordinate=0)]
+        loads = [Load(id=1, x_coordinate=0, y_coordinate=0), Load(id=2, x_coordinate=1, y_coordinate=0),
+                 Load(id=3, x_coordinate=2, y_coordinate=0)]
+        assigner = self.create_assigner(robots, selection_policy=WindowSelectionPolicy(min_battery_level=50))
+
+        for use_optimal_assignment in [True, False]:
+            assigned_robots = assigner.assign_robots_to_loads(loads, use_optimal_assignment=use_optimal_assignment)
+            self.assertEqual(first=sorted(robot.get_id() for robot in assigned_robots if robot), second=[1, 3])
+            self.assertEqual(first=len([robot for robot in assigned_robots if robot is None]), second=1)
+
+    def test_greedy_assignment_never_reuses_robots(self):
+        random_generator = random.Random(20230306)
+        robots = self.create_random_robots(random_generator=random_generator, robot_count=500, spread=100)
+        loads = self.create_random_loads(random_generator=random_generator, load_count=300, spread=100)
+        assigner = self.create_assigner(robots)
+
+        assigned_robots = assigner.assign_robots_to_loads_greedily(loads)
+
+        assigned_ids = [robot.get_id() for robot in assigned_robots]
+        self.assertEqual(first=len(assigned_ids), second=len(set(assigned_ids)))
+        self.assertNotIn(member=None, container=assigned_robots)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,74 @@
+import os
+import tempfile
+import unittest
+
+# Internal Libraries
+from benchmark_utilities import ALL_WITHIN_WINDOW_DISTRIBUTION, ALL_ZERO_BATTERY_DISTRIBUTION, DISTRIBUTIONS, \
+    BenchmarkResults, BenchmarkTimer, SyntheticFleetGenerator
+from json_helpers import RequestJSONTransformer, RobotDatabaseJSONTransformer
+from spatial_index import RobotSpatialIndex
+
+
+class SyntheticFleetGeneratorUnitTest(unittest.TestCase):
+
+    def test_every_distribution_creates_valid_robot_database_and_request_json(self):
+        for distribution in DISTRIBUTIONS:
+            fleet_generator = SyntheticFleetGenerator(distribution)
+            robots_json = fleet_generator.create_robots_json(100)
+            loads_json = fleet_generator.create_loads_json(10)
+
+            self.assertEqual(first=len(robots_json), second=100)
+            self.assertTrue(all(RobotDatabaseJSONTransformer.is_robot_database_json_valid(robot_json)
+                                for robot_json in robots_json))
+            self.assertTrue(all(RequestJSONTransformer.is_request_json_valid(load_json) for load_json in loads_json))
+
+    def test_same_seed_creates_same_fleet(self):
+        self.assertEqual(first=SyntheticFleetGenerator(DISTRIBUTIONS[0], random_seed=1).create_robots_json(10),
+                         second=SyntheticFleetGenerator(DISTRIBUTIONS[0], random_seed=1).create_robots_json(10))
+
+    def test_all_within_window_distribution_puts_every_robot_within_the_window_of_every_load(self):
+        fleet_generator = SyntheticFleetGenerator(ALL_WITHIN_WINDOW_DISTRIBUTION)
+        robots_json = fleet_generator.create_robots_json(100)
+        for load_json in fleet_generator.create_loads_json(10):
+            for robot_json in robots_json:
+                distance = RobotSpatialIndex.calculate_distance(robot_json['x'], robot_json['y'],
+                                                                load_json['x'], load_json['y'])
+                self.assertLessEqual(a=distance, b=10)
+
+    def test_all_zero_battery_distribution_creates_robots_without_battery(self):
+        robots_json = SyntheticFleetGenerator(ALL_ZERO_BATTERY_DISTRIBUTION).create_robots_json(100)
+        self.assertEqual(first={robot_json['batteryLevel'] for robot_json in robots_json}, second={0})
+
+    def test_unknown_distribution_raises_value_error(self):
+        with self.assertRaises(ValueError):
+            SyntheticFleetGenerator('unknown')
+
+
+class BenchmarkResultsUnitTest(unittest.TestCase):
+
+    def test_timer_runs_at_least_once_and_summarizes_durations(self):
+        timings = BenchmarkTimer(min_duration_seconds=0).time_function(lambda argument: argument, [1])
+        self.assertEqual(first=timings['iterations'], second=1)
+        self.assertEqual(first=set(timings), second={'iterations', 'mean_us', 'median_us', 'min_us', 'p95_us'})
+
+    def test_results_can_be_written_read_and_compared(self):
+        previous_benchmark_results = BenchmarkResults()
+        previous_benchmark_results.add_result('fast', 'uniform', 10, {'median_us': 10})
+        previous_benchmark_results.add_result('slow', 'uniform', 10, {'median_us': 10})
+        benchmark_results = BenchmarkResults()
+        benchmark_results.add_result('fast', 'uniform', 10, {'median_us': 5})
+        benchmark_results.add_result('slow', 'uniform', 10, {'median_us': 20})
+        benchmark_results.add_result('new', 'uniform', 10, {'median_us': 20})
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'benchmark_results.json')
+            previous_benchmark_results.write(path)
+            comparisons = benchmark_results.compare_with(BenchmarkResults.read(path))
+
+        self.assertEqual(first=[(result['benchmark'], ratio, is_regression)
+                                for result, _, ratio, is_regression in comparisons],
+                         second=[('fast', 0.5, False), ('slow', 2.0, True)])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,70 @@
+import unittest
+
+# Internal Libraries
+from binary_helpers import ResponseBinaryFormatter, RequestBinaryTransformer
+
+
+class ResponseBinaryFormatterUnitTest(unittest.TestCase):
+
+    def test_formatted_response_binary_round_trips(self):
+        response_binary = ResponseBinaryFormatter.get_formatted_response_binary(robot_id=1,
+                                                                                distance_to_goal=2.5,
+                                                                                battery_level=3)
+
+        self.assertEqual(first=ResponseBinaryFormatter.create_response_jsons_from_response_binary(response_binary),
+                         second=[{'robotId': 1, 'distanceToGoal': 2.5, 'batteryLevel': 3.0}])
+
+    def test_error_and_batch_item_error_responses_are_distinguished(self):
+        response_binary = ResponseBinaryFormatter.get_formatted_error_response_binary() + \
+            ResponseBinaryFormatter.get_formatted_batch_item_error_response_binary()
+
+        self.assertTrue(ResponseBinaryFormatter.is_response_binary_valid(response_binary))
+        self.assertEqual(first=ResponseBinaryFormatter.create_response_jsons_from_response_binary(response_binary),
+                         second=[{'robotId': None, 'distanceToGoal': None, 'batteryLevel': None},
+                                 {'robotId': None, 'distanceToGoal': None, 'batteryLevel': None, 'error': True}])
+
+
+class RequestBinaryTransformerUnitTest(unittest.TestCase):
+
+    def test_load_is_created_from_request_binary(self):
+        request_binary = RequestBinaryTransformer.get_formatted_request_binary(load_id=7,
+                                                                               x_coordinate=1.5,
+                                                                               y_coordinate=-2)
+
+        self.assertTrue(RequestBinaryTransformer.is_request_binary_valid(request_binary))
+        load = RequestBinaryTransformer.create_load_from_request_binary(request_binary)
+        self.assertEqual(first=(load.get_id(), load.get_x_coordinate(), load.get_y_coordinate()), second=(7, 1.5, -2))
+
+    def test_request_binary_of_the_wrong_length_is_invalid(self):
+        request_binary = RequestBinaryTransformer.get_formatted_request_binary(load_id=7,
+                                                                               x_coordinate=1,
+                                                                               y_coordinate=2)
+
+        self.assertFalse(RequestBinaryTransformer.is_request_binary_valid(request_binary[:-1]))
+        self.assertFalse(RequestBinaryTransformer.is_request_binary_valid(request_binary * 2))
+        self.assertFalse(RequestBinaryTransformer.is_batch_request_binary_valid(request_binary[:-1]))
+
+    def test_request_binary_with_unusable_coordinates_is_invalid(self):
+        for x_coordinate, y_coordinate in [(float('inf'), 0), (0, float('nan')), (1e308, 0), (0, -1e308)]:
+            request_binary = RequestBinaryTransformer.get_formatted_request_binary(load_id=7,
+                                                                                   x_coordinate=x_coordinate,
+                                                                                   y_coordinate=y_coordinate)
+
+            self.assertFalse(RequestBinaryTransformer.is_request_binary_valid(request_binary))
+            self.assertEqual(first=RequestBinaryTransformer.create_loads_from_batch_request_binary(request_binary),
+                             second=[None])
+
+    def test_loads_are_created_from_batch_request_binary_in_order(self):
+        request_binary = b''.join(RequestBinaryTransformer.get_formatted_request_binary(load_id=load_id,
+                                                                                        x_coordinate=load_id,
+                                                                                        y_coordinate=0)
+                                  for load_id in range(3))
+
+        self.assertTrue(RequestBinaryTransformer.is_batch_request_binary_valid(request_binary))
+        self.assertEqual(first=[load.get_id() for load
+                                in RequestBinaryTransformer.create_loads_from_batch_request_binary(request_binary)],
+                         second=[0, 1, 2])
+
+
+if __name__ == '__main__':
+    unittest.main()
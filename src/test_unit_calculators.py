@@ -1,8 +1,11 @@
+import random
 import unittest
 
 # Internal Libraries
-from calculators import ClosestRobotCalculator
+from calculators import ClosestRobotCalculator, VectorizedClosestRobotCalculator
 from models import Robot, Load
+from selection_policies import SelectionPolicy, WeightedScoreSelectionPolicy, WindowSelectionPolicy
+from spatial_index import RobotSpatialIndex
 
 
 class ClosestRobotCalculatorTest(unittest.TestCase):
@@ -146,6 +149,201 @@ class ClosestRobotCalculatorTest(unittest.TestCase):
 
         self.assertIsNone(closest_robot)
 
+    def test_calculate_closest_robot_for_load_does_not_modify_robots(self):
+        robot_one = self.create_robot_with(robot_id=1, battery_level=50, x_coordinate=10, y_coordinate=0)
+        robot_two = self.create_robot_with(robot_id=2, battery_level=50, x_coordinate=20, y_coordinate=0)
+        robots = [robot_one, robot_two]
+        load = self.create_load_with(x_coordinate=10, y_coordinate=0)
+
+        closest_robot = ClosestRobotCalculator.calculate_closest_robot_for_load(robots=robots,
+                                                                                load=load)
+
+        self.assertEqual(first=closest_robot.get_distance_to_load(), second=0)
+        self.assertIsNone(robot_one.get_distance_to_load())
+        self.assertIsNone(robot_two.get_distance_to_load())
+
+    def test_calculate_closest_robots_for_load_ranks_window_by_charge_then_the_rest_by_distance(self):
+        robots = [self.create_robot_with(robot_id=1, battery_level=100, x_coordinate=0, y_coordinate=20),
+                  self.create_robot_with(robot_id=2, battery_level=50, x_coordinate=0, y_coordinate=1),
+                  self.create_robot_with(robot_id=3, battery_level=90, x_coordinate=0, y_coordinate=9),
+                  self.create_robot_with(robot_id=4, battery_level=0, x_coordinate=0, y_coordinate=0),
+                  self.create_robot_with(robot_id=5, battery_level=100, x_coordinate=0, y_coordinate=15)]
+
+        closest_robots = ClosestRobotCalculator.calculate_closest_robots_for_load(robots=robots,
+                                                                                  load=self.create_load_with(),
+                                                                                  robot_count=10)
+
+        self.assertEqual(first=[(robot.get_id(), robot.get_distance_to_load()) for robot in closest_robots],
+                         second=[(3, 9.0), (2, 1.0), (5, 15.0), (1, 20.0)])
+        self.assertEqual(first=[robot.get_id() for robot in ClosestRobotCalculator.calculate_closest_robots_for_load(
+            robots=robots, load=self.create_load_with(), robot_count=2)], second=[3, 2])
+
+
+class ClosestRobotCalculatorUsingIndexTest(unittest.TestCase):
+
+    @staticmethod
+    def create_random_robots(random_generator, robot_count, spread):
+        return [Robot(id=robot_id,
+                      battery_level=random_generator.choice([0, 1, 25, 50, 50.5, 99, 100]),
+                      x_coordinate=random_generator.randint(-spread, spread),
+                      y_coordinate=random_generator.uniform(-spread, spread))
+                for robot_id in range(robot_count)]
+
+    def assert_index_matches_linear_path(self, robots, load):
+        expected_robot = ClosestRobotCalculator.calculate_closest_robot_for_load(robots=robots, load=load)
+        closest_robot = ClosestRobotCalculator.calculate_closest_robot_for_load_using_index(
+            robot_spatial_index=RobotSpatialIndex(robots), load=load)
+        if expected_robot is None:
+            self.assertIsNone(closest_robot)
+        else:
+            self.assertEqual(first=(closest_robot.get_id(), closest_robot.get_distance_to_load()),
+                             second=(expected_robot.get_id(), expected_robot.get_distance_to_load()))
+
+    def test_returns_none_for_empty_index(self):
+        self.assert_index_matches_linear_path(robots=[], load=Load(id=0, x_coordinate=0, y_coordinate=0))
+
+    def test_returns_none_when_all_robots_have_0_battery(self):
+        robots = [Robot(id=1, battery_level=0, x_coordinate=0, y_coordinate=0)]
+        self.assert_index_matches_linear_path(robots=robots, load=Load(id=0, x_coordinate=0, y_coordinate=0))
+
+    def test_returns_robot_with_most_charge_within_10_distance_units(self):
+        robots = [Robot(id=1, battery_level=50, x_coordinate=0, y_coordinate=1),
+                  Robot(id=2, battery_level=95, x_coordinate=0, y_coordinate=10),
+                  Robot(id=3, battery_level=100, x_coordinate=0, y_coordinate=11)]
+        self.assert_index_matches_linear_path(robots=robots, load=Load(id=0, x_coordinate=0, y_coordinate=0))
+
+    def test_does_not_modify_indexed_robots(self):
+        robot = Robot(id=1, battery_level=50, x_coordinate=3, y_coordinate=4)
+
+        closest_robot = ClosestRobotCalculator.calculate_closest_robot_for_load_using_index(
+            robot_spatial_index=RobotSpatialIndex([robot]), load=Load(id=0, x_coordinate=0, y_coordinate=0))
+
+        self.assertEqual(first=closest_robot.get_distance_to_load(), second=5.0)
+        self.assertIsNone(robot.get_distance_to_load())
+
+    def test_matches_linear_path_for_random_fleets(self):
+        random_generator = random.Random(20230301)
+        for spread in [5, 30, 300]:
+            robots = self.create_random_robots(random_generator=random_generator, robot_count=300, spread=spread)
+            for load_id in range(50):
+                load = Load(id=load_id,
+                            x_coordinate=random_generator.randint(-2 * spread, 2 * spread),
+                            y_coordinate=random_generator.uniform(-2 * spread, 2 * spread))
+                self.assert_index_matches_linear_path(robots=robots, load=load)
+
+    def test_ranked_robots_match_linear_path_for_random_fleets(self):
+        random_generator = random.Random(20230302)
+        for spread in [5, 30, 300]:
+            robots = self.create_random_robots(random_generator=random_generator, robot_count=300, spread=spread)
+            robot_spatial_index = RobotSpatialIndex(robots)
+            for load_id in range(30):
+                load = Load(id=load_id,
+                            x_coordinate=random_generator.randint(-2 * spread, 2 * spread),
+                            y_coordinate=random_generator.uniform(-2 * spread, 2 * spread))
+                for robot_count in [1, 3, 40]:
+                    expected_robots = ClosestRobotCalculator.calculate_closest_robots_for_load(
+                        robots=robots, load=load, robot_count=robot_count)
+                    closest_robots = ClosestRobotCalculator.calculate_closest_robots_for_load_using_index(
+                        robot_spatial_index=robot_spatial_index, load=load, robot_count=robot_count)
+                    self.assertEqual(first=[(robot.get_id(), robot.get_distance_to_load()) for robot in closest_robots],
+                                     second=[(robot.get_id(), robot.get_distance_to_load())
+                                             for robot in expected_robots])
+                expected_robot = ClosestRobotCalculator.calculate_closest_robot_for_load(robots=robots, load=load)
+                self.assertEqual(first=expected_robots[0].get_id(), second=expected_robot.get_id())
+
+
+class VectorizedClosestRobotCalculatorTest(unittest.TestCase):
+
+    def assert_results_match_linear_path(self, robots, loads, selection_policy=None):
+        calculator = VectorizedClosestRobotCalculator(robots, selection_policy=selection_policy)
+
+        closest_robots = calculator.calculate_closest_robots_for_loads(loads)
+
+        for load, closest_robot in zip(loads, closest_robots):
+            expected_robot = ClosestRobotCalculator.calculate_closest_robot_for_load(robots=robots,
+                                                                                     load=load,
+                                                                                     selection_policy=selection_policy)
+            if expected_robot is None:
+                self.assertIsNone(closest_robot)
+            else:
+                self.assertEqual(first=(closest_robot.get_id(), closest_robot.get_distance_to_load()),
+                                 second=(expected_robot.get_id(), expected_robot.get_distance_to_load()))
+
+    def test_returns_none_for_empty_robot_list(self):
+        calculator = VectorizedClosestRobotCalculator([])
+
+        self.assertIsNone(calculator.calculate_closest_robot_for_load(Load(id=0, x_coordinate=0, y_coordinate=0)))
+
+    def test_returns_none_when_all_robots_have_0_battery(self):
+        robots = [Robot(id=1, battery_level=0, x_coordinate=0, y_coordinate=0)]
+        self.assert_results_match_linear_path(robots=robots, loads=[Load(id=0, x_coordinate=0, y_coordinate=0)])
+
+    def test_returns_robot_with_most_charge_within_10_distance_units(self):
+        robots = [Robot(id=1, battery_level=50, x_coordinate=0, y_coordinate=1),
+                  Robot(id=2, battery_level=95, x_coordinate=0, y_coordinate=10),
+                  Robot(id=3, battery_level=100, x_coordinate=0, y_coordinate=11)]
+        calculator = VectorizedClosestRobotCalculator(robots)
+
+        closest_robot = calculator.calculate_closest_robot_for_load(Load(id=0, x_coordinate=0, y_coordinate=0))
+
+        self.assertEqual(first=(closest_robot.get_id(), closest_robot.get_distance_to_load()), second=(2, 10.0))
+
+    def test_keeps_original_battery_level_values(self):
+        calculator = VectorizedClosestRobotCalculator([Robot(id='5', battery_level=42, x_coordinate=0, y_coordinate=0)])
+
+        closest_robot = calculator.calculate_closest_robot_for_load(Load(id=0, x_coordinate=0, y_coordinate=0))
+
+        self.assertIs(type(closest_robot.get_battery_level()), int)
+        self.assertEqual(first=closest_robot.get_id(), second=5)
+
+    def test_prefers_earliest_robot_when_distances_tie(self):
+        robots = [Robot(id=1, battery_level=100, x_coordinate=3, y_coordinate=3),
+                  Robot(id=2, battery_level=100, x_coordinate=-3, y_coordinate=-3),
+                  Robot(id=3, battery_level=100, x_coordinate=30, y_coordinate=0),
+                  Robot(id=4, battery_level=100, x_coordinate=-30, y_coordinate=0)]
+        loads = [Load(id=0, x_coordinate=0, y_coordinate=0), Load(id=1, x_coordinate=0, y_coordinate=100)]
+        self.assert_results_match_linear_path(robots=robots, loads=loads)
+        self.assert_results_match_linear_path(robots=list(reversed(robots)), loads=loads)
+
+    def test_matches_linear_path_for_random_fleets_and_batched_loads(self):
+        random_generator = random.Random(20230302)
+        for spread in [5, 30, 300]:
+            robots = ClosestRobotCalculatorUsingIndexTest.create_random_robots(random_generator=random_generator,
+                                                                               robot_count=300,
+                                                                               spread=spread)
+            loads = [Load(id=load_id,
+                          x_coordinate=random_generator.randint(-2 * spread, 2 * spread),
+                          y_coordinate=random_generator.uniform(-2 * spread, 2 * spread))
+                     for load_id in range(50)]
+            self.assert_results_match_linear_path(robots=robots, loads=loads)
+
+    def test_matches_linear_path_for_other_selection_policies(self):
+        random_generator = random.Random(20230303)
+        selection_policies = [WindowSelectionPolicy(distance_window=40, min_battery_level=50),
+                              WeightedScoreSelectionPolicy(distance_weight=1, battery_weight=0.5),
+                              WeightedScoreSelectionPolicy(distance_weight=2, battery_weight=1, min_battery_level=60)]
+        for selection_policy in selection_policies:
+            for spread in [5, 30, 300]:
+                robots = ClosestRobotCalculatorUsingIndexTest.create_random_robots(random_generator=random_generator,
+                                                                                   robot_count=300,
+                                                                                   spread=spread)
+                loads = [Load(id=load_id,
+                              x_coordinate=random_generator.randint(-2 * spread, 2 * spread),
+                              y_coordinate=random_generator.uniform(-2 * spread, 2 * spread))
+                         for load_id in range(50)]
+                self.assert_results_match_linear_path(robots=robots, loads=loads, selection_policy=selection_policy)
+
+    def test_matches_linear_path_where_squaring_by_multiplication_differs_from_math_pow(self):
+        # Squared by Multiplication, This Robot Is One Bit Farther From the Load Than math.pow Puts It
+        robots = [Robot(id=1, battery_level=100, x_coordinate=-1.0778253313808195, y_coordinate=-3.74158547765275)]
+        loads = [Load(id=0, x_coordinate=0.5014426168317172, y_coordinate=-4.916782719900724)]
+        for selection_policy in [None, WeightedScoreSelectionPolicy(distance_weight=1, battery_weight=0.5)]:
+            self.assert_results_match_linear_path(robots=robots, loads=loads, selection_policy=selection_policy)
+
+    def test_rejects_selection_policies_it_cannot_vectorize(self):
+        with self.assertRaises(ValueError):
+            VectorizedClosestRobotCalculator([], selection_policy=SelectionPolicy())
+
 
 if __name__ == '__main__':
     unittest.main()
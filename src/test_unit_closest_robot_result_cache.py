@@ -0,0 +1,132 @@
+import unittest
+
+# Internal Libraries
+from closest_robot_result_cache import ClosestRobotResultCache
+from fleet_snapshot_cache import FleetSnapshot, FleetSnapshotCache
+from models import Load, Robot
+
+# Internal Test Libraries
+from test_utilities import JSONRobotDatabaseDataTextFixtureUtilities, StubJSONRetriever
+
+
+class ClosestRobotResultCacheUnitTest(unittest.TestCase):
+
+    def setUp(self):
+        self._fleet_snapshot = FleetSnapshot(version=1, robots=[], fetched_at=0)
+        self._calculated_loads = []
+
+    @staticmethod
+    def get_robots_json():
+        return [JSONRobotDatabaseDataTextFixtureUtilities.get_robot_database_data(robot_id=7)]
+
+    def calculate_closest_robot(self, load):
+        self._calculated_loads.append(load)
+        return Robot(id=len(self._calculated_loads), battery_level=50, x_coordinate=0, y_coordinate=0)
+
+    def get_closest_robot(self, result_cache, x_coordinate, y_coordinate, fleet_snapshot=None):
+        return result_cache.get_closest_robot(fleet_snapshot=fleet_snapshot or self._fleet_snapshot,
+                                              load=Load(id=1, x_coordinate=x_coordinate, y_coordinate=y_coordinate),
+                                              calculate_closest_robot=self.calculate_closest_robot)
+
+    def test_repeated_positions_are_only_calculated_once(self):
+        result_cache = ClosestRobotResultCache()
+
+        closest_robots = [self.get_closest_robot(result_cache, 3, 4) for _ in range(3)]
+
+        self.assertEqual(first=[robot.get_id() for robot in closest_robots], second=[1, 1, 1])
+        self.assertEqual(first=[robot.get_distance_to_load() for robot in closest_robots], second=[5.0, 5.0, 5.0])
+        self.assertEqual(first=len(self._calculated_loads), second=1)
+        self.assertEqual(first=(result_cache.get_hit_count(), result_cache.get_miss_count()), second=(2, 1))
+
+    def test_quantized_positions_share_a_result_but_keep_their_own_distance(self):
+        result_cache = ClosestRobotResultCache(quantization=1)
+
+        first_robot = self.get_closest_robot(result_cache, 3, 4)
+        second_robot = self.get_closest_robot(result_cache, 3.2, 3.9)
+
+        self.assertEqual(first=second_robot.get_id(), second=first_robot.get_id())
+        self.assertAlmostEqual(first=second_robot.get_distance_to_load(), second=(3.2 ** 2 + 3.9 ** 2) ** 0.5)
+        self.assertEqual(first=first_robot.get_distance_to_load(), second=5.0)
+
+    def test_least_recently_used_results_are_evicted_first(self):
+        result_cache = ClosestRobotResultCache(max_entry_count=2)
+
+        for x_coordinate in [1, 2, 1, 3, 1, 2]:
+            self.get_closest_robot(result_cache, x_coordinate, 0)
+
+        self.assertEqual(first=[load.get_x_coordinate() for load in self._calculated_loads], second=[1, 2, 3, 2])
+        self.assertEqual(first=result_cache.get_entry_count(), second=2)
+
+    def test_results_are_invalidated_when_robots_change(self):
+        result_cache = ClosestRobotResultCache()
+
+        self.get_closest_robot(result_cache, 1, 1)
+        self.get_closest_robot(result_cache, 1, 1, fleet_snapshot=self._fleet_snapshot.create_updated_snapshot(
+            version=2, robots=[Robot(id=1, battery_level=50, x_coordinate=0, y_coordinate=0)]))
+        self.get_closest_robot(result_cache, 1, 1, fleet_snapshot=FleetSnapshot(version=3, robots=[], fetched_at=0))
+
+        self.assertEqual(first=len(self._calculated_loads), second=3)
+        self.assertEqual(first=result_cache.get_hit_count(), second=0)
+
+    def test_results_survive_refreshes_that_changed_no_robots(self):
+        result_cache = ClosestRobotResultCache()
+        fleet_snapshot_cache = FleetSnapshotCache(json_retriever=StubJSONRetriever([(True, self.get_robots_json()),
+                                                                                    (True, self.get_robots_json())]))
+        fleet_snapshot_cache.refresh()
+        self.get_closest_robot(result_cache, 1, 1, fleet_snapshot=fleet_snapshot_cache.get_snapshot())
+
+        fleet_snapshot_cache.refresh()
+        self.get_closest_robot(result_cache, 1, 1, fleet_snapshot=fleet_snapshot_cache.get_snapshot())
+
+        self.assertEqual(first=len(self._calculated_loads), second=1)
+        self.assertEqual(first=result_cache.get_hit_count(), second=1)
+
+    def test_results_for_an_older_fleet_never_replace_newer_ones(self):
+        result_cache = ClosestRobotResultCache()
+        newer_fleet_snapshot = FleetSnapshot(version=2, robots=[], fetched_at=0)
+        self.get_closest_robot(result_cache, 1, 1, fleet_snapshot=newer_fleet_snapshot)
+
+        self.get_closest_robot(result_cache, 1, 1)
+        self.get_closest_robot(result_cache, 1, 1)
+        self.get_closest_robot(result_cache, 1, 1, fleet_snapshot=newer_fleet_snapshot)
+
+        self.assertEqual(first=len(self._calculated_loads), second=3)
+        self.assertEqual(first=result_cache.get_hit_count(), second=1)
+
+    def test_missing_robots_are_cached_too(self):
+        result_cache = ClosestRobotResultCache()
+        load = Load(id=1, x_coordinate=0, y_coordinate=0)
+        calculated_loads = []
+
+        for _ in range(2):
+            self.assertIsNone(result_cache.get_closest_robot(fleet_snapshot=self._fleet_snapshot,
+                                                             load=load,
+                                                             calculate_closest_robot=calculated_loads.append))
+
+        self.assertEqual(first=calculated_loads, second=[load])
+
+    def test_loads_missing_from_the_cache_are_calculated_together(self):
+        result_cache = ClosestRobotResultCache()
+        self.get_closest_robot(result_cache, 3, 4)
+        loads = [Load(id=load_id, x_coordinate=x_coordinate, y_coordinate=0)
+                 for load_id, x_coordinate in enumerate([5, 3, 7])]
+        loads.insert(1, Load(id=3, x_coordinate=3, y_coordinate=4))
+        calculated_load_batches = []
+
+        def calculate_closest_robots(missing_loads):
+            calculated_load_batches.append(missing_loads)
+            return [self.calculate_closest_robot(load) for load in missing_loads]
+
+        closest_robots = result_cache.get_closest_robots(fleet_snapshot=self._fleet_snapshot,
+                                                         loads=loads,
+                                                         calculate_closest_robots=calculate_closest_robots)
+
+        self.assertEqual(first=[robot.get_id() for robot in closest_robots], second=[2, 1, 3, 4])
+        self.assertEqual(first=[robot.get_distance_to_load() for robot in closest_robots], second=[5.0, 5.0, 3.0, 7.0])
+        self.assertEqual(first=calculated_load_batches, second=[[loads[0], loads[2], loads[3]]])
+        self.assertEqual(first=(result_cache.get_hit_count(), result_cache.get_miss_count()), second=(1, 4))
+        self.assertEqual(first=result_cache.get_entry_count(), second=4)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,562 @@
+import json
+import os
+import tempfile
+import threading
+import time
+import unittest
+import unittest.mock
+
+# Internal Libraries
+import closest_robot_service
+from binary_helpers import MEDIA_TYPE as BINARY_MEDIA_TYPE, RequestBinaryTransformer, ResponseBinaryFormatter
+from closest_robot_result_cache import ClosestRobotResultCache
+from fleet_snapshot_cache import FleetSnapshotCache
+from fleet_snapshot_file import FleetSnapshotFile
+from models import Load, Robot
+from nearest_robot_raster import NearestRobotRaster
+from selection_policies import WindowSelectionPolicy
+
+# Internal Test Libraries
+from test_utilities import JSONRequestTestFixtureUtilities, JSONRobotDatabaseDataTextFixtureUtilities, StubJSONRetriever
+
+
+class ClosestRobotServiceUnitTest(unittest.TestCase):
+    _ENDPOINT_PATH = '/api/robots/closest'
+    _BATCH_ENDPOINT_PATH = '/api/robots/closest/batch'
+    _UPDATES_ENDPOINT_PATH = '/api/robots/updates'
+    _STREAM_ENDPOINT_PATH = '/api/robots/closest/stream'
+    _SUBSCRIPTIONS_ENDPOINT_PATH = '/api/robots/closest/subscriptions'
+    _ERROR_RESPONSE_JSON = {'robotId': None,
+                            'distanceToGoal': None,
+                            'batteryLevel': None}
+
+    def setUp(self):
+        robots_json = [JSONRobotDatabaseDataTextFixtureUtilities.get_robot_database_data(robot_id=1,
+                                                                                         battery_level=50,
+                                                                                         x=0,
+                                                                                         y=5),
+                       JSONRobotDatabaseDataTextFixtureUtilities.get_robot_database_data(robot_id=2,
+                                                                                         battery_level=90,
+                                                                                         x=100,
+                                                                                         y=100)]
+        self.use_robot_database_responses([(True, robots_json)])
+        self._client = closest_robot_service.g_flask_app.test_client()
+
+    def tearDown(self):
+        closest_robot_service.g_fleet_snapshot_cache = self._original_fleet_snapshot_cache
+
+    def use_robot_database_responses(self, responses):
+        if not hasattr(self, '_original_fleet_snapshot_cache'):
+            self._original_fleet_snapshot_cache = closest_robot_service.g_fleet_snapshot_cache
+        closest_robot_service.g_fleet_snapshot_cache = FleetSnapshotCache(json_retriever=StubJSONRetriever(responses))
+
+    def test_valid_post_data_leads_to_closest_robot_response(self):
+        response = self._client.post(self._ENDPOINT_PATH,
+                                     json=JSONRequestTestFixtureUtilities.get_post_data(load_id=1, x=0, y=0))
+
+        self.assertEqual(first=response.status_code, second=200)
+        self.assertEqual(first=response.get_json(), second={'robotId': 1,
+                                                            'distanceToGoal': 5.0,
+                                                            'batteryLevel': 50})
+
+    def test_list_post_data_leads_to_bad_request_response(self):
+        response = self._client.post(self._ENDPOINT_PATH, json=[])
+
+        self.assertEqual(first=response.status_code, second=400)
+        self.assertEqual(first=response.get_json(), second=self._ERROR_RESPONSE_JSON)
+
+    def test_unusable_coordinates_lead_to_bad_request_response(self):
+        for x_coordinate in [float('inf'), float('nan'), 10 ** 400, -1e308]:
+            response = self._client.post(self._ENDPOINT_PATH,
+                                         json=JSONRequestTestFixtureUtilities.get_post_data(x=x_coordinate, y=0))
+
+            self.assertEqual(first=response.status_code, second=400)
+            self.assertEqual(first=response.get_json(), second=self._ERROR_RESPONSE_JSON)
+
+    def test_unavailable_robot_database_leads_to_error_response(self):
+        self.use_robot_database_responses([(False, None)])
+
+        response = self._client.post(self._ENDPOINT_PATH, json=JSONRequestTestFixtureUtilities.get_post_data())
+
+        self.assertEqual(first=response.status_code, second=500)
+        self.assertEqual(first=response.get_json(), second=self._ERROR_RESPONSE_JSON)
+
+    def test_batch_post_returns_results_in_load_order(self):
+        loads_json = [JSONRequestTestFixtureUtilities.get_post_data(load_id=1, x=100, y=90),
+                      JSONRequestTestFixtureUtilities.get_post_data(load_id=2, x=0, y=0)]
+
+        response = self._client.post(self._BATCH_ENDPOINT_PATH, json=loads_json)
+
+        self.assertEqual(first=response.status_code, second=200)
+        self.assertEqual(first=[robot_json['robotId'] for robot_json in response.get_json()], second=[2, 1])
+
+    def test_batch_post_reports_malformed_loads_per_item(self):
+        loads_json = [JSONRequestTestFixtureUtilities.get_post_data(load_id=-1),
+                      'bad_data',
+                      JSONRequestTestFixtureUtilities.get_post_data(load_id=2, x=0, y=0)]
+
+        response = self._client.post(self._BATCH_ENDPOINT_PATH, json=loads_json)
+
+        self.assertEqual(first=response.status_code, second=200)
+        response_json = response.get_json()
+        expected_error_json = dict(self._ERROR_RESPONSE_JSON, error='Load Request JSON is Invalid.')
+        self.assertEqual(first=response_json[0], second=expected_error_json)
+        self.assertEqual(first=response_json[1], second=expected_error_json)
+        self.assertEqual(first=response_json[2]['robotId'], second=1)
+
+    def test_batch_post_of_many_loads_is_vectorized_and_matches_single_load_responses(self):
+        loads_json = [JSONRequestTestFixtureUtilities.get_post_data(load_id=load_id, x=load_id * 11, y=load_id * 10)
+                      for load_id in range(10)]
+
+        # Nothing Is Cached, So the Single Load Responses Are Calculated Afresh Through the Spatial Index
+        with unittest.mock.patch.object(closest_robot_service, 'g_closest_robot_result_cache',
+                                        ClosestRobotResultCache(max_entry_count=0)), \
+                unittest.mock.patch.object(closest_robot_service.calculators, 'VectorizedClosestRobotCalculator',
+                                           wraps=closest_robot_service.calculators.VectorizedClosestRobotCalculator) \
+                as vectorized_calculator_class:
+            response = self._client.post(self._BATCH_ENDPOINT_PATH, json=loads_json)
+            single_load_response_jsons = [self._client.post(self._ENDPOINT_PATH, json=load_json).get_json()
+                                          for load_json in loads_json]
+
+        self.assertEqual(first=response.status_code, second=200)
+        self.assertEqual(first=vectorized_calculator_class.call_count, second=1)
+        self.assertEqual(first=response.get_json(), second=single_load_response_jsons)
+
+    def test_batch_post_fetches_the_fleet_once(self):
+        json_retriever = StubJSONRetriever([(True, [])])
+        closest_robot_service.g_fleet_snapshot_cache = FleetSnapshotCache(json_retriever=json_retriever)
+
+        response = self._client.post(self._BATCH_ENDPOINT_PATH,
+                                     json=[JSONRequestTestFixtureUtilities.get_post_data() for _ in range(10)])
+
+        self.assertEqual(first=response.status_code, second=200)
+        self.assertEqual(first=json_retriever.get_call_count(), second=1)
+        self.assertEqual(first=response.get_json(), second=[self._ERROR_RESPONSE_JSON] * 10)
+
+    def test_exclusive_batch_post_assigns_each_robot_at_most_once(self):
+        loads_json = [JSONRequestTestFixtureUtilities.get_post_data(load_id=1, x=0, y=0),
+                      'bad_data',
+                      JSONRequestTestFixtureUtilities.get_post_data(load_id=2, x=0, y=1),
+                      JSONRequestTestFixtureUtilities.get_post_data(load_id=3, x=0, y=2)]
+
+        response = self._client.post(self._BATCH_ENDPOINT_PATH + '?mode=exclusive', json=loads_json)
+
+        self.assertEqual(first=response.status_code, second=200)
+        response_json = response.get_json()
+        self.assertEqual(first=response_json[1]['error'], second='Load Request JSON is Invalid.')
+        self.assertEqual(first=sorted(robot_json['robotId'] for robot_json in response_json if robot_json['robotId']),
+                         second=[1, 2])
+        self.assertEqual(first=len([robot_json for robot_json in response_json if robot_json['robotId'] is None]),
+                         second=2)
+
+    def test_batch_post_with_unknown_mode_leads_to_bad_request_response(self):
+        response = self._client.post(self._BATCH_ENDPOINT_PATH + '?mode=unknown', json=[])
+
+        self.assertEqual(first=response.status_code, second=400)
+
+    def test_batch_post_of_non_list_leads_to_bad_request_response(self):
+        response = self._client.post(self._BATCH_ENDPOINT_PATH, json=JSONRequestTestFixtureUtilities.get_post_data())
+
+        self.assertEqual(first=response.status_code, second=400)
+        self.assertEqual(first=response.get_json(), second=self._ERROR_RESPONSE_JSON)
+
+    def test_batch_post_of_non_json_leads_to_unsupported_media_type_response(self):
+        response = self._client.post(self._BATCH_ENDPOINT_PATH, data='bad_data')
+
+        self.assertEqual(first=response.status_code, second=415)
+
+    def test_robot_updates_are_applied_to_the_fleet(self):
+        robots_json = [JSONRobotDatabaseDataTextFixtureUtilities.get_robot_database_data(robot_id=2, x=1, y=0),
+                       JSONRobotDatabaseDataTextFixtureUtilities.get_robot_database_data(robot_id=-1),
+                       'bad_data']
+
+        response = self._client.post(self._UPDATES_ENDPOINT_PATH, json=robots_json)
+
+        self.assertEqual(first=response.status_code, second=200)
+        self.assertEqual(first=response.get_json(), second={'appliedUpdates': 1, 'rejectedUpdates': 2})
+        response = self._client.post(self._ENDPOINT_PATH,
+                                     json=JSONRequestTestFixtureUtilities.get_post_data(load_id=1, x=0, y=0))
+        self.assertEqual(first=response.get_json(), second={'robotId': 2,
+                                                            'distanceToGoal': 1.0,
+                                                            'batteryLevel': 100})
+
+    def test_robot_updates_with_unusable_coordinates_are_rejected(self):
+        robots_json = [JSONRobotDatabaseDataTextFixtureUtilities.get_robot_database_data(robot_id=3, x=10 ** 400),
+                       JSONRobotDatabaseDataTextFixtureUtilities.get_robot_database_data(robot_id=4, y=1e308)]
+
+        response = self._client.post(self._UPDATES_ENDPOINT_PATH, json=robots_json)
+
+        self.assertEqual(first=response.status_code, second=200)
+        self.assertEqual(first=response.get_json(), second={'appliedUpdates': 0, 'rejectedUpdates': 2})
+
+    def test_robot_updates_of_non_list_leads_to_bad_request_response(self):
+        response = self._client.post(self._UPDATES_ENDPOINT_PATH, json={})
+
+        self.assertEqual(first=response.status_code, second=400)
+        self.assertEqual(first=response.get_json(), second={'appliedUpdates': None, 'rejectedUpdates': None})
+
+    def test_metrics_endpoint_reports_stage_durations_response_codes_and_fleet_gauges(self):
+        self._client.post(self._ENDPOINT_PATH, json=JSONRequestTestFixtureUtilities.get_post_data(load_id=1, x=0, y=0))
+        self._client.post(self._ENDPOINT_PATH, json=[])
+
+        response = self._client.get('/metrics')
+        metrics_text = response.get_data(as_text=True)
+
+        self.assertEqual(first=response.status_code, second=200)
+        self.assertTrue(response.content_type.startswith('text/plain'))
+        for stage in ['validation', 'fetch', 'calculation', 'serialization']:
+            self.assertIn('closest_robot_stage_duration_seconds_count{{stage="{}"}}'.format(stage), metrics_text)
+        self.assertIn('closest_robot_service_responses_total{endpoint="determine_closest_robot",code="400"}',
+                      metrics_text)
+        self.assertIn('closest_robot_fleet_size 2\n', metrics_text)
+        self.assertIn('closest_robot_fleet_snapshot_age_seconds ', metrics_text)
+
+    def test_request_profiles_are_unavailable_while_profiling_is_disabled(self):
+        response = self._client.get('/admin/profiles')
+
+        self.assertEqual(first=response.status_code, second=404)
+        self.assertEqual(first=response.get_json(), second={'requestProfiles': None})
+
+    def test_only_requests_with_the_profiling_header_are_profiled(self):
+        closest_robot_service.enable_request_profiling()
+        try:
+            self._client.post(self._ENDPOINT_PATH,
+                              json=JSONRequestTestFixtureUtilities.get_post_data(load_id=1, x=100, y=90))
+            profiled_response = self._client.post(self._ENDPOINT_PATH,
+                                                  json=JSONRequestTestFixtureUtilities.get_post_data(load_id=2, x=0,
+                                                                                                     y=0),
+                                                  headers={'X-Profile-Request': '1'})
+
+            response = self._client.get('/admin/profiles')
+        finally:
+            closest_robot_service.disable_request_profiling()
+
+        self.assertEqual(first=profiled_response.get_json(), second={'robotId': 1,
+                                                                     'distanceToGoal': 5.0,
+                                                                     'batteryLevel': 50})
+        self.assertEqual(first=response.status_code, second=200)
+        request_profiles = response.get_json()['requestProfiles']
+        self.assertEqual(first=len(request_profiles), second=1)
+        self.assertEqual(first=request_profiles[0]['function'], second='determine_closest_robot')
+        self.assertTrue(any('calculate_closest_robot_for_load_using_index' in function_entry['function']
+                            for function_entry in request_profiles[0]['functions']))
+
+    def test_repeated_load_positions_are_answered_from_the_result_cache(self):
+        result_cache = closest_robot_service.g_closest_robot_result_cache
+        hit_count = result_cache.get_hit_count()
+
+        responses = [self._client.post(self._ENDPOINT_PATH,
+                                       json=JSONRequestTestFixtureUtilities.get_post_data(load_id=load_id, x=0, y=0))
+                     for load_id in [1, 2]]
+
+        self.assertEqual(first=[response.get_json() for response in responses],
+                         second=[{'robotId': 1, 'distanceToGoal': 5.0, 'batteryLevel': 50}] * 2)
+        self.assertEqual(first=result_cache.get_hit_count(), second=hit_count + 1)
+
+    def test_robot_updates_invalidate_cached_results(self):
+        load_json = JSONRequestTestFixtureUtilities.get_post_data(load_id=1, x=0, y=0)
+        self._client.post(self._ENDPOINT_PATH, json=load_json)
+        self._client.post(self._UPDATES_ENDPOINT_PATH,
+                          json=[JSONRobotDatabaseDataTextFixtureUtilities.get_robot_database_data(robot_id=3,
+                                                                                                  battery_level=70,
+                                                                                                  x=0,
+                                                                                                  y=1)])
+
+        response = self._client.post(self._ENDPOINT_PATH, json=load_json)
+
+        self.assertEqual(first=response.get_json(), second={'robotId': 3,
+                                                            'distanceToGoal': 1.0,
+                                                            'batteryLevel': 70})
+
+    def test_responses_from_an_old_fleet_snapshot_are_flagged_as_stale(self):
+        fresh_response = self._client.post(self._ENDPOINT_PATH, json=JSONRequestTestFixtureUtilities.get_post_data())
+        with unittest.mock.patch.object(closest_robot_service, 'FLEET_SNAPSHOT_STALE_AGE_SECONDS', -1):
+            stale_response = self._client.post(self._ENDPOINT_PATH,
+                                               json=JSONRequestTestFixtureUtilities.get_post_data())
+            stale_batch_response = self._client.post(self._BATCH_ENDPOINT_PATH,
+                                                     json=[JSONRequestTestFixtureUtilities.get_post_data()])
+
+        self.assertNotIn('Warning', fresh_response.headers)
+        self.assertEqual(first=stale_response.status_code, second=200)
+        self.assertEqual(first=stale_response.headers['Warning'], second='110 - "Response is Stale"')
+        self.assertEqual(first=stale_batch_response.headers['Warning'], second='110 - "Response is Stale"')
+
+    def test_responses_from_a_restored_fleet_snapshot_are_flagged_as_stale_until_it_is_refreshed(self):
+        robots_json = [JSONRobotDatabaseDataTextFixtureUtilities.get_robot_database_data(robot_id=1,
+                                                                                         battery_level=50,
+                                                                                         x=0,
+                                                                                         y=5)]
+        with tempfile.TemporaryDirectory() as temporary_directory:
+            fleet_snapshot_file = FleetSnapshotFile(os.path.join(temporary_directory, 'fleet.bin'))
+            fleet_snapshot_file.write(closest_robot_service.g_fleet_snapshot_cache.get_snapshot())
+            fleet_snapshot_cache = FleetSnapshotCache(json_retriever=StubJSONRetriever([(True, robots_json)]),
+                                                      refresh_interval_seconds=60,
+                                                      fleet_snapshot_file=fleet_snapshot_file)
+            closest_robot_service.g_fleet_snapshot_cache = fleet_snapshot_cache
+            fleet_snapshot_cache.restore_snapshot()
+
+            restored_response = self._client.post(self._ENDPOINT_PATH,
+                                                  json=JSONRequestTestFixtureUtilities.get_post_data())
+            fleet_snapshot_cache.refresh()
+            refreshed_response = self._client.post(self._ENDPOINT_PATH,
+                                                   json=JSONRequestTestFixtureUtilities.get_post_data())
+
+        self.assertEqual(first=restored_response.headers['Warning'], second='110 - "Response is Stale"')
+        self.assertEqual(first=restored_response.get_json(), second=refreshed_response.get_json())
+        self.assertNotIn('Warning', refreshed_response.headers)
+
+    def test_binary_post_data_leads_to_binary_closest_robot_response(self):
+        response = self._client.post(self._ENDPOINT_PATH,
+                                     data=RequestBinaryTransformer.get_formatted_request_binary(load_id=1,
+                                                                                                x_coordinate=0,
+                                                                                                y_coordinate=0),
+                                     content_type=BINARY_MEDIA_TYPE,
+                                     headers={'Accept': BINARY_MEDIA_TYPE})
+
+        self.assertEqual(first=response.status_code, second=200)
+        self.assertEqual(first=response.mimetype, second=BINARY_MEDIA_TYPE)
+        self.assertEqual(first=ResponseBinaryFormatter.create_response_jsons_from_response_binary(response.data),
+                         second=[{'robotId': 1, 'distanceToGoal': 5.0, 'batteryLevel': 50.0}])
+
+    def test_binary_post_data_without_binary_accept_header_leads_to_json_response(self):
+        response = self._client.post(self._ENDPOINT_PATH,
+                                     data=RequestBinaryTransformer.get_formatted_request_binary(load_id=1,
+                                                                                                x_coordinate=0,
+                                                                                                y_coordinate=0),
+                                     content_type=BINARY_MEDIA_TYPE)
+
+        self.assertEqual(first=response.status_code, second=200)
+        self.assertEqual(first=response.get_json(), second={'robotId': 1,
+                                                            'distanceToGoal': 5.0,
+                                                            'batteryLevel': 50})
+
+    def test_truncated_binary_post_data_leads_to_binary_bad_request_response(self):
+        response = self._client.post(self._ENDPOINT_PATH,
+                                     data=b'\0' * 5,
+                                     content_type=BINARY_MEDIA_TYPE,
+                                     headers={'Accept': BINARY_MEDIA_TYPE})
+
+        self.assertEqual(first=response.status_code, second=400)
+        self.assertEqual(first=response.data, second=ResponseBinaryFormatter.get_formatted_error_response_binary())
+
+    def test_binary_batch_post_returns_binary_results_in_load_order(self):
+        request_binary = b''.join(RequestBinaryTransformer.get_formatted_request_binary(load_id=load_id,
+                                                                                        x_coordinate=x,
+                                                                                        y_coordinate=y)
+                                  for load_id, x, y in [(1, 100, 90), (2, 0, 0)])
+
+        response = self._client.post(self._BATCH_ENDPOINT_PATH,
+                                     data=request_binary,
+                                     content_type=BINARY_MEDIA_TYPE,
+                                     headers={'Accept': BINARY_MEDIA_TYPE})
+
+        self.assertEqual(first=response.status_code, second=200)
+        self.assertEqual(first=[response_json['robotId'] for response_json
+                                in ResponseBinaryFormatter.create_response_jsons_from_response_binary(response.data)],
+                         second=[2, 1])
+
+    def test_json_batch_post_with_binary_accept_header_flags_malformed_loads(self):
+        response = self._client.post(self._BATCH_ENDPOINT_PATH,
+                                     json=['bad_data', JSONRequestTestFixtureUtilities.get_post_data(x=0, y=0)],
+                                     headers={'Accept': BINARY_MEDIA_TYPE})
+
+        self.assertEqual(first=response.status_code, second=200)
+        self.assertEqual(first=ResponseBinaryFormatter.create_response_jsons_from_response_binary(response.data),
+                         second=[dict(self._ERROR_RESPONSE_JSON, error=True),
+                                 {'robotId': 1, 'distanceToGoal': 5.0, 'batteryLevel': 50.0}])
+
+    def test_candidate_count_returns_the_best_robots_ranked(self):
+        response = self._client.post(self._ENDPOINT_PATH + '?k=5',
+                                     json=JSONRequestTestFixtureUtilities.get_post_data(load_id=1, x=100, y=90))
+
+        single_response = self._client.post(self._ENDPOINT_PATH + '?k=1',
+                                            json=JSONRequestTestFixtureUtilities.get_post_data(load_id=1, x=0, y=0))
+
+        self.assertEqual(first=response.status_code, second=200)
+        self.assertEqual(first=[robot_json['robotId'] for robot_json in response.get_json()], second=[2, 1])
+        self.assertEqual(first=single_response.get_json(), second=[{'robotId': 1,
+                                                                    'distanceToGoal': 5.0,
+                                                                    'batteryLevel': 50}])
+
+    def test_invalid_candidate_count_leads_to_bad_request_response(self):
+        for candidate_count in ['0', '-1', 'two', '101']:
+            response = self._client.post(self._ENDPOINT_PATH + '?k=' + candidate_count,
+                                         json=JSONRequestTestFixtureUtilities.get_post_data())
+
+            self.assertEqual(first=response.status_code, second=400)
+
+    def test_configured_selection_policy_is_used_for_closest_and_ranked_robots(self):
+        with unittest.mock.patch.object(closest_robot_service, 'g_selection_policy',
+                                        WindowSelectionPolicy(min_battery_level=60)):
+            response = self._client.post(self._ENDPOINT_PATH,
+                                         json=JSONRequestTestFixtureUtilities.get_post_data(load_id=1, x=0, y=0))
+            ranked_response = self._client.post(self._ENDPOINT_PATH + '?k=5',
+                                                json=JSONRequestTestFixtureUtilities.get_post_data(load_id=1, x=0,
+                                                                                                   y=0))
+
+        self.assertEqual(first=response.get_json()['robotId'], second=2)
+        self.assertEqual(first=[robot_json['robotId'] for robot_json in ranked_response.get_json()], second=[2])
+
+    def test_invalid_selection_policy_json_is_rejected_at_startup(self):
+        self.assertIs(closest_robot_service._create_selection_policy(''),
+                      closest_robot_service.selection_policies.DEFAULT_SELECTION_POLICY)
+        with self.assertRaises(ValueError):
+            closest_robot_service._create_selection_policy('{"type": "window", "distanceWindow": -1}')
+
+    def test_stream_post_answers_each_line_in_order(self):
+        request_lines = [json.dumps(JSONRequestTestFixtureUtilities.get_post_data(load_id=1, x=100, y=90)),
+                         'bad_data',
+                         '',
+                         json.dumps(JSONRequestTestFixtureUtilities.get_post_data(load_id=2, x=0, y=0))]
+
+        response = self._client.post(self._STREAM_ENDPOINT_PATH,
+                                     data='\n'.join(request_lines),
+                                     content_type='application/x-ndjson')
+
+        self.assertEqual(first=response.status_code, second=200)
+        self.assertTrue(response.is_streamed)
+        response_jsons = [json.loads(response_line) for response_line in response.get_data(as_text=True).splitlines()]
+        self.assertEqual(first=[response_json['robotId'] for response_json in response_jsons], second=[2, None, 1])
+        self.assertEqual(first=response_jsons[1]['error'], second='Load Request JSON is Invalid.')
+
+    def test_streamed_results_are_produced_before_the_request_is_read_to_the_end(self):
+        read_line_count = 0
+
+        def iterate_request_lines():
+            nonlocal read_line_count
+            for load_id in range(3):
+                read_line_count += 1
+                yield json.dumps(JSONRequestTestFixtureUtilities.get_post_data(load_id=load_id, x=0, y=0)) + '\n'
+
+        response_lines = closest_robot_service._iterate_streamed_response_lines(
+            fleet_snapshot=closest_robot_service.g_fleet_snapshot_cache.get_snapshot(),
+            request_lines=iterate_request_lines())
+
+        self.assertEqual(first=json.loads(next(response_lines))['robotId'], second=1)
+        self.assertEqual(first=read_line_count, second=1)
+        self.assertEqual(first=len(list(response_lines)), second=2)
+
+    def test_stream_post_of_json_leads_to_unsupported_media_type_response(self):
+        response = self._client.post(self._STREAM_ENDPOINT_PATH, json=JSONRequestTestFixtureUtilities.get_post_data())
+
+        self.assertEqual(first=response.status_code, second=415)
+
+    def test_subscription_post_streams_closest_robot_events(self):
+        loads_json = [JSONRequestTestFixtureUtilities.get_post_data(load_id=1, x=100, y=90),
+                      JSONRequestTestFixtureUtilities.get_post_data(load_id=2, x=0, y=0)]
+
+        response = self._client.post(self._SUBSCRIPTIONS_ENDPOINT_PATH, json=loads_json)
+        response_events = response.response
+        first_events = [next(response_events), next(response_events)]
+        closest_robot_service.g_fleet_snapshot_cache.apply_robot_updates(
+            [Robot(id=3, battery_level=99, x_coordinate=1, y_coordinate=1)])
+        changed_event = next(response_events)
+        response.close()
+
+        self.assertEqual(first=response.status_code, second=200)
+        self.assertEqual(first=response.mimetype, second='text/event-stream')
+        event_jsons = [json.loads(event.decode().split('data: ')[1]) for event in first_events + [changed_event]]
+        self.assertTrue(first_events[0].startswith(b'event: closestRobot\n'))
+        self.assertEqual(first=[(event_json['loadId'], event_json['robotId']) for event_json in event_jsons],
+                         second=[(1, 2), (2, 1), (2, 3)])
+        self.assertEqual(first=closest_robot_service.g_closest_robot_subscriptions.get_subscription_count(), second=0)
+
+    def test_subscription_post_with_an_invalid_load_leads_to_bad_request_response(self):
+        response = self._client.post(self._SUBSCRIPTIONS_ENDPOINT_PATH,
+                                     json=[JSONRequestTestFixtureUtilities.get_post_data(), 'bad_data'])
+
+        self.assertEqual(first=response.status_code, second=400)
+
+    def test_micro_batched_requests_get_their_own_closest_robots(self):
+        micro_batcher = closest_robot_service.enable_micro_batching(max_wait_seconds=0.001)
+        try:
+            first_response = self._client.post(self._ENDPOINT_PATH,
+                                               json=JSONRequestTestFixtureUtilities.get_post_data(load_id=1, x=0, y=0))
+            second_response = self._client.post(self._ENDPOINT_PATH,
+                                                json=JSONRequestTestFixtureUtilities.get_post_data(load_id=2, x=100,
+                                                                                                   y=90))
+        finally:
+            closest_robot_service.disable_micro_batching()
+
+        self.assertEqual(first=first_response.get_json(), second={'robotId': 1,
+                                                                  'distanceToGoal': 5.0,
+                                                                  'batteryLevel': 50})
+        self.assertEqual(first=second_response.get_json()['robotId'], second=2)
+        self.assertEqual(first=micro_batcher.get_item_count(), second=2)
+
+    def test_concurrent_micro_batched_loads_are_calculated_together(self):
+        calculate_closest_robots = closest_robot_service._calculate_closest_robots
+        is_blocking_batch_released = threading.Event()
+        calculated_load_batches = []
+
+        def calculate_micro_batch(fleet_snapshot, loads):
+            if fleet_snapshot == 'blocking':
+                is_blocking_batch_released.wait()
+                return [None]
+            calculated_load_batches.append(loads)
+            return calculate_closest_robots(fleet_snapshot, loads)
+
+        fleet_snapshot = closest_robot_service.g_fleet_snapshot_cache.get_snapshot()
+        loads = [Load(id=load_id, x_coordinate=load_id * 30, y_coordinate=load_id * 30) for load_id in range(4)]
+        results = {}
+        start_barrier = threading.Barrier(len(loads))
+
+        def submit(load):
+            start_barrier.wait()
+            results[load.get_id()] = micro_batcher.submit(batch_key=fleet_snapshot, item=load)
+
+        with unittest.mock.patch.object(closest_robot_service, '_calculate_closest_robots', calculate_micro_batch), \
+                unittest.mock.patch.object(closest_robot_service, 'g_closest_robot_result_cache',
+                                           ClosestRobotResultCache(max_entry_count=0)), \
+                unittest.mock.patch.object(closest_robot_service.calculators, 'VectorizedClosestRobotCalculator',
+                                           wraps=closest_robot_service.calculators.VectorizedClosestRobotCalculator) \
+                as vectorized_calculator_class:
+            micro_batcher = closest_robot_service.enable_micro_batching(max_wait_seconds=5, max_batch_size=len(loads))
+            try:
+                # Keeps a Submission in Flight, So the Loads Wait to Fill a Batch Instead of Being Calculated at Once
+                blocking_thread = threading.Thread(target=micro_batcher.submit, args=('blocking', None))
+                blocking_thread.start()
+                while micro_batcher.get_batch_count() == 0:
+                    time.sleep(0.001)
+                threads = [threading.Thread(target=submit, args=(load,)) for load in loads]
+                for thread in threads:
+                    thread.start()
+                for thread in threads:
+                    thread.join()
+                is_blocking_batch_released.set()
+                blocking_thread.join()
+            finally:
+                closest_robot_service.disable_micro_batching()
+
+        self.assertEqual(first=[sorted(load.get_id() for load in loads) for loads in calculated_load_batches],
+                         second=[[0, 1, 2, 3]])
+        self.assertEqual(first=vectorized_calculator_class.call_count, second=1)
+        self.assertEqual(first=[results[load.get_id()].get_id() for load in loads], second=[1, 1, 2, 2])
+
+    def test_nearest_robot_raster_answers_loads_on_the_floor(self):
+        original_nearest_robot_raster = closest_robot_service.g_nearest_robot_raster
+        closest_robot_service.g_nearest_robot_raster = NearestRobotRaster(min_x=-20, min_y=-20, max_x=20, max_y=20)
+        try:
+            response = self._client.post(self._ENDPOINT_PATH,
+                                         json=JSONRequestTestFixtureUtilities.get_post_data(load_id=1, x=0, y=0))
+            nearest_robot_raster = closest_robot_service.g_nearest_robot_raster
+        finally:
+            closest_robot_service.g_nearest_robot_raster = original_nearest_robot_raster
+
+        self.assertEqual(first=response.get_json(), second={'robotId': 1,
+                                                            'distanceToGoal': 5.0,
+                                                            'batteryLevel': 50})
+        self.assertEqual(first=nearest_robot_raster.get_cell_count(), second=1)
+
+    def test_malformed_nearest_robot_raster_bounds_are_rejected_at_startup(self):
+        with self.assertRaises(ValueError):
+            closest_robot_service._create_nearest_robot_raster(bounds_text='0,0,100',
+                                                               resolution=5,
+                                                               selection_policy=WindowSelectionPolicy())
+        self.assertIsNone(closest_robot_service._create_nearest_robot_raster(bounds_text='',
+                                                                             resolution=5,
+                                                                             selection_policy=WindowSelectionPolicy()))
+
+
+if __name__ == '__main__':
+    unittest.main()
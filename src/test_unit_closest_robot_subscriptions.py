@@ -0,0 +1,110 @@
+import random
+import unittest
+
+# Internal Libraries
+from closest_robot_subscriptions import ClosestRobotSubscriptions
+from fleet_snapshot_cache import FleetSnapshotCache
+from models import Load, Robot
+from selection_policies import WeightedScoreSelectionPolicy, WindowSelectionPolicy
+
+# Internal Test Libraries
+from test_utilities import StubJSONRetriever
+
+
+class ClosestRobotSubscriptionsUnitTest(unittest.TestCase):
+
+    @staticmethod
+    def create_fleet_snapshot_cache(robots):
+        fleet_snapshot_cache = FleetSnapshotCache(json_retriever=StubJSONRetriever([(False, None)]))
+        fleet_snapshot_cache.apply_robot_updates(robots)
+        return fleet_snapshot_cache
+
+    @staticmethod
+    def get_events(subscription):
+        events = []
+        event = subscription.get_event(timeout_seconds=0)
+        while event is not None:
+            load, closest_robot = event
+            events.append((load.get_id(), None if closest_robot is None else closest_robot.get_id()))
+            event = subscription.get_event(timeout_seconds=0)
+        return events
+
+    def setUp(self):
+        self._fleet_snapshot_cache = self.create_fleet_snapshot_cache([
+            Robot(id=1, battery_level=50, x_coordinate=0, y_coordinate=0),
+            Robot(id=2, battery_level=50, x_coordinate=500, y_coordinate=500)])
+        self._subscriptions = ClosestRobotSubscriptions(selection_policy=WindowSelectionPolicy())
+        self._subscriptions.watch(self._fleet_snapshot_cache)
+        self._subscription = self._subscriptions.subscribe(
+            fleet_snapshot=self._fleet_snapshot_cache.get_snapshot(),
+            loads=[Load(id=10, x_coordinate=1, y_coordinate=1), Load(id=20, x_coordinate=499, y_coordinate=499)])
+
+    def test_subscribe_sends_the_current_closest_robot_for_every_load(self):
+        self.assertEqual(first=self.get_events(self._subscription), second=[(10, 1), (20, 2)])
+
+    def test_only_loads_whose_closest_robot_changed_are_sent_events(self):
+        self.get_events(self._subscription)
+
+        self._fleet_snapshot_cache.apply_robot_updates([Robot(id=3, battery_level=90, x_coordinate=2, y_coordinate=2)])
+
+        self.assertEqual(first=self.get_events(self._subscription), second=[(10, 3)])
+
+    def test_distant_robot_changes_recalculate_nothing(self):
+        self.get_events(self._subscription)
+        calculation_count = self._subscriptions.get_calculation_count()
+
+        self._fleet_snapshot_cache.apply_robot_updates([Robot(id=3, battery_level=90, x_coordinate=250,
+                                                              y_coordinate=250)])
+
+        self.assertEqual(first=self.get_events(self._subscription), second=[])
+        self.assertEqual(first=self._subscriptions.get_calculation_count(), second=calculation_count)
+
+    def test_loads_losing_their_robot_are_reassigned(self):
+        self.get_events(self._subscription)
+
+        self._fleet_snapshot_cache.apply_robot_updates([Robot(id=1, battery_level=0, x_coordinate=0, y_coordinate=0)])
+
+        self.assertEqual(first=self.get_events(self._subscription), second=[(10, 2)])
+
+    def test_unsubscribed_subscriptions_are_sent_nothing(self):
+        self.get_events(self._subscription)
+
+        self._subscriptions.unsubscribe(self._subscription)
+        self._fleet_snapshot_cache.apply_robot_updates([Robot(id=3, battery_level=90, x_coordinate=2, y_coordinate=2)])
+
+        self.assertEqual(first=self.get_events(self._subscription), second=[])
+        self.assertEqual(first=self._subscriptions.get_subscription_count(), second=0)
+
+    def test_latest_events_match_recalculated_closest_robots_after_random_updates(self):
+        random_generator = random.Random(20230412)
+        for selection_policy in [WindowSelectionPolicy(),
+                                 WeightedScoreSelectionPolicy(distance_weight=1, battery_weight=0.5)]:
+            fleet_snapshot_cache = self.create_fleet_snapshot_cache([
+                Robot(id=robot_id,
+                      battery_level=random_generator.choice([0, 20, 50, 80]),
+                      x_coordinate=random_generator.uniform(-100, 100),
+                      y_coordinate=random_generator.uniform(-100, 100))
+                for robot_id in range(40)])
+            subscriptions = ClosestRobotSubscriptions(selection_policy=selection_policy)
+            subscriptions.watch(fleet_snapshot_cache)
+            loads = [Load(id=load_id,
+                          x_coordinate=random_generator.uniform(-120, 120),
+                          y_coordinate=random_generator.uniform(-120, 120))
+                     for load_id in range(30)]
+            subscription = subscriptions.subscribe(fleet_snapshot=fleet_snapshot_cache.get_snapshot(), loads=loads)
+            latest_robot_ids = {}
+            for _ in range(100):
+                fleet_snapshot_cache.apply_robot_updates([
+                    Robot(id=random_generator.randint(0, 45),
+                          battery_level=random_generator.choice([0, 20, 50, 80]),
+                          x_coordinate=random_generator.uniform(-100, 100),
+                          y_coordinate=random_generator.uniform(-100, 100))])
+                latest_robot_ids.update(self.get_events(subscription))
+                robot_spatial_index = fleet_snapshot_cache.get_snapshot().get_robot_spatial_index()
+                expected_robot_ids = {load.get_id(): selection_policy.select_robot_using_index(
+                    robot_spatial_index=robot_spatial_index, load=load).get_id() for load in loads}
+                self.assertEqual(first=latest_robot_ids, second=expected_robot_ids)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,366 @@
+import os
+import random
+import tempfile
+import threading
+import time
+import unittest
+
+# Internal Libraries
+from calculators import ClosestRobotCalculator
+from fleet_snapshot_cache import FleetSnapshot, FleetSnapshotCache
+from fleet_snapshot_file import FleetSnapshotFile
+from models import Robot, RobotFleet, Load
+
+# Internal Test Libraries
+from test_utilities import JSONRobotDatabaseDataTextFixtureUtilities, StubJSONRetriever
+
+
+class FleetSnapshotUnitTest(unittest.TestCase):
+
+    def test_create_from_robot_database_json_keeps_only_valid_robots(self):
+        valid_robot_json = JSONRobotDatabaseDataTextFixtureUtilities.get_robot_database_data(robot_id=1)
+        invalid_robot_json = JSONRobotDatabaseDataTextFixtureUtilities.get_robot_database_data(robot_id=-1)
+
+        snapshot = FleetSnapshot.create_from_robot_database_json(version=3,
+                                                                 robots_json=[valid_robot_json, invalid_robot_json])
+
+        self.assertEqual(first=snapshot.get_version(), second=3)
+        self.assertEqual(first=[robot.get_id() for robot in snapshot.get_robot_fleet()], second=[1])
+        self.assertEqual(first=snapshot.get_robot_spatial_index().get_robot_count(), second=1)
+
+    def test_snapshot_age_grows_from_fetch_time(self):
+        snapshot = FleetSnapshot.create_from_robot_database_json(version=1,
+                                                                 robots_json=[],
+                                                                 fetched_at=time.monotonic() - 5)
+
+        self.assertGreaterEqual(a=snapshot.get_age(), b=5)
+
+    def test_create_updated_snapshot_replaces_known_robots_and_appends_new_ones(self):
+        robots_json = [JSONRobotDatabaseDataTextFixtureUtilities.get_robot_database_data(robot_id=1, x=0, y=0),
+                       JSONRobotDatabaseDataTextFixtureUtilities.get_robot_database_data(robot_id=2, x=50, y=50)]
+        snapshot = FleetSnapshot.create_from_robot_database_json(version=1, robots_json=robots_json)
+
+        updated_snapshot = snapshot.create_updated_snapshot(
+            version=2, robots=[Robot(id=2, battery_level=10, x_coordinate=1, y_coordinate=1),
+                               Robot(id=3, battery_level=10, x_coordinate=2, y_coordinate=2)])
+
+        self.assertEqual(first=updated_snapshot.get_version(), second=2)
+        self.assertEqual(first=[(robot.get_id(), robot.get_x_coordinate())
+                                for robot in updated_snapshot.get_robot_fleet()],
+                         second=[(1, 0), (2, 1), (3, 2)])
+        self.assertEqual(first=updated_snapshot.get_robot_spatial_index().get_robot_count(), second=3)
+        self.assertEqual(first=updated_snapshot.get_robot_by_id(3).get_x_coordinate(), second=2)
+
+    def test_create_updated_snapshot_leaves_the_snapshot_unchanged(self):
+        robots_json = [JSONRobotDatabaseDataTextFixtureUtilities.get_robot_database_data(robot_id=1, x=0, y=0),
+                       JSONRobotDatabaseDataTextFixtureUtilities.get_robot_database_data(robot_id=2, x=50, y=50)]
+        snapshot = FleetSnapshot.create_from_robot_database_json(version=1, robots_json=robots_json)
+
+        snapshot.create_updated_snapshot(version=2, robots=[Robot(id=2, battery_level=10, x_coordinate=1,
+                                                                   y_coordinate=1),
+                                                             Robot(id=3, battery_level=10, x_coordinate=2,
+                                                                   y_coordinate=2)])
+        entries = snapshot.get_robot_spatial_index().find_robots_within_distance(x_coordinate=0, y_coordinate=0,
+                                                                                 distance=10)
+
+        self.assertEqual(first=snapshot.get_version(), second=1)
+        self.assertEqual(first=[(robot.get_id(), robot.get_x_coordinate()) for robot in snapshot.get_robot_fleet()],
+                         second=[(1, 0), (2, 50)])
+        self.assertEqual(first=[robot.get_id() for _, robot, _ in entries], second=[1])
+        self.assertIsNone(snapshot.get_robot_by_id(3))
+
+    def test_index_matches_linear_path_after_many_robot_updates(self):
+        random_generator = random.Random(20230307)
+        snapshot = FleetSnapshot(version=1, robots=[], fetched_at=time.monotonic())
+        for version in range(2, 200):
+            robot = Robot(id=random_generator.randint(0, 50),
+                          battery_level=random_generator.choice([0, 20, 80]),
+                          x_coordinate=random_generator.uniform(-40, 40),
+                          y_coordinate=random_generator.uniform(-40, 40))
+            snapshot = snapshot.create_updated_snapshot(version=version, robots=[robot])
+        for load_id in range(50):
+            load = Load(id=load_id,
+                        x_coordinate=random_generator.uniform(-60, 60),
+                        y_coordinate=random_generator.uniform(-60, 60))
+            expected_robot = ClosestRobotCalculator.calculate_closest_robot_for_load(robots=snapshot.get_robot_fleet(),
+                                                                                     load=load)
+            closest_robot = ClosestRobotCalculator.calculate_closest_robot_for_load_using_index(
+                robot_spatial_index=snapshot.get_robot_spatial_index(), load=load)
+            self.assertEqual(first=closest_robot.get_id(), second=expected_robot.get_id())
+
+    def test_changed_robot_ids_hold_changed_and_appended_robots(self):
+        robots = [Robot(id=1, battery_level=50, x_coordinate=0, y_coordinate=0),
+                  Robot(id=2, battery_level=50, x_coordinate=5, y_coordinate=5)]
+        previous_snapshot = FleetSnapshot(version=1, robots=robots, fetched_at=time.monotonic())
+        snapshot = FleetSnapshot(version=2,
+                                 robots=robots[:1] + [Robot(id=2, battery_level=40, x_coordinate=5, y_coordinate=5),
+                                                      Robot(id=3, battery_level=50, x_coordinate=9, y_coordinate=9)],
+                                 fetched_at=time.monotonic())
+
+        self.assertEqual(first=snapshot.get_changed_robot_ids(previous_snapshot), second={2, 3})
+        self.assertIsNone(previous_snapshot.get_changed_robot_ids(snapshot))
+
+
+class FleetSnapshotCacheUnitTest(unittest.TestCase):
+
+    @staticmethod
+    def get_robots_json(robot_id):
+        return [JSONRobotDatabaseDataTextFixtureUtilities.get_robot_database_data(robot_id=robot_id)]
+
+    @staticmethod
+    def hold_fetches_until(json_retriever, fetch_released):
+        get_json_data = json_retriever.get_json_data
+
+        def get_json_data_once_released():
+            fetch_released.wait()
+            return get_json_data()
+
+        json_retriever.get_json_data = get_json_data_once_released
+
+    def test_get_snapshot_fetches_synchronously_on_cold_start(self):
+        json_retriever = StubJSONRetriever([(True, self.get_robots_json(robot_id=7))])
+        cache = FleetSnapshotCache(json_retriever=json_retriever)
+
+        snapshot = cache.get_snapshot()
+
+        self.assertEqual(first=snapshot.get_version(), second=1)
+        self.assertEqual(first=snapshot.get_robot_fleet()[0].get_id(), second=7)
+        self.assertEqual(first=json_retriever.get_call_count(), second=1)
+
+    def test_get_snapshot_does_not_refetch_while_snapshot_is_fresh(self):
+        json_retriever = StubJSONRetriever([(True, self.get_robots_json(robot_id=7))])
+        cache = FleetSnapshotCache(json_retriever=json_retriever, refresh_interval_seconds=60)
+
+        first_snapshot = cache.get_snapshot()
+        second_snapshot = cache.get_snapshot()
+
+        self.assertIs(first_snapshot, second_snapshot)
+        self.assertEqual(first=json_retriever.get_call_count(), second=1)
+
+    def test_get_snapshot_returns_none_when_upstream_is_unavailable_on_cold_start(self):
+        cache = FleetSnapshotCache(json_retriever=StubJSONRetriever([(False, None)]))
+
+        self.assertIsNone(cache.get_snapshot())
+
+    def test_cold_start_callers_share_one_fetch_whatever_its_outcome(self):
+        for response in [(True, self.get_robots_json(robot_id=7)), (False, None)]:
+            json_retriever = StubJSONRetriever([response])
+            fetch_released = threading.Event()
+            self.hold_fetches_until(json_retriever, fetch_released)
+            cache = FleetSnapshotCache(json_retriever=json_retriever)
+            snapshots = []
+            threads = [threading.Thread(target=lambda: snapshots.append(cache.get_snapshot())) for _ in range(8)]
+            for thread in threads:
+                thread.start()
+            time.sleep(0.1)
+
+            fetch_released.set()
+            for thread in threads:
+                thread.join()
+
+            self.assertEqual(first=json_retriever.get_call_count(), second=1)
+            self.assertEqual(first=len(snapshots), second=8)
+            self.assertTrue(all(snapshot is cache.peek_snapshot() for snapshot in snapshots))
+
+    def test_refreshed_snapshots_are_persisted_and_restored_while_upstream_is_unavailable(self):
+        with tempfile.TemporaryDirectory() as temporary_directory:
+            fleet_snapshot_file = FleetSnapshotFile(os.path.join(temporary_directory, 'fleet.bin'))
+            FleetSnapshotCache(json_retriever=StubJSONRetriever([(True, self.get_robots_json(robot_id=7))]),
+                               fleet_snapshot_file=fleet_snapshot_file).refresh()
+            json_retriever = StubJSONRetriever([(False, None)])
+            cache = FleetSnapshotCache(json_retriever=json_retriever, refresh_interval_seconds=60,
+                                       fleet_snapshot_file=fleet_snapshot_file)
+
+            self.assertTrue(cache.restore_snapshot())
+            snapshot = cache.get_snapshot()
+
+        self.assertEqual(first=snapshot.get_version(), second=1)
+        self.assertEqual(first=snapshot.get_robot_fleet()[0].get_id(), second=7)
+        self.assertEqual(first=json_retriever.get_call_count(), second=0)
+
+    def test_restored_snapshot_stays_flagged_as_restored_until_the_first_refresh(self):
+        with tempfile.TemporaryDirectory() as temporary_directory:
+            fleet_snapshot_file = FleetSnapshotFile(os.path.join(temporary_directory, 'fleet.bin'))
+            fleet_snapshot_file.write(FleetSnapshot.create_from_robot_database_json(
+                version=1, robots_json=self.get_robots_json(robot_id=7)))
+            cache = FleetSnapshotCache(json_retriever=StubJSONRetriever([(False, None),
+                                                                         (True, self.get_robots_json(robot_id=7))]),
+                                       fleet_snapshot_file=fleet_snapshot_file)
+            cache.restore_snapshot()
+
+            cache.apply_robot_updates([Robot(id=8, battery_level=5, x_coordinate=1, y_coordinate=2)])
+            is_restored_after_robot_updates = cache.peek_snapshot().is_restored_from_file()
+            cache.refresh()
+            is_restored_after_failed_refresh = cache.peek_snapshot().is_restored_from_file()
+            cache.refresh()
+
+        self.assertTrue(is_restored_after_robot_updates)
+        self.assertTrue(is_restored_after_failed_refresh)
+        self.assertFalse(cache.peek_snapshot().is_restored_from_file())
+
+    def test_restore_snapshot_does_nothing_without_a_persisted_snapshot(self):
+        with tempfile.TemporaryDirectory() as temporary_directory:
+            cache = FleetSnapshotCache(json_retriever=StubJSONRetriever([(False, None)]),
+                                       fleet_snapshot_file=FleetSnapshotFile(os.path.join(temporary_directory,
+                                                                                          'fleet.bin')))
+
+            self.assertFalse(cache.restore_snapshot())
+        self.assertIsNone(cache.peek_snapshot())
+
+    def test_failed_refresh_keeps_serving_last_snapshot(self):
+        json_retriever = StubJSONRetriever([(True, self.get_robots_json(robot_id=7)), (False, None)])
+        cache = FleetSnapshotCache(json_retriever=json_retriever)
+        cache.refresh()
+
+        self.assertFalse(cache.refresh())
+        self.assertEqual(first=cache.get_snapshot().get_version(), second=1)
+
+    def test_refresh_ignores_non_list_payloads(self):
+        cache = FleetSnapshotCache(json_retriever=StubJSONRetriever([(True, {'error': 'unavailable'})]))
+
+        self.assertFalse(cache.refresh())
+
+    def test_refresh_uses_robot_fleets_built_by_streaming_retrievers(self):
+        robot_fleet = RobotFleet.create_from_robots([Robot(id=4, battery_level=50, x_coordinate=1, y_coordinate=2)])
+        cache = FleetSnapshotCache(json_retriever=StubJSONRetriever([(True, robot_fleet)]))
+
+        self.assertTrue(cache.refresh())
+        self.assertIs(cache.get_snapshot().get_robot_fleet(), robot_fleet)
+        self.assertEqual(first=cache.get_snapshot().get_robot_spatial_index().get_robot_count(), second=1)
+
+    def test_apply_robot_updates_bumps_the_snapshot_version(self):
+        cache = FleetSnapshotCache(json_retriever=StubJSONRetriever([(True, self.get_robots_json(robot_id=7))]))
+        cache.refresh()
+
+        cache.apply_robot_updates([Robot(id=7, battery_level=5, x_coordinate=1, y_coordinate=2)])
+
+        snapshot = cache.get_snapshot()
+        self.assertEqual(first=snapshot.get_version(), second=2)
+        self.assertEqual(first=snapshot.get_robot_fleet()[0].get_battery_level(), second=5)
+
+    def test_apply_robot_updates_swaps_in_a_new_snapshot(self):
+        cache = FleetSnapshotCache(json_retriever=StubJSONRetriever([(True, self.get_robots_json(robot_id=7))]))
+        cache.refresh()
+        previous_snapshot = cache.get_snapshot()
+
+        cache.apply_robot_updates([Robot(id=7, battery_level=5, x_coordinate=1, y_coordinate=2)])
+
+        self.assertIsNot(cache.get_snapshot(), previous_snapshot)
+        self.assertEqual(first=previous_snapshot.get_version(), second=1)
+        self.assertNotEqual(first=previous_snapshot.get_robot_fleet()[0].get_battery_level(), second=5)
+
+    def test_refresh_keeps_robots_pushed_while_it_was_fetching(self):
+        json_retriever = StubJSONRetriever([(True, self.get_robots_json(robot_id=7))])
+        cache = FleetSnapshotCache(json_retriever=json_retriever)
+        cache.refresh()
+        get_json_data = json_retriever.get_json_data
+
+        def get_json_data_while_a_robot_is_pushed():
+            response = get_json_data()
+            cache.apply_robot_updates([Robot(id=7, battery_level=5, x_coordinate=1, y_coordinate=2)])
+            return response
+
+        json_retriever.get_json_data = get_json_data_while_a_robot_is_pushed
+        cache.refresh()
+        merged_snapshot = cache.get_snapshot()
+        json_retriever.get_json_data = get_json_data
+        cache.refresh()
+
+        self.assertEqual(first=merged_snapshot.get_version(), second=3)
+        self.assertEqual(first=merged_snapshot.get_robot_fleet()[0].get_battery_level(), second=5)
+        self.assertEqual(first=cache.get_snapshot().get_robot_fleet()[0].get_battery_level(), second=100)
+
+    def test_snapshot_listeners_are_told_which_robots_changed(self):
+        json_retriever = StubJSONRetriever([(True, self.get_robots_json(robot_id=7)),
+                                            (True, self.get_robots_json(robot_id=7)),
+                                            (True, self.get_robots_json(robot_id=8))])
+        cache = FleetSnapshotCache(json_retriever=json_retriever)
+        notifications = []
+        cache.add_snapshot_listener(lambda snapshot, changed_robot_ids: notifications.append(changed_robot_ids))
+
+        cache.refresh()
+        cache.refresh()
+        cache.apply_robot_updates([Robot(id=7, battery_level=5, x_coordinate=1, y_coordinate=2)])
+        cache.refresh()
+
+        self.assertEqual(first=notifications, second=[None, set(), {7}, None])
+
+    def test_apply_robot_updates_creates_a_snapshot_on_cold_start(self):
+        cache = FleetSnapshotCache(json_retriever=StubJSONRetriever([(False, None)]))
+
+        cache.apply_robot_updates([Robot(id=7, battery_level=5, x_coordinate=1, y_coordinate=2)])
+
+        self.assertEqual(first=[robot.get_id() for robot in cache.get_snapshot().get_robot_fleet()], second=[7])
+
+    def test_stale_snapshot_is_served_while_revalidating_in_background(self):
+        json_retriever = StubJSONRetriever([(True, self.get_robots_json(robot_id=7)),
+                                            (True, self.get_robots_json(robot_id=8))])
+        cache = FleetSnapshotCache(json_retriever=json_retriever, refresh_interval_seconds=0)
+        cache.refresh()
+
+        stale_snapshot = cache.get_snapshot()
+        deadline = time.monotonic() + 5
+        while cache.get_snapshot().get_version() == 1 and time.monotonic() < deadline:
+            time.sleep(0.01)
+
+        self.assertEqual(first=stale_snapshot.get_robot_fleet()[0].get_id(), second=7)
+        self.assertEqual(first=cache.get_snapshot().get_robot_fleet()[0].get_id(), second=8)
+
+    def test_burst_of_stale_requests_starts_one_background_refresh(self):
+        json_retriever = StubJSONRetriever([(True, self.get_robots_json(robot_id=7)),
+                                            (True, self.get_robots_json(robot_id=8))])
+        cache = FleetSnapshotCache(json_retriever=json_retriever, refresh_interval_seconds=0)
+        cache.refresh()
+        fetch_released = threading.Event()
+        self.hold_fetches_until(json_retriever, fetch_released)
+
+        for _ in range(20):
+            cache.get_snapshot()
+        fetch_released.set()
+        deadline = time.monotonic() + 5
+        while cache.peek_snapshot().get_version() == 1 and time.monotonic() < deadline:
+            time.sleep(0.01)
+
+        self.assertEqual(first=json_retriever.get_call_count(), second=2)
+        self.assertEqual(first=cache.peek_snapshot().get_robot_fleet()[0].get_id(), second=8)
+
+    def test_background_refresher_keeps_going_after_a_refresh_raises(self):
+        json_retriever = StubJSONRetriever([(True, None), (True, self.get_robots_json(robot_id=8))])
+        get_json_data = json_retriever.get_json_data
+
+        def get_json_data_raising_once():
+            is_successful, robots_json = get_json_data()
+            if robots_json is None:
+                raise OverflowError('Robot Id Too Large.')
+            return is_successful, robots_json
+
+        json_retriever.get_json_data = get_json_data_raising_once
+        cache = FleetSnapshotCache(json_retriever=json_retriever, refresh_interval_seconds=0.01)
+
+        with self.assertLogs('fleet_snapshot_cache', level='ERROR'):
+            cache.start()
+            deadline = time.monotonic() + 5
+            while cache.peek_snapshot() is None and time.monotonic() < deadline:
+                time.sleep(0.01)
+        cache.stop()
+
+        self.assertEqual(first=cache.get_snapshot().get_robot_fleet()[0].get_id(), second=8)
+
+    def test_background_refresher_swaps_in_new_snapshots(self):
+        json_retriever = StubJSONRetriever([(True, self.get_robots_json(robot_id=7)),
+                                            (True, self.get_robots_json(robot_id=8))])
+        cache = FleetSnapshotCache(json_retriever=json_retriever, refresh_interval_seconds=0.01)
+
+        cache.start()
+        deadline = time.monotonic() + 5
+        while (cache.get_snapshot() is None or cache.get_snapshot().get_version() < 2) and \
+                time.monotonic() < deadline:
+            time.sleep(0.01)
+        cache.stop()
+
+        self.assertFalse(cache.is_running())
+        self.assertEqual(first=cache.get_snapshot().get_robot_fleet()[0].get_id(), second=8)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,79 @@
+import os
+import tempfile
+import time
+import unittest
+import unittest.mock
+
+# Internal Libraries
+from fleet_snapshot_cache import FleetSnapshot
+from fleet_snapshot_file import FleetSnapshotFile
+from models import Robot
+from spatial_index import RobotSpatialIndex
+
+
+class FleetSnapshotFileUnitTest(unittest.TestCase):
+
+    def setUp(self):
+        self._temporary_directory = tempfile.TemporaryDirectory()
+        self._fleet_snapshot_file = FleetSnapshotFile(os.path.join(self._temporary_directory.name, 'fleet.bin'))
+
+    def tearDown(self):
+        self._temporary_directory.cleanup()
+
+    @staticmethod
+    def create_fleet_snapshot(fetched_at=None):
+        return FleetSnapshot(version=4,
+                             robots=[Robot(id=1, battery_level=50, x_coordinate=1, y_coordinate=2),
+                                     Robot(id=2, battery_level=75.5, x_coordinate=3.5, y_coordinate=-4)],
+                             fetched_at=time.monotonic() if fetched_at is None else fetched_at)
+
+    def test_written_snapshot_is_read_back_with_the_same_robots_and_age(self):
+        self.assertTrue(self._fleet_snapshot_file.write(self.create_fleet_snapshot(fetched_at=time.monotonic() - 60)))
+
+        fleet_snapshot = self._fleet_snapshot_file.read(version=9)
+
+        self.assertEqual(first=fleet_snapshot.get_version(), second=9)
+        self.assertEqual(first=[(robot.get_id(), robot.get_battery_level(), robot.get_x_coordinate(),
+                                 robot.get_y_coordinate()) for robot in fleet_snapshot.get_robot_fleet()],
+                         second=[(1, 50, 1, 2), (2, 75.5, 3.5, -4)])
+        self.assertIs(type(fleet_snapshot.get_robot_fleet()[0].get_battery_level()), int)
+        self.assertEqual(first=fleet_snapshot.get_robot_spatial_index().get_robot_count(), second=2)
+        self.assertAlmostEqual(first=fleet_snapshot.get_age(), second=60, delta=1)
+
+    def test_read_snapshot_is_flagged_as_restored_and_builds_its_index_on_first_use(self):
+        written_fleet_snapshot = self.create_fleet_snapshot()
+        self._fleet_snapshot_file.write(written_fleet_snapshot)
+
+        with unittest.mock.patch('fleet_snapshot_cache.RobotSpatialIndex', wraps=RobotSpatialIndex) as index_class:
+            fleet_snapshot = self._fleet_snapshot_file.read(version=9)
+            index_count_after_read = index_class.call_count
+            robot_spatial_index = fleet_snapshot.get_robot_spatial_index()
+
+        self.assertFalse(written_fleet_snapshot.is_restored_from_file())
+        self.assertTrue(fleet_snapshot.is_restored_from_file())
+        self.assertEqual(first=(index_count_after_read, index_class.call_count), second=(0, 1))
+        self.assertEqual(first=robot_spatial_index.find_nearest_robot(3, -3)[0], second=1)
+        self.assertIs(fleet_snapshot.get_robot_spatial_index(), robot_spatial_index)
+
+    def test_missing_file_is_read_as_no_snapshot(self):
+        self.assertIsNone(self._fleet_snapshot_file.read(version=1))
+
+    def test_unrecognised_or_truncated_files_are_read_as_no_snapshot(self):
+        self._fleet_snapshot_file.write(self.create_fleet_snapshot())
+        with open(self._fleet_snapshot_file.get_path(), 'rb') as snapshot_file:
+            file_bytes = snapshot_file.read()
+
+        for corrupt_file_bytes in [b'', b'NOTFLEET' + file_bytes[8:], file_bytes[:-1]]:
+            with open(self._fleet_snapshot_file.get_path(), 'wb') as snapshot_file:
+                snapshot_file.write(corrupt_file_bytes)
+            self.assertIsNone(self._fleet_snapshot_file.read(version=1))
+
+    def test_failed_write_is_reported_and_leaves_nothing_behind(self):
+        fleet_snapshot_file = FleetSnapshotFile(os.path.join(self._temporary_directory.name, 'missing', 'fleet.bin'))
+
+        self.assertFalse(fleet_snapshot_file.write(self.create_fleet_snapshot()))
+        self.assertEqual(first=os.listdir(self._temporary_directory.name), second=[])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,7 +1,10 @@
+import json
 import unittest
 
 # Internal Libraries
-from json_helpers import ResponseJSONFormatter, RequestJSONTransformer, RobotDatabaseJSONTransformer
+from json_helpers import ResponseJSONFormatter, RequestJSONTransformer, RobotDatabaseJSONTransformer, \
+    JSONArrayStreamDecoder, SelectionPolicyJSONTransformer
+from selection_policies import WeightedScoreSelectionPolicy, WindowSelectionPolicy
 
 # Internal Test Libraries
 from test_utilities import JSONRequestTestFixtureUtilities, JSONRobotDatabaseDataTextFixtureUtilities
@@ -28,12 +31,33 @@ class ResponseJSONFormatterUnitTest(unittest.TestCase):
 
         self.assertEqual(first=json_data, second=expected_json_data)
 
+    def test_get_formatted_batch_item_error_response_json(self):
+        json_data = ResponseJSONFormatter.get_formatted_batch_item_error_response_json(error_message='Bad Load.')
+
+        expected_json_data = {'robotId': None,
+                              'distanceToGoal': None,
+                              'batteryLevel': None,
+                              'error': 'Bad Load.'}
+
+        self.assertEqual(first=json_data, second=expected_json_data)
+
+    def test_get_formatted_update_response_json(self):
+        json_data = ResponseJSONFormatter.get_formatted_update_response_json(applied_update_count=3,
+                                                                             rejected_update_count=1)
+
+        self.assertEqual(first=json_data, second={'appliedUpdates': 3, 'rejectedUpdates': 1})
+
 
 class RequestJSONTransformerUnitTest(unittest.TestCase):
 
     def test_is_request_json_valid_returns_false_when_json_is_empty(self):
         self.assertFalse(RequestJSONTransformer.is_request_json_valid({}))
 
+    def test_is_request_json_valid_returns_false_when_json_is_not_an_object(self):
+        self.assertFalse(RequestJSONTransformer.is_request_json_valid([]))
+        self.assertFalse(RequestJSONTransformer.is_request_json_valid('bad_data'))
+        self.assertFalse(RequestJSONTransformer.is_request_json_valid(None))
+
     def test_is_request_json_valid_returns_false_when_json_has_wrong_types(self):
         invalid_json_data = JSONRequestTestFixtureUtilities.get_post_data(load_id='bad_data')
         is_valid = RequestJSONTransformer.is_request_json_valid(invalid_json_data)
@@ -47,6 +71,13 @@ class RequestJSONTransformerUnitTest(unittest.TestCase):
         is_valid = RequestJSONTransformer.is_request_json_valid(invalid_json_data)
         self.assertFalse(is_valid)
 
+    def test_is_request_json_valid_returns_false_when_json_has_unusable_x_y_coordinates(self):
+        for coordinate in [float('inf'), float('-inf'), float('nan'), 10 ** 400, -10 ** 400, 1e308, -1e308, 1e151]:
+            self.assertFalse(RequestJSONTransformer.is_request_json_valid(
+                JSONRequestTestFixtureUtilities.get_post_data(x=coordinate)))
+            self.assertFalse(RequestJSONTransformer.is_request_json_valid(
+                JSONRequestTestFixtureUtilities.get_post_data(y=coordinate)))
+
     def test_is_request_json_valid_returns_false_when_json_has_wrong_field_names(self):
         invalid_json_data = JSONRequestTestFixtureUtilities.get_post_data_override_names(load_id_name='wrong_name')
         is_valid = RequestJSONTransformer.is_request_json_valid(invalid_json_data)
@@ -145,6 +176,10 @@ class RobotDatabaseJSONTransformerUnitTest(unittest.TestCase):
     def test_is_robot_database_json_valid_returns_false_when_json_is_empty(self):
         self.assertFalse(RobotDatabaseJSONTransformer.is_robot_database_json_valid({}))
 
+    def test_is_robot_database_json_valid_returns_false_when_json_is_not_an_object(self):
+        self.assertFalse(RobotDatabaseJSONTransformer.is_robot_database_json_valid([]))
+        self.assertFalse(RobotDatabaseJSONTransformer.is_robot_database_json_valid('bad_data'))
+
     def test_is_robot_database_json_valid_returns_false_when_json_has_wrong_types(self):
         invalid_json_data = JSONRobotDatabaseDataTextFixtureUtilities.get_robot_database_data(robot_id='bad_data')
         is_valid = RobotDatabaseJSONTransformer.is_robot_database_json_valid(invalid_json_data)
@@ -162,6 +197,27 @@ class RobotDatabaseJSONTransformerUnitTest(unittest.TestCase):
         is_valid = RobotDatabaseJSONTransformer.is_robot_database_json_valid(invalid_json_data)
         self.assertFalse(is_valid)
 
+    def test_is_robot_database_json_valid_returns_false_when_json_has_unusable_x_y_coordinates(self):
+        for coordinate in [float('inf'), float('-inf'), float('nan'), 10 ** 400, -10 ** 400, 1e308, -1e308, 1e151]:
+            self.assertFalse(RobotDatabaseJSONTransformer.is_robot_database_json_valid(
+                JSONRobotDatabaseDataTextFixtureUtilities.get_robot_database_data(x=coordinate)))
+            self.assertFalse(RobotDatabaseJSONTransformer.is_robot_database_json_valid(
+                JSONRobotDatabaseDataTextFixtureUtilities.get_robot_database_data(y=coordinate)))
+
+    def test_is_robot_database_json_valid_accepts_coordinates_up_to_the_max_magnitude(self):
+        for coordinate in [1e150, -1e150, 10 ** 149]:
+            self.assertTrue(RobotDatabaseJSONTransformer.is_robot_database_json_valid(
+                JSONRobotDatabaseDataTextFixtureUtilities.get_robot_database_data(x=coordinate, y=coordinate)))
+            self.assertTrue(RequestJSONTransformer.is_request_json_valid(
+                JSONRequestTestFixtureUtilities.get_post_data(x=coordinate, y=coordinate)))
+
+    def test_is_robot_database_json_valid_returns_false_when_json_has_robot_id_beyond_64_bits(self):
+        for robot_id in [2 ** 63, str(2 ** 63), 10 ** 30]:
+            self.assertFalse(RobotDatabaseJSONTransformer.is_robot_database_json_valid(
+                JSONRobotDatabaseDataTextFixtureUtilities.get_robot_database_data(robot_id=robot_id)))
+        self.assertTrue(RobotDatabaseJSONTransformer.is_robot_database_json_valid(
+            JSONRobotDatabaseDataTextFixtureUtilities.get_robot_database_data(robot_id=2 ** 63 - 1)))
+
     def test_is_robot_database_json_valid_returns_false_when_json_has_wrong_field_names(self):
         invalid_json_data = JSONRobotDatabaseDataTextFixtureUtilities.get_robot_database_data_override_names(
             robot_id_name='wrong_name')
@@ -292,6 +348,95 @@ class RobotDatabaseJSONTransformerUnitTest(unittest.TestCase):
         else:
             self.fail('Robot Database JSON Used for Testing is Not Valid.')
 
+    def test_creates_robot_fleet_from_only_the_valid_robot_database_json(self):
+        robots_json = [JSONRobotDatabaseDataTextFixtureUtilities.get_robot_database_data(robot_id=1, battery_level=50),
+                       JSONRobotDatabaseDataTextFixtureUtilities.get_robot_database_data(robot_id='2', x=1.5, y=-2),
+                       JSONRobotDatabaseDataTextFixtureUtilities.get_robot_database_data(battery_level=100.5),
+                       JSONRobotDatabaseDataTextFixtureUtilities.get_robot_database_data_override_names(x_name='z'),
+                       'bad_data']
+
+        robot_fleet = RobotDatabaseJSONTransformer.create_robot_fleet_from_robot_database_json(robots_json)
+
+        self.assertEqual(first=list(robot_fleet.get_ids()), second=[1, 2])
+        self.assertEqual(first=[robot.get_battery_level() for robot in robot_fleet], second=[50, 100])
+        self.assertEqual(first=list(robot_fleet.get_x_coordinates()), second=[0, 1.5])
+        self.assertEqual(first=list(robot_fleet.get_y_coordinates()), second=[0, -2])
+
+    def test_creates_robot_fleet_accepting_exactly_what_is_robot_database_json_valid_accepts(self):
+        values = [0, 1, -1, 100, 101, 50.5, float('inf'), float('nan'), 1e308, 10 ** 400, '7', '-7', 'bad_data', True,
+                  None, [1]]
+        robot_ids = values + [2 ** 63 - 1, 2 ** 63, str(2 ** 63)]
+        robots_json = [JSONRobotDatabaseDataTextFixtureUtilities.get_robot_database_data(robot_id=robot_id,
+                                                                                         battery_level=battery_level,
+                                                                                         x=coordinate,
+                                                                                         y=coordinate)
+                       for robot_id in robot_ids for battery_level in values for coordinate in values]
+
+        robot_fleet = RobotDatabaseJSONTransformer.create_robot_fleet_from_robot_database_json(robots_json)
+
+        expected_robots = [RobotDatabaseJSONTransformer.create_robot_from_robot_database_json(robot_json)
+                           for robot_json in robots_json
+                           if RobotDatabaseJSONTransformer.is_robot_database_json_valid(robot_json)]
+        self.assertEqual(first=[(robot.get_id(), robot.get_battery_level(), robot.get_x_coordinate(),
+                                 robot.get_y_coordinate()) for robot in robot_fleet],
+                         second=[(robot.get_id(), robot.get_battery_level(), robot.get_x_coordinate(),
+                                  robot.get_y_coordinate()) for robot in expected_robots])
+
+
+class SelectionPolicyJSONTransformerUnitTest(unittest.TestCase):
+
+    def test_valid_selection_policy_jsons(self):
+        for selection_policy_json in [{'type': 'window'},
+                                      {'type': 'window', 'distanceWindow': 15.5, 'minBatteryLevel': 20},
+                                      {'type': 'weightedScore', 'distanceWeight': 2, 'batteryWeight': 0}]:
+            self.assertTrue(SelectionPolicyJSONTransformer.is_selection_policy_json_valid(selection_policy_json))
+
+    def test_invalid_selection_policy_jsons(self):
+        for selection_policy_json in [[], {}, {'type': 'unknown'}, {'type': 'window', 'distanceWindow': -1},
+                                      {'type': 'window', 'distanceWeight': 1},
+                                      {'type': 'window', 'minBatteryLevel': '20'},
+                                      {'type': 'weightedScore', 'distanceWeight': 0},
+                                      {'type': 'weightedScore', 'batteryWeight': float('inf')}]:
+            self.assertFalse(SelectionPolicyJSONTransformer.is_selection_policy_json_valid(selection_policy_json))
+
+    def test_create_selection_policy_from_selection_policy_json(self):
+        window_selection_policy = SelectionPolicyJSONTransformer.create_selection_policy_from_selection_policy_json(
+            {'type': 'window', 'minBatteryLevel': 20})
+        weighted_score_selection_policy = \
+            SelectionPolicyJSONTransformer.create_selection_policy_from_selection_policy_json(
+                {'type': 'weightedScore', 'batteryWeight': 0.5})
+
+        self.assertIsInstance(window_selection_policy, WindowSelectionPolicy)
+        self.assertEqual(first=(window_selection_policy.get_distance_window(),
+                                window_selection_policy.get_min_battery_level()), second=(10, 20))
+        self.assertIsInstance(weighted_score_selection_policy, WeightedScoreSelectionPolicy)
+        self.assertEqual(first=(weighted_score_selection_policy.get_distance_weight(),
+                                weighted_score_selection_policy.get_battery_weight()), second=(1, 0.5))
+
+
+class JSONArrayStreamDecoderUnitTest(unittest.TestCase):
+
+    @staticmethod
+    def split_into_chunks(text, chunk_size):
+        data = text.encode()
+        return [data[index:index + chunk_size] for index in range(0, len(data), chunk_size)]
+
+    def test_decodes_each_element_of_an_array_split_across_any_chunk_boundary(self):
+        elements = [{'robotId': '1', 'batteryLevel': 50.5, 'x': -1.5e-7, 'y': 2}, 123456789, 'caf\u00e9 \u4e2d',
+                    None, True, [], {}]
+        text = json.dumps(elements, ensure_ascii=False, indent=2)
+        for chunk_size in range(1, 16):
+            decoded_elements = list(JSONArrayStreamDecoder(self.split_into_chunks(text, chunk_size)))
+            self.assertEqual(first=decoded_elements, second=elements)
+
+    def test_decodes_empty_array(self):
+        self.assertEqual(first=list(JSONArrayStreamDecoder([b' [ ] '])), second=[])
+
+    def test_raises_value_error_for_anything_but_a_single_complete_array(self):
+        for text in ['', '{}', '[', '[1', '[1,]', '[1 2]', '[1.]', '[1e]', '[1] 2']:
+            with self.assertRaises(ValueError):
+                list(JSONArrayStreamDecoder(self.split_into_chunks(text, 1)))
+
 
 if __name__ == '__main__':
     unittest.main()
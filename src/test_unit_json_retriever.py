@@ -0,0 +1,170 @@
+import asyncio
+import threading
+import time
+import unittest
+
+# Internal Libraries
+from json_helpers import RobotDatabaseJSONTransformer
+from json_retriever import JSONRetriever, PooledJSONRetriever
+from mock_robot_database import StandInRobotDatabaseServer
+from models import RobotFleet
+
+
+class SlowJSONRetriever(JSONRetriever):
+
+    def __init__(self, delay_seconds):
+        super().__init__('unused_url')
+        self._delay_seconds = delay_seconds
+        self._upstream_call_count = 0
+
+    def get_upstream_call_count(self):
+        return self._upstream_call_count
+
+    def _fetch_json_data(self):
+        self._upstream_call_count += 1
+        time.sleep(self._delay_seconds)
+        return True, [self._upstream_call_count]
+
+
+class JSONRetrieverUnitTest(unittest.TestCase):
+    _CALLER_COUNT = 10
+
+    def test_concurrent_threaded_callers_share_one_fetch(self):
+        json_retriever = SlowJSONRetriever(delay_seconds=0.2)
+        results = []
+
+        threads = [threading.Thread(target=lambda: results.append(json_retriever.get_json_data()))
+                   for _ in range(self._CALLER_COUNT)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(first=json_retriever.get_upstream_call_count(), second=1)
+        self.assertEqual(first=results, second=[(True, [1])] * self._CALLER_COUNT)
+        self.assertEqual(first=json_retriever.get_fetch_count(), second=1)
+        self.assertEqual(first=json_retriever.get_coalesced_call_count(), second=self._CALLER_COUNT - 1)
+
+    def test_sequential_callers_each_fetch(self):
+        json_retriever = SlowJSONRetriever(delay_seconds=0)
+
+        self.assertEqual(first=json_retriever.get_json_data(), second=(True, [1]))
+        self.assertEqual(first=json_retriever.get_json_data(), second=(True, [2]))
+        self.assertEqual(first=json_retriever.get_coalesced_call_count(), second=0)
+
+    def test_concurrent_asyncio_callers_share_one_fetch(self):
+        json_retriever = SlowJSONRetriever(delay_seconds=0.2)
+
+        async def get_json_data_concurrently():
+            return await asyncio.gather(*[json_retriever.get_json_data_async() for _ in range(self._CALLER_COUNT)])
+
+        results = asyncio.run(get_json_data_concurrently())
+
+        self.assertEqual(first=json_retriever.get_upstream_call_count(), second=1)
+        self.assertEqual(first=results, second=[(True, [1])] * self._CALLER_COUNT)
+        self.assertEqual(first=json_retriever.get_coalesced_call_count(), second=self._CALLER_COUNT - 1)
+
+    def test_failed_fetch_is_shared_as_failure(self):
+        json_retriever = JSONRetriever('some_garabge_url')
+
+        self.assertEqual(first=json_retriever.get_json_data(), second=(False, None))
+
+
+class PooledJSONRetrieverUnitTest(unittest.TestCase):
+
+    def setUp(self):
+        self._servers = []
+
+    def tearDown(self):
+        for server in self._servers:
+            server.stop()
+
+    def start_server(self, robots_json, delay_seconds=0, status_code=200):
+        server = StandInRobotDatabaseServer(robots_json=robots_json,
+                                            delay_seconds=delay_seconds,
+                                            status_code=status_code).start()
+        self._servers.append(server)
+        return server
+
+    def test_retrieves_json_from_primary_endpoint_without_hedging(self):
+        primary_server = self.start_server(robots_json=['primary'])
+        backup_server = self.start_server(robots_json=['backup'])
+        json_retriever = PooledJSONRetriever([primary_server.get_url(), backup_server.get_url()],
+                                             initial_hedge_delay_seconds=1)
+
+        for _ in range(3):
+            self.assertEqual(first=json_retriever.get_json_data(), second=(True, ['primary']))
+
+        self.assertEqual(first=json_retriever.get_hedged_request_count(), second=0)
+        self.assertEqual(first=backup_server.get_request_count(), second=0)
+        json_retriever.close()
+
+    def test_hedges_to_backup_endpoint_when_primary_is_slow(self):
+        primary_server = self.start_server(robots_json=['primary'], delay_seconds=1)
+        backup_server = self.start_server(robots_json=['backup'])
+        json_retriever = PooledJSONRetriever([primary_server.get_url(), backup_server.get_url()],
+                                             initial_hedge_delay_seconds=0.05)
+
+        start_time = time.monotonic()
+        result = json_retriever.get_json_data()
+
+        self.assertEqual(first=result, second=(True, ['backup']))
+        self.assertLess(a=time.monotonic() - start_time, b=0.5)
+        self.assertEqual(first=json_retriever.get_hedged_request_count(), second=1)
+        json_retriever.close()
+
+    def test_fails_over_immediately_when_primary_returns_an_error(self):
+        primary_server = self.start_server(robots_json={'error': 'unavailable'}, status_code=503)
+        backup_server = self.start_server(robots_json=['backup'])
+        json_retriever = PooledJSONRetriever([primary_server.get_url(), backup_server.get_url()],
+                                             initial_hedge_delay_seconds=5)
+
+        start_time = time.monotonic()
+        result = json_retriever.get_json_data()
+
+        self.assertEqual(first=result, second=(True, ['backup']))
+        self.assertLess(a=time.monotonic() - start_time, b=2)
+        json_retriever.close()
+
+    def test_returns_error_when_every_endpoint_times_out(self):
+        slow_server = self.start_server(robots_json=['slow'], delay_seconds=1)
+        json_retriever = PooledJSONRetriever([slow_server.get_url(), 'some_garabge_url'],
+                                             attempt_timeout_seconds=0.1,
+                                             initial_hedge_delay_seconds=0.05)
+
+        self.assertEqual(first=json_retriever.get_json_data(), second=(False, None))
+        json_retriever.close()
+
+    def test_streams_the_json_array_into_the_json_array_consumer(self):
+        server = self.start_server(robots_json=[{'robotId': 1, 'batteryLevel': 50, 'x': 1, 'y': 2},
+                                                {'robotId': 2, 'batteryLevel': 'bad_data', 'x': 3, 'y': 4}])
+        consumer = RobotDatabaseJSONTransformer.create_robot_fleet_from_robot_database_json
+        for json_retriever in [JSONRetriever(server.get_url(), json_array_consumer=consumer),
+                               PooledJSONRetriever([server.get_url()], json_array_consumer=consumer)]:
+            is_successful, robot_fleet = json_retriever.get_json_data()
+
+            self.assertTrue(is_successful)
+            self.assertIsInstance(robot_fleet, RobotFleet)
+            self.assertEqual(first=list(robot_fleet.get_ids()), second=[1])
+
+    def test_streaming_returns_error_when_the_payload_is_not_a_json_array(self):
+        server = self.start_server(robots_json={'robotId': 1})
+        json_retriever = PooledJSONRetriever([server.get_url()], json_array_consumer=list)
+
+        self.assertEqual(first=json_retriever.get_json_data(), second=(False, None))
+        json_retriever.close()
+
+    def test_hedge_delay_follows_the_observed_latency_percentile(self):
+        server = self.start_server(robots_json=[])
+        json_retriever = PooledJSONRetriever([server.get_url()], initial_hedge_delay_seconds=10)
+        self.assertEqual(first=json_retriever.get_hedge_delay_seconds(), second=10)
+
+        for _ in range(20):
+            json_retriever.get_json_data()
+
+        self.assertLess(a=json_retriever.get_hedge_delay_seconds(), b=1)
+        json_retriever.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
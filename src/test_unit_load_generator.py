@@ -0,0 +1,45 @@
+import unittest
+
+# Internal Libraries
+from load_generator import LoadGenerator
+from mock_robot_database import MockRobotDatabaseServer
+
+
+class LoadGeneratorUnitTest(unittest.TestCase):
+
+    def test_summarizes_throughput_latency_percentiles_and_errors(self):
+        samples = [(latency_milliseconds / 1e3, '200') for latency_milliseconds in range(1, 1001)]
+        samples[-1] = (1, '503')
+
+        report = LoadGenerator.summarize_samples(samples, elapsed_seconds=2)
+
+        self.assertEqual(first=report['request_count'], second=1000)
+        self.assertEqual(first=report['throughput_rps'], second=500)
+        self.assertEqual(first=report['error_count'], second=1)
+        self.assertEqual(first=report['error_rate'], second=0.001)
+        self.assertEqual(first=report['outcome_counts'], second={'200': 999, '503': 1})
+        self.assertEqual(first=[round(report['latency_ms'][name]) for name in ['p50', 'p95', 'p99', 'p99.9']],
+                         second=[500, 950, 990, 999])
+
+    def test_sends_the_requested_number_of_requests_and_counts_failed_ones_as_errors(self):
+        # The Mock Robot Database Only Answers GET, So Every POST Sent to It Comes Back as an Error
+        mock_server = MockRobotDatabaseServer(fleet_size=1).start()
+        try:
+            load_generator = LoadGenerator(url=mock_server.get_url(),
+                                           loads_json=[{'loadId': 1, 'x': 0, 'y': 0}],
+                                           concurrency=3,
+                                           request_count=10)
+            report = load_generator.run()
+        finally:
+            mock_server.stop()
+
+        self.assertEqual(first=report['request_count'], second=10)
+        self.assertEqual(first=report['error_count'], second=10)
+
+    def test_requires_a_request_count_or_a_duration(self):
+        with self.assertRaises(ValueError):
+            LoadGenerator(url='unused_url', loads_json=[])
+
+
+if __name__ == '__main__':
+    unittest.main()
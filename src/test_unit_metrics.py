@@ -0,0 +1,72 @@
+import math
+import unittest
+
+# Internal Libraries
+from metrics import MetricsRegistry, Histogram, format_prometheus_value
+
+
+class MetricsUnitTest(unittest.TestCase):
+
+    def test_histogram_counts_each_value_in_the_first_bucket_it_fits(self):
+        histogram = Histogram(bucket_upper_bounds=[1, 2])
+        for value in [0.5, 1, 1.5, 3]:
+            histogram.observe(value)
+
+        samples = list(histogram.collect_samples('duration', (), ()))
+
+        self.assertEqual(first=samples, second=[('duration_bucket{le="1"}', 2),
+                                                ('duration_bucket{le="2"}', 3),
+                                                ('duration_bucket{le="+Inf"}', 4),
+                                                ('duration_sum', 6.0),
+                                                ('duration_count', 4)])
+
+    def test_registry_renders_prometheus_text_for_every_metric_type(self):
+        metrics_registry = MetricsRegistry()
+        counters = metrics_registry.create_counter(name='responses_total', help_text='Responses.', label_names=['code'])
+        histograms = metrics_registry.create_histogram(name='stage_seconds', help_text='Stages.',
+                                                       bucket_upper_bounds=[0.5], label_names=['stage'])
+        metrics_registry.create_function_metric(name='fleet_size', help_text='Fleet size.', value_function=lambda: 7)
+        metrics_registry.create_function_metric(name='snapshot_age_seconds', help_text='Age.',
+                                                value_function=lambda: None)
+        counters.labels('200').increment()
+        counters.labels('200').increment()
+        counters.labels('a"b').increment()
+        histograms.labels('fetch').observe(0.25)
+
+        self.assertEqual(first=metrics_registry.render_prometheus_text(),
+                         second='# HELP responses_total Responses.\n'
+                                '# TYPE responses_total counter\n'
+                                'responses_total{code="200"} 2\n'
+                                'responses_total{code="a\\"b"} 1\n'
+                                '# HELP stage_seconds Stages.\n'
+                                '# TYPE stage_seconds histogram\n'
+                                'stage_seconds_bucket{stage="fetch",le="0.5"} 1\n'
+                                'stage_seconds_bucket{stage="fetch",le="+Inf"} 1\n'
+                                'stage_seconds_sum{stage="fetch"} 0.25\n'
+                                'stage_seconds_count{stage="fetch"} 1\n'
+                                '# HELP fleet_size Fleet size.\n'
+                                '# TYPE fleet_size gauge\n'
+                                'fleet_size 7\n'
+                                '# HELP snapshot_age_seconds Age.\n'
+                                '# TYPE snapshot_age_seconds gauge\n')
+
+    def test_labels_returns_the_same_metric_for_the_same_label_values(self):
+        counters = MetricsRegistry().create_counter(name='responses_total', help_text='Responses.',
+                                                    label_names=['code'])
+        self.assertIs(counters.labels('200'), counters.labels('200'))
+        with self.assertRaises(ValueError):
+            counters.labels('200', 'extra')
+
+    def test_registry_rejects_duplicate_metric_names(self):
+        metrics_registry = MetricsRegistry()
+        metrics_registry.create_counter(name='responses_total', help_text='Responses.')
+        with self.assertRaises(ValueError):
+            metrics_registry.create_counter(name='responses_total', help_text='Responses.')
+
+    def test_special_values_are_formatted_for_prometheus(self):
+        self.assertEqual(first=[format_prometheus_value(value) for value in [math.inf, -math.inf, math.nan, 3, 0.5]],
+                         second=['+Inf', '-Inf', 'NaN', '3', '0.5'])
+
+
+if __name__ == '__main__':
+    unittest.main()
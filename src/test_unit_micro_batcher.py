@@ -0,0 +1,86 @@
+import threading
+import time
+import unittest
+
+# Internal Libraries
+from micro_batcher import MicroBatcher
+
+
+class MicroBatcherUnitTest(unittest.TestCase):
+
+    def setUp(self):
+        self._processed_batches = []
+
+    def process_batch(self, batch_key, items):
+        self._processed_batches.append((batch_key, list(items)))
+        return [item * 10 for item in items]
+
+    def submit_concurrently(self, micro_batcher, batch_keys_and_items):
+        results = {}
+        start_barrier = threading.Barrier(len(batch_keys_and_items))
+
+        def submit(batch_key, item):
+            start_barrier.wait()
+            results[item] = micro_batcher.submit(batch_key=batch_key, item=item)
+
+        threads = [threading.Thread(target=submit, args=batch_key_and_item)
+                   for batch_key_and_item in batch_keys_and_items]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return results
+
+    def test_lone_submission_is_processed_without_waiting(self):
+        micro_batcher = MicroBatcher(process_batch=self.process_batch, max_wait_seconds=60)
+
+        start_time = time.monotonic()
+        self.assertEqual(first=micro_batcher.submit(batch_key='a', item=4), second=40)
+        self.assertLess(a=time.monotonic() - start_time, b=30)
+        self.assertEqual(first=self._processed_batches, second=[('a', [4])])
+
+    def test_concurrent_submissions_are_processed_together_and_each_gets_its_own_result(self):
+        is_blocking_batch_released = threading.Event()
+
+        def process_batch(batch_key, items):
+            if batch_key == 'blocking':
+                is_blocking_batch_released.wait()
+            return self.process_batch(batch_key, items)
+
+        micro_batcher = MicroBatcher(process_batch=process_batch, max_wait_seconds=5, max_batch_size=4)
+        # Keeps a Submission in Flight, So the Next Batch Waits to Fill Up Instead of Being Processed at Once
+        blocking_thread = threading.Thread(target=micro_batcher.submit, args=('blocking', 100))
+        blocking_thread.start()
+        while micro_batcher.get_batch_count() == 0:
+            time.sleep(0.001)
+
+        results = self.submit_concurrently(micro_batcher, [('a', item) for item in range(4)])
+        is_blocking_batch_released.set()
+        blocking_thread.join()
+
+        self.assertEqual(first=results, second={0: 0, 1: 10, 2: 20, 3: 30})
+        self.assertEqual(first=[(batch_key, sorted(items)) for batch_key, items in self._processed_batches],
+                         second=[('a', [0, 1, 2, 3]), ('blocking', [100])])
+        self.assertEqual(first=(micro_batcher.get_batch_count(), micro_batcher.get_item_count()), second=(2, 5))
+
+    def test_submissions_with_different_keys_are_never_batched_together(self):
+        micro_batcher = MicroBatcher(process_batch=self.process_batch, max_wait_seconds=0.05, max_batch_size=2)
+
+        results = self.submit_concurrently(micro_batcher, [('a', 1), ('b', 2), ('a', 3), ('b', 4)])
+
+        self.assertEqual(first=results, second={1: 10, 2: 20, 3: 30, 4: 40})
+        for batch_key, items in self._processed_batches:
+            self.assertLessEqual(a=set(items), b={1, 3} if batch_key == 'a' else {2, 4})
+
+    def test_processing_errors_are_raised_to_every_submitter(self):
+        def fail_to_process_batch(batch_key, items):
+            raise ValueError('Unavailable')
+
+        micro_batcher = MicroBatcher(process_batch=fail_to_process_batch, max_wait_seconds=0.001)
+
+        with self.assertRaises(ValueError):
+            micro_batcher.submit(batch_key='a', item=1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,59 @@
+import unittest
+
+import requests
+
+# Internal Libraries
+from json_helpers import RobotDatabaseJSONTransformer
+from mock_robot_database import MockRobotDatabaseServer
+
+
+class MockRobotDatabaseServerUnitTest(unittest.TestCase):
+
+    def setUp(self):
+        self._mock_servers = []
+
+    def tearDown(self):
+        for mock_server in self._mock_servers:
+            mock_server.stop()
+
+    def start_mock_server(self, **kwargs):
+        mock_server = MockRobotDatabaseServer(**kwargs).start()
+        self._mock_servers.append(mock_server)
+        return mock_server
+
+    def test_serves_a_fleet_of_the_configured_size(self):
+        mock_server = self.start_mock_server(fleet_size=25)
+
+        response = requests.get(mock_server.get_url())
+
+        self.assertEqual(first=response.status_code, second=200)
+        self.assertEqual(first=len(response.json()), second=25)
+        self.assertTrue(all(RobotDatabaseJSONTransformer.is_robot_database_json_valid(robot_json)
+                            for robot_json in response.json()))
+
+    def test_injects_failures_at_the_configured_rate(self):
+        mock_server = self.start_mock_server(fleet_size=1, failure_rate=1, failure_status_code=500)
+
+        self.assertEqual(first=requests.get(mock_server.get_url()).status_code, second=500)
+        self.assertEqual(first=mock_server.get_failure_count(), second=1)
+
+    def test_injects_malformed_bodies_at_the_configured_rate(self):
+        mock_server = self.start_mock_server(fleet_size=10, malformed_rate=1)
+
+        response = requests.get(mock_server.get_url())
+
+        self.assertEqual(first=response.status_code, second=200)
+        with self.assertRaises(ValueError):
+            response.json()
+
+    def test_delays_responses_by_the_configured_latency(self):
+        mock_server = self.start_mock_server(fleet_size=1, latency_seconds=0.2)
+
+        response = requests.get(mock_server.get_url())
+
+        self.assertGreaterEqual(a=response.elapsed.total_seconds(), b=0.2)
+        self.assertEqual(first=mock_server.get_request_count(), second=1)
+
+
+if __name__ == '__main__':
+    unittest.main()
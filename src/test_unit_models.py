@@ -1,7 +1,7 @@
 import unittest
 
 # Internal Libraries
-from models import Robot, Load
+from models import Robot, RobotFleet, Load
 
 
 class RobotUnitTest(unittest.TestCase):
@@ -39,6 +39,70 @@ class RobotUnitTest(unittest.TestCase):
         robot.set_distance_to_load(10)
         self.assertEqual(first=robot.get_distance_to_load(), second=10)
 
+    def test_robot_with_distance_to_load_returns_a_copy_and_leaves_the_robot_unchanged(self):
+        robot = self.create_robot_with(id=7, battery_level=40, x_coordinate=1, y_coordinate=2)
+        robot_with_distance = robot.with_distance_to_load(5)
+        self.assertIsNone(robot.get_distance_to_load())
+        self.assertEqual(first=robot_with_distance.get_distance_to_load(), second=5)
+        self.assertEqual(first=robot_with_distance.get_id(), second=7)
+        self.assertEqual(first=robot_with_distance.get_battery_level(), second=40)
+
+    def test_robot_does_not_accept_new_attributes(self):
+        robot = self.create_robot_with()
+        with self.assertRaises(AttributeError):
+            robot.name = 'robot'
+
+
+class RobotFleetUnitTest(unittest.TestCase):
+
+    @staticmethod
+    def create_robot_fleet():
+        return RobotFleet.create_from_robots([Robot(id=1, battery_level=50, x_coordinate=1, y_coordinate=2),
+                                              Robot(id='2', battery_level=75.5, x_coordinate=3.5, y_coordinate=4)])
+
+    def test_robot_fleet_stores_each_attribute_as_a_column(self):
+        robot_fleet = self.create_robot_fleet()
+        self.assertEqual(first=len(robot_fleet), second=2)
+        self.assertEqual(first=list(robot_fleet.get_ids()), second=[1, 2])
+        self.assertEqual(first=list(robot_fleet.get_battery_levels()), second=[50, 75.5])
+        self.assertEqual(first=list(robot_fleet.get_x_coordinates()), second=[1, 3.5])
+        self.assertEqual(first=list(robot_fleet.get_y_coordinates()), second=[2, 4])
+
+    def test_robot_fleet_returns_robots_by_position(self):
+        robot = self.create_robot_fleet()[1]
+        self.assertEqual(first=robot.get_id(), second=2)
+        self.assertEqual(first=robot.get_battery_level(), second=75.5)
+        self.assertEqual(first=robot.get_x_coordinate(), second=3.5)
+        self.assertEqual(first=robot.get_y_coordinate(), second=4)
+
+    def test_robot_fleet_keeps_integer_battery_levels_as_integers(self):
+        robot = self.create_robot_fleet().get_robot(0)
+        self.assertIs(type(robot.get_battery_level()), int)
+
+    def test_robot_fleet_can_update_and_append_robots(self):
+        robot_fleet = self.create_robot_fleet()
+        robot_fleet.update_robot(position=0, robot=Robot(id=1, battery_level=10, x_coordinate=9, y_coordinate=8))
+        robot_fleet.append_robot(Robot(id=3, battery_level=20, x_coordinate=7, y_coordinate=6))
+        self.assertEqual(first=[(robot.get_id(), robot.get_battery_level(), robot.get_x_coordinate(),
+                                 robot.get_y_coordinate()) for robot in robot_fleet],
+                         second=[(1, 10, 9, 8), (2, 75.5, 3.5, 4), (3, 20, 7, 6)])
+
+    def test_robot_fleet_created_from_borrowed_columns_copies_them_before_writing(self):
+        robot_fleet = self.create_robot_fleet()
+        columns = [memoryview(column) for column in [robot_fleet.get_ids(), robot_fleet.get_battery_levels(),
+                                                      robot_fleet.get_x_coordinates(),
+                                                      robot_fleet.get_y_coordinates(),
+                                                      robot_fleet.get_battery_level_is_integer()]]
+
+        borrowing_robot_fleet = RobotFleet.create_from_columns(*columns)
+        self.assertEqual(first=borrowing_robot_fleet.get_robot(1).get_battery_level(), second=75.5)
+        borrowing_robot_fleet.update_robot(position=0, robot=Robot(id=1, battery_level=10, x_coordinate=9,
+                                                                   y_coordinate=8))
+        borrowing_robot_fleet.append_robot(Robot(id=3, battery_level=20, x_coordinate=7, y_coordinate=6))
+
+        self.assertEqual(first=[robot.get_battery_level() for robot in borrowing_robot_fleet], second=[10, 75.5, 20])
+        self.assertEqual(first=[robot.get_battery_level() for robot in robot_fleet], second=[50, 75.5])
+
 
 class LoadUnitTest(unittest.TestCase):
 
@@ -0,0 +1,167 @@
+import random
+import unittest
+
+# Internal Libraries
+from fleet_snapshot_cache import FleetSnapshotCache
+from models import Load, Robot
+from nearest_robot_raster import NearestRobotRaster
+from selection_policies import WeightedScoreSelectionPolicy, WindowSelectionPolicy
+
+# Internal Test Libraries
+from test_utilities import JSONRobotDatabaseDataTextFixtureUtilities, StubJSONRetriever
+
+
+class NearestRobotRasterUnitTest(unittest.TestCase):
+
+    @staticmethod
+    def create_random_robot(random_generator, robot_id):
+        return Robot(id=robot_id,
+                     battery_level=random_generator.choice([0, 10, 50, 50, 90]),
+                     x_coordinate=random_generator.choice([random_generator.randint(-60, 60),
+                                                           random_generator.uniform(-60, 60)]),
+                     y_coordinate=random_generator.choice([random_generator.randint(-60, 60),
+                                                           random_generator.uniform(-60, 60)]))
+
+    @staticmethod
+    def create_random_loads(random_generator, load_count):
+        # Whole Coordinates Land on Cell Edges and Exactly on Robots, Where Ties Are Most Likely
+        return [Load(id=load_id,
+                     x_coordinate=random_generator.choice([random_generator.randint(-70, 70),
+                                                           random_generator.uniform(-70, 70)]),
+                     y_coordinate=random_generator.choice([random_generator.randint(-70, 70),
+                                                           random_generator.uniform(-70, 70)]))
+                for load_id in range(load_count)]
+
+    @staticmethod
+    def create_fleet_snapshot_cache(robots):
+        fleet_snapshot_cache = FleetSnapshotCache(json_retriever=StubJSONRetriever([(False, None)]))
+        fleet_snapshot_cache.apply_robot_updates(robots)
+        return fleet_snapshot_cache
+
+    def assert_raster_matches_selection_policy(self, nearest_robot_raster, selection_policy, fleet_snapshot, loads):
+        robots = list(fleet_snapshot.get_robot_fleet())
+        for load in loads:
+            expected_robot = selection_policy.select_robot(robots=robots, load=load)
+            closest_robot = nearest_robot_raster.find_closest_robot(fleet_snapshot=fleet_snapshot, load=load)
+            self.assertEqual(first=(closest_robot.get_id(), closest_robot.get_distance_to_load()),
+                             second=(expected_robot.get_id(), expected_robot.get_distance_to_load()))
+
+    def test_raster_matches_selection_policy_for_random_fleets(self):
+        random_generator = random.Random(20230415)
+        for selection_policy, resolution in [(WindowSelectionPolicy(), 5),
+                                             (WindowSelectionPolicy(), 0.7),
+                                             (WindowSelectionPolicy(distance_window=25, min_battery_level=50), 13)]:
+            fleet_snapshot_cache = self.create_fleet_snapshot_cache(
+                [self.create_random_robot(random_generator, robot_id) for robot_id in range(60)])
+            nearest_robot_raster = NearestRobotRaster(min_x=-50, min_y=-50, max_x=50, max_y=50, resolution=resolution,
+                                                      selection_policy=selection_policy)
+            nearest_robot_raster.watch(fleet_snapshot_cache)
+
+            self.assert_raster_matches_selection_policy(nearest_robot_raster=nearest_robot_raster,
+                                                        selection_policy=selection_policy,
+                                                        fleet_snapshot=fleet_snapshot_cache.get_snapshot(),
+                                                        loads=self.create_random_loads(random_generator, 400))
+            self.assertGreater(a=nearest_robot_raster.get_cell_count(), b=0)
+
+    def test_raster_keeps_matching_as_robots_move(self):
+        random_generator = random.Random(20230416)
+        selection_policy = WindowSelectionPolicy()
+        fleet_snapshot_cache = self.create_fleet_snapshot_cache(
+            [self.create_random_robot(random_generator, robot_id) for robot_id in range(40)])
+        nearest_robot_raster = NearestRobotRaster(min_x=-50, min_y=-50, max_x=50, max_y=50, resolution=4)
+        nearest_robot_raster.watch(fleet_snapshot_cache)
+        loads = self.create_random_loads(random_generator, 60)
+        for _ in range(50):
+            self.assert_raster_matches_selection_policy(nearest_robot_raster=nearest_robot_raster,
+                                                        selection_policy=selection_policy,
+                                                        fleet_snapshot=fleet_snapshot_cache.get_snapshot(),
+                                                        loads=loads)
+            fleet_snapshot_cache.apply_robot_updates([self.create_random_robot(random_generator,
+                                                                               random_generator.randint(0, 45))])
+
+    def test_robot_moves_only_invalidate_cells_they_reach(self):
+        fleet_snapshot_cache = self.create_fleet_snapshot_cache(
+            [Robot(id=robot_id, battery_level=50, x_coordinate=x_coordinate, y_coordinate=0)
+             for robot_id, x_coordinate in enumerate(range(-40, 41, 5))])
+        nearest_robot_raster = NearestRobotRaster(min_x=-50, min_y=-10, max_x=50, max_y=10, resolution=5)
+        nearest_robot_raster.watch(fleet_snapshot_cache)
+        for x_coordinate in [-40, 40]:
+            nearest_robot_raster.find_closest_robot(fleet_snapshot=fleet_snapshot_cache.get_snapshot(),
+                                                    load=Load(id=1, x_coordinate=x_coordinate, y_coordinate=1))
+
+        fleet_snapshot_cache.apply_robot_updates([Robot(id=16, battery_level=90, x_coordinate=41, y_coordinate=0)])
+
+        self.assertEqual(first=nearest_robot_raster.get_cell_count(), second=1)
+
+    def test_cells_calculated_without_eligible_robots_are_recalculated_when_one_appears(self):
+        fleet_snapshot_cache = self.create_fleet_snapshot_cache(
+            [Robot(id=1, battery_level=0, x_coordinate=0, y_coordinate=0)])
+        nearest_robot_raster = NearestRobotRaster(min_x=-10, min_y=-10, max_x=10, max_y=10)
+        nearest_robot_raster.watch(fleet_snapshot_cache)
+        load = Load(id=1, x_coordinate=1, y_coordinate=1)
+        self.assertIsNone(nearest_robot_raster.find_closest_robot(fleet_snapshot=fleet_snapshot_cache.get_snapshot(),
+                                                                  load=load))
+
+        fleet_snapshot_cache.apply_robot_updates([Robot(id=2, battery_level=50, x_coordinate=900, y_coordinate=0)])
+
+        closest_robot = nearest_robot_raster.find_closest_robot(fleet_snapshot=fleet_snapshot_cache.get_snapshot(),
+                                                                load=load)
+        self.assertEqual(first=closest_robot.get_id(), second=2)
+
+    def test_loads_off_the_floor_are_answered_from_the_spatial_index(self):
+        fleet_snapshot_cache = self.create_fleet_snapshot_cache(
+            [Robot(id=1, battery_level=50, x_coordinate=0, y_coordinate=0),
+             Robot(id=2, battery_level=50, x_coordinate=500, y_coordinate=500)])
+        nearest_robot_raster = NearestRobotRaster(min_x=-10, min_y=-10, max_x=10, max_y=10)
+        nearest_robot_raster.watch(fleet_snapshot_cache)
+
+        closest_robot = nearest_robot_raster.find_closest_robot(fleet_snapshot=fleet_snapshot_cache.get_snapshot(),
+                                                                load=Load(id=1, x_coordinate=490, y_coordinate=490))
+
+        self.assertEqual(first=closest_robot.get_id(), second=2)
+        self.assertEqual(first=nearest_robot_raster.get_cell_count(), second=0)
+
+    def test_loads_for_earlier_snapshots_are_answered_from_their_own_fleet(self):
+        fleet_snapshot_cache = self.create_fleet_snapshot_cache(
+            [Robot(id=1, battery_level=50, x_coordinate=0, y_coordinate=0)])
+        nearest_robot_raster = NearestRobotRaster(min_x=-10, min_y=-10, max_x=10, max_y=10)
+        nearest_robot_raster.watch(fleet_snapshot_cache)
+        earlier_fleet_snapshot = fleet_snapshot_cache.get_snapshot()
+        load = Load(id=1, x_coordinate=1, y_coordinate=1)
+        nearest_robot_raster.find_closest_robot(fleet_snapshot=earlier_fleet_snapshot, load=load)
+
+        fleet_snapshot_cache.apply_robot_updates([Robot(id=2, battery_level=90, x_coordinate=1, y_coordinate=1)])
+        nearest_robot_raster.find_closest_robot(fleet_snapshot=fleet_snapshot_cache.get_snapshot(), load=load)
+
+        closest_robot = nearest_robot_raster.find_closest_robot(fleet_snapshot=earlier_fleet_snapshot, load=load)
+        self.assertEqual(first=closest_robot.get_id(), second=1)
+
+    def test_raster_serves_lookups_after_a_refresh_that_changed_no_robots(self):
+        robots_json = [JSONRobotDatabaseDataTextFixtureUtilities.get_robot_database_data(robot_id=1, battery_level=50),
+                       JSONRobotDatabaseDataTextFixtureUtilities.get_robot_database_data(robot_id=2, battery_level=50,
+                                                                                         x=8, y=8)]
+        fleet_snapshot_cache = FleetSnapshotCache(json_retriever=StubJSONRetriever([(True, robots_json),
+                                                                                    (True, robots_json)]))
+        fleet_snapshot_cache.refresh()
+        nearest_robot_raster = NearestRobotRaster(min_x=-10, min_y=-10, max_x=10, max_y=10)
+        nearest_robot_raster.watch(fleet_snapshot_cache)
+        nearest_robot_raster.find_closest_robot(fleet_snapshot=fleet_snapshot_cache.get_snapshot(),
+                                                load=Load(id=1, x_coordinate=1, y_coordinate=1))
+
+        fleet_snapshot_cache.refresh()
+        closest_robot = nearest_robot_raster.find_closest_robot(fleet_snapshot=fleet_snapshot_cache.get_snapshot(),
+                                                                load=Load(id=2, x_coordinate=9, y_coordinate=9))
+
+        self.assertEqual(first=closest_robot.get_id(), second=2)
+        self.assertEqual(first=nearest_robot_raster.get_cell_count(), second=2)
+
+    def test_only_window_selection_policies_are_supported(self):
+        with self.assertRaises(ValueError):
+            NearestRobotRaster(min_x=0, min_y=0, max_x=10, max_y=10,
+                               selection_policy=WeightedScoreSelectionPolicy(battery_weight=1))
+        with self.assertRaises(ValueError):
+            NearestRobotRaster(min_x=0, min_y=0, max_x=0, max_y=10)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,68 @@
+import unittest
+
+import requests
+
+# Internal Libraries
+import closest_robot_service
+from fleet_snapshot_cache import FleetSnapshotCache
+from json_retriever import JSONRetriever
+from mock_robot_database import StandInRobotDatabaseServer
+from production_server import ProductionServer
+
+# Internal Test Libraries
+from test_utilities import JSONRobotDatabaseDataTextFixtureUtilities, JSONRequestTestFixtureUtilities
+
+
+class ProductionServerUnitTest(unittest.TestCase):
+    _REFRESH_INTERVAL_SECONDS = 60
+    _WORKER_COUNT = 2
+
+    def setUp(self):
+        robots_json = [JSONRobotDatabaseDataTextFixtureUtilities.get_robot_database_data(robot_id=1,
+                                                                                         battery_level=50,
+                                                                                         x=0,
+                                                                                         y=5)]
+        self._stand_in_server = StandInRobotDatabaseServer(robots_json=robots_json).start()
+        # Swapped Before the Workers Are Forked, So the Refresher Fetches From the Stand-In
+        self._original_fleet_snapshot_cache = closest_robot_service.g_fleet_snapshot_cache
+        closest_robot_service.g_fleet_snapshot_cache = FleetSnapshotCache(
+            json_retriever=JSONRetriever(self._stand_in_server.get_url()),
+            refresh_interval_seconds=self._REFRESH_INTERVAL_SECONDS)
+        self._production_server = ProductionServer(host='localhost', port=0, worker_count=self._WORKER_COUNT).start()
+        self._base_url = 'http://{}:{}'.format(*self._production_server.get_address())
+
+    def tearDown(self):
+        self._production_server.stop()
+        closest_robot_service.g_fleet_snapshot_cache = self._original_fleet_snapshot_cache
+        self._stand_in_server.stop()
+
+    def post_load(self):
+        return requests.post(self._base_url + '/api/robots/closest',
+                             json=JSONRequestTestFixtureUtilities.get_post_data(load_id=1, x=0, y=0))
+
+    def test_workers_answer_from_the_fleet_published_by_the_single_refresher(self):
+        responses = [self.post_load() for _ in range(4 * self._WORKER_COUNT)]
+
+        self.assertEqual(first=[response.json() for response in responses],
+                         second=[{'robotId': 1, 'distanceToGoal': 5.0, 'batteryLevel': 50}] * len(responses))
+        self.assertEqual(first=self._stand_in_server.get_request_count(), second=1)
+
+    def test_robot_updates_sent_to_any_worker_are_published_to_every_worker(self):
+        self.post_load()
+        robot_json = JSONRobotDatabaseDataTextFixtureUtilities.get_robot_database_data(robot_id=2,
+                                                                                       battery_level=70,
+                                                                                       x=0,
+                                                                                       y=1)
+        requests.post(self._base_url + '/api/robots/updates', json=[robot_json])
+
+        robot_ids = set()
+        for _ in range(100):
+            robot_ids = {self.post_load().json()['robotId'] for _ in range(2 * self._WORKER_COUNT)}
+            if robot_ids == {2}:
+                break
+
+        self.assertEqual(first=robot_ids, second={2})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,49 @@
+import unittest
+
+# Internal Libraries
+from profiling import RequestProfiler
+
+
+class RequestProfilerUnitTest(unittest.TestCase):
+
+    @staticmethod
+    def create_robot_ids(robot_count):
+        return [str(robot_id) for robot_id in range(robot_count)]
+
+    def test_profile_returns_the_result_and_records_functions_and_allocations(self):
+        request_profiler = RequestProfiler()
+
+        robot_ids = request_profiler.profile(self.create_robot_ids, 1000)
+
+        self.assertEqual(first=len(robot_ids), second=1000)
+        request_profiles = request_profiler.get_profiles()
+        self.assertEqual(first=len(request_profiles), second=1)
+        self.assertEqual(first=request_profiles[0]['function'], second='create_robot_ids')
+        self.assertTrue(any('create_robot_ids' in function_entry['function']
+                            for function_entry in request_profiles[0]['functions']))
+        self.assertTrue(any(__file__ in allocation_entry['location']
+                            for allocation_entry in request_profiles[0]['allocations']))
+        self.assertGreater(request_profiles[0]['peakAllocatedBytes'], 0)
+
+    def test_only_the_most_recent_profiles_are_kept(self):
+        request_profiler = RequestProfiler(max_profile_count=2)
+
+        for robot_count in [1, 2, 3]:
+            request_profiler.profile(self.create_robot_ids, robot_count)
+
+        self.assertEqual(first=len(request_profiler.get_profiles()), second=2)
+
+    def test_wrapped_function_is_only_profiled_when_asked_to(self):
+        request_profiler = RequestProfiler()
+        should_profile = [False]
+        profiled_create_robot_ids = request_profiler.wrap(self.create_robot_ids, lambda: should_profile[0])
+
+        self.assertEqual(first=profiled_create_robot_ids(2), second=['0', '1'])
+        self.assertEqual(first=request_profiler.get_profiles(), second=[])
+        should_profile[0] = True
+        self.assertEqual(first=profiled_create_robot_ids(2), second=['0', '1'])
+        self.assertEqual(first=len(request_profiler.get_profiles()), second=1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,89 @@
+import random
+import unittest
+
+# Internal Libraries
+from models import Load, Robot, RobotFleet
+from selection_policies import WeightedScoreSelectionPolicy, WindowSelectionPolicy
+from spatial_index import RobotSpatialIndex
+
+
+class SelectionPoliciesUnitTest(unittest.TestCase):
+    _POLICIES = [WindowSelectionPolicy(),
+                 WindowSelectionPolicy(distance_window=25, min_battery_level=50),
+                 WindowSelectionPolicy(distance_window=0, min_battery_level=99),
+                 WeightedScoreSelectionPolicy(distance_weight=1, battery_weight=0.5),
+                 WeightedScoreSelectionPolicy(distance_weight=2, battery_weight=0, min_battery_level=25)]
+
+    @staticmethod
+    def create_random_robots(random_generator, robot_count, spread):
+        return [Robot(id=robot_id,
+                      battery_level=random_generator.choice([0, 1, 25, 50, 50.5, 99, 100]),
+                      x_coordinate=random_generator.randint(-spread, spread),
+                      y_coordinate=random_generator.uniform(-spread, spread))
+                for robot_id in range(robot_count)]
+
+    @staticmethod
+    def get_ids_and_distances(robots):
+        return [(robot.get_id(), robot.get_distance_to_load()) for robot in robots]
+
+    def test_min_battery_level_leaves_out_robots_below_it(self):
+        robots = [Robot(id=1, battery_level=30, x_coordinate=0, y_coordinate=1),
+                  Robot(id=2, battery_level=60, x_coordinate=0, y_coordinate=50)]
+        load = Load(id=0, x_coordinate=0, y_coordinate=0)
+
+        closest_robot = WindowSelectionPolicy(min_battery_level=50).select_robot(robots=robots, load=load)
+
+        self.assertEqual(first=closest_robot.get_id(), second=2)
+        self.assertIsNone(WindowSelectionPolicy(min_battery_level=61).select_robot(robots=robots, load=load))
+
+    def test_weighted_score_trades_distance_against_battery(self):
+        robots = [Robot(id=1, battery_level=10, x_coordinate=0, y_coordinate=5),
+                  Robot(id=2, battery_level=100, x_coordinate=0, y_coordinate=30)]
+        load = Load(id=0, x_coordinate=0, y_coordinate=0)
+
+        self.assertEqual(first=WeightedScoreSelectionPolicy(battery_weight=0.5).select_robot(robots=robots,
+                                                                                             load=load).get_id(),
+                         second=2)
+        self.assertEqual(first=WeightedScoreSelectionPolicy(battery_weight=0.1).select_robot(robots=robots,
+                                                                                             load=load).get_id(),
+                         second=1)
+
+    def test_fleet_columns_give_the_same_answers_as_robots(self):
+        robots = self.create_random_robots(random_generator=random.Random(1), robot_count=50, spread=20)
+        robot_fleet = RobotFleet.create_from_robots(robots)
+        load = Load(id=0, x_coordinate=3, y_coordinate=-4)
+        for policy in self._POLICIES:
+            closest_robot = policy.select_robot(robots=robot_fleet, load=load)
+
+            self.assertEqual(first=self.get_ids_and_distances([closest_robot]),
+                             second=self.get_ids_and_distances([policy.select_robot(robots=robots, load=load)]))
+            self.assertEqual(first=type(closest_robot.get_battery_level()),
+                             second=type(robots[closest_robot.get_id()].get_battery_level()))
+
+    def test_index_and_ranking_match_the_single_pass_selector_for_random_fleets(self):
+        random_generator = random.Random(20230303)
+        for spread in [5, 30, 300]:
+            robots = self.create_random_robots(random_generator=random_generator, robot_count=200, spread=spread)
+            robot_spatial_index = RobotSpatialIndex(robots)
+            for load_id in range(20):
+                load = Load(id=load_id,
+                            x_coordinate=random_generator.randint(-2 * spread, 2 * spread),
+                            y_coordinate=random_generator.uniform(-2 * spread, 2 * spread))
+                for policy in self._POLICIES:
+                    closest_robot = policy.select_robot(robots=robots, load=load)
+                    ranked_robots = policy.rank_robots(robots=robots, load=load, robot_count=7)
+
+                    self.assertEqual(first=self.get_ids_and_distances(ranked_robots[:1]),
+                                     second=self.get_ids_and_distances([closest_robot] if closest_robot else []))
+                    self.assertEqual(first=self.get_ids_and_distances(policy.rank_robots_using_index(
+                        robot_spatial_index=robot_spatial_index, load=load, robot_count=7)),
+                        second=self.get_ids_and_distances(ranked_robots))
+                    index_closest_robot = policy.select_robot_using_index(robot_spatial_index=robot_spatial_index,
+                                                                          load=load)
+                    self.assertEqual(first=self.get_ids_and_distances([index_closest_robot] if index_closest_robot
+                                                                      else []),
+                                     second=self.get_ids_and_distances(ranked_robots[:1]))
+
+
+if __name__ == '__main__':
+    unittest.main()
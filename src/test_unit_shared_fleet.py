@@ -0,0 +1,195 @@
+import queue
+import threading
+import time
+import unittest
+
+# Internal Libraries
+from fleet_snapshot_cache import FleetSnapshotCache
+from models import Robot, RobotFleet
+from shared_fleet import SharedFleetPublisher, SharedFleetReader, SharedFleetSnapshotCache
+
+# Internal Test Libraries
+from test_utilities import StubJSONRetriever
+
+
+class SharedFleetUnitTest(unittest.TestCase):
+
+    def setUp(self):
+        self._shared_fleet_publisher = SharedFleetPublisher()
+        self._shared_fleet_reader = SharedFleetReader(self._shared_fleet_publisher.get_control_segment_name())
+
+    def tearDown(self):
+        self._shared_fleet_reader.close()
+        self._shared_fleet_publisher.close()
+
+    @staticmethod
+    def create_robot_fleet(robot_count, battery_level=50):
+        return RobotFleet.create_from_robots([Robot(id=robot_id, battery_level=battery_level, x_coordinate=robot_id,
+                                                    y_coordinate=robot_id / 2)
+                                              for robot_id in range(robot_count)])
+
+    @staticmethod
+    def get_robot_values(robot_fleet):
+        return [(robot.get_id(), robot.get_battery_level(), robot.get_x_coordinate(), robot.get_y_coordinate())
+                for robot in robot_fleet]
+
+    def test_nothing_is_read_before_the_first_publication(self):
+        self.assertEqual(first=self._shared_fleet_reader.get_generation(), second=0)
+        self.assertIsNone(self._shared_fleet_reader.read_snapshot())
+
+    def test_published_fleet_is_read_back_with_its_generation_and_fetch_time(self):
+        robot_fleet = RobotFleet.create_from_robots([Robot(id=1, battery_level=50, x_coordinate=1, y_coordinate=2),
+                                                     Robot(id=2, battery_level=75.5, x_coordinate=3.5, y_coordinate=4)])
+
+        generation = self._shared_fleet_publisher.publish(robot_fleet=robot_fleet, fetched_at=12.5)
+        fleet_snapshot = self._shared_fleet_reader.read_snapshot()
+
+        self.assertEqual(first=self._shared_fleet_reader.get_generation(), second=generation)
+        self.assertEqual(first=fleet_snapshot.get_version(), second=generation)
+        self.assertEqual(first=fleet_snapshot.get_fetched_at(), second=12.5)
+        self.assertEqual(first=self.get_robot_values(fleet_snapshot.get_robot_fleet()),
+                         second=[(1, 50, 1, 2), (2, 75.5, 3.5, 4)])
+        self.assertIs(type(fleet_snapshot.get_robot_fleet().get_robot(0).get_battery_level()), int)
+        self.assertEqual(first=fleet_snapshot.get_robot_spatial_index().get_robot_count(), second=2)
+
+    def test_fleets_restored_from_file_are_read_back_flagged_as_restored(self):
+        for is_restored_from_file in [True, False]:
+            self._shared_fleet_publisher.publish(robot_fleet=self.create_robot_fleet(3), fetched_at=0,
+                                                 is_restored_from_file=is_restored_from_file)
+
+            self.assertEqual(first=self._shared_fleet_reader.read_snapshot().is_restored_from_file(),
+                             second=is_restored_from_file)
+
+    def test_read_snapshots_view_the_published_columns_in_place(self):
+        self._shared_fleet_publisher.publish(robot_fleet=self.create_robot_fleet(3), fetched_at=0)
+
+        robot_fleet = self._shared_fleet_reader.read_snapshot().get_robot_fleet()
+
+        for column in [robot_fleet.get_ids(), robot_fleet.get_battery_levels(), robot_fleet.get_x_coordinates(),
+                       robot_fleet.get_y_coordinates()]:
+            self.assertIsInstance(column, memoryview)
+            self.assertTrue(column.readonly)
+
+    def test_each_publication_is_read_as_a_new_generation_even_when_the_fleet_grows(self):
+        for robot_count in [3, 5000, 10]:
+            self._shared_fleet_publisher.publish(robot_fleet=self.create_robot_fleet(robot_count), fetched_at=0)
+            fleet_snapshot = self._shared_fleet_reader.read_snapshot()
+
+            self.assertEqual(first=self.get_robot_values(fleet_snapshot.get_robot_fleet()),
+                             second=self.get_robot_values(self.create_robot_fleet(robot_count)))
+        self.assertEqual(first=fleet_snapshot.get_version(), second=3)
+
+    def test_earlier_snapshots_are_unchanged_by_the_next_publication(self):
+        self._shared_fleet_publisher.publish(robot_fleet=self.create_robot_fleet(3), fetched_at=0)
+        fleet_snapshot = self._shared_fleet_reader.read_snapshot()
+
+        self._shared_fleet_publisher.publish(robot_fleet=self.create_robot_fleet(3, battery_level=10), fetched_at=0)
+        self._shared_fleet_publisher.publish(robot_fleet=self.create_robot_fleet(3, battery_level=20), fetched_at=0)
+
+        self.assertEqual(first=[robot.get_battery_level() for robot in fleet_snapshot.get_robot_fleet()],
+                         second=[50, 50, 50])
+
+    def test_reading_from_a_previous_snapshot_matches_reading_afresh(self):
+        robot_fleet = self.create_robot_fleet(100)
+        self._shared_fleet_publisher.publish(robot_fleet=robot_fleet, fetched_at=0)
+        previous_fleet_snapshot = self._shared_fleet_reader.read_snapshot()
+        robot_fleet.update_robot(position=7, robot=Robot(id=7, battery_level=0, x_coordinate=7, y_coordinate=3.5))
+        robot_fleet.update_robot(position=9, robot=Robot(id=9, battery_level=50, x_coordinate=-40, y_coordinate=0))
+        robot_fleet.append_robot(Robot(id=100, battery_level=90, x_coordinate=2, y_coordinate=1))
+        self._shared_fleet_publisher.publish(robot_fleet=robot_fleet, fetched_at=5)
+
+        fleet_snapshot = self._shared_fleet_reader.read_snapshot(previous_snapshot=previous_fleet_snapshot)
+        expected_fleet_snapshot = self._shared_fleet_reader.read_snapshot()
+
+        self.assertEqual(first=(fleet_snapshot.get_version(), fleet_snapshot.get_fetched_at()), second=(2, 5))
+        self.assertEqual(first=fleet_snapshot.get_robot_by_id(100).get_x_coordinate(), second=2)
+        self.assertEqual(first=fleet_snapshot.get_robot_spatial_index().get_robot_count(),
+                         second=expected_fleet_snapshot.get_robot_spatial_index().get_robot_count())
+        for x_coordinate in range(-50, 120, 7):
+            self.assertEqual(first=fleet_snapshot.get_robot_spatial_index().find_nearest_robot_positions(
+                x_coordinate=x_coordinate, y_coordinate=x_coordinate / 3, robot_count=5),
+                second=expected_fleet_snapshot.get_robot_spatial_index().find_nearest_robot_positions(
+                    x_coordinate=x_coordinate, y_coordinate=x_coordinate / 3, robot_count=5))
+        self.assertEqual(first=previous_fleet_snapshot.get_robot_by_id(7).get_battery_level(), second=50)
+
+    def test_updating_a_read_snapshot_does_not_change_the_shared_fleet(self):
+        self._shared_fleet_publisher.publish(robot_fleet=self.create_robot_fleet(2), fetched_at=0)
+        fleet_snapshot = self._shared_fleet_reader.read_snapshot()
+
+        fleet_snapshot.create_updated_snapshot(version=99, robots=[Robot(id=0, battery_level=1, x_coordinate=0,
+                                                                         y_coordinate=0)])
+
+        self.assertEqual(first=[robot.get_battery_level() for robot in
+                                self._shared_fleet_reader.read_snapshot().get_robot_fleet()],
+                         second=[50, 50])
+
+
+class SharedFleetRefresherUnitTest(unittest.TestCase):
+
+    def test_robot_updates_waiting_together_are_published_as_one_generation(self):
+        shared_fleet_publisher = SharedFleetPublisher()
+        shared_fleet_reader = SharedFleetReader(shared_fleet_publisher.get_control_segment_name())
+        fleet_snapshot_cache = FleetSnapshotCache(json_retriever=StubJSONRetriever([(True, [])]),
+                                                  refresh_interval_seconds=60)
+        robot_update_queue = queue.Queue()
+        stop_event = threading.Event()
+        for robot_id in range(3):
+            robot_update_queue.put([Robot(id=robot_id, battery_level=50, x_coordinate=robot_id, y_coordinate=0)])
+        refresher_thread = threading.Thread(target=shared_fleet_publisher.run_refresher,
+                                            args=(fleet_snapshot_cache, robot_update_queue, stop_event))
+        try:
+            refresher_thread.start()
+            deadline = time.monotonic() + 5
+            while shared_fleet_reader.get_generation() < 2 and time.monotonic() < deadline:
+                time.sleep(0.01)
+            stop_event.set()
+            robot_update_queue.put(None)
+            refresher_thread.join()
+
+            self.assertEqual(first=shared_fleet_reader.get_generation(), second=2)
+            self.assertEqual(first=[robot.get_id() for robot in shared_fleet_reader.read_snapshot().get_robot_fleet()],
+                             second=[0, 1, 2])
+        finally:
+            shared_fleet_reader.close()
+            shared_fleet_publisher.close()
+
+
+class SharedFleetSnapshotCacheUnitTest(unittest.TestCase):
+
+    def setUp(self):
+        self._shared_fleet_publisher = SharedFleetPublisher()
+        self._shared_fleet_reader = SharedFleetReader(self._shared_fleet_publisher.get_control_segment_name())
+        self._robot_update_queue = queue.Queue()
+        self._shared_fleet_snapshot_cache = SharedFleetSnapshotCache(shared_fleet_reader=self._shared_fleet_reader,
+                                                                     robot_update_queue=self._robot_update_queue,
+                                                                     first_snapshot_timeout_seconds=0.05)
+
+    def tearDown(self):
+        # Snapshots View the Reader's Segments, So They Must Be Let Go of Before the Reader Can Close Them
+        self._shared_fleet_snapshot_cache = None
+        self._shared_fleet_reader.close()
+        self._shared_fleet_publisher.close()
+
+    def test_snapshot_is_none_until_something_is_published(self):
+        self.assertIsNone(self._shared_fleet_snapshot_cache.get_snapshot())
+
+    def test_snapshot_is_only_rebuilt_when_a_new_generation_is_published(self):
+        self._shared_fleet_publisher.publish(robot_fleet=SharedFleetUnitTest.create_robot_fleet(2), fetched_at=0)
+        fleet_snapshot = self._shared_fleet_snapshot_cache.get_snapshot()
+
+        self.assertIs(self._shared_fleet_snapshot_cache.get_snapshot(), fleet_snapshot)
+        self._shared_fleet_publisher.publish(robot_fleet=SharedFleetUnitTest.create_robot_fleet(3), fetched_at=0)
+        self.assertEqual(first=len(self._shared_fleet_snapshot_cache.get_snapshot().get_robot_fleet()), second=3)
+        self.assertIs(self._shared_fleet_snapshot_cache.peek_snapshot(),
+                      self._shared_fleet_snapshot_cache.get_snapshot())
+
+    def test_robot_updates_are_forwarded_to_the_refresher(self):
+        robots = [Robot(id=1, battery_level=10, x_coordinate=0, y_coordinate=0)]
+
+        self._shared_fleet_snapshot_cache.apply_robot_updates(robots)
+
+        self.assertIs(self._robot_update_queue.get_nowait(), robots)
+
+
+if __name__ == '__main__':
+    unittest.main()
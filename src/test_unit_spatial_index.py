@@ -0,0 +1,153 @@
+import unittest
+
+# Internal Libraries
+from models import Robot
+from spatial_index import RobotSpatialIndex
+
+
+class RobotSpatialIndexUnitTest(unittest.TestCase):
+
+    @staticmethod
+    def create_robot_with(robot_id=0, battery_level=100, x_coordinate=0, y_coordinate=0):
+        return Robot(id=robot_id,
+                     battery_level=battery_level,
+                     x_coordinate=x_coordinate,
+                     y_coordinate=y_coordinate)
+
+    def test_index_leaves_out_robots_with_0_battery(self):
+        robots = [self.create_robot_with(robot_id=1, battery_level=0),
+                  self.create_robot_with(robot_id=2, battery_level=50)]
+
+        robot_spatial_index = RobotSpatialIndex(robots)
+
+        self.assertEqual(first=robot_spatial_index.get_robot_count(), second=1)
+
+    def test_find_robots_within_distance_includes_robots_exactly_on_the_boundary(self):
+        robots = [self.create_robot_with(robot_id=1, x_coordinate=0, y_coordinate=10),
+                  self.create_robot_with(robot_id=2, x_coordinate=0, y_coordinate=-10.5),
+                  self.create_robot_with(robot_id=3, x_coordinate=-6, y_coordinate=-8)]
+
+        robot_spatial_index = RobotSpatialIndex(robots)
+        entries = robot_spatial_index.find_robots_within_distance(x_coordinate=0, y_coordinate=0, distance=10)
+
+        self.assertEqual(first=sorted(robot.get_id() for _, robot, _ in entries), second=[1, 3])
+
+    def test_find_robots_within_distance_returns_positions_and_distances(self):
+        robots = [self.create_robot_with(robot_id=1, x_coordinate=100, y_coordinate=100),
+                  self.create_robot_with(robot_id=2, x_coordinate=3, y_coordinate=4)]
+
+        robot_spatial_index = RobotSpatialIndex(robots)
+        entries = robot_spatial_index.find_robots_within_distance(x_coordinate=0, y_coordinate=0, distance=10)
+
+        self.assertEqual(first=[(position, robot.get_id(), distance) for position, robot, distance in entries],
+                         second=[(1, 2, 5.0)])
+        self.assertEqual(first=robot_spatial_index.find_robot_positions_within_distance(x_coordinate=0,
+                                                                                        y_coordinate=0,
+                                                                                        distance=10),
+                         second=[(1, 5.0)])
+
+    def test_find_nearest_robot_returns_none_for_empty_index(self):
+        self.assertIsNone(RobotSpatialIndex([]).find_nearest_robot(x_coordinate=0, y_coordinate=0))
+
+    def test_find_nearest_robot_searches_beyond_neighbouring_cells(self):
+        robots = [self.create_robot_with(robot_id=1, x_coordinate=-500, y_coordinate=0),
+                  self.create_robot_with(robot_id=2, x_coordinate=0, y_coordinate=300),
+                  self.create_robot_with(robot_id=3, x_coordinate=1000, y_coordinate=1000)]
+
+        robot_spatial_index = RobotSpatialIndex(robots)
+        position, robot, distance = robot_spatial_index.find_nearest_robot(x_coordinate=0, y_coordinate=0)
+
+        self.assertEqual(first=(position, robot.get_id(), distance), second=(1, 2, 300.0))
+
+    def test_find_nearest_robot_prefers_earliest_robot_when_distances_tie(self):
+        robots = [self.create_robot_with(robot_id=1, x_coordinate=30, y_coordinate=0),
+                  self.create_robot_with(robot_id=2, x_coordinate=-30, y_coordinate=0),
+                  self.create_robot_with(robot_id=3, x_coordinate=0, y_coordinate=-30)]
+
+        robot_spatial_index = RobotSpatialIndex(robots)
+        _, robot, _ = robot_spatial_index.find_nearest_robot(x_coordinate=0, y_coordinate=0)
+
+        self.assertEqual(first=robot.get_id(), second=1)
+
+    def test_find_nearest_robots_returns_requested_count_ordered_by_distance(self):
+        robots = [self.create_robot_with(robot_id=1, x_coordinate=0, y_coordinate=300),
+                  self.create_robot_with(robot_id=2, x_coordinate=5, y_coordinate=0),
+                  self.create_robot_with(robot_id=3, x_coordinate=-40, y_coordinate=0),
+                  self.create_robot_with(robot_id=4, x_coordinate=40, y_coordinate=0)]
+
+        robot_spatial_index = RobotSpatialIndex(robots)
+        entries = robot_spatial_index.find_nearest_robots(x_coordinate=0, y_coordinate=0, robot_count=3)
+
+        self.assertEqual(first=[robot.get_id() for _, robot, _ in entries], second=[2, 3, 4])
+        self.assertEqual(first=len(robot_spatial_index.find_nearest_robots(x_coordinate=0,
+                                                                           y_coordinate=0,
+                                                                           robot_count=10)), second=4)
+
+    def test_cells_hold_fleet_positions_in_fleet_order(self):
+        robots = [self.create_robot_with(robot_id=robot_id, x_coordinate=robot_id % 2 * 100, y_coordinate=0)
+                  for robot_id in range(6)]
+
+        robot_spatial_index = RobotSpatialIndex(robots)
+
+        self.assertEqual(first=robot_spatial_index.find_nearest_robot_positions(x_coordinate=0, y_coordinate=0,
+                                                                                robot_count=6),
+                         second=[(0, 0.0), (2, 0.0), (4, 0.0), (1, 100.0), (3, 100.0), (5, 100.0)])
+
+    @staticmethod
+    def update_robot(robot_spatial_index, position, robot):
+        robot_fleet = robot_spatial_index.get_robot_fleet().copy()
+        if position < len(robot_fleet):
+            robot_fleet.update_robot(position=position, robot=robot)
+        else:
+            robot_fleet.append_robot(robot)
+        return robot_spatial_index.create_updated_index(robot_fleet=robot_fleet, updated_positions=[position])
+
+    def test_updated_index_moves_robot_between_cells(self):
+        robots = [self.create_robot_with(robot_id=1, x_coordinate=0, y_coordinate=0),
+                  self.create_robot_with(robot_id=2, x_coordinate=500, y_coordinate=500)]
+        robot_spatial_index = RobotSpatialIndex(robots)
+
+        robot_spatial_index = self.update_robot(robot_spatial_index, position=1,
+                                                robot=self.create_robot_with(robot_id=2, x_coordinate=1,
+                                                                             y_coordinate=0))
+        entries = robot_spatial_index.find_robots_within_distance(x_coordinate=0, y_coordinate=0, distance=10)
+
+        self.assertEqual(first=sorted(robot.get_id() for _, robot, _ in entries), second=[1, 2])
+        self.assertEqual(first=robot_spatial_index.get_robot_count(), second=2)
+
+    def test_updated_index_leaves_robots_that_lose_their_battery_out(self):
+        robot_spatial_index = RobotSpatialIndex([self.create_robot_with(robot_id=1)])
+
+        robot_spatial_index = self.update_robot(robot_spatial_index, position=0,
+                                                robot=self.create_robot_with(robot_id=1, battery_level=0))
+
+        self.assertEqual(first=robot_spatial_index.get_robot_count(), second=0)
+        self.assertIsNone(robot_spatial_index.find_nearest_robot(x_coordinate=0, y_coordinate=0))
+
+    def test_updated_index_adds_new_positions(self):
+        robot_spatial_index = RobotSpatialIndex([])
+
+        robot_spatial_index = self.update_robot(robot_spatial_index, position=0,
+                                                robot=self.create_robot_with(robot_id=9, x_coordinate=-70,
+                                                                             y_coordinate=20))
+        position, robot, _ = robot_spatial_index.find_nearest_robot(x_coordinate=0, y_coordinate=0)
+
+        self.assertEqual(first=(position, robot.get_id()), second=(0, 9))
+
+    def test_updating_leaves_the_original_index_unchanged(self):
+        robots = [self.create_robot_with(robot_id=1, x_coordinate=0, y_coordinate=0),
+                  self.create_robot_with(robot_id=2, x_coordinate=500, y_coordinate=500)]
+        robot_spatial_index = RobotSpatialIndex(robots)
+
+        self.update_robot(robot_spatial_index, position=0,
+                          robot=self.create_robot_with(robot_id=1, x_coordinate=490, y_coordinate=490))
+        self.update_robot(robot_spatial_index, position=2,
+                          robot=self.create_robot_with(robot_id=3, x_coordinate=1, y_coordinate=1))
+        entries = robot_spatial_index.find_robots_within_distance(x_coordinate=0, y_coordinate=0, distance=10)
+
+        self.assertEqual(first=[(position, robot.get_id()) for position, robot, _ in entries], second=[(0, 1)])
+        self.assertEqual(first=robot_spatial_index.get_robot_count(), second=2)
+
+
+if __name__ == '__main__':
+    unittest.main()
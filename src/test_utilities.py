@@ -1,4 +1,3 @@
-
 class JSONRequestTestFixtureUtilities(object):
 
     @staticmethod
@@ -34,3 +33,18 @@ class JSONRobotDatabaseDataTextFixtureUtilities(object):
                 battery_level_name: 100,
                 x_name: 0,
                 y_name: 0}
+
+
+class StubJSONRetriever(object):
+
+    def __init__(self, responses):
+        self._responses = list(responses)
+        self._call_count = 0
+
+    def get_call_count(self):
+        return self._call_count
+
+    def get_json_data(self):
+        response = self._responses[min(self._call_count, len(self._responses) - 1)]
+        self._call_count += 1
+        return response